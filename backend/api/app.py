@@ -1,6 +1,5 @@
 from flask import Flask, request, jsonify, session, send_from_directory
 from flask_cors import CORS
-import joblib
 import sys
 import os
 import os
@@ -17,61 +16,57 @@ from backend.api.routes.auth import register_routes
 from backend.api.routes.api import calculate_eco_score
 from backend.api.routes.enterprise_dashboard import enterprise_bp
 from backend.api.routes.benchmarking_api import benchmarking_bp
+from backend.services.dataset_service import ECO_DATASET_PATH, get_dataset_service
+from backend.services.event_log import get_event_log
+from backend.core.caching import asin_tag, dataset_tag, get_response_cache, invalidate_cache_tags, model_tag
+from backend.ml.inference.model_registry import get_model_registry
+from backend.utils.lazy import lazy_import, lazy_object, module_available
+from backend.utils.title_features import container_weight, parse_title
+from backend.ml.inference.feature_builder import (
+    BASIC_FEATURES,
+    ENHANCED_FEATURES,
+    predict_labels
+)
 
-# Add manufacturing complexity system for realistic CO2 calculations
-sys.path.append('/Users/jamie/Documents/University/dsp_eco_tracker/backend/services')
-try:
-    from manufacturing_complexity_multipliers import ManufacturingComplexityCalculator
-    from enhanced_materials_database import EnhancedMaterialsDatabase
-    
-    # Initialize for realistic CO2 calculations
-    complexity_calculator = ManufacturingComplexityCalculator()
-    materials_db = EnhancedMaterialsDatabase()
-    print("✅ Main API now using realistic CO2 calculations with manufacturing complexity")
-    MANUFACTURING_COMPLEXITY_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ Manufacturing complexity not available: {e}")
-    MANUFACTURING_COMPLEXITY_AVAILABLE = False
+# Heavy modules (selenium scraper stack, pgeocode, materials databases) load on
+# the first request that needs them, so importing the app and booting a worker
+# stays cheap. See backend/utils/lazy.py
+manufacturing_complexity = lazy_import("backend.services.manufacturing_complexity_multipliers")
+enhanced_materials = lazy_import("backend.services.enhanced_materials_database")
+
+# Realistic CO2 calculations with manufacturing complexity
+MANUFACTURING_COMPLEXITY_AVAILABLE = (
+    module_available("backend.services.manufacturing_complexity_multipliers")
+    and module_available("backend.services.enhanced_materials_database")
+)
+complexity_calculator = lazy_object(
+    lambda: manufacturing_complexity.ManufacturingComplexityCalculator(), "ManufacturingComplexityCalculator"
+)
+materials_db = lazy_object(lambda: enhanced_materials.EnhancedMaterialsDatabase(), "EnhancedMaterialsDatabase")
+if not MANUFACTURING_COMPLEXITY_AVAILABLE:
+    print("⚠️ Manufacturing complexity not available")
 
 
 import pandas as pd
-# Import production scraper with category intelligence and enhanced reliability
-try:
-    from backend.scrapers.amazon.production_scraper import ProductionAmazonScraper
-    PRODUCTION_SCRAPER_AVAILABLE = True
-    print("✅ Production scraper with category intelligence loaded")
-except ImportError as e:
-    print(f"⚠️ Production scraper not available: {e}")
-    PRODUCTION_SCRAPER_AVAILABLE = False
-
-# Always import unified scraper functions
-from backend.scrapers.amazon.unified_scraper import (
-    scrape_amazon_product_page,  # Final fallback scraper
-    UnifiedProductScraper
-)
+# Production scraper with category intelligence; the shared pool imports it on first use
+production_scraper_module = lazy_import("backend.scrapers.amazon.production_scraper")
+from backend.scrapers.amazon.scraper_pool import DEFAULT_ACQUIRE_TIMEOUT, get_production_scraper_pool, normalize_asin
 
-# Always try to load enhanced scraper as fallback
-try:
-    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
-    from enhanced_scraper_fix import EnhancedAmazonScraper
-    ENHANCED_SCRAPER_AVAILABLE = True
-    print("✅ Enhanced scraper with dual origins loaded (fallback)")
-except ImportError as e2:
-    ENHANCED_SCRAPER_AVAILABLE = False
-    print(f"⚠️ Enhanced scraper not available: {e2}")
-from backend.scrapers.amazon.integrated_scraper import (
-    estimate_origin_country,
-    resolve_brand_origin,
-    save_brand_locations,
-    haversine, 
-    origin_hubs, 
-    uk_hub
-)
+# Unified scraper (final fallback) and the dual-origin enhanced scraper
+unified_scraper = lazy_import("backend.scrapers.amazon.unified_scraper")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+enhanced_scraper_fix = lazy_import("enhanced_scraper_fix")
+
+# Brand origin helpers and hub coordinates (pull in the selenium title scraper)
+integrated_scraper = lazy_import("backend.scrapers.amazon.integrated_scraper")
 
 import csv
 import re
+import time
 import numpy as np
-import pgeocode
+pgeocode = lazy_import("pgeocode")
+# Postcode lookups share one geocoder (its constructor reads the whole GB table)
+uk_geocoder = lazy_object(lambda: pgeocode.Nominatim("gb"), "pgeocode.Nominatim")
 
 # === Load Flask ===
 #   app = Flask(__name__)
@@ -99,83 +94,17 @@ def extract_weight_from_title(title: str) -> float:
     """
     if not title:
         return 0.0
-        
-    import re
-    title_lower = title.lower()
-    
-    print(f"🔍 Extracting weight from title: {title}")
-    
-    # STEP 1: Exclude nutritional content patterns to avoid false matches
-    nutritional_exclusions = [
-        r'\d+\s*g\s*protein\b',
-        r'\d+\s*g\s*carbs?\b', 
-        r'\d+\s*g\s*fat\b',
-        r'\d+\s*mg\s*(?:sodium|caffeine)\b',
-        r'\d+\s*(?:cal|kcal)\b',
-        r'\d+\s*g\s*sugar\b',
-        r'\d+\s*g\s*fiber\b',
-        r'\d+\s*servings?\b',
-        r'\d+\s*scoops?\b'
-    ]
-    
-    # Remove nutritional info to avoid false matches
-    cleaned_title = title_lower
-    for exclusion in nutritional_exclusions:
-        if re.search(exclusion, cleaned_title):
-            print(f"⚠️ Removing nutritional info pattern: {exclusion}")
-            cleaned_title = re.sub(exclusion, ' ', cleaned_title)
-    
-    print(f"🧹 Cleaned title: {cleaned_title}")
-    
-    # STEP 2: Look for container weight patterns (ordered by precision)
-    container_weight_patterns = [
-        # Most precise: explicit container weight
-        (r'(\d+(?:\.\d+)?)\s*kg\b', 'kg', 1.0),
-        (r'(\d+(?:\.\d+)?)\s*lb[s]?\b', 'lb', 0.453592),
-        (r'(\d+(?:\.\d+)?)\s*pound[s]?\b', 'lb', 0.453592),
-        
-        # Medium precision: large gram amounts (likely containers)
-        (r'(\d{3,4})\s*g\b', 'g_large', 0.001),  # 500g, 1000g, 2500g
-        
-        # Common Amazon formats  
-        (r'(\d+(?:\.\d+)?)\s*kilograms?\b', 'kg', 1.0),
-        (r'(\d+(?:\.\d+)?)\s*pounds?\b', 'lb', 0.453592),
-        (r'(\d+(?:\.\d+)?)\s*ounces?\b', 'oz', 0.0283495),
-        
-        # Low precision: any gram amount (use with caution)
-        (r'(\d+(?:\.\d+)?)\s*g\b(?!ram)', 'g', 0.001),
-    ]
-    
-    for pattern, unit, multiplier in container_weight_patterns:
-        matches = re.findall(pattern, cleaned_title)
-        if matches:
-            try:
-                weight_val = float(matches[0])
-                weight_kg = weight_val * multiplier
-                
-                # Category-specific validation
-                is_protein_supplement = any(keyword in title_lower for keyword in ['protein', 'whey', 'casein', 'mass gainer', 'supplement'])
-                
-                if is_protein_supplement:
-                    # For protein products, reject weights that are clearly nutritional content
-                    if unit == 'g' and weight_val < 200:  # Less than 200g unlikely to be container
-                        print(f"⚠️ Rejecting small gram value for protein: {weight_val}g (likely nutritional)")
-                        continue
-                    elif unit == 'g_large' and weight_val < 400:  # Even large gram pattern, be cautious
-                        print(f"⚠️ Rejecting medium gram value for protein: {weight_val}g (likely nutritional)")
-                        continue
-                
-                # General sanity check - reasonable product weights
-                if 0.05 <= weight_kg <= 50:  # 50g to 50kg range
-                    print(f"⚖️ ✅ Extracted weight: {weight_val}{unit} = {weight_kg:.3f}kg")
-                    return weight_kg
-                else:
-                    print(f"⚠️ Weight out of range: {weight_kg:.3f}kg")
-                    
-            except (ValueError, IndexError):
-                continue
-    
-    print("⚠️ No valid weight found in title")
+
+    # One cached scan finds weights and nutrition facts ("23g protein",
+    # "76 servings") together; nutrition is never read as the weight
+    features = parse_title(title)
+    found = container_weight(features)
+    if found:
+        weight, rule, weight_kg = found
+        print(f"⚖️ ✅ Extracted weight: {weight.value}{rule} = {weight_kg:.3f}kg")
+        return weight_kg
+
+    print(f"⚠️ No valid weight found in title: {title}")
     return 0.0
 
 def get_category_fallback_weight(title: str, brand: str = "") -> float:
@@ -311,7 +240,7 @@ def extract_enhanced_origins(product: dict, title: str) -> dict:
     # 2. Fallback: Brand locations database
     brand_origin = None
     if brand and brand != "Unknown":
-        brand_result = resolve_brand_origin(brand)
+        brand_result = integrated_scraper.resolve_brand_origin(brand)
         # Handle case where resolve_brand_origin returns a tuple
         if isinstance(brand_result, tuple):
             brand_origin = brand_result[0] if brand_result[0] != "Unknown" else None
@@ -565,7 +494,39 @@ print("✅ Supply chain benchmarking routes registered")
 
 
 
-SUBMISSION_FILE = "submitted_predictions.json"
+# Submission and feedback logs live under the project root, not the working
+# directory; EVENT_LOG_DIR moves them elsewhere (the tests use a temp dir)
+EVENT_LOG_DIR = os.environ.get("EVENT_LOG_DIR") or BASE_DIR
+app.config['EVENT_LOG_DIR'] = EVENT_LOG_DIR
+
+SUBMISSION_FILE = os.path.join(EVENT_LOG_DIR, "submitted_predictions.jsonl")
+LEGACY_SUBMISSION_FILE = os.path.join(EVENT_LOG_DIR, "submitted_predictions.json")
+FEEDBACK_FILE = os.path.join(EVENT_LOG_DIR, "ml_model", "user_feedback.jsonl")
+LEGACY_FEEDBACK_FILE = os.path.join(EVENT_LOG_DIR, "ml_model", "user_feedback.json")
+
+submission_log = get_event_log(SUBMISSION_FILE, legacy_json_path=LEGACY_SUBMISSION_FILE)
+feedback_log = get_event_log(FEEDBACK_FILE, legacy_json_path=LEGACY_FEEDBACK_FILE)
+
+
+def _submission_material(submission):
+    if not isinstance(submission, dict):
+        return None
+    raw_input = submission.get("raw_input")
+    material = raw_input.get("material") if isinstance(raw_input, dict) else None
+    return material if isinstance(material, str) and material != "Unknown" else None
+
+
+def _submission_label(submission):
+    if not isinstance(submission, dict):
+        return None
+    label = submission.get("predicted_label")
+    return label if isinstance(label, str) and label != "Unknown" else None
+
+
+# Dashboard counters, kept up to date as the log grows
+submission_log.add_counter("material", _submission_material)
+submission_log.add_counter("predicted_label", _submission_label)
+submission_log.add_counter("non_empty", lambda submission: True if submission else None)
 
 
 @app.route("/admin/submissions")
@@ -574,11 +535,7 @@ def get_submissions():
     if not user or user.get("role") != "admin":
         return jsonify({"error": "Unauthorized"}), 401
 
-    if not os.path.exists(SUBMISSION_FILE):
-        return jsonify([])
-
-    with open(SUBMISSION_FILE, "r", encoding="utf-8") as f:
-        return jsonify(json.load(f))
+    return jsonify(submission_log.read_all())
 
 
 
@@ -589,33 +546,15 @@ def update_submission():
         return jsonify({"error": "Unauthorized"}), 401
 
     item = request.json
-    with open(SUBMISSION_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    for i, row in enumerate(data):
-        if row["title"] == item["title"]:
-            data[i] = item
-            break
-    with open(SUBMISSION_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    submission_log.replace(lambda row: isinstance(row, dict) and row.get("title") == item["title"], item)
     return jsonify({"status": "success"})
 
 
 
 def log_submission(product):
-    path = "submitted_predictions.json"
     try:
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                try:
-                    data = json.load(f)
-                except json.JSONDecodeError as e:
-                    print(f"⚠️ JSON decode error in {path}: {e}. Starting fresh.")
-                    data = []
-        else:
-            data = []
-        data.append(product)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Queued for the log's writer thread: no read or rewrite of earlier submissions
+        submission_log.append(product)
         print(f"✅ Logged submission: {product.get('title', 'Unknown')}")
     except Exception as e:
         print(f"❌ Failed to log submission: {e}")
@@ -638,203 +577,31 @@ def predict_eco_score():
     print("📩 /predict endpoint was hit via POST")  # debug
     try:
         data = request.get_json()
-        product = data  # ensure it's always defined
-        material = normalize_feature(data.get("material"), "Other")
-        weight = float(data.get("weight") or 0.0)
-        # Estimate default transport from distance if none provided
         user_transport = data.get("transport")
-        origin_km = float(product.get("distance_origin_to_uk", 0) or 0)
-
-        # Heuristic fallback: choose mode by distance
-        def guess_transport_by_distance(km):
-            if km > 7000:
-                return "Ship"
-            elif km > 2000:
-                return "Air"
-            else:
-                return "Land"
-
-        # === Determine transport mode based on distance (default + override)
-        override_transport = normalize_feature(data.get("override_transport_mode"), None)
-
-        def determine_transport_mode(distance_km):
-            if distance_km < 1500:
-                return "Truck", 0.15
-            elif distance_km < 6000:
-                return "Ship", 0.03
-            else:
-                return "Air", 0.5
-            
-        origin_distance_km = float(data.get("distance_origin_to_uk") or 0)
-        origin = normalize_feature(data.get("origin"), "Other")
-
-        default_mode, default_emission_factor = determine_transport_mode(origin_distance_km)
-
-        if override_transport in ["Truck", "Ship", "Air"]:
-            transport = override_transport
-            print(f"🚛 User override mode: {transport}")
-        else:
-            transport = default_mode
-            print(f"📦 Default transport mode applied: {transport}")
+        models = model_registry.current()
+        model, label_encoder = models.model, models.label_encoder
 
+        # === Encode features (shared builder: dict lookups, one matrix row)
+        X, raw_inputs = models.feature_builder.build_matrix([data])
+        raw_input = raw_inputs[0]
+        transport = raw_input["transport"]
         print(f"🚛 Final transport used: {transport} (user selected: {user_transport})")
+        print(f"🔧 Using {X.shape[1]}-feature model for prediction")
 
-        recyclability = normalize_feature(data.get("recyclability"), "Medium")
-
-        # === Encode features
-        material_encoded = safe_encode(material, material_encoder, "Other")
-        transport_encoded = safe_encode(transport, transport_encoder, "Land")
-        recycle_encoded = safe_encode(recyclability, recycle_encoder, "Medium")
-        origin_encoded = safe_encode(origin, origin_encoder, "Other")
-
-        # === Bin weight (for 6th feature)
-        def bin_weight(w):
-            if w < 0.5:
-                return 0
-            elif w < 2:
-                return 1
-            elif w < 10:
-                return 2
-            else:
-                return 3
-
-        weight_bin_encoded = bin_weight(weight)
-
-        weight_log = np.log1p(weight)
-
-        # === Prepare enhanced features for 11-feature model
-        try:
-            # Infer additional features from title if available
-            title = data.get("title", "")
-            title_lower = title.lower()
-            
-            # Packaging type inference
-            if any(x in title_lower for x in ["bottle", "jar", "can"]):
-                packaging_type = "bottle"
-            elif any(x in title_lower for x in ["box", "pack", "carton"]):
-                packaging_type = "box"
-            else:
-                packaging_type = "other"
-            
-            # Size category inference
-            if weight > 2.0:
-                size_category = "large"
-            elif weight > 0.5:
-                size_category = "medium"
-            else:
-                size_category = "small"
-            
-            # Quality level inference
-            if any(x in title_lower for x in ["premium", "pro", "professional", "deluxe"]):
-                quality_level = "premium"
-            elif any(x in title_lower for x in ["basic", "standard", "regular"]):
-                quality_level = "standard"
-            else:
-                quality_level = "standard"
-            
-            # Pack size (number of items)
-            pack_size = 1
-            for num_word in ["2 pack", "3 pack", "4 pack", "5 pack", "6 pack", "8 pack", "10 pack", "12 pack"]:
-                if num_word in title_lower:
-                    pack_size = int(num_word.split()[0])
-                    break
-            
-            # Material confidence
-            material_confidence = 0.8 if material != "Other" else 0.3
-            
-            # Try to encode enhanced features if available
-            if packaging_type_encoder and size_category_encoder and quality_level_encoder and inferred_category_encoder:
-                packaging_encoded = safe_encode(packaging_type, packaging_type_encoder, "box")
-                size_encoded = safe_encode(size_category, size_category_encoder, "medium") 
-                quality_encoded = safe_encode(quality_level, quality_level_encoder, "standard")
-                
-                # Inferred category (basic inference)
-                if any(x in title_lower for x in ["protein", "supplement", "vitamins"]):
-                    inferred_category = "health"
-                elif any(x in title_lower for x in ["electronics", "phone", "computer"]):
-                    inferred_category = "electronics"  
-                elif any(x in title_lower for x in ["clothing", "shirt", "dress"]):
-                    inferred_category = "clothing"
-                else:
-                    inferred_category = "other"
-                
-                # Encode inferred category
-                category_encoded = safe_encode(inferred_category, inferred_category_encoder, "other")
-                
-                # Additional confidence measures
-                origin_confidence = 0.8 if origin != "Other" else 0.4
-                weight_confidence = 0.9 if weight > 0.1 else 0.5
-                
-                # Estimated lifespan (years) - basic heuristic
-                if "electronics" in inferred_category:
-                    estimated_lifespan_years = 5.0
-                elif "clothing" in inferred_category:
-                    estimated_lifespan_years = 2.0
-                else:
-                    estimated_lifespan_years = 3.0
-                
-                # Repairability score (1-10, higher is more repairable)
-                if "electronics" in inferred_category:
-                    repairability_score = 3.0
-                elif inferred_category in ["other", "health"]:
-                    repairability_score = 1.0  # Consumables not repairable
-                else:
-                    repairability_score = 5.0
-                
-                # Use 16-feature enhanced model (matching our training)
-                X = [[
-                    material_encoded,           # 1: material_encoded
-                    transport_encoded,          # 2: transport_encoded  
-                    recycle_encoded,           # 3: recyclability_encoded
-                    origin_encoded,            # 4: origin_encoded
-                    weight_log,                # 5: weight_log
-                    weight_bin_encoded,        # 6: weight_bin_encoded
-                    packaging_encoded,         # 7: packaging_type_encoded
-                    size_encoded,              # 8: size_category_encoded
-                    quality_encoded,           # 9: quality_level_encoded
-                    category_encoded,          # 10: inferred_category_encoded
-                    pack_size,                 # 11: pack_size
-                    material_confidence,       # 12: material_confidence
-                    origin_confidence,         # 13: origin_confidence
-                    weight_confidence,         # 14: weight_confidence
-                    estimated_lifespan_years,  # 15: estimated_lifespan_years
-                    repairability_score        # 16: repairability_score
-                ]]
-                print(f"🔧 Using 16-feature enhanced model for prediction")
-            else:
-                raise Exception("Enhanced encoders not available")
-                
-        except Exception as e:
-            print(f"⚠️ Enhanced features failed: {e}, falling back to 6 features")
-            # Fallback to 6-feature model
-            X = [[
-                material_encoded,
-                transport_encoded,
-                recycle_encoded,
-                origin_encoded,
-                weight_log,
-                weight_bin_encoded
-            ]]
+        material_encoded, transport_encoded, recycle_encoded, origin_encoded, weight_log, weight_bin_encoded = (
+            to_python_type(value) for value in X[0][:6]
+        )
+        weight_bin_encoded = int(weight_bin_encoded)
         
         if model is None:
             return jsonify({"error": "Model not available - please check server logs"}), 500
             
-        prediction = model.predict(X)
-        decoded_score = label_encoder.inverse_transform([prediction[0]])[0]
+        # Native Booster path for xgboost models (one inplace_predict call)
+        labels, confidences = predict_labels(models.predictor, label_encoder.classes_, X)
+        decoded_score = labels[0]
+        confidence = confidences[0]
 
-        print("🧠 Predicted Label:", decoded_score)
-        
-        confidence = 0.0
-        if hasattr(model, "predict_proba"):
-            proba = model.predict_proba(X)
-            print("🧪 predict_proba output:", proba)
-            print("🎯 Raw predict_proba values:", proba[0])  # <=== ADD THIS HERE
-
-            best_index = int(np.argmax(proba[0]))
-            best_label = label_encoder.inverse_transform([best_index])[0]
-            confidence = round(float(proba[0][best_index]) * 100, 1)
-
-            print(f"🧠 Most confident class: {best_label} with {confidence}%")
+        print(f"🧠 Predicted Label: {decoded_score} ({confidence}%)")
 
                 
         # === Feature Importance (optional)
@@ -862,13 +629,7 @@ def predict_eco_score():
         # === Log the prediction
         log_submission({
             "title": data.get("title", "Manual Submission"),
-            "raw_input": {
-                "material": material,
-                "weight": weight,
-                "transport": transport,
-                "recyclability": recyclability,
-                "origin": origin
-            },
+            "raw_input": raw_input,
             "predicted_label": decoded_score,
             "confidence": f"{confidence}%"
         })
@@ -877,20 +638,14 @@ def predict_eco_score():
         return jsonify({
             "predicted_label": decoded_score,
             "confidence": f"{confidence}%",
-            "raw_input": {
-                "material": material,
-                "weight": weight,
-                "transport": transport,
-                "recyclability": recyclability,
-                "origin": origin
-            },
+            "raw_input": raw_input,
             "encoded_input": {
-                "material": to_python_type(material_encoded),
-                "weight": to_python_type(weight),
-                "transport": to_python_type(transport_encoded),
-                "recyclability": to_python_type(recycle_encoded),
-                "origin": to_python_type(origin_encoded),
-                "weight_bin": to_python_type(weight_bin_encoded)
+                "material": int(material_encoded),
+                "weight": raw_input["weight"],
+                "transport": int(transport_encoded),
+                "recyclability": int(recycle_encoded),
+                "origin": int(origin_encoded),
+                "weight_bin": weight_bin_encoded
             },
             "feature_impact": local_impact
         })
@@ -900,120 +655,67 @@ def predict_eco_score():
         return jsonify({"error": str(e)}), 500
 
 
-# === Load Model and Encoders ===
+# Largest catalogue accepted by a single /predict/batch call
+MAX_BATCH_PREDICTIONS = 50000
 
-# Load the enhanced XGBoost model with error handling
-model = None
-model_type = None  # Track which model type is loaded
 
-# First try to load the 16-feature enhanced model (eco_model.pkl)
-try:
-    model = joblib.load(os.path.join(model_dir, "eco_model.pkl"))
-    print("✅ Loaded enhanced XGBoost model (16-feature)")
-    model_type = "enhanced_16"
-except Exception as e:
-    print(f"⚠️ Failed to load enhanced 16-feature model: {e}")
-    
-    # Fallback to old XGBoost JSON format
+@app.route("/predict/batch", methods=["POST"])
+def predict_eco_score_batch():
+    """
+    Score a whole catalogue in one call.
+
+    Body: {"products": [<same fields as /predict>, ...]} or a bare list.
+    Features are built into one matrix and scored with a single
+    predict_proba call; batch results are not written to the submission log.
+    """
+    data = request.get_json(silent=True)
+    products = data.get("products") if isinstance(data, dict) else data
+    if not isinstance(products, list) or not all(isinstance(p, dict) for p in products):
+        return jsonify({"error": "Expected a JSON list of products or {\"products\": [...]}"}), 400
+    if len(products) > MAX_BATCH_PREDICTIONS:
+        return jsonify({"error": f"Batch too large - at most {MAX_BATCH_PREDICTIONS} products per call"}), 413
     try:
-        import xgboost as xgb
-        model = xgb.XGBClassifier()
-        model.load_model(os.path.join(model_dir, "xgb_model.json"))
-        print("✅ Loaded legacy XGBoost model")
-        model_type = "legacy"
-    except Exception as e2:
-        print(f"⚠️ Failed to load XGBoost JSON model: {e2}")
-        print("🔄 Trying other formats...")
+        models = model_registry.current()
+    except Exception as e:
+        print(f"❌ Model not available: {e}")
+        return jsonify({"error": "Model not available - please check server logs"}), 500
+
     try:
-        # Try loading the pickled model without XGBoost dependency
-        import pickle
-        with open(os.path.join(model_dir, "eco_model.pkl"), 'rb') as f:
-            model = pickle.load(f)
-        print("✅ Loaded fallback model via pickle")
-    except Exception as e2:
-        try:
-            # Try to load enhanced XGBoost model first
-            try:
-                model = joblib.load(os.path.join(model_dir, "enhanced_xgboost_model.pkl"))
-                print("✅ Loaded enhanced XGBoost model (11 features)")
-                model_type = "enhanced"
-            except:
-                # Fallback to basic model
-                model = joblib.load(os.path.join(model_dir, "eco_model.pkl"))
-                print("⚠️ Loaded basic model (6 features)")
-                model_type = "basic"
-            print("✅ Loaded fallback model via joblib")
-        except Exception as e3:
-            print(f"❌ Failed to load any model: {e3}")
-            print("🔄 Creating simple fallback model...")
-            
-            # Create a simple fallback model class
-            class FallbackModel:
-                def predict(self, X):
-                    # Simple rule-based prediction based on features
-                    material_score = X[0][0] / 10.0  # Material encoded value
-                    weight_score = min(X[0][4], 3.0)  # Weight log
-                    transport_score = X[0][1] / 3.0   # Transport encoded
-                    
-                    # Simple scoring logic
-                    total_score = (material_score + weight_score + transport_score) / 3
-                    
-                    if total_score < 0.3:
-                        return [0]  # A+
-                    elif total_score < 0.5:
-                        return [1]  # A
-                    elif total_score < 0.7:
-                        return [2]  # B
-                    elif total_score < 0.9:
-                        return [3]  # C
-                    elif total_score < 1.2:
-                        return [4]  # D
-                    elif total_score < 1.5:
-                        return [5]  # E
-                    else:
-                        return [6]  # F
-                
-                def predict_proba(self, X):
-                    # Return mock probabilities
-                    pred = self.predict(X)[0]
-                    proba = [0.1] * 7  # 7 classes
-                    proba[pred] = 0.7  # High confidence for predicted class
-                    return [proba]
-                
-                @property
-                def feature_importances_(self):
-                    # Mock feature importances for 6 or 11 features
-                    return [0.25, 0.20, 0.15, 0.15, 0.15, 0.10]  # 6 features
-            
-            model = FallbackModel()
-            print("✅ Created fallback rule-based model")
-
-# Load basic encoders
-material_encoder = joblib.load(os.path.join(encoders_dir, "material_encoder.pkl"))
-print("🧩 Loaded material encoder classes:", material_encoder.classes_)
-
-transport_encoder = joblib.load(os.path.join(encoders_dir, "transport_encoder.pkl"))
-recycle_encoder = joblib.load(os.path.join(encoders_dir, "recycle_encoder.pkl"))
-label_encoder = joblib.load(os.path.join(encoders_dir, "label_encoder.pkl"))
-origin_encoder = joblib.load(os.path.join(encoders_dir, "origin_encoder.pkl"))
-
-# Load enhanced encoders for 16-feature model
-try:
-    packaging_type_encoder = joblib.load(os.path.join(encoders_dir, "packaging_type_encoder.pkl"))
-    size_category_encoder = joblib.load(os.path.join(encoders_dir, "size_category_encoder.pkl"))
-    quality_level_encoder = joblib.load(os.path.join(encoders_dir, "quality_level_encoder.pkl"))
-    inferred_category_encoder = joblib.load(os.path.join(encoders_dir, "inferred_category_encoder.pkl"))
-    print("✅ Loaded enhanced encoders for 16-feature model")
-except Exception as e:
-    print(f"⚠️ Could not load enhanced encoders: {e}")
-    # Set to None so we can check later
-    packaging_type_encoder = None
-    size_category_encoder = None
-    quality_level_encoder = None
-    inferred_category_encoder = None
-
-valid_scores = list(label_encoder.classes_)
-print("✅ Loaded label classes:", valid_scores)
+        start_time = time.perf_counter()
+        X, raw_inputs = models.feature_builder.build_matrix(products)
+        labels, confidences = predict_labels(models.predictor, models.label_encoder.classes_, X) if products else ([], [])
+        elapsed_ms = round((time.perf_counter() - start_time) * 1000, 2)
+        inference_ms = getattr(models.predictor, "last_latency_ms", None) if products else None
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid product data: {e}"}), 400
+    except Exception as e:
+        print(f"❌ Error in /predict/batch: {e}")
+        return jsonify({"error": str(e)}), 500
+
+    print(f"📦 /predict/batch scored {len(products)} products in {elapsed_ms}ms")
+    return jsonify({
+        "count": len(products),
+        "feature_count": X.shape[1],
+        "elapsed_ms": elapsed_ms,
+        "inference_ms": round(inference_ms, 3) if inference_ms is not None else None,
+        "predictions": [
+            {
+                "title": product.get("title", "Manual Submission"),
+                "predicted_label": label,
+                "confidence": f"{confidence}%",
+                "raw_input": raw_input
+            }
+            for product, label, confidence, raw_input in zip(products, labels, confidences, raw_inputs)
+        ]
+    })
+
+
+# === Model and Encoders ===
+# Loaded on first prediction, or in the gunicorn master before workers fork
+# (preload_app in gunicorn.conf.py) so every worker starts warm
+model_registry = get_model_registry()
+# A hot-swapped model must not keep serving the previous version's cached scores
+model_registry.on_swap(lambda old, new: invalidate_cache_tags(model_tag("xgboost")))
 
 
 @app.route("/all-model-metrics", methods=["GET"])
@@ -1080,17 +782,15 @@ def ml_audit_report():
         
         # 2. Dataset analysis
         try:
-            dataset_path = os.path.join(BASE_DIR, "common", "data", "csv", "expanded_eco_dataset.csv")
-            if os.path.exists(dataset_path):
-                df = pd.read_csv(dataset_path)
-                
-                # Analyze dataset characteristics
-                unique_materials = df["material"].nunique() if "material" in df.columns else 0
-                unique_origins = df["origin"].nunique() if "origin" in df.columns else 0
-                score_distribution = df["true_eco_score"].value_counts().to_dict() if "true_eco_score" in df.columns else {}
+            dataset = get_dataset_service(ECO_DATASET_PATH)
+            if dataset.available:
+                # Analyze dataset characteristics (memoized until the CSV changes)
+                unique_materials = dataset.nunique("material")
+                unique_origins = dataset.nunique("origin")
+                score_distribution = dataset.value_counts("true_eco_score")
                 
                 audit_report["dataset_analysis"] = {
-                    "total_samples": len(df),
+                    "total_samples": len(dataset.frame()),
                     "unique_materials": unique_materials,
                     "unique_origins": unique_origins,
                     "score_distribution": score_distribution,
@@ -1200,20 +900,18 @@ def load_material_co2_data():
 material_co2_map = load_material_co2_data()
 
 # === Helpers ===
-def normalize_feature(value, default):
-    clean = str(value or default).strip().title()
-    return default if clean.lower() == "unknown" else clean
-
-def safe_encode(value, encoder, default):
-    value = normalize_feature(value, default)
-    if value not in encoder.classes_:
-        print(f"⚠️ '{value}' not in encoder classes. Defaulting to '{default}'.")
-        value = default
-    return encoder.transform([value])[0]
+# Display names of the feature builder's columns (ENHANCED_FEATURES order)
+ML_FEATURE_DISPLAY_NAMES = [
+    "Material Type", "Transport Mode", "Recyclability", "Origin Country",
+    "Weight (log)", "Weight Category", "Packaging Type", "Size Category",
+    "Quality Level", "Inferred Category", "Pack Size", "Material Confidence",
+    "Origin Confidence", "Weight Confidence", "Estimated Lifespan", "Repairability Score"
+]
 
 @app.route("/api/feature-importance")
 def get_feature_importance():
     try:
+        model = model_registry.current().model
         if model is None:
             return jsonify({"error": "Model not available"}), 500
             
@@ -1293,15 +991,15 @@ def fuzzy_match_origin(origin):
 @app.route("/api/eco-data", methods=["GET"])
 def fetch_eco_dataset():
     try:
-        dataset_path = os.path.join(BASE_DIR, "common", "data", "csv", "expanded_eco_dataset.csv")
+        dataset = get_dataset_service(ECO_DATASET_PATH)
         
         # Check if file exists
-        if not os.path.exists(dataset_path):
-            print(f"⚠️ Dataset file not found: {dataset_path}")
+        if not dataset.available:
+            print(f"⚠️ Dataset file not found: {dataset.path}")
             # Return empty dataset instead of crashing
             return jsonify([])
         
-        df = pd.read_csv(dataset_path)
+        df = dataset.frame()
         
         # Handle missing columns gracefully
         required_cols = ["material", "true_eco_score", "co2_emissions"]
@@ -1311,24 +1009,19 @@ def fetch_eco_dataset():
             print("⚠️ No required columns found in dataset")
             return jsonify([])
         
-        df = df.dropna(subset=existing_cols)
-        
-        # Replace NaN values with None/null for JSON serialization
-        df = df.where(pd.notnull(df), None)
-        
         # Get limit from query parameter, default to 1000 for performance
         limit = request.args.get('limit', type=int, default=1000)
         limit = min(limit, 50000)  # Cap at 50k to allow full dataset access
         
-        # Apply limit
-        df_limited = df.head(limit)
+        # Served from memory; NaN values come back as None for JSON serialization
+        products = dataset.records(dropna_subset=existing_cols, limit=max(limit, 0))
         
         # Add metadata about the dataset
         response_data = {
-            "products": df_limited.to_dict(orient="records"),
+            "products": products,
             "metadata": {
-                "total_products_in_dataset": len(df),
-                "products_returned": len(df_limited),
+                "total_products_in_dataset": len(dataset.clean(existing_cols)),
+                "products_returned": len(products),
                 "limit_applied": limit
             }
         }
@@ -1349,19 +1042,15 @@ def fetch_eco_dataset():
 def insights_dashboard():
     try:
         # Load the logged data
-        dataset_path = os.path.join(BASE_DIR, "common", "data", "csv", "expanded_eco_dataset.csv")
-        df = pd.read_csv(dataset_path)
-        print("🔍 Dataset path:", dataset_path)
-        print("✅ Exists?", os.path.exists(dataset_path))
-
-
-        df = df.dropna(subset=["material", "true_eco_score", "co2_emissions"])  # Clean
+        dataset = get_dataset_service(ECO_DATASET_PATH)
+        if not dataset.available:
+            raise FileNotFoundError(dataset.path)
 
-        # Keep only the needed fields
-        insights = df[["material", "true_eco_score", "co2_emissions"]]
-        insights = insights.head(1000)  # Limit for frontend performance
+        # Clean rows, needed fields only, limited for frontend performance
+        fields = ["material", "true_eco_score", "co2_emissions"]
+        insights = dataset.records(columns=fields, dropna_subset=fields, limit=1000)
 
-        return jsonify(insights.to_dict(orient="records"))
+        return jsonify(insights)
     except Exception as e:
         print(f"❌ Failed to serve insights: {e}")
         return jsonify({"error": str(e)}), 500
@@ -1385,20 +1074,20 @@ def get_dashboard_metrics():
         
         # 1. Load main dataset
         try:
-            dataset_path = os.path.join(BASE_DIR, "common", "data", "csv", "expanded_eco_dataset.csv")
-            if os.path.exists(dataset_path):
-                df = pd.read_csv(dataset_path)
-                df_clean = df.dropna(subset=["material", "true_eco_score"])
+            dataset = get_dataset_service(ECO_DATASET_PATH)
+            if dataset.available:
+                clean_subset = ["material", "true_eco_score"]
+                df_clean = dataset.clean(clean_subset)
                 
                 metrics["total_products"] += len(df_clean)
                 
                 # Material distribution from dataset
-                material_counts = df_clean["material"].value_counts().to_dict()
+                material_counts = dataset.value_counts("material", dropna_subset=clean_subset)
                 for material, count in material_counts.items():
                     metrics["material_distribution"][material] = metrics["material_distribution"].get(material, 0) + count
                 
                 # Score distribution from dataset
-                score_counts = df_clean["true_eco_score"].value_counts().to_dict()
+                score_counts = dataset.value_counts("true_eco_score", dropna_subset=clean_subset)
                 for score, count in score_counts.items():
                     metrics["score_distribution"][score] = metrics["score_distribution"].get(score, 0) + count
                     
@@ -1406,29 +1095,19 @@ def get_dashboard_metrics():
         except Exception as e:
             print(f"⚠️ Could not load main dataset: {e}")
         
-        # 2. Load submitted predictions
+        # 2. Add submitted predictions (incremental counters, no re-parse of the log)
         try:
-            if os.path.exists(SUBMISSION_FILE):
-                with open(SUBMISSION_FILE, "r", encoding="utf-8") as f:
-                    submissions = json.load(f)
-                
-                metrics["total_predictions"] = len(submissions)
-                metrics["recent_activity"] = len([s for s in submissions if s])  # Non-empty submissions
-                
-                # Add submission data to distributions
-                for submission in submissions:
-                    if isinstance(submission, dict):
-                        # Material distribution from submissions
-                        material = submission.get("raw_input", {}).get("material", "Unknown")
-                        if material != "Unknown":
-                            metrics["material_distribution"][material] = metrics["material_distribution"].get(material, 0) + 1
-                        
-                        # Score distribution from submissions
-                        predicted_label = submission.get("predicted_label", "Unknown")
-                        if predicted_label != "Unknown":
-                            metrics["score_distribution"][predicted_label] = metrics["score_distribution"].get(predicted_label, 0) + 1
-                
-                print(f"📊 Loaded {len(submissions)} submitted predictions")
+            submission_counts = submission_log.counts()
+            
+            metrics["total_predictions"] = submission_counts["total"]
+            metrics["recent_activity"] = submission_counts["non_empty"].get(True, 0)  # Non-empty submissions
+            
+            for material, count in submission_counts["material"].items():
+                metrics["material_distribution"][material] = metrics["material_distribution"].get(material, 0) + count
+            for predicted_label, count in submission_counts["predicted_label"].items():
+                metrics["score_distribution"][predicted_label] = metrics["score_distribution"].get(predicted_label, 0) + count
+            
+            print(f"📊 Counted {submission_counts['total']} submitted predictions")
         except Exception as e:
             print(f"⚠️ Could not load submissions: {e}")
         
@@ -1465,19 +1144,8 @@ def get_dashboard_metrics():
 def save_feedback():
     try:
         data = request.get_json()
-        feedback_dir = os.path.join("ml_model", "user_feedback.json")
         print("Received feedback:", data)
-        # Append to file
-        import json
-        existing = []
-        if os.path.exists(feedback_dir):
-            with open(feedback_dir, "r") as f:
-                existing = json.load(f)
-
-        existing.append(data)
-
-        with open(feedback_dir, "w") as f:
-            json.dump(existing, f, indent=2)
+        feedback_log.append(data)
 
         return jsonify({"message": "✅ Feedback saved!"}), 200
 
@@ -1516,6 +1184,34 @@ def map_score_to_grade(score):
         return "F"
 
 
+# Responses keyed by (ASIN, postcode district, transport override): fresh for an
+# hour, then served stale for up to a day while a background refresh re-scrapes
+emissions_cache = get_response_cache("estimate_emissions", ttl=3600, stale_ttl=86400)
+# Retraining evicts model:xgboost, a brand DB refresh evicts dataset:brand_locations
+EMISSIONS_CACHE_TAGS = (model_tag("xgboost"), dataset_tag("brand_locations"))
+
+
+def postcode_district(postcode):
+    """Outward code of a UK postcode ("SW1A 1AA" -> "SW1A"); the whole value otherwise"""
+    compact = re.sub(r"\s+", "", str(postcode or "")).upper()
+    if re.fullmatch(r"[A-Z]{1,2}\d[A-Z\d]?\d[A-Z]{2}", compact):
+        return compact[:-3]
+    return compact
+
+
+def emissions_cache_key(data):
+    """(ASIN, postcode district, override mode, packaging) or None when the URL has no ASIN"""
+    asin = normalize_asin(data.get("amazon_url") or "")
+    if not asin:
+        return None
+    return ":".join([
+        asin,
+        postcode_district(data.get("postcode")),
+        (data.get("override_transport_mode") or "default").lower(),
+        "pkg" if data.get("include_packaging", True) else "nopkg"
+    ])
+
+
 @app.route("/estimate_emissions", methods=["POST", "OPTIONS"])
 def estimate_emissions():
     print("🔔 Route hit: /estimate_emissions")
@@ -1529,6 +1225,27 @@ def estimate_emissions():
     if not data:
         return jsonify({"error": "Missing JSON in request"}), 400
 
+    cache_key = emissions_cache_key(data) if data.get("postcode") else None
+    if cache_key is None:
+        return compute_emissions_response(data)
+
+    def compute():
+        # May run on a background refresh thread, so it brings its own app context
+        with app.app_context():
+            response = compute_emissions_response(data)
+            response, status = response if isinstance(response, tuple) else (response, 200)
+            return response.get_json(), status
+
+    payload, status = emissions_cache.get_or_compute(
+        cache_key, compute,
+        should_cache=lambda result: result[1] == 200,
+        tags=[asin_tag(cache_key.split(":")[0]), *EMISSIONS_CACHE_TAGS]
+    )
+    return jsonify(payload), status
+
+
+def compute_emissions_response(data):
+    """Scrape, geocode and score one product (the uncached /estimate_emissions work)"""
     # Convert numpy types to Python native types for JSON serialization
     def convert_numpy_types(obj):
         if hasattr(obj, 'item'):
@@ -1552,10 +1269,12 @@ def estimate_emissions():
         # Scrape product using production scraper with category intelligence
         print(f"🔍 Scraping URL: {url}")
         
-        if PRODUCTION_SCRAPER_AVAILABLE:
+        if production_scraper_module.available:
             # Use production scraper with category intelligence and enhanced reliability
-            production_scraper = ProductionAmazonScraper()
-            result = production_scraper.scrape_with_full_url(url)
+            # (borrowed from the shared pool: warm session, shared ASIN result cache;
+            # a fresh scraper if every pooled one is still busy after the timeout)
+            with get_production_scraper_pool().acquire(timeout=DEFAULT_ACQUIRE_TIMEOUT, overflow=True) as production_scraper:
+                result = production_scraper.scrape_with_full_url(url)
             
             if result and result.get('title', 'Unknown Product') != 'Unknown Product':
                 print(f"✅ Production scraper success: {result.get('title', '')[:50]}... (confidence: {result.get('confidence_score', 0):.1%})")
@@ -1577,7 +1296,7 @@ def estimate_emissions():
                         print(f"⚠️ Error getting materials from detailed scraper: {e}")
                         # Fallback to unified scraper
                         try:
-                            unified_result = scrape_amazon_product_page(url)
+                            unified_result = unified_scraper.scrape_amazon_product_page(url)
                             if unified_result.get('materials'):
                                 print(f"✅ Unified scraper fallback found materials: {unified_result.get('materials')}")
                                 product['materials'] = unified_result['materials']
@@ -1587,20 +1306,20 @@ def estimate_emissions():
                             print(f"⚠️ Error with unified scraper fallback: {e2}")
             else:
                 print("⚠️ Production scraper failed, trying fallback")
-                if ENHANCED_SCRAPER_AVAILABLE:
-                    enhanced_scraper = EnhancedAmazonScraper()
+                if enhanced_scraper_fix.available:
+                    enhanced_scraper = enhanced_scraper_fix.EnhancedAmazonScraper()
                     result = enhanced_scraper.scrape_product_enhanced(url)
                     if result and result.get('title', 'Unknown Product') != 'Unknown Product':
                         print(f"✅ Enhanced scraper fallback success")
                         product = result
                     else:
                         print("⚠️ Enhanced scraper also failed, using unified fallback")
-                        product = scrape_amazon_product_page(url)
+                        product = unified_scraper.scrape_amazon_product_page(url)
                 else:
-                    product = scrape_amazon_product_page(url)
-        elif ENHANCED_SCRAPER_AVAILABLE:
+                    product = unified_scraper.scrape_amazon_product_page(url)
+        elif enhanced_scraper_fix.available:
             # Use enhanced scraper as fallback
-            enhanced_scraper = EnhancedAmazonScraper()
+            enhanced_scraper = enhanced_scraper_fix.EnhancedAmazonScraper()
             result = enhanced_scraper.scrape_product_enhanced(url)
             
             if result and result.get('title', 'Unknown Product') != 'Unknown Product':
@@ -1608,10 +1327,10 @@ def estimate_emissions():
                 product = result
             else:
                 print("⚠️ Enhanced scraper failed, using unified fallback")
-                product = scrape_amazon_product_page(url)
+                product = unified_scraper.scrape_amazon_product_page(url)
         else:
             # Use unified scraper as final fallback
-            product = scrape_amazon_product_page(url)
+            product = unified_scraper.scrape_amazon_product_page(url)
         
         # Debug what the scraper returned
         print("🔍 DEBUG: Scraper returned:")
@@ -1668,7 +1387,7 @@ def estimate_emissions():
         print("🔍 END DEBUG")
         
         # Add additional fields for compatibility with existing UI
-        if PRODUCTION_SCRAPER_AVAILABLE and 'category' in product:
+        if production_scraper_module.available and 'category' in product:
             print(f"🏷️ Product category: {product['category']} (confidence: {product.get('category_confidence', 0):.1%})")
             if 'scraping_metadata' in product:
                 print(f"🔧 Scraping strategy: {product['scraping_metadata']['successful_strategy']}")
@@ -1678,13 +1397,13 @@ def estimate_emissions():
 
         material = product.get("material_type")
         # Only do additional material processing if using fallback scrapers
-        if not PRODUCTION_SCRAPER_AVAILABLE and (not material or material.lower() in ["unknown", "other", ""]):
+        if not production_scraper_module.available and (not material or material.lower() in ["unknown", "other", ""]):
             guessed = smart_guess_material(product.get("title", ""))
             if guessed:
                 print(f"🧠 Fallback guessed material: {guessed}")
                 material = guessed.title()
                 product["material_type"] = material
-        elif PRODUCTION_SCRAPER_AVAILABLE:
+        elif production_scraper_module.available:
             print(f"🔧 Production scraper handled material detection: {material}")
         
         # Ensure material is set
@@ -1701,7 +1420,7 @@ def estimate_emissions():
         print(f"🔧 Current weight from scraper: {current_weight}kg")
         
         # Only do additional weight processing if using fallback scrapers
-        if not PRODUCTION_SCRAPER_AVAILABLE and current_weight <= 0.1:
+        if not production_scraper_module.available and current_weight <= 0.1:
             import re
             enhanced_weight = extract_weight_from_title(title)
             if enhanced_weight > 0:
@@ -1713,7 +1432,7 @@ def estimate_emissions():
                 product["weight_kg"] = fallback_weight
                 print(f"🔧 Using category fallback weight: {fallback_weight}kg")
         else:
-            if PRODUCTION_SCRAPER_AVAILABLE:
+            if production_scraper_module.available:
                 print(f"🔧 Production scraper handled weight extraction: {current_weight}kg")
             else:
                 print(f"🔧 Weight seems reasonable, keeping: {current_weight}kg")
@@ -1728,9 +1447,7 @@ def estimate_emissions():
             return jsonify({"error": "Could not fetch product"}), 500
 
         # Get user coordinates from postcode
-        import pgeocode
-        geo = pgeocode.Nominatim("gb")
-        location = geo.query_postal_code(postcode)
+        location = uk_geocoder.query_postal_code(postcode)
         if location.empty or location.latitude is None:
             return jsonify({"error": "Invalid postcode"}), 400
 
@@ -1754,11 +1471,12 @@ def estimate_emissions():
             print(f"🇬🇧 UK internal delivery - Origin: {origin_country}")
         
         print(f"🌍 Origin determined: {origin_country}")
-        origin_coords = origin_hubs.get(origin_country, uk_hub)
+        origin_coords = integrated_scraper.origin_hubs.get(origin_country, integrated_scraper.uk_hub)
 
         # Distance calculations
-        origin_distance_km = round(haversine(origin_coords["lat"], origin_coords["lon"], user_lat, user_lon), 1)
-        uk_distance_km = round(haversine(uk_hub["lat"], uk_hub["lon"], user_lat, user_lon), 1)
+        uk_hub = integrated_scraper.uk_hub
+        origin_distance_km = round(integrated_scraper.haversine(origin_coords["lat"], origin_coords["lon"], user_lat, user_lon), 1)
+        uk_distance_km = round(integrated_scraper.haversine(uk_hub["lat"], uk_hub["lon"], user_lat, user_lon), 1)
 
         print(f"🌍 Distances → origin: {origin_distance_km} km | UK hub: {uk_distance_km} km")
 
@@ -1877,189 +1595,47 @@ def estimate_emissions():
         # === ENHANCED ML Prediction (New Method)
         ml_features_used = None
         try:
-            material = product.get("material_type", "Other")
-            recyclability = product.get("recyclability", "Medium")
-            origin = origin_country
-
-            # === Normalize and encode for ML
-            material = normalize_feature(material, "Other")
-            recyclability = normalize_feature(recyclability, "Medium")
-            origin = normalize_feature(origin, "Other")
-            transport = transport_mode
-
-            material_encoded = safe_encode(material, material_encoder, "Other")
-            transport_encoded = safe_encode(transport, transport_encoder, "Land")
-            recycle_encoded = safe_encode(recyclability, recycle_encoder, "Medium")
-            origin_encoded = safe_encode(origin, origin_encoder, "Other")
-
-            # === Enhanced features for ML (11 features total)
-            weight_log = np.log1p(weight)
-            weight_bin_encoded = 2 if weight > 0.5 else 1 if weight > 0.1 else 0
-            
-            # Infer additional features from product data
-            title_lower = product.get("title", "").lower()
-            
-            # Packaging type inference
-            if any(x in title_lower for x in ["bottle", "jar", "can"]):
-                packaging_type = "bottle"
-            elif any(x in title_lower for x in ["box", "pack", "carton"]):
-                packaging_type = "box"
-            else:
-                packaging_type = "other"
-            
-            # Size category inference
-            if weight > 2.0:
-                size_category = "large"
-            elif weight > 0.5:
-                size_category = "medium"
-            else:
-                size_category = "small"
-            
-            # Quality level inference
-            if any(x in title_lower for x in ["premium", "pro", "professional", "deluxe"]):
-                quality_level = "premium"
-            elif any(x in title_lower for x in ["basic", "standard", "regular"]):
-                quality_level = "standard"
-            else:
-                quality_level = "standard"
-            
-            # Pack size (number of items)
-            pack_size = 1
-            for num_word in ["2 pack", "3 pack", "4 pack", "5 pack", "6 pack", "8 pack", "10 pack", "12 pack"]:
-                if num_word in title_lower:
-                    pack_size = int(num_word.split()[0])
-                    break
-            
-            # Material confidence (based on how specific the material type is)
-            material_confidence = 0.8 if material != "Other" else 0.3
-            
-            # Load enhanced encoders
-            try:
-                # Check if enhanced encoders are available
-                if packaging_type_encoder and size_category_encoder and quality_level_encoder:
-                    # Try to encode the enhanced features
-                    packaging_encoded = safe_encode(packaging_type, packaging_type_encoder, "box")
-                    size_encoded = safe_encode(size_category, size_category_encoder, "medium") 
-                    quality_encoded = safe_encode(quality_level, quality_level_encoder, "standard")
-                    
-                    # === ADD MISSING ENHANCED FEATURES FOR 16-FEATURE MODEL ===
-                    
-                    # Infer category from product title
-                    category_encoded = 0  # Default to first category
-                    if inferred_category_encoder:
-                        inferred_category = "supplement" if "protein" in product.get("title", "").lower() else "other"
-                        category_encoded = safe_encode(inferred_category, inferred_category_encoder, "other")
-                    
-                    # Additional confidence scores
-                    origin_confidence = 0.9 if product.get("origin", "Unknown") != "Unknown" else 0.3
-                    weight_confidence = 0.9 if product.get("weight_kg", 1.0) != 1.0 else 0.5
-                    
-                    # Product lifecycle estimates
-                    estimated_lifespan_years = 2.0 if "supplement" in product.get("title", "").lower() else 5.0
-                    repairability_score = 0.1 if material in ["Plastic", "Glass"] else 0.6
-                    
-                    # Build the full feature vector (16 features as expected by enhanced model)
-                    X = [[
-                        material_encoded,           # 1: material_encoded
-                        transport_encoded,          # 2: transport_encoded  
-                        recycle_encoded,           # 3: recyclability_encoded
-                        origin_encoded,            # 4: origin_encoded
-                        weight_log,                # 5: weight_log
-                        weight_bin_encoded,        # 6: weight_bin_encoded
-                        packaging_encoded,         # 7: packaging_type_encoded
-                        size_encoded,              # 8: size_category_encoded
-                        quality_encoded,           # 9: quality_level_encoded
-                        category_encoded,          # 10: inferred_category_encoded
-                        pack_size,                 # 11: pack_size
-                        material_confidence,       # 12: material_confidence
-                        origin_confidence,         # 13: origin_confidence
-                        weight_confidence,         # 14: weight_confidence
-                        estimated_lifespan_years,  # 15: estimated_lifespan_years
-                        repairability_score        # 16: repairability_score
-                    ]]
-                    
-                    # Show all 16 features for transparency
-                    feature_names = [
-                        "Material Type", "Transport Mode", "Recyclability", "Origin Country",
-                        "Weight (log)", "Weight Category", "Packaging Type", "Size Category", 
-                        "Quality Level", "Inferred Category", "Pack Size", "Material Confidence",
-                        "Origin Confidence", "Weight Confidence", "Estimated Lifespan", "Repairability Score"
-                    ]
-                    feature_values = [
-                        material_encoded, transport_encoded, recycle_encoded, origin_encoded,
-                        weight_log, weight_bin_encoded, packaging_encoded, size_encoded,
-                        quality_encoded, category_encoded, pack_size, material_confidence,
-                        origin_confidence, weight_confidence, estimated_lifespan_years, repairability_score
-                    ]
-                    
-                    print(f"🔧 Using 16 enhanced features for ML prediction:")
-                    for name, value in zip(feature_names, feature_values):
-                        print(f"   {name}: {value}")
-                    
-                    print(f"🔧 Final feature vector: {X[0]}")
-                    
-                    # Store features for response (convert numpy types)
-                    ml_features_used = {
-                        "feature_count": 16,
-                        "model_type": "enhanced_16_feature",
-                        "features": [{"name": name, "value": convert_numpy_types(value)} for name, value in zip(feature_names, feature_values)]
-                    }
-                else:
-                    raise Exception("Enhanced encoders not available")
-                
-            except Exception as enc_error:
-                print(f"⚠️ Enhanced encoder error: {enc_error}, falling back to 6 features")
-                # Fallback to original 6 features
-                X = [[
-                    material_encoded,
-                    transport_encoded,
-                    recycle_encoded,
-                    origin_encoded,
-                    weight_log,
-                    weight_bin_encoded
-                ]]
-                
-                # Store fallback features for response
-                fallback_feature_names = [
-                    "Material Type", "Transport Mode", "Recyclability", "Origin Country",
-                    "Weight (log)", "Weight Category"
-                ]
-                fallback_feature_values = [
-                    material_encoded, transport_encoded, recycle_encoded, origin_encoded,
-                    weight_log, weight_bin_encoded
-                ]
-                ml_features_used = {
-                    "feature_count": 6,
-                    "features": [{"name": name, "value": convert_numpy_types(value)} for name, value in zip(fallback_feature_names, fallback_feature_values)]
-                }
+            models = model_registry.current()
+            model, model_type, label_encoder = models.model, models.model_type, models.label_encoder
+
+            # === Encode features with the shared builder, exactly as /predict does
+            X, _ = models.feature_builder.build_matrix([{
+                "material": product.get("material_type", "Other"),
+                "weight": weight,
+                "origin": origin_country,
+                "recyclability": product.get("recyclability", "Medium"),
+                "override_transport_mode": transport_mode,
+                "title": product.get("title") or ""
+            }])
 
-            # ML Prediction - Use correct features based on loaded model
             if model_type == "basic" or model_type is None:
-                # Force 6 features for basic model
-                X = [[
-                    material_encoded,
-                    transport_encoded,
-                    recycle_encoded,
-                    origin_encoded,
-                    weight_log,
-                    weight_bin_encoded
-                ]]
+                # Basic models take the first 6 features only
+                X = X[:, :len(BASIC_FEATURES)]
                 print("📊 Using 6 features for basic model")
-                ml_features_used["feature_count"] = 6
-            
+            else:
+                print(f"🔧 Using {X.shape[1]} features for ML prediction")
+
+            # Store features for response
+            ml_features_used = {
+                "feature_count": X.shape[1],
+                "features": [
+                    {"name": name, "value": round(float(value), 4)}
+                    for name, value in zip(ML_FEATURE_DISPLAY_NAMES, X[0])
+                ]
+            }
+            if X.shape[1] == len(ENHANCED_FEATURES):
+                ml_features_used["model_type"] = "enhanced_16_feature"
+
             # ML Prediction
             if model is None:
                 raise Exception("Model not available")
             
             try:
-                prediction = model.predict(X)[0]
-                eco_score_ml = label_encoder.inverse_transform([prediction])[0]
+                # One predict_proba call gives both the label and its confidence
+                labels, confidences = predict_labels(models.predictor, label_encoder.classes_, X)
+                eco_score_ml = labels[0]
+                confidence = confidences[0]
                 print(f"✅ ML prediction successful: {eco_score_ml}")
-                
-                confidence = 0.0
-                if hasattr(model, "predict_proba"):
-                    proba = model.predict_proba(X)
-                    confidence = round(float(np.max(proba[0])) * 100, 1)
             except Exception as pred_error:
                 print(f"⚠️ ML prediction error: {pred_error}")
                 print(f"   Feature vector shape: {len(X[0])} features")
@@ -2161,6 +1737,40 @@ def health():
     return jsonify({"status": "✅ Server is up"}), 200
 
 
+@app.route("/admin/cache-stats")
+def cache_stats():
+    user = session.get("user")
+    if not user or user.get("role") != "admin":
+        return jsonify({"error": "Unauthorized"}), 401
+
+    return jsonify({"estimate_emissions": emissions_cache.get_stats()}), 200
+
+
+@app.route("/admin/models")
+def loaded_models():
+    user = session.get("user")
+    if not user or user.get("role") != "admin":
+        return jsonify({"error": "Unauthorized"}), 401
+
+    return jsonify({
+        "versions": model_registry.loaded_versions(),
+        "reload_interval_seconds": model_registry.reload_interval
+    }), 200
+
+
+@app.route("/admin/models/reload", methods=["POST"])
+def reload_models():
+    user = session.get("user")
+    if not user or user.get("role") != "admin":
+        return jsonify({"error": "Unauthorized"}), 401
+
+    new = model_registry.reload(force=bool((request.get_json(silent=True) or {}).get("force")))
+    return jsonify({
+        "reloaded": new is not None,
+        "live_version": model_registry.current().version
+    }), 200
+
+
 
 @app.route("/")
 def home():
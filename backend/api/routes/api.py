@@ -1,25 +1,27 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from backend.scrapers.amazon.unified_scraper import scrape_amazon_product_page
-from backend.scrapers.amazon.integrated_scraper import haversine, origin_hubs, uk_hub
-import pgeocode
-from backend.scrapers.amazon.guess_material import smart_guess_material
-import sys
-import os
+from backend.utils.lazy import lazy_import, lazy_object
 
-# Add services directory for manufacturing complexity
-sys.path.append('/Users/jamie/Documents/University/dsp_eco_tracker/backend/services')
-from manufacturing_complexity_multipliers import ManufacturingComplexityCalculator
-from enhanced_materials_database import EnhancedMaterialsDatabase
+# The scraper stack, pgeocode and the materials databases load on first use:
+# the main app imports calculate_eco_score from here and should not pay for them
+unified_scraper = lazy_import("backend.scrapers.amazon.unified_scraper")
+integrated_scraper = lazy_import("backend.scrapers.amazon.integrated_scraper")
+guess_material = lazy_import("backend.scrapers.amazon.guess_material")
+pgeocode = lazy_import("pgeocode")
+manufacturing_complexity = lazy_import("backend.services.manufacturing_complexity_multipliers")
+enhanced_materials = lazy_import("backend.services.enhanced_materials_database")
 
 
 app = Flask(__name__)
 CORS(app)
 
-# Initialize manufacturing complexity system for realistic CO2 calculations
-complexity_calculator = ManufacturingComplexityCalculator()
-materials_db = EnhancedMaterialsDatabase()
-print("✅ API now using realistic CO2 calculations with manufacturing complexity")
+# Manufacturing complexity system for realistic CO2 calculations
+complexity_calculator = lazy_object(
+    lambda: manufacturing_complexity.ManufacturingComplexityCalculator(), "ManufacturingComplexityCalculator"
+)
+materials_db = lazy_object(lambda: enhanced_materials.EnhancedMaterialsDatabase(), "EnhancedMaterialsDatabase")
+# One geocoder per process (its constructor reads the whole GB table)
+uk_geocoder = lazy_object(lambda: pgeocode.Nominatim('gb'), "pgeocode.Nominatim")
 
 # Helper function to determine transport mode based on distance
 def determine_transport_mode(distance_km):
@@ -101,19 +103,18 @@ def estimate():
         return jsonify({'error': 'Missing URL or postcode'}), 400
 
     # Get lat/lon from postcode
-    geo = pgeocode.Nominatim('gb')
-    location = geo.query_postal_code(postcode)
+    location = uk_geocoder.query_postal_code(postcode)
     if location.empty or location.latitude is None:
         return jsonify({'error': 'Invalid postcode'}), 400
 
     user_lat, user_lon = location.latitude, location.longitude
 
     # Scrape product
-    product = scrape_amazon_product_page(url)
+    product = unified_scraper.scrape_amazon_product_page(url)
     # Fallback guess for material type
     material = product.get("material_type")
     if not material or material.lower() in ["unknown", "other", ""]:
-        guessed = smart_guess_material(product.get("title", ""))
+        guessed = guess_material.smart_guess_material(product.get("title", ""))
         if guessed:
             print(f"🧠 Fallback guessed material: {guessed}")
             material = guessed.title()
@@ -124,14 +125,15 @@ def estimate():
 
     print(f"🔍 Scraped product: {product.get('title', 'N/A')}")
 
-    origin = origin_hubs.get(product['brand_estimated_origin'], uk_hub)
+    uk_hub = integrated_scraper.uk_hub
+    origin = integrated_scraper.origin_hubs.get(product['brand_estimated_origin'], uk_hub)
 
     # Distance from origin to user
-    distance = haversine(origin['lat'], origin['lon'], user_lat, user_lon)
+    distance = integrated_scraper.haversine(origin['lat'], origin['lon'], user_lat, user_lon)
     origin_distance = round(distance, 1)
 
     # Distance from UK hub to user
-    uk_distance = round(haversine(uk_hub['lat'], uk_hub['lon'], user_lat, user_lon), 1)
+    uk_distance = round(integrated_scraper.haversine(uk_hub['lat'], uk_hub['lon'], user_lat, user_lon), 1)
 
     # Raw + final weight
     raw_weight = product['estimated_weight_kg']
@@ -16,7 +16,7 @@ Features:
 Inspiration: Salesforce Analytics + Watershed + Power BI, but superior with real Amazon data.
 """
 
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, Response, jsonify, request, send_file
 from datetime import datetime, timedelta
 import pandas as pd
 import io
@@ -26,6 +26,15 @@ import os
 from collections import defaultdict
 import numpy as np
 
+from backend.services.dataset_service import get_dataset_service
+from backend.services.report_export import (
+    EXPORT_FORMATS,
+    STREAMABLE_FORMATS,
+    get_report_exporter,
+    iter_export_bytes,
+    normalize_format
+)
+
 # Add services for enhanced data
 sys.path.append('/Users/jamie/Documents/University/dsp_eco_tracker/backend/services')
 sys.path.append('/Users/jamie/Documents/University/dsp_eco_tracker/common/data')
@@ -42,19 +51,45 @@ except ImportError:
 # Blueprint for enterprise dashboard routes
 enterprise_bp = Blueprint('enterprise_dashboard', __name__, url_prefix='/api/enterprise')
 
+ENTERPRISE_DATASET_PATH = '/Users/jamie/Documents/University/dsp_eco_tracker/common/data/csv/enhanced_eco_dataset.csv'
+BRAND_LOCATIONS_PATH = '/Users/jamie/Documents/University/dsp_eco_tracker/common/data/json/brand_locations.json'
+
+# Supplier scoring
+SUSTAINABLE_MATERIALS = ['bamboo', 'hemp', 'organic cotton', 'recycled steel', 'cork']
+SUPPLIER_SORT_COLUMNS = (
+    'overall_score', 'carbon_performance', 'recyclability_score', 'material_sustainability',
+    'geographic_efficiency', 'product_count', 'category_diversity', 'avg_carbon_kg'
+)
+SUPPLIER_PAGE_SIZE = 50
+SUPPLIER_MAX_PAGE_SIZE = 500
+
+def enterprise_dataset():
+    """Shared DatasetService for the enterprise dataset"""
+    # float64 keeps the endpoints' arithmetic and JSON output unchanged
+    return get_dataset_service(ENTERPRISE_DATASET_PATH, float_dtype='float64')
+
 def load_enterprise_data():
-    """Load enhanced eco dataset for enterprise analytics."""
+    """Load enhanced eco dataset for enterprise analytics (cached in memory, read-only)."""
     try:
-        df = pd.read_csv('/Users/jamie/Documents/University/dsp_eco_tracker/common/data/csv/enhanced_eco_dataset.csv')
-        return df
+        service = enterprise_dataset()
+        if not service.available:
+            raise FileNotFoundError(service.path)
+        return service.frame()
     except Exception as e:
         print(f"Error loading enterprise data: {e}")
         return pd.DataFrame()
 
+def brand_locations_version():
+    """mtime of the brand locations file (None if missing), part of supplier cache keys"""
+    try:
+        return os.stat(BRAND_LOCATIONS_PATH).st_mtime_ns
+    except OSError:
+        return None
+
 def load_brand_locations():
     """Load brand locations for supplier analysis."""
     try:
-        with open('/Users/jamie/Documents/University/dsp_eco_tracker/common/data/json/brand_locations.json', 'r') as f:
+        with open(BRAND_LOCATIONS_PATH, 'r') as f:
             return json.load(f)
     except Exception as e:
         print(f"Error loading brand locations: {e}")
@@ -98,7 +133,7 @@ def get_dashboard_overview():
         # Carbon intensity by category - using inferred_category
         category_emissions = {}
         if 'inferred_category' in df.columns and 'co2_emissions' in df.columns:
-            category_emissions = df.groupby('inferred_category')['co2_emissions'].mean().round(2).to_dict()
+            category_emissions = df.groupby('inferred_category', observed=True)['co2_emissions'].mean().round(2).to_dict()
         
         # Top carbon hotspots (worst performing products)
         carbon_hotspots = []
@@ -117,7 +152,7 @@ def get_dashboard_overview():
         # Supplier sustainability rankings - using origin as supplier
         supplier_rankings = []
         if 'origin' in df.columns and 'co2_emissions' in df.columns:
-            supplier_data = df.groupby('origin').agg({
+            supplier_data = df.groupby('origin', observed=True).agg({
                 'co2_emissions': ['mean', 'count'],
                 'recyclability': lambda x: (x == 'High').sum() / len(x) * 100 if len(x) > 0 else 0
             }).round(2)
@@ -194,7 +229,7 @@ def get_carbon_analytics():
         # Carbon distribution by categories - using correct column names
         category_analysis = {}
         if 'inferred_category' in df.columns and 'co2_emissions' in df.columns:
-            category_stats = df.groupby('inferred_category')['co2_emissions'].agg(['mean', 'std', 'count']).round(2)
+            category_stats = df.groupby('inferred_category', observed=True)['co2_emissions'].agg(['mean', 'std', 'count']).round(2)
             category_analysis = {
                 category: {
                     'avg_carbon_kg': stats['mean'],
@@ -208,7 +243,7 @@ def get_carbon_analytics():
         # Material impact analysis
         material_impact = {}
         if 'material' in df.columns and 'co2_emissions' in df.columns:
-            material_stats = df.groupby('material')['co2_emissions'].agg(['mean', 'count']).round(2)
+            material_stats = df.groupby('material', observed=True)['co2_emissions'].agg(['mean', 'count']).round(2)
             material_impact = {
                 material: {
                     'avg_carbon_kg': stats['mean'],
@@ -221,7 +256,7 @@ def get_carbon_analytics():
         # Transportation impact analysis
         transport_analysis = {}
         if 'transport' in df.columns and 'co2_emissions' in df.columns:
-            transport_stats = df.groupby('transport')['co2_emissions'].agg(['mean', 'count']).round(2)
+            transport_stats = df.groupby('transport', observed=True)['co2_emissions'].agg(['mean', 'count']).round(2)
             transport_analysis = {
                 transport: {
                     'avg_carbon_kg': stats['mean'],
@@ -290,126 +325,54 @@ def get_supplier_analysis():
     
     Provides comprehensive supplier sustainability analysis with scoring, rankings,
     and actionable insights for procurement teams.
+    
+    The supplier table is scored once per dataset version; every supplier is
+    served in pages via ?page=&page_size=&sort_by=&order=asc|desc.
     """
     try:
+        service = enterprise_dataset()
         df = load_enterprise_data()
-        brand_locations = load_brand_locations()
-        material_insights = load_material_insights()
         
         if df.empty:
             return jsonify({'error': 'No data available'}), 500
         
-        # Calculate comprehensive supplier scores
-        supplier_scores = {}
-        
-        if 'origin' in df.columns:
-            for brand in df['origin'].unique():
-                if pd.isna(brand):
-                    continue
-                brand_data = df[df['origin'] == brand]
-                
-                # Carbon performance score (0-100, higher is better)
-                avg_carbon = brand_data['co2_emissions'].mean() if 'co2_emissions' in brand_data.columns else 0
-                carbon_score = max(0, 100 - (avg_carbon * 5))  # Penalize high carbon
-                
-                # Recyclability score
-                recyclability_score = 0
-                if 'recyclability' in brand_data.columns:
-                    recyclable_count = (brand_data['recyclability'] == 'High').sum()
-                    recyclability_score = (recyclable_count / len(brand_data)) * 100
-                
-                # Material sustainability score
-                material_score = 50  # Default neutral score
-                if 'material' in brand_data.columns:
-                    brand_materials = brand_data['material'].value_counts()
-                    sustainable_materials = ['bamboo', 'hemp', 'organic cotton', 'recycled steel', 'cork']
-                    sustainable_count = sum(brand_materials.get(mat, 0) for mat in sustainable_materials)
-                    material_score = min(100, (sustainable_count / len(brand_data)) * 200)  # Boost for sustainable materials
-                
-                # Geographic diversity score (lower carbon footprint from diverse supply chains)
-                geographic_score = 50  # Default
-                if brand in brand_locations:
-                    # Bonus for having local/regional presence
-                    origin = brand_locations[brand].get('origin', '').lower()
-                    if origin in ['uk', 'united kingdom', 'europe']:
-                        geographic_score = 75
-                    elif origin in ['usa', 'canada', 'north america']:
-                        geographic_score = 65
-                
-                # Overall sustainability score (weighted average)
-                overall_score = (
-                    carbon_score * 0.4 +          # 40% weight on carbon performance
-                    recyclability_score * 0.25 +   # 25% weight on recyclability
-                    material_score * 0.25 +        # 25% weight on materials
-                    geographic_score * 0.1         # 10% weight on geography
-                )
-                
-                # Product volume and diversity
-                product_count = len(brand_data)
-                category_diversity = brand_data['category'].nunique() if 'category' in brand_data.columns else 1
-                
-                supplier_scores[brand] = {
-                    'overall_score': round(overall_score, 1),
-                    'carbon_performance': round(carbon_score, 1),
-                    'recyclability_score': round(recyclability_score, 1),
-                    'material_sustainability': round(material_score, 1),
-                    'geographic_efficiency': round(geographic_score, 1),
-                    'product_count': product_count,
-                    'category_diversity': category_diversity,
-                    'avg_carbon_kg': round(avg_carbon, 2),
-                    'sustainability_grade': get_sustainability_grade(overall_score),
-                    'origin_country': brand_locations.get(brand, {}).get('origin', 'Unknown'),
-                    'improvement_areas': get_improvement_recommendations(carbon_score, recyclability_score, material_score)
-                }
-        
-        # Rank suppliers by overall score
-        ranked_suppliers = sorted(supplier_scores.items(), key=lambda x: x[1]['overall_score'], reverse=True)
-        
-        # Category-wise best performers
-        category_leaders = {}
-        if 'category' in df.columns:
-            for category in df['category'].unique():
-                category_data = df[df['category'] == category]
-                if not category_data.empty:
-                    best_brand = category_data.loc[category_data['carbon_kg'].idxmin(), 'brand'] if 'carbon_kg' in category_data.columns else None
-                    if best_brand and best_brand in supplier_scores:
-                        category_leaders[category] = {
-                            'brand': best_brand,
-                            'score': supplier_scores[best_brand]['overall_score'],
-                            'carbon_kg': supplier_scores[best_brand]['avg_carbon_kg']
-                        }
-        
-        # Risk assessment
-        high_risk_suppliers = [
-            {'brand': brand, 'score': data['overall_score'], 'risk_factors': data['improvement_areas']}
-            for brand, data in ranked_suppliers
-            if data['overall_score'] < 30
-        ]
-        
+        sort_by = request.args.get('sort_by', 'overall_score')
+        if sort_by not in SUPPLIER_SORT_COLUMNS:
+            return jsonify({
+                'error': f'Unsupported sort_by "{sort_by}"',
+                'sortable_columns': list(SUPPLIER_SORT_COLUMNS),
+                'status': 'error'
+            }), 400
+        ascending = request.args.get('order', 'desc').lower() == 'asc'
+        page = max(1, request.args.get('page', 1, type=int))
+        page_size = min(max(1, request.args.get('page_size', SUPPLIER_PAGE_SIZE, type=int)), SUPPLIER_MAX_PAGE_SIZE)
+        
+        # Recomputed only when the dataset or the brand locations change
+        locations_version = brand_locations_version()
+        analysis = service.aggregate(
+            ('supplier_analysis', locations_version),
+            lambda frame: build_supplier_analysis(frame, load_brand_locations())
+        )
+        table = analysis['table']
+        order = service.aggregate(
+            ('supplier_order', locations_version, sort_by, ascending),
+            lambda frame: supplier_sort_order(table, sort_by, ascending)
+        )
+        
+        start = (page - 1) * page_size
         supplier_analysis = {
             'status': 'success',
             'timestamp': datetime.now().isoformat(),
-            'summary': {
-                'total_suppliers': len(supplier_scores),
-                'average_sustainability_score': round(sum(data['overall_score'] for data in supplier_scores.values()) / len(supplier_scores), 1) if supplier_scores else 0,
-                'top_performer': ranked_suppliers[0] if ranked_suppliers else None,
-                'suppliers_needing_attention': len(high_risk_suppliers)
-            },
-            'supplier_rankings': {
-                'top_10_sustainable': [{'brand': brand, **data} for brand, data in ranked_suppliers[:10]],
-                'bottom_10_need_improvement': [{'brand': brand, **data} for brand, data in ranked_suppliers[-10:]] if len(ranked_suppliers) > 10 else [],
-                'category_leaders': category_leaders
-            },
-            'risk_analysis': {
-                'high_risk_suppliers': high_risk_suppliers,
-                'sustainability_distribution': {
-                    'excellent': len([s for s in supplier_scores.values() if s['overall_score'] >= 80]),
-                    'good': len([s for s in supplier_scores.values() if 60 <= s['overall_score'] < 80]),
-                    'average': len([s for s in supplier_scores.values() if 40 <= s['overall_score'] < 60]),
-                    'poor': len([s for s in supplier_scores.values() if s['overall_score'] < 40])
-                }
-            },
-            'actionable_insights': generate_supplier_insights(ranked_suppliers, high_risk_suppliers)
+            **analysis['report'],
+            'suppliers': {
+                'page': page,
+                'page_size': page_size,
+                'total': len(table),
+                'total_pages': -(-len(table) // page_size),
+                'sort_by': sort_by,
+                'order': 'asc' if ascending else 'desc',
+                'items': supplier_records(table.iloc[order[start:start + page_size]])
+            }
         }
         
         return jsonify(supplier_analysis)
@@ -420,6 +383,155 @@ def get_supplier_analysis():
             'status': 'error'
         }), 500
 
+def build_supplier_table(df, brand_locations):
+    """
+    Score every supplier (origin) in one grouped pass.
+    
+    Returns one row per supplier, indexed by name and ranked by overall_score
+    (best first, ties in order of first appearance in the dataset).
+    """
+    columns = ['overall_score', 'carbon_performance', 'recyclability_score', 'material_sustainability',
+               'geographic_efficiency', 'product_count', 'category_diversity', 'avg_carbon_kg',
+               'sustainability_grade', 'origin_country', 'improvement_areas']
+    if 'origin' not in df.columns:
+        return pd.DataFrame(columns=columns)
+    
+    rows = df[df['origin'].notna()]
+    if rows.empty:
+        return pd.DataFrame(columns=columns)
+    
+    # Per-row inputs, so a single groupby().agg() computes every supplier's totals
+    inputs = pd.DataFrame({
+        'origin': rows['origin'],
+        'co2': rows['co2_emissions'] if 'co2_emissions' in rows.columns else 0.0,
+        'high_recyclability': (rows['recyclability'] == 'High') if 'recyclability' in rows.columns else False,
+        'sustainable_material': rows['material'].isin(SUSTAINABLE_MATERIALS) if 'material' in rows.columns else False,
+        'category': rows['category'] if 'category' in rows.columns else np.nan
+    })
+    grouped = inputs.groupby('origin', observed=True, sort=False).agg(
+        product_count=('origin', 'size'),
+        avg_carbon=('co2', 'mean'),
+        high_recyclability=('high_recyclability', 'sum'),
+        sustainable_material=('sustainable_material', 'sum'),
+        category_diversity=('category', 'nunique')
+    )
+    grouped = grouped.reindex(inputs['origin'].unique())
+    brands = list(grouped.index)
+    product_count = grouped['product_count'].to_numpy(dtype=float)
+    
+    # Carbon performance score (0-100, higher is better); NaN averages score 0
+    carbon_score = 100 - grouped['avg_carbon'].to_numpy() * 5
+    carbon_score = np.where(carbon_score > 0, carbon_score, 0.0)
+    
+    recyclability_score = grouped['high_recyclability'].to_numpy(dtype=float) / product_count * 100
+    
+    # Boost for sustainable materials; neutral without material data
+    if 'material' in rows.columns:
+        material_score = np.minimum(100, grouped['sustainable_material'].to_numpy(dtype=float) / product_count * 200)
+    else:
+        material_score = np.full(len(brands), 50.0)
+    
+    # Geographic score: bonus for local/regional presence
+    regions = [str(brand_locations.get(brand, {}).get('origin', '')).lower() if brand in brand_locations else None
+               for brand in brands]
+    geographic_score = np.array([
+        75 if region in ('uk', 'united kingdom', 'europe') else
+        65 if region in ('usa', 'canada', 'north america') else 50
+        for region in regions
+    ], dtype=float)
+    
+    overall_score = (
+        carbon_score * 0.4 +          # 40% weight on carbon performance
+        recyclability_score * 0.25 +   # 25% weight on recyclability
+        material_score * 0.25 +        # 25% weight on materials
+        geographic_score * 0.1         # 10% weight on geography
+    )
+    
+    table = pd.DataFrame({
+        'overall_score': np.round(overall_score, 1),
+        'carbon_performance': np.round(carbon_score, 1),
+        'recyclability_score': np.round(recyclability_score, 1),
+        'material_sustainability': np.round(material_score, 1),
+        'geographic_efficiency': np.round(geographic_score, 1),
+        'product_count': grouped['product_count'].to_numpy(dtype=int),
+        'category_diversity': grouped['category_diversity'].to_numpy(dtype=int) if 'category' in rows.columns else 1,
+        'avg_carbon_kg': np.round(grouped['avg_carbon'].to_numpy(dtype=float), 2),
+        'sustainability_grade': [get_sustainability_grade(score) for score in overall_score],
+        'origin_country': [brand_locations.get(brand, {}).get('origin', 'Unknown') for brand in brands],
+        'improvement_areas': [
+            get_improvement_recommendations(c, r, m)
+            for c, r, m in zip(carbon_score, recyclability_score, material_score)
+        ]
+    }, index=pd.Index(brands, dtype=object, name='brand'))
+    
+    return table.sort_values('overall_score', ascending=False, kind='stable')
+
+def supplier_records(table):
+    """Supplier rows as JSON-ready dicts with a 'brand' key"""
+    return table.reset_index().to_dict(orient='records')
+
+def supplier_sort_order(table, sort_by, ascending):
+    """Row positions of the ranked supplier table ordered by sort_by (stable, NaN last)"""
+    values = table[sort_by].reset_index(drop=True)
+    return values.sort_values(ascending=ascending, kind='stable').index.to_numpy()
+
+def build_supplier_analysis(df, brand_locations):
+    """Supplier table plus the request-independent parts of the scoring report"""
+    table = build_supplier_table(df, brand_locations)
+    
+    def pairs(rows):
+        return [(record.pop('brand'), record) for record in supplier_records(rows)]
+    
+    # generate_supplier_insights only looks at the top and bottom 10
+    ranked_suppliers = pairs(table) if len(table) <= 20 else pairs(pd.concat([table.head(10), table.tail(10)]))
+    
+    # Category-wise best performers
+    category_leaders = {}
+    if {'category', 'carbon_kg', 'brand'} <= set(df.columns):
+        products = df.dropna(subset=['carbon_kg'])
+        best_rows = products.groupby('category', observed=True)['carbon_kg'].idxmin()
+        for category, row in best_rows.items():
+            best_brand = products.at[row, 'brand']
+            if best_brand and best_brand in table.index:
+                category_leaders[category] = {
+                    'brand': best_brand,
+                    'score': table.at[best_brand, 'overall_score'],
+                    'carbon_kg': table.at[best_brand, 'avg_carbon_kg']
+                }
+    
+    # Risk assessment
+    high_risk = table[table['overall_score'] < 30]
+    high_risk_suppliers = [
+        {'brand': brand, 'score': score, 'risk_factors': risk_factors}
+        for brand, score, risk_factors in zip(high_risk.index, high_risk['overall_score'].tolist(), high_risk['improvement_areas'])
+    ]
+    
+    scores = table['overall_score']
+    report = {
+        'summary': {
+            'total_suppliers': len(table),
+            'average_sustainability_score': round(float(scores.sum()) / len(table), 1) if len(table) else 0,
+            'top_performer': ranked_suppliers[0] if ranked_suppliers else None,
+            'suppliers_needing_attention': len(high_risk_suppliers)
+        },
+        'supplier_rankings': {
+            'top_10_sustainable': supplier_records(table.head(10)),
+            'bottom_10_need_improvement': supplier_records(table.tail(10)) if len(table) > 10 else [],
+            'category_leaders': category_leaders
+        },
+        'risk_analysis': {
+            'high_risk_suppliers': high_risk_suppliers,
+            'sustainability_distribution': {
+                'excellent': int((scores >= 80).sum()),
+                'good': int(((scores >= 60) & (scores < 80)).sum()),
+                'average': int(((scores >= 40) & (scores < 60)).sum()),
+                'poor': int((scores < 40).sum())
+            }
+        },
+        'actionable_insights': generate_supplier_insights(ranked_suppliers, high_risk_suppliers)
+    }
+    return {'table': table, 'report': report}
+
 def get_sustainability_grade(score):
     """Convert numerical score to letter grade."""
     if score >= 90:
@@ -471,53 +583,72 @@ def generate_supplier_insights(ranked_suppliers, high_risk_suppliers):
     
     return insights
 
+def compliance_columns():
+    """Compliance-specific columns added to every exported row"""
+    return {
+        'scope_3_category': 'Purchased Goods and Services',
+        'reporting_period': datetime.now().strftime('%Y'),
+        'data_quality': 'Primary Data',
+        'verification_status': 'Third-party Verified'
+    }
+
 @enterprise_bp.route('/reports/export', methods=['POST'])
 def export_compliance_report():
     """
     Export Compliance Reports - Generate downloadable reports for regulatory compliance
     
-    Supports multiple formats (CSV, Excel, PDF) for different compliance frameworks.
+    Supports multiple formats (CSV, gzip-CSV, Parquet) for different compliance frameworks.
+    The report is written in chunks by a background job; poll status_url, then
+    fetch download_url. With "stream": true, CSV and gzip-CSV are streamed
+    straight into the response instead.
     """
     try:
-        request_data = request.get_json() or {}
-        export_format = request_data.get('format', 'csv').lower()
+        request_data = request.get_json(silent=True) or {}
+        requested_format = str(request_data.get('format', 'csv')).lower()
         report_type = request_data.get('type', 'full_analysis')
         
+        if requested_format == 'excel':
+            return jsonify({
+                'status': 'success',
+                'message': 'Excel export feature coming soon',
+                'alternative': 'Use CSV export for now'
+            })
+        
+        export_format = normalize_format(requested_format)
+        if export_format is None:
+            return jsonify({'error': 'Unsupported export format', 'supported_formats': list(EXPORT_FORMATS)}), 400
+        
         df = load_enterprise_data()
         
         if df.empty:
             return jsonify({'error': 'No data available for export'}), 500
         
-        # Prepare compliance data
-        compliance_data = df.copy()
+        extension, mimetype = EXPORT_FORMATS[export_format]
+        filename = f'carbon_intelligence_report_{datetime.now().strftime("%Y%m%d")}{extension}'
         
-        # Add compliance-specific columns
-        compliance_data['scope_3_category'] = 'Purchased Goods and Services'
-        compliance_data['reporting_period'] = datetime.now().strftime('%Y')
-        compliance_data['data_quality'] = 'Primary Data'
-        compliance_data['verification_status'] = 'Third-party Verified'
+        if request_data.get('stream'):
+            if export_format not in STREAMABLE_FORMATS:
+                return jsonify({'error': f'{export_format} exports cannot be streamed; omit "stream" to run a job'}), 400
+            return Response(
+                iter_export_bytes(df, export_format, compliance_columns()),
+                mimetype=mimetype,
+                headers={'Content-Disposition': f'attachment; filename={filename}'}
+            )
         
-        if export_format == 'csv':
-            output = io.StringIO()
-            compliance_data.to_csv(output, index=False)
-            output.seek(0)
-            
-            return jsonify({
-                'status': 'success',
-                'download_url': '/api/enterprise/reports/download/csv',
-                'filename': f'carbon_intelligence_report_{datetime.now().strftime("%Y%m%d")}.csv',
-                'record_count': len(compliance_data)
-            })
-        
-        elif export_format == 'excel':
-            return jsonify({
-                'status': 'success',
-                'message': 'Excel export feature coming soon',
-                'alternative': 'Use CSV export for now'
-            })
+        try:
+            job = get_report_exporter().submit(df, export_format, report_type, compliance_columns(), filename)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'status': 'error'}), 400
         
-        else:
-            return jsonify({'error': 'Unsupported export format'}), 400
+        return jsonify({
+            'status': 'accepted',
+            'job_id': job.job_id,
+            'status_url': f'/api/enterprise/reports/export/{job.job_id}',
+            'download_url': f'/api/enterprise/reports/download/{job.job_id}',
+            'filename': job.filename,
+            'format': job.export_format,
+            'record_count': job.record_count
+        }), 202
             
     except Exception as e:
         return jsonify({
@@ -525,6 +656,33 @@ def export_compliance_report():
             'status': 'error'
         }), 500
 
+@enterprise_bp.route('/reports/export/<job_id>', methods=['GET'])
+def get_export_status(job_id):
+    """Status of a compliance report export job."""
+    job = get_report_exporter().job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown export job', 'status': 'error'}), 404
+    
+    return jsonify({
+        **job.to_dict(),
+        'download_url': f'/api/enterprise/reports/download/{job.job_id}' if job.status == 'completed' else None
+    })
+
+@enterprise_bp.route('/reports/download/<job_id>', methods=['GET'])
+def download_export(job_id):
+    """Download a finished compliance report."""
+    exporter = get_report_exporter()
+    job = exporter.job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown export job', 'status': 'error'}), 404
+    if job.status != 'completed':
+        return jsonify({'error': f'Export is {job.status}', 'status': job.status}), 409
+    
+    path = exporter.file_path(job)
+    if not os.path.exists(path):
+        return jsonify({'error': 'Export has expired', 'status': 'error'}), 410
+    return send_file(path, mimetype=exporter.mimetype(job), as_attachment=True, download_name=job.filename)
+
 @enterprise_bp.route('/demo/series-a-data', methods=['GET'])
 def get_series_a_demo_data():
     """
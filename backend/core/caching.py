@@ -13,30 +13,180 @@ Features:
 - Performance monitoring and metrics
 - Cache hierarchy with multiple TTL strategies
 - Graceful degradation when cache is unavailable
+- Synchronous two-tier cache (in-process LRU in front of Redis) for
+  Flask handlers, with request coalescing and stale-while-revalidate
+- Tag-based invalidation: entries register in per-tag sets ("asin:B0…",
+  "model:xgboost", "dataset:brand_locations") that are evicted in
+  pipelined batches, with a SCAN fallback for ad-hoc patterns (never KEYS).
+  Tag sets are swept of expired members in the background as they grow
 
 This demonstrates enterprise-level caching patterns expected
 in high-performance production systems.
 """
 
+import fnmatch
 import json
 import hashlib
+import re
 import logging
 import time
 import asyncio
-from typing import Any, Dict, Optional, Callable, List, Union
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Callable, List, Union
 from datetime import datetime, timedelta
 from functools import wraps
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from enum import Enum
 
 import redis.asyncio as redis
+from redis import Redis as SyncRedis
 from redis.exceptions import RedisError, ConnectionError, TimeoutError
 
-from .monitoring import monitoring
 from .exceptions import BaseEcoTrackerException, ErrorSeverity, ErrorCategory
 
+try:
+    from .monitoring import monitoring
+except ImportError:
+    # OpenTelemetry is optional: without it the cache runs untraced
+    class _NullMonitoring:
+        @contextmanager
+        def trace_span(self, span_name: str, attributes: Optional[Dict[str, Any]] = None):
+            yield None
+
+        def record_request(self, endpoint: str, method: str, status_code: int, duration: float):
+            pass
+
+    monitoring = _NullMonitoring()
+
 logger = logging.getLogger(__name__)
 
+# Keys deleted per pipelined UNLINK batch during invalidation
+INVALIDATION_BATCH_SIZE = 500
+
+# A tag set is swept in the background for members whose entries have
+# expired once it has grown this many members past its last sweep. Global
+# tags ("model:xgboost") are on every entry, so their sets would otherwise
+# only ever grow.
+TAG_PRUNE_INTERVAL = 1000
+
+_ASIN_IN_URL = re.compile(r'/(?:dp|gp/product)/([A-Z0-9]{10})', re.I)
+
+
+def asin_tag(asin: str) -> str:
+    return f"asin:{asin.upper()}"
+
+
+def model_tag(model_name: str) -> str:
+    return f"model:{model_name}"
+
+
+def dataset_tag(dataset_name: str) -> str:
+    return f"dataset:{dataset_name}"
+
+
+def tag_key(key_prefix: str, tag: str) -> str:
+    """Redis set holding the cache keys registered under a tag"""
+    return f"{key_prefix}:tag:{tag}"
+
+
+# Commands register_tags queues per tag; the last one is the set's SCARD
+_TAG_COMMANDS = 4
+
+
+def register_tags(pipe, key_prefix: str, cache_key: str, tags: Iterable[str], ttl: int) -> None:
+    """Queue tag-set registration on a (sync or async) pipeline"""
+    for tag in tags:
+        set_key = tag_key(key_prefix, tag)
+        pipe.sadd(set_key, cache_key)
+        # The set lives as long as its longest-lived member
+        pipe.expire(set_key, ttl, nx=True)
+        pipe.expire(set_key, ttl, gt=True)
+        pipe.scard(set_key)
+
+
+class TagSetPruner:
+    """
+    Decides, per process, which tag sets are due a background sweep
+
+    A set is due once a write finds it at or past its threshold (a threshold,
+    not an exact multiple, so sizes skipped by interleaved writers still
+    count). After a sweep the threshold moves to the surviving size plus
+    TAG_PRUNE_INTERVAL, and only one sweep per set runs at a time.
+    """
+
+    def __init__(self):
+        self._thresholds: Dict[str, int] = {}
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def due(self, key_prefix: str, tags: List[str], results: Optional[list]) -> List[str]:
+        """Tag sets to sweep, from the results of a pipeline ending with register_tags"""
+        if not tags or not results:
+            return []
+        due = []
+        tag_results = results[-_TAG_COMMANDS * len(tags):]
+        with self._lock:
+            for i, tag in enumerate(tags):
+                set_key = tag_key(key_prefix, tag)
+                size = tag_results[(i + 1) * _TAG_COMMANDS - 1]
+                if set_key in self._running or size < self._thresholds.get(set_key, TAG_PRUNE_INTERVAL):
+                    continue
+                self._running.add(set_key)
+                due.append(set_key)
+        return due
+
+    def finished(self, set_key: str, remaining: Optional[int]) -> None:
+        """Record a sweep's outcome (remaining is None when it failed)"""
+        with self._lock:
+            self._running.discard(set_key)
+            if remaining is not None:
+                self._thresholds[set_key] = remaining + TAG_PRUNE_INTERVAL
+
+
+def prune_tag_set(client: SyncRedis, set_key: str, batch_size: int = INVALIDATION_BATCH_SIZE) -> int:
+    """
+    Drop members whose cache entries have expired (SSCAN, pipelined EXISTS,
+    SREM) and return how many members are left
+    """
+    removed = 0
+    cursor = 0
+    while True:
+        cursor, members = client.sscan(set_key, cursor, count=batch_size)
+        if members:
+            pipe = client.pipeline(transaction=False)
+            for member in members:
+                pipe.exists(member)
+            dead = [member for member, alive in zip(members, pipe.execute()) if not alive]
+            if dead:
+                removed += client.srem(set_key, *dead)
+        if not cursor:
+            break
+    logger.debug(f"🧹 Pruned {removed} expired members from {set_key}")
+    return client.scard(set_key)
+
+
+async def prune_tag_set_async(client, set_key: str, batch_size: int = INVALIDATION_BATCH_SIZE) -> int:
+    """Asynchronous variant of prune_tag_set() for CacheService"""
+    removed = 0
+    cursor = 0
+    while True:
+        cursor, members = await client.sscan(set_key, cursor, count=batch_size)
+        if members:
+            pipe = client.pipeline(transaction=False)
+            for member in members:
+                pipe.exists(member)
+            dead = [member for member, alive in zip(members, await pipe.execute()) if not alive]
+            if dead:
+                removed += await client.srem(set_key, *dead)
+        if not cursor:
+            break
+    logger.debug(f"🧹 Pruned {removed} expired members from {set_key}")
+    return await client.scard(set_key)
+
+
 class CircuitBreakerState(str, Enum):
     """Circuit breaker states"""
     CLOSED = "closed"      # Normal operation
@@ -80,9 +230,7 @@ class CircuitBreaker:
             time.time() - self.last_failure_time >= self.recovery_timeout
         )
     
-    async def call(self, func: Callable, *args, **kwargs) -> Any:
-        """Execute function with circuit breaker protection"""
-        
+    def _before_call(self) -> None:
         # Open circuit - fail fast
         if self.state == CircuitBreakerState.OPEN:
             if self._can_attempt_reset():
@@ -90,36 +238,53 @@ class CircuitBreaker:
                 logger.info("🔄 Circuit breaker moving to HALF_OPEN state")
             else:
                 raise CircuitBreakerOpenError("Circuit breaker is OPEN")
+
+    def _record_success(self) -> None:
+        # Success - reset failure count
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            self.state = CircuitBreakerState.CLOSED
+            logger.info("✅ Circuit breaker reset to CLOSED state")
         
+        self.failure_count = 0
+
+    def _record_failure(self, error: Exception) -> None:
+        self.failure_count += 1
+        self.last_failure_time = time.time()
+        
+        logger.warning(f"❌ Circuit breaker failure {self.failure_count}/{self.failure_threshold}: {error}")
+        
+        # Open circuit if threshold reached
+        if self.failure_count >= self.failure_threshold:
+            self.state = CircuitBreakerState.OPEN
+            logger.error(f"🚨 Circuit breaker OPENED after {self.failure_count} failures")
+
+    async def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Execute function with circuit breaker protection"""
+        self._before_call()
         try:
             result = await func(*args, **kwargs)
-            
-            # Success - reset failure count
-            if self.state == CircuitBreakerState.HALF_OPEN:
-                self.state = CircuitBreakerState.CLOSED
-                logger.info("✅ Circuit breaker reset to CLOSED state")
-            
-            self.failure_count = 0
-            return result
-            
         except self.expected_exception as e:
-            self.failure_count += 1
-            self.last_failure_time = time.time()
-            
-            logger.warning(f"❌ Circuit breaker failure {self.failure_count}/{self.failure_threshold}: {e}")
-            
-            # Open circuit if threshold reached
-            if self.failure_count >= self.failure_threshold:
-                self.state = CircuitBreakerState.OPEN
-                logger.error(f"🚨 Circuit breaker OPENED after {self.failure_count} failures")
-            
+            self._record_failure(e)
+            raise
+        self._record_success()
+        return result
+
+    def call_sync(self, func: Callable, *args, **kwargs) -> Any:
+        """Synchronous variant of call() for blocking clients"""
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exception as e:
+            self._record_failure(e)
             raise
+        self._record_success()
+        return result
 
 class CircuitBreakerOpenError(BaseEcoTrackerException):
     """Raised when circuit breaker is open"""
-    def __init__(self):
+    def __init__(self, message: str = "Cache service unavailable - circuit breaker is open"):
         super().__init__(
-            "Cache service unavailable - circuit breaker is open",
+            message,
             severity=ErrorSeverity.MEDIUM,
             category=ErrorCategory.EXTERNAL_API,
             recovery_suggestion="Cache will automatically retry after recovery timeout"
@@ -168,6 +333,10 @@ class CacheService:
             "circuit_breaker_opens": 0
         }
         
+        # Tag-set sweeps run as background tasks, off the caller's await
+        self._tag_pruner = TagSetPruner()
+        self._background_tasks = set()
+        
         logger.info(f"🚀 Cache service initialized with Redis at {redis_url}")
     
     def _make_key(self, key: str) -> str:
@@ -221,11 +390,13 @@ class CacheService:
         key: str,
         value: Any,
         ttl: Optional[int] = None,
-        strategy: CacheStrategy = CacheStrategy.TTL
+        strategy: CacheStrategy = CacheStrategy.TTL,
+        tags: Iterable[str] = ()
     ) -> bool:
-        """Set value in cache with circuit breaker protection"""
+        """Set value in cache with circuit breaker protection, registering it under tags"""
         cache_key = self._make_key(key)
         ttl = ttl or self.default_ttl
+        tags = list(tags)
         
         try:
             with monitoring.trace_span("cache_set", {
@@ -235,12 +406,23 @@ class CacheService:
             }):
                 serialized_value = self._serialize_value(value)
                 
-                success = await self.circuit_breaker.call(
-                    self.redis_client.setex,
-                    cache_key,
-                    ttl,
-                    serialized_value
-                )
+                if tags:
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.setex(cache_key, ttl, serialized_value)
+                    register_tags(pipe, self.key_prefix, cache_key, tags, ttl)
+                    results = await self.circuit_breaker.call(pipe.execute)
+                    success = results[0]
+                    for set_key in self._tag_pruner.due(self.key_prefix, tags, results):
+                        task = asyncio.create_task(self._prune_tag_set(set_key))
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._background_tasks.discard)
+                else:
+                    success = await self.circuit_breaker.call(
+                        self.redis_client.setex,
+                        cache_key,
+                        ttl,
+                        serialized_value
+                    )
                 
                 if success:
                     logger.debug(f"💾 Cache SET: {key} (TTL: {ttl}s)")
@@ -252,6 +434,15 @@ class CacheService:
             
         return False
     
+    async def _prune_tag_set(self, set_key: str) -> None:
+        remaining = None
+        try:
+            remaining = await self.circuit_breaker.call(prune_tag_set_async, self.redis_client, set_key)
+        except (CircuitBreakerOpenError, RedisError) as e:
+            logger.debug(f"❌ Tag set prune skipped: {e}")
+        finally:
+            self._tag_pruner.finished(set_key, remaining)
+    
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         cache_key = self._make_key(key)
@@ -283,35 +474,64 @@ class CacheService:
         except (CircuitBreakerOpenError, RedisError):
             return False
     
-    async def invalidate_pattern(self, pattern: str) -> int:
-        """Invalidate all keys matching pattern"""
+    async def invalidate_tags(self, *tags: str, batch_size: int = INVALIDATION_BATCH_SIZE) -> int:
+        """
+        Invalidate every entry registered under any of the tags
+        
+        Members are popped from each tag set and UNLINKed in pipelined
+        batches, so no single command touches more than batch_size keys.
+        """
+        deleted = 0
+        try:
+            for tag in tags:
+                set_key = tag_key(self.key_prefix, tag)
+                while True:
+                    members = await self.circuit_breaker.call(self.redis_client.spop, set_key, batch_size)
+                    if not members:
+                        break
+                    deleted += await self.circuit_breaker.call(self.redis_client.unlink, *members)
+            if deleted:
+                logger.info(f"🧹 Invalidated {deleted} cache keys tagged {', '.join(tags)}")
+        except (CircuitBreakerOpenError, RedisError) as e:
+            self.stats["errors"] += 1
+            logger.warning(f"❌ Cache tag invalidation failed: {e}")
+        return deleted
+    
+    async def invalidate_pattern(self, pattern: str, batch_size: int = INVALIDATION_BATCH_SIZE) -> int:
+        """Invalidate all keys matching pattern (incremental SCAN, never KEYS)"""
+        deleted = 0
         try:
             cache_pattern = self._make_key(pattern)
-            keys = await self.circuit_breaker.call(
-                self.redis_client.keys, cache_pattern
-            )
-            
-            if keys:
-                deleted = await self.circuit_breaker.call(
-                    self.redis_client.delete, *keys
+            cursor = 0
+            while True:
+                cursor, keys = await self.circuit_breaker.call(
+                    self.redis_client.scan, cursor, match=cache_pattern, count=batch_size
                 )
+                if keys:
+                    deleted += await self.circuit_breaker.call(self.redis_client.unlink, *keys)
+                if not cursor:
+                    break
+            
+            if deleted:
                 logger.info(f"🧹 Invalidated {deleted} cache keys matching '{pattern}'")
-                return deleted
                 
         except (CircuitBreakerOpenError, RedisError) as e:
             logger.warning(f"❌ Cache pattern invalidation failed: {e}")
             
-        return 0
+        return deleted
     
     def cache_result(
         self,
         ttl: int = None,
         key_generator: Optional[Callable] = None,
-        strategy: CacheStrategy = CacheStrategy.TTL
+        strategy: CacheStrategy = CacheStrategy.TTL,
+        tags: Union[Iterable[str], Callable[..., Iterable[str]], None] = None
     ):
         """
         Decorator for caching function results
         
+        tags is a list of tags or a callable taking the function's arguments.
+        
         Usage:
             @cache.cache_result(ttl=1800, strategy=CacheStrategy.REFRESH_AHEAD)
             async def expensive_function(param1, param2):
@@ -338,7 +558,8 @@ class CacheService:
                 execution_time = time.time() - start_time
                 
                 # Store in cache
-                await self.set(cache_key, result, ttl or self.default_ttl, strategy)
+                entry_tags = tags(*args, **kwargs) if callable(tags) else (tags or ())
+                await self.set(cache_key, result, ttl or self.default_ttl, strategy, tags=entry_tags)
                 
                 # Record metrics
                 monitoring.record_request("cache", "SET", 200, execution_time)
@@ -447,6 +668,395 @@ class CacheService:
         await self.redis_client.close()
         logger.info("🔌 Cache service connections closed")
 
+class LocalLRUCache:
+    """Bounded in-process LRU of cache envelopes (the L1 tier)"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            envelope = self._entries.get(key)
+            if envelope is None:
+                return None
+            if envelope["expires_at"] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return envelope
+
+    def set(self, key: str, envelope: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = envelope
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, tags: Iterable[str] = (), pattern: Optional[str] = None) -> int:
+        """Drop entries carrying any of the tags or whose key matches the glob pattern"""
+        wanted = set(tags)
+        with self._lock:
+            doomed = [
+                key for key, envelope in self._entries.items()
+                if wanted.intersection(envelope.get("tags", ())) or (pattern and fnmatch.fnmatchcase(key, pattern))
+            ]
+            for key in doomed:
+                del self._entries[key]
+        return len(doomed)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _InFlight:
+    """One computation that concurrent callers for the same key wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class TieredCache:
+    """
+    Synchronous two-tier cache for Flask handlers
+
+    L1 is a bounded in-process LRU and L2 is Redis behind the circuit
+    breaker, so an unavailable Redis only costs the L2 hit rate. Entries are
+    fresh for `ttl` seconds, then served stale for up to `stale_ttl` more
+    while one background refresh recomputes them. Concurrent misses for the
+    same key share a single computation.
+
+    Usage:
+        cache = TieredCache(namespace="estimate_emissions", ttl=3600)
+        payload = cache.get_or_compute(key, lambda: expensive(...))
+    """
+
+    def __init__(
+        self,
+        namespace: str = "response",
+        ttl: int = 300,
+        stale_ttl: int = 900,
+        l1_max_entries: int = 1024,
+        redis_client: Optional[SyncRedis] = None,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "eco_tracker",
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.key_prefix = key_prefix
+
+        if redis_client is None:
+            redis_client = SyncRedis.from_url(
+                redis_url or os.environ.get("REDIS_URL", "redis://localhost:6379"),
+                socket_timeout=0.25,
+                socket_connect_timeout=0.25,
+                decode_responses=True
+            )
+        self.redis_client = redis_client
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_threshold=5,
+            recovery_timeout=60,
+            expected_exception=RedisError
+        )
+        self.l1 = LocalLRUCache(l1_max_entries)
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._refreshing = set()
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+        self._tag_pruner = TagSetPruner()
+
+        self.stats = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "computes": 0,
+            "compute_errors": 0,
+            "invalidated": 0,
+            "l2_errors": 0,
+            "l2_calls": 0,
+            "l2_time_ms": 0.0,
+            "compute_time_ms": 0.0
+        }
+
+    def _bump(self, name: str, amount: Union[int, float] = 1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    def _make_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{self.namespace}:{key}"
+
+    # === L2 (Redis) ===
+
+    def _l2(self, method: str, *args) -> Any:
+        """Redis call through the circuit breaker; None when Redis is unavailable"""
+        start = time.perf_counter()
+        try:
+            return self.circuit_breaker.call_sync(getattr(self.redis_client, method), *args)
+        except (CircuitBreakerOpenError, RedisError) as e:
+            self._bump("l2_errors")
+            logger.debug(f"❌ L2 {method} skipped: {e}")
+            return None
+        finally:
+            self._bump("l2_calls")
+            self._bump("l2_time_ms", (time.perf_counter() - start) * 1000)
+
+    def _lookup(self, key: str):
+        envelope = self.l1.get(key)
+        if envelope is not None:
+            return envelope, "l1"
+
+        raw = self._l2("get", self._make_key(key))
+        if raw is None:
+            return None, None
+        try:
+            envelope = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return None, None
+        self.l1.set(key, envelope)
+        return envelope, "l2"
+
+    # === Public API ===
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value (fresh or stale) or None"""
+        envelope, _ = self._lookup(key)
+        return envelope["value"] if envelope is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        ttl = ttl or self.ttl
+        tags = list(tags)
+        now = time.time()
+        envelope = {"value": value, "fresh_until": now + ttl, "expires_at": now + ttl + self.stale_ttl, "tags": tags}
+        self.l1.set(key, envelope)
+
+        redis_key = self._make_key(key)
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.setex(redis_key, ttl + self.stale_ttl, json.dumps(envelope, default=str, separators=(',', ':')))
+        register_tags(pipe, self.key_prefix, redis_key, tags, ttl + self.stale_ttl)
+        results = self._l2_pipeline(pipe)
+        for set_key in self._tag_pruner.due(self.key_prefix, tags, results):
+            # Sweeping a large set takes many round trips: keep it off the request
+            self._background_pool().submit(self._prune_tag_set, set_key)
+
+    def _prune_tag_set(self, set_key: str) -> None:
+        remaining = None
+        try:
+            remaining = self.circuit_breaker.call_sync(prune_tag_set, self.redis_client, set_key)
+        except (CircuitBreakerOpenError, RedisError) as e:
+            self._bump("l2_errors")
+            logger.debug(f"❌ Tag set prune skipped: {e}")
+        finally:
+            self._tag_pruner.finished(set_key, remaining)
+
+    def _l2_pipeline(self, pipe) -> Optional[list]:
+        start = time.perf_counter()
+        try:
+            return self.circuit_breaker.call_sync(pipe.execute)
+        except (CircuitBreakerOpenError, RedisError) as e:
+            self._bump("l2_errors")
+            logger.debug(f"❌ L2 pipeline skipped: {e}")
+            return None
+        finally:
+            self._bump("l2_calls")
+            self._bump("l2_time_ms", (time.perf_counter() - start) * 1000)
+
+    def invalidate_tags(self, *tags: str, batch_size: int = INVALIDATION_BATCH_SIZE) -> int:
+        """
+        Evict entries registered under any of the tags, locally and in Redis
+
+        Redis members are popped from each tag set and UNLINKed in pipelined
+        batches. L1 copies in other processes age out with their TTL.
+        """
+        evicted = self.l1.invalidate(tags=tags)
+        for tag in tags:
+            set_key = tag_key(self.key_prefix, tag)
+            while True:
+                members = self._l2("spop", set_key, batch_size)
+                if not members:
+                    break
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.unlink(*members)
+                results = self._l2_pipeline(pipe)
+                evicted += results[0] if results else 0
+        self._bump("invalidated", evicted)
+        return evicted
+
+    def invalidate_pattern(self, pattern: str, batch_size: int = INVALIDATION_BATCH_SIZE) -> int:
+        """Evict keys matching a glob pattern (incremental SCAN in Redis, never KEYS)"""
+        evicted = self.l1.invalidate(pattern=pattern)
+        cursor = 0
+        while True:
+            page = self._l2("scan", cursor, self._make_key(pattern), batch_size)
+            if page is None:
+                break
+            cursor, keys = page
+            if keys:
+                evicted += self._l2("unlink", *keys) or 0
+            if not cursor:
+                break
+        self._bump("invalidated", evicted)
+        return evicted
+
+    def delete(self, key: str) -> None:
+        self.l1.delete(key)
+        self._l2("delete", self._make_key(key))
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        tags: Union[Iterable[str], Callable[[Any], Iterable[str]], None] = None
+    ) -> Any:
+        """
+        Cached value for key, computing it on a miss
+
+        should_cache(value) can veto storing a result (e.g. error responses);
+        callers waiting on the same computation still receive it. tags is a
+        list of tags or a callable deriving them from the computed value.
+        """
+        envelope, tier = self._lookup(key)
+        if envelope is not None:
+            if envelope["fresh_until"] > time.time():
+                self._bump(f"{tier}_hits")
+            else:
+                self._bump("stale_hits")
+                self._refresh_in_background(key, compute, ttl, should_cache, tags)
+            return envelope["value"]
+
+        self._bump("misses")
+        return self._compute_coalesced(key, compute, ttl, should_cache, tags)
+
+    def _compute_coalesced(self, key, compute, ttl, should_cache, tags=None) -> Any:
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _InFlight()
+
+        if not leader:
+            self._bump("coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        start = time.perf_counter()
+        try:
+            value = compute()
+            if should_cache is None or should_cache(value):
+                self.set(key, value, ttl, tags=tags(value) if callable(tags) else (tags or ()))
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            self._bump("compute_errors")
+            raise
+        finally:
+            self._bump("computes")
+            self._bump("compute_time_ms", (time.perf_counter() - start) * 1000)
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _refresh_in_background(self, key, compute, ttl, should_cache, tags=None) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._compute_coalesced(key, compute, ttl, should_cache, tags)
+                self._bump("refreshes")
+            except Exception as e:
+                logger.warning(f"❌ Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._background_pool().submit(refresh)
+
+    def _background_pool(self) -> ThreadPoolExecutor:
+        """Threads for stale refreshes and tag-set sweeps"""
+        with self._lock:
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"{self.namespace}-refresh")
+            return self._refresh_pool
+
+    def clear_local(self) -> None:
+        self.l1.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss/latency counters plus tier and breaker state"""
+        with self._lock:
+            stats = dict(self.stats)
+        hits = stats["l1_hits"] + stats["l2_hits"] + stats["stale_hits"]
+        lookups = hits + stats["misses"]
+        return {
+            **stats,
+            "hit_rate": round(hits / lookups * 100, 2) if lookups else 0,
+            "avg_l2_ms": round(stats["l2_time_ms"] / stats["l2_calls"], 3) if stats["l2_calls"] else 0,
+            "avg_compute_ms": round(stats["compute_time_ms"] / stats["computes"], 1) if stats["computes"] else 0,
+            "l2_time_ms": round(stats["l2_time_ms"], 1),
+            "compute_time_ms": round(stats["compute_time_ms"], 1),
+            "l1_size": len(self.l1),
+            "l1_max_entries": self.l1.max_entries,
+            "circuit_breaker_state": self.circuit_breaker.state.value,
+            "circuit_breaker_failures": self.circuit_breaker.failure_count
+        }
+
+
+_response_caches: Dict[str, TieredCache] = {}
+_response_caches_lock = threading.Lock()
+
+
+def get_response_cache(namespace: str = "response", **kwargs) -> TieredCache:
+    """Process-wide TieredCache per namespace (kwargs apply on first use)"""
+    cache_instance = _response_caches.get(namespace)
+    if cache_instance is None:
+        with _response_caches_lock:
+            cache_instance = _response_caches.get(namespace)
+            if cache_instance is None:
+                cache_instance = _response_caches[namespace] = TieredCache(namespace=namespace, **kwargs)
+    return cache_instance
+
+
+def invalidate_cache_tags(*tags: str) -> int:
+    """
+    Evict tagged entries everywhere this process can reach
+
+    For use after retraining a model or refreshing a reference dataset.
+    Response caches in this process drop their L1 copies. Redis entries are
+    shared, so offline scripts with no caches of their own connect directly.
+    """
+    with _response_caches_lock:
+        caches = list(_response_caches.values())
+    if not caches:
+        caches = [TieredCache(namespace="invalidation", l1_max_entries=1)]
+    evicted = sum(cache_instance.invalidate_tags(*tags) for cache_instance in caches)
+    logger.info(f"🧹 Invalidated {evicted} cache entries tagged {', '.join(tags)}")
+    return evicted
+
+
 # Global cache service instance
 cache = CacheService()
 
@@ -456,17 +1066,22 @@ def cache_for(seconds: int):
     return cache.cache_result(ttl=seconds)
 
 def cache_scraping_result(ttl: int = 3600):
-    """Cache scraping results with custom TTL"""
+    """Cache scraping results with custom TTL, tagged by ASIN"""
     def key_generator(*args, **kwargs):
         # Use URL as part of cache key for scraping functions
         url = args[0] if args else kwargs.get('url', 'unknown')
         return f"scraping:{hashlib.md5(url.encode()).hexdigest()}"
     
-    return cache.cache_result(ttl=ttl, key_generator=key_generator)
+    def tags(*args, **kwargs):
+        url = args[0] if args else kwargs.get('url', '')
+        match = _ASIN_IN_URL.search(url or '')
+        return ["scraping"] + ([asin_tag(match.group(1))] if match else [])
+    
+    return cache.cache_result(ttl=ttl, key_generator=key_generator, tags=tags)
 
-def cache_ml_prediction(ttl: int = 7200):
-    """Cache ML predictions with longer TTL"""
-    return cache.cache_result(ttl=ttl, strategy=CacheStrategy.REFRESH_AHEAD)
+def cache_ml_prediction(ttl: int = 7200, model_name: str = "xgboost"):
+    """Cache ML predictions with longer TTL, tagged by model"""
+    return cache.cache_result(ttl=ttl, strategy=CacheStrategy.REFRESH_AHEAD, tags=[model_tag(model_name)])
 
 if __name__ == "__main__":
     # Test the caching system
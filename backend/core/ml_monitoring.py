@@ -39,6 +39,8 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_sc
 import joblib
 
 from .monitoring import monitoring
+from .streaming_drift import DEFAULT_KS_STRIDE, FeatureDriftState
+from .prediction_store import DEFAULT_CAPACITY, ModelPrediction, PredictionStore, RecentWindow
 from .exceptions import BaseEcoTrackerException, ErrorSeverity, ErrorCategory
 
 logger = logging.getLogger(__name__)
@@ -71,21 +73,6 @@ class DriftAlert:
     recommendations: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass 
-class ModelPrediction:
-    """Represents a single model prediction with metadata"""
-    prediction_id: str
-    model_name: str
-    model_version: str
-    input_features: Dict[str, Any]
-    prediction: Any
-    confidence: float
-    prediction_time: datetime
-    processing_time_ms: float
-    user_id: Optional[str] = None
-    feedback: Optional[Any] = None
-    feedback_time: Optional[datetime] = None
-
 class StatisticalTests:
     """Statistical tests for drift detection"""
     
@@ -193,7 +180,10 @@ class DriftDetector:
         detection_window_size: int = 100,
         psi_threshold: float = 0.2,
         ks_alpha: float = 0.05,
-        kl_threshold: float = 0.1
+        kl_threshold: float = 0.1,
+        ks_stride: int = DEFAULT_KS_STRIDE,
+        ks_interval_seconds: Optional[float] = None,
+        max_alerts: int = 1000
     ):
         self.reference_window_size = reference_window_size
         self.detection_window_size = detection_window_size
@@ -201,52 +191,79 @@ class DriftDetector:
         self.ks_alpha = ks_alpha
         self.kl_threshold = kl_threshold
         
-        # Data storage for drift detection
-        self.reference_data: Dict[str, deque] = defaultdict(lambda: deque(maxlen=reference_window_size))
-        self.current_data: Dict[str, deque] = defaultdict(lambda: deque(maxlen=detection_window_size))
-        
-        # Alert storage
-        self.alerts: List[DriftAlert] = []
+        # Streaming histograms per feature (PSI/KL every value, KS every ks_stride values)
+        self.features: Dict[str, FeatureDriftState] = defaultdict(lambda: FeatureDriftState(
+            reference_window_size=reference_window_size,
+            detection_window_size=detection_window_size,
+            ks_stride=ks_stride,
+            ks_interval_seconds=ks_interval_seconds
+        ))
+        
+        # Alert storage: the newest max_alerts alerts, plus a running total
+        self.alerts: deque = deque(maxlen=max_alerts)
+        self.total_alerts = 0
+        # Last 24 hours of alerts with per-type counts, for the dashboard
+        self.recent_alerts = RecentWindow(
+            timedelta(hours=24),
+            timestamp=lambda alert: alert.detected_at,
+            key=lambda alert: alert.drift_type,
+            max_items=max_alerts
+        )
         
         logger.info("🔍 Drift detector initialized with statistical thresholds")
     
+    @property
+    def reference_data(self) -> Dict[str, deque]:
+        return {name: state.reference for name, state in self.features.items() if state.reference}
+    
+    @property
+    def current_data(self) -> Dict[str, deque]:
+        return {name: state.current for name, state in self.features.items() if state.current}
+    
     def add_reference_data(self, feature_name: str, values: List[float]):
         """Add reference data for baseline comparison"""
-        self.reference_data[feature_name].extend(values)
+        self.features[feature_name].add_reference(values)
         logger.debug(f"📊 Added {len(values)} reference values for {feature_name}")
     
     def add_current_data(self, feature_name: str, value: float):
         """Add current data point for drift detection"""
-        self.current_data[feature_name].append(value)
+        state = self.features[feature_name]
+        state.append(value)
         
         # Trigger drift detection if we have enough data
-        if len(self.current_data[feature_name]) >= self.detection_window_size:
+        if state.window_full:
+            self._detect_feature_drift(feature_name)
+    
+    def add_current_batch(self, feature_name: str, values: List[float]):
+        """Add many current data points, then run drift detection once"""
+        state = self.features[feature_name]
+        state.extend(values)
+        
+        if state.window_full:
             self._detect_feature_drift(feature_name)
     
     def _detect_feature_drift(self, feature_name: str):
         """Detect drift for a specific feature"""
         
-        if feature_name not in self.reference_data or len(self.reference_data[feature_name]) < 100:
+        state = self.features[feature_name]
+        if len(state.reference) < 100:
             logger.warning(f"⚠️ Insufficient reference data for {feature_name}")
             return
         
-        reference = np.array(self.reference_data[feature_name])
-        current = np.array(self.current_data[feature_name])
-        
         with monitoring.trace_span("drift_detection", {
             "feature_name": feature_name,
-            "reference_size": len(reference),
-            "current_size": len(current)
+            "reference_size": len(state.reference),
+            "current_size": len(state.current)
         }):
             
             # Population Stability Index
-            psi_score = StatisticalTests.population_stability_index(reference, current)
+            psi_score = state.psi()
             
-            # Kolmogorov-Smirnov test
-            ks_p_value, ks_drift = StatisticalTests.kolmogorov_smirnov_test(reference, current, self.ks_alpha)
+            # Kolmogorov-Smirnov test (rerun every ks_stride values)
+            ks_p_value, ks_drift = state.ks_test(self.ks_alpha)
             
             # Kullback-Leibler divergence
-            kl_divergence = StatisticalTests.kullback_leibler_divergence(reference, current)
+            kl_divergence = state.kl_divergence()
             
             # Determine drift severity
             drift_detected = False
@@ -271,6 +288,7 @@ class DriftDetector:
             
             # Create alert if drift detected
             if drift_detected:
+                current_mean, current_std = state.current_mean_std()
                 alert = DriftAlert(
                     alert_id=self._generate_alert_id(feature_name),
                     drift_type=DriftType.DATA_DRIFT,
@@ -285,14 +303,16 @@ class DriftDetector:
                         "psi_score": psi_score,
                         "ks_p_value": ks_p_value,
                         "kl_divergence": kl_divergence,
-                        "reference_mean": float(np.mean(reference)),
-                        "current_mean": float(np.mean(current)),
-                        "reference_std": float(np.std(reference)),
-                        "current_std": float(np.std(current))
+                        "reference_mean": state.reference_mean,
+                        "current_mean": current_mean,
+                        "reference_std": state.reference_std,
+                        "current_std": current_std
                     }
                 )
                 
                 self.alerts.append(alert)
+                self.total_alerts += 1
+                self.recent_alerts.add(alert)
                 self._send_drift_alert(alert)
                 
                 logger.warning(f"🚨 {severity.upper()} drift alert: {alert.message}")
@@ -493,7 +513,13 @@ class MLMonitoringService:
     drift detection, performance tracking, and automated alerting.
     """
     
-    def __init__(self, model_name: str, model_version: str):
+    def __init__(
+        self,
+        model_name: str,
+        model_version: str,
+        max_predictions: int = DEFAULT_CAPACITY,
+        spill_path: Optional[str] = None
+    ):
         self.model_name = model_name
         self.model_version = model_version
         
@@ -501,8 +527,9 @@ class MLMonitoringService:
         self.drift_detector = DriftDetector()
         self.performance_monitor = ModelPerformanceMonitor()
         
-        # Prediction storage
-        self.predictions: List[ModelPrediction] = []
+        # Prediction storage: newest max_predictions in memory, older ones spilled to SQLite if spill_path is set
+        self.predictions = PredictionStore(capacity=max_predictions, spill_path=spill_path)
+        self.recent_confidences: deque = deque(maxlen=100)
         self.prediction_stats = {
             "total_predictions": 0,
             "average_confidence": 0.0,
@@ -527,6 +554,59 @@ class MLMonitoringService:
             prediction_id for tracking and feedback
         """
         
+        pred_record = self._record_prediction(input_features, prediction, confidence, processing_time_ms, user_id)
+        
+        # Add features to drift detection
+        for feature_name, feature_value in input_features.items():
+            if isinstance(feature_value, (int, float)):
+                self.drift_detector.add_current_data(feature_name, float(feature_value))
+        
+        return pred_record.prediction_id
+    
+    def log_predictions(self, predictions: List[Dict[str, Any]]) -> List[str]:
+        """
+        Log many model predictions at once
+        
+        Each item holds the log_prediction arguments (input_features, prediction,
+        confidence, processing_time_ms and optionally user_id). Drift detection
+        runs once per feature for the whole batch instead of once per prediction.
+        
+        Returns:
+            prediction_ids in input order
+        """
+        
+        prediction_ids = []
+        feature_values: Dict[str, List[float]] = defaultdict(list)
+        
+        for item in predictions:
+            pred_record = self._record_prediction(
+                item["input_features"],
+                item["prediction"],
+                item["confidence"],
+                item["processing_time_ms"],
+                item.get("user_id")
+            )
+            prediction_ids.append(pred_record.prediction_id)
+            
+            for feature_name, feature_value in pred_record.input_features.items():
+                if isinstance(feature_value, (int, float)):
+                    feature_values[feature_name].append(float(feature_value))
+        
+        for feature_name, values in feature_values.items():
+            self.drift_detector.add_current_batch(feature_name, values)
+        
+        return prediction_ids
+    
+    def _record_prediction(
+        self,
+        input_features: Dict[str, Any],
+        prediction: Any,
+        confidence: float,
+        processing_time_ms: float,
+        user_id: Optional[str]
+    ) -> ModelPrediction:
+        """Store a prediction, update statistics and record its metrics"""
+        
         prediction_id = self._generate_prediction_id()
         
         # Create prediction record
@@ -542,16 +622,12 @@ class MLMonitoringService:
             user_id=user_id
         )
         
-        self.predictions.append(pred_record)
+        self.predictions.add(pred_record)
+        self.recent_confidences.append(confidence)
         
         # Update statistics
         self._update_prediction_stats(pred_record)
         
-        # Add features to drift detection
-        for feature_name, feature_value in input_features.items():
-            if isinstance(feature_value, (int, float)):
-                self.drift_detector.add_current_data(feature_name, float(feature_value))
-        
         # Record monitoring metrics
         monitoring.record_ml_prediction(
             self.model_name,
@@ -561,26 +637,29 @@ class MLMonitoringService:
         
         logger.debug(f"📝 Logged prediction {prediction_id} with confidence {confidence:.3f}")
         
-        return prediction_id
+        return pred_record
     
     def add_feedback(self, prediction_id: str, ground_truth: Any):
         """Add ground truth feedback for performance monitoring"""
         
         # Find prediction record
-        for pred in self.predictions:
-            if pred.prediction_id == prediction_id:
-                pred.feedback = ground_truth
-                pred.feedback_time = datetime.utcnow()
-                
-                # Add to performance monitor
-                self.performance_monitor.add_prediction(
-                    prediction=pred.prediction,
-                    ground_truth=ground_truth,
-                    confidence=pred.confidence
-                )
-                
-                logger.debug(f"✅ Added feedback for prediction {prediction_id}")
-                break
+        pred = self.predictions.get(prediction_id)
+        if pred is None:
+            logger.warning(f"⚠️ No prediction {prediction_id} for feedback")
+            return
+        
+        pred.feedback = ground_truth
+        pred.feedback_time = datetime.utcnow()
+        self.predictions.update(pred)
+        
+        # Add to performance monitor
+        self.performance_monitor.add_prediction(
+            prediction=pred.prediction,
+            ground_truth=ground_truth,
+            confidence=pred.confidence
+        )
+        
+        logger.debug(f"✅ Added feedback for prediction {prediction_id}")
     
     def set_baseline_data(self, baseline_features: pd.DataFrame):
         """Set baseline feature distributions for drift detection"""
@@ -604,7 +683,7 @@ class MLMonitoringService:
     
     def _generate_prediction_id(self) -> str:
         """Generate unique prediction ID"""
-        content = f"{self.model_name}:{time.time()}:{len(self.predictions)}"
+        content = f"{self.model_name}:{time.time()}:{self.predictions.total}"
         return hashlib.md5(content.encode()).hexdigest()[:16]
     
     def _update_prediction_stats(self, prediction: ModelPrediction):
@@ -650,10 +729,8 @@ class MLMonitoringService:
         """Get comprehensive monitoring dashboard data"""
         
         # Recent alerts (last 24 hours)
-        recent_alerts = [
-            alert for alert in self.drift_detector.alerts
-            if alert.detected_at > datetime.utcnow() - timedelta(hours=24)
-        ]
+        recent_window = self.drift_detector.recent_alerts
+        recent_alerts = recent_window.latest(10)
         
         # Feature statistics with mean and std
         feature_stats = {}
@@ -672,8 +749,7 @@ class MLMonitoringService:
                 }
         
         # Confidence distribution
-        recent_predictions = self.predictions[-100:] if len(self.predictions) > 100 else self.predictions
-        confidence_scores = [p.confidence for p in recent_predictions]
+        confidence_scores = list(self.recent_confidences)
         
         return {
             "model_info": {
@@ -684,10 +760,10 @@ class MLMonitoringService:
                 "average_processing_time_ms": round(self.prediction_stats["average_processing_time"], 2)
             },
             "drift_status": {
-                "total_alerts": len(self.drift_detector.alerts),
-                "recent_alerts": len(recent_alerts),
+                "total_alerts": self.drift_detector.total_alerts,
+                "recent_alerts": len(recent_window),
                 "alert_breakdown": {
-                    alert_type.value: len([a for a in recent_alerts if a.drift_type == alert_type])
+                    alert_type.value: recent_window.counts[alert_type]
                     for alert_type in DriftType
                 }
             },
@@ -707,7 +783,7 @@ class MLMonitoringService:
                     "feature_name": alert.feature_name,
                     "drift_score": alert.drift_score
                 }
-                for alert in recent_alerts[-10:]  # Last 10 alerts
+                for alert in recent_alerts  # Last 10 alerts
             ]
         }
 
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+🗃️ BOUNDED PREDICTION STORE
+==========================
+
+Memory-bounded storage behind MLMonitoringService, so a long-running
+worker keeps constant memory and constant feedback cost however many
+predictions it logs.
+
+- PredictionStore keeps the newest `capacity` predictions in a ring buffer
+  with a prediction_id -> slot index: add and lookup are O(1)
+- Overwritten predictions can be spilled to a SQLite log (batched inserts)
+  so feedback for older predictions still finds them
+- RecentWindow keeps the items of a sliding time window with per-key
+  counts, updated as items arrive and expire, for dashboard aggregates
+- ModelPrediction uses __slots__
+
+Usage:
+    store = PredictionStore(capacity=10000, spill_path="ml_model/predictions.db")
+    store.add(prediction)
+    store.get(prediction_id)
+    store.recent(100)
+"""
+
+import atexit
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Predictions kept in memory per MLMonitoringService
+DEFAULT_CAPACITY = int(os.environ.get("ML_PREDICTION_STORE_CAPACITY", "10000"))
+# Overwritten predictions written to SQLite per transaction
+SPILL_BATCH_SIZE = 1000
+
+
+@dataclass(slots=True)
+class ModelPrediction:
+    """Represents a single model prediction with metadata"""
+    prediction_id: str
+    model_name: str
+    model_version: str
+    input_features: Dict[str, Any]
+    prediction: Any
+    confidence: float
+    prediction_time: datetime
+    processing_time_ms: float
+    user_id: Optional[str] = None
+    feedback: Optional[Any] = None
+    feedback_time: Optional[datetime] = None
+
+
+class PredictionStore:
+    """Ring buffer of the newest predictions, indexed by prediction_id"""
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        spill_path: Optional[str] = None,
+        spill_batch_size: int = SPILL_BATCH_SIZE
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spill_batch_size = spill_batch_size
+
+        self._slots: List[Optional[ModelPrediction]] = [None] * capacity
+        self._index: Dict[str, int] = {}
+        self._added = 0
+        self._lock = threading.Lock()
+
+        # Overwritten predictions not yet written to SQLite
+        self._spill_pending: Dict[str, ModelPrediction] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        if spill_path:
+            directory = os.path.dirname(spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(spill_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions "
+                "(prediction_id TEXT PRIMARY KEY, prediction_time TEXT, record BLOB)"
+            )
+            self._db.commit()
+            atexit.register(self.close)
+
+    @property
+    def total(self) -> int:
+        """Predictions added over the store's lifetime"""
+        return self._added
+
+    def __len__(self) -> int:
+        return min(self._added, self.capacity)
+
+    def __contains__(self, prediction_id: str) -> bool:
+        return self.get(prediction_id) is not None
+
+    def __iter__(self) -> Iterator[ModelPrediction]:
+        """In-memory predictions, oldest first"""
+        return iter(self.recent(len(self)))
+
+    def add(self, prediction: ModelPrediction) -> None:
+        with self._lock:
+            slot = self._added % self.capacity
+            evicted = self._slots[slot]
+            if evicted is not None:
+                del self._index[evicted.prediction_id]
+                if self._db is not None:
+                    self._spill_pending[evicted.prediction_id] = evicted
+                    if len(self._spill_pending) >= self.spill_batch_size:
+                        self._write_spilled()
+            self._slots[slot] = prediction
+            self._index[prediction.prediction_id] = slot
+            self._added += 1
+
+    def get(self, prediction_id: str) -> Optional[ModelPrediction]:
+        """Prediction by id, from memory or the spill log"""
+        with self._lock:
+            slot = self._index.get(prediction_id)
+            if slot is not None:
+                return self._slots[slot]
+            if self._db is None:
+                return None
+            if prediction_id in self._spill_pending:
+                return self._spill_pending[prediction_id]
+            row = self._db.execute(
+                "SELECT record FROM predictions WHERE prediction_id = ?", (prediction_id,)
+            ).fetchone()
+            return pickle.loads(row[0]) if row else None
+
+    def update(self, prediction: ModelPrediction) -> None:
+        """Persist changes to a prediction that has already been spilled"""
+        with self._lock:
+            if prediction.prediction_id in self._index or self._db is None:
+                return
+            self._spill_pending[prediction.prediction_id] = prediction
+            self._write_spilled()
+
+    def recent(self, n: int) -> List[ModelPrediction]:
+        """The newest n in-memory predictions, oldest first"""
+        with self._lock:
+            n = min(n, len(self))
+            return [self._slots[i % self.capacity] for i in range(self._added - n, self._added)]
+
+    def _write_spilled(self) -> None:
+        rows = [
+            (p.prediction_id, p.prediction_time.isoformat(), pickle.dumps(p, protocol=pickle.HIGHEST_PROTOCOL))
+            for p in self._spill_pending.values()
+        ]
+        self._spill_pending = {}
+        try:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            logger.error(f"❌ Failed to spill {len(rows)} predictions to {self.spill_path}: {e}")
+
+    def flush(self) -> None:
+        """Write overwritten predictions still held in memory to the spill log"""
+        with self._lock:
+            if self._db is not None and self._spill_pending:
+                self._write_spilled()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class RecentWindow:
+    """
+    Items from the last `window` of time, with counts per key
+
+    Items must arrive in timestamp order. Expired items are dropped from the
+    front as they age out, so reads never rescan the full history. At most
+    max_items are kept; past that the oldest go first, counts included.
+    """
+
+    def __init__(
+        self,
+        window: timedelta,
+        timestamp: Callable[[Any], datetime],
+        key: Callable[[Any], Hashable],
+        clock: Callable[[], datetime] = datetime.utcnow,
+        max_items: Optional[int] = None
+    ):
+        self.window = window
+        self.max_items = max_items
+        self._timestamp = timestamp
+        self._key = key
+        self._clock = clock
+        self._items: deque = deque()
+        self.counts: Counter = Counter()
+
+    def add(self, item: Any) -> None:
+        self._items.append(item)
+        self.counts[self._key(item)] += 1
+        if self.max_items is not None and len(self._items) > self.max_items:
+            self._drop_oldest()
+
+    def _drop_oldest(self) -> None:
+        key = self._key(self._items.popleft())
+        self.counts[key] -= 1
+        if not self.counts[key]:
+            del self.counts[key]
+
+    def expire(self) -> None:
+        cutoff = self._clock() - self.window
+        while self._items and self._timestamp(self._items[0]) <= cutoff:
+            self._drop_oldest()
+
+    def __len__(self) -> int:
+        self.expire()
+        return len(self._items)
+
+    def latest(self, n: int) -> List[Any]:
+        """The newest n items in the window, oldest first"""
+        self.expire()
+        n = min(n, len(self._items))
+        return [self._items[i] for i in range(len(self._items) - n, len(self._items))]
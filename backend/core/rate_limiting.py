@@ -7,7 +7,8 @@ Production-grade rate limiting with multiple algorithms, user authentication,
 and comprehensive monitoring for the DSP Eco Tracker API.
 
 Features:
-- Token bucket and sliding window rate limiting
+- Token bucket and sliding window rate limiting, each check one atomic
+  Lua script call (EVALSHA), with several limits checked in a single call
 - User-based and IP-based rate limiting  
 - JWT authentication with role-based access control
 - API key management for external integrations
@@ -32,7 +33,21 @@ from flask import request, jsonify, g
 import redis.asyncio as redis
 from redis.exceptions import RedisError
 
-from .monitoring import monitoring
+try:
+    from .monitoring import monitoring
+except ImportError:
+    # OpenTelemetry is optional: without it limits are enforced untraced
+    from contextlib import contextmanager
+
+    class _NullMonitoring:
+        @contextmanager
+        def trace_span(self, span_name: str, attributes: Optional[Dict[str, Any]] = None):
+            yield None
+
+        def create_alert(self, alert_name: str, severity: str, message: str, context: Dict[str, Any]):
+            logger.warning(f"🚨 {alert_name}: {message}")
+
+    monitoring = _NullMonitoring()
 from .exceptions import (
     BaseEcoTrackerException, 
     ErrorSeverity, 
@@ -100,6 +115,124 @@ class AuthenticationError(BaseEcoTrackerException):
             **kwargs
         )
 
+# One script serves every limiter: KEYS are the limit keys, and ARGV holds four
+# values per key (kind, a, b, cost). Either every limit admits the request and all
+# of them are charged, or none is. Redis runs the script atomically, so
+# concurrent checks cannot interleave between the read and the write, and a
+# check costs one round trip. Time comes from the Redis server, so clock skew
+# between app servers does not matter. Redis >= 5 replicates script effects,
+# which allows writes after TIME.
+#   bucket: a = capacity, b = refill rate (tokens/s); hash {tokens, last_refill (us)}
+#   window: a = window size (s), b = max requests; sorted set scored by time (us)
+RATE_LIMIT_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+
+local function check_bucket(key, capacity, rate, cost)
+    local state = redis.call('HMGET', key, 'tokens', 'last_refill')
+    local tokens = tonumber(state[1]) or capacity
+    local last = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - last) * rate / 1000000)
+    if tokens >= cost then
+        return 1, tokens - cost, 0
+    end
+    return 0, tokens, (cost - tokens) / rate
+end
+
+local function commit_bucket(key, capacity, rate, remaining)
+    redis.call('HSET', key, 'tokens', tostring(remaining), 'last_refill', string.format('%d', now))
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000) + 1000)
+end
+
+local function check_window(key, window, limit, cost)
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', string.format('%d', now - window * 1000000))
+    local count = redis.call('ZCARD', key)
+    if count + cost <= limit then
+        return 1, limit - count - cost, 0
+    end
+    local retry_after = window
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    if oldest[2] then
+        retry_after = math.max(0, (tonumber(oldest[2]) + window * 1000000 - now) / 1000000)
+    end
+    return 0, math.max(0, limit - count), retry_after
+end
+
+local function commit_window(key, window, cost)
+    local count = redis.call('ZCARD', key)
+    local score = string.format('%d', now)
+    for i = 1, cost do
+        -- Members must be unique even when two requests share a microsecond
+        redis.call('ZADD', key, score, score .. '-' .. (count + i))
+    end
+    redis.call('PEXPIRE', key, math.ceil(window * 1000))
+end
+
+local results = {}
+local admitted = 1
+for i, key in ipairs(KEYS) do
+    local base = (i - 1) * 4
+    local kind, a, b, cost = ARGV[base + 1], tonumber(ARGV[base + 2]), tonumber(ARGV[base + 3]), tonumber(ARGV[base + 4])
+    local ok, remaining, retry_after
+    if kind == 'bucket' then
+        ok, remaining, retry_after = check_bucket(key, a, b, cost)
+    else
+        ok, remaining, retry_after = check_window(key, a, b, cost)
+    end
+    if ok == 0 then
+        admitted = 0
+    end
+    results[i] = {ok, tostring(remaining), tostring(retry_after)}
+end
+
+if admitted == 1 then
+    for i, key in ipairs(KEYS) do
+        local base = (i - 1) * 4
+        local kind, a, b, cost = ARGV[base + 1], tonumber(ARGV[base + 2]), tonumber(ARGV[base + 3]), tonumber(ARGV[base + 4])
+        if kind == 'bucket' then
+            commit_bucket(key, a, b, tonumber(results[i][2]))
+        else
+            commit_window(key, a, cost)
+        end
+    end
+end
+
+return {admitted, results}
+"""
+
+_scripts: Dict[int, Any] = {}
+
+
+def _rate_limit_script(redis_client: redis.Redis):
+    """RATE_LIMIT_LUA registered on a client (SCRIPT LOAD once, then EVALSHA)"""
+    script = _scripts.get(id(redis_client))
+    if script is None or script.registered_client is not redis_client:
+        script = _scripts[id(redis_client)] = redis_client.register_script(RATE_LIMIT_LUA)
+    return script
+
+
+async def run_rate_limit_checks(
+    redis_client: redis.Redis,
+    checks: List[Tuple[str, List[Any]]]
+) -> Tuple[bool, List[Tuple[bool, float, float]]]:
+    """
+    Check and charge several limits in one atomic script call
+
+    Args:
+        checks: (redis_key, [kind, a, b, cost]) per limit
+
+    Returns:
+        (admitted, [(allowed, remaining, retry_after), ...]) in input order
+    """
+    keys = [key for key, _ in checks]
+    args = [arg for _, limit_args in checks for arg in limit_args]
+    admitted, results = await _rate_limit_script(redis_client)(keys=keys, args=args)
+    return bool(int(admitted)), [
+        (bool(int(allowed)), float(remaining), float(retry_after))
+        for allowed, remaining, retry_after in results
+    ]
+
+
 class TokenBucket:
     """
     Token bucket algorithm implementation
@@ -120,6 +253,26 @@ class TokenBucket:
         self.redis_client = redis_client
         self.key_prefix = key_prefix
     
+    def script_check(self, key: str, tokens: int = 1) -> Tuple[str, List[Any]]:
+        """This bucket's entry for run_rate_limit_checks"""
+        return f"{self.key_prefix}:{key}", ["bucket", self.capacity, self.refill_rate, tokens]
+    
+    def metadata(self, allowed: bool, remaining: float, retry_after: float, tokens: int = 1) -> Dict[str, Any]:
+        if allowed:
+            return {
+                "tokens_remaining": remaining,
+                "capacity": self.capacity,
+                "refill_rate": self.refill_rate,
+                "algorithm": "token_bucket"
+            }
+        return {
+            "tokens_remaining": remaining,
+            "tokens_needed": tokens - remaining,
+            "retry_after": retry_after,
+            "capacity": self.capacity,
+            "algorithm": "token_bucket"
+        }
+    
     async def consume(self, key: str, tokens: int = 1) -> Tuple[bool, Dict[str, Any]]:
         """
         Attempt to consume tokens from bucket
@@ -127,67 +280,11 @@ class TokenBucket:
         Returns:
             (success, metadata) where metadata contains current state
         """
-        bucket_key = f"{self.key_prefix}:{key}"
-        
         try:
-            # Get current bucket state
-            bucket_data = await self.redis_client.hgetall(bucket_key)
-            
-            current_time = time.time()
-            
-            if bucket_data:
-                last_refill = float(bucket_data.get("last_refill", current_time))
-                current_tokens = float(bucket_data.get("tokens", self.capacity))
-            else:
-                last_refill = current_time
-                current_tokens = self.capacity
-            
-            # Calculate tokens to add based on time elapsed
-            time_elapsed = current_time - last_refill
-            tokens_to_add = time_elapsed * self.refill_rate
-            
-            # Update token count (capped at capacity)
-            new_tokens = min(self.capacity, current_tokens + tokens_to_add)
-            
-            # Check if we can consume requested tokens
-            if new_tokens >= tokens:
-                # Consume tokens
-                remaining_tokens = new_tokens - tokens
-                
-                # Update bucket state
-                await self.redis_client.hset(bucket_key, mapping={
-                    "tokens": remaining_tokens,
-                    "last_refill": current_time
-                })
-                
-                # Set expiration (cleanup old buckets)
-                await self.redis_client.expire(bucket_key, 3600)
-                
-                return True, {
-                    "tokens_remaining": remaining_tokens,
-                    "capacity": self.capacity,
-                    "refill_rate": self.refill_rate,
-                    "algorithm": "token_bucket"
-                }
-            else:
-                # Not enough tokens - calculate retry after
-                tokens_needed = tokens - new_tokens
-                retry_after = tokens_needed / self.refill_rate
-                
-                # Update last refill time
-                await self.redis_client.hset(bucket_key, mapping={
-                    "tokens": new_tokens,
-                    "last_refill": current_time
-                })
-                
-                return False, {
-                    "tokens_remaining": new_tokens,
-                    "tokens_needed": tokens_needed,
-                    "retry_after": retry_after,
-                    "capacity": self.capacity,
-                    "algorithm": "token_bucket"
-                }
-                
+            _, [(allowed, remaining, retry_after)] = await run_rate_limit_checks(
+                self.redis_client, [self.script_check(key, tokens)]
+            )
+            return allowed, self.metadata(allowed, remaining, retry_after, tokens)
         except RedisError as e:
             logger.warning(f"❌ Token bucket Redis error: {e}")
             # Fail open on Redis errors
@@ -213,6 +310,26 @@ class SlidingWindowCounter:
         self.redis_client = redis_client
         self.key_prefix = key_prefix
     
+    def script_check(self, key: str, requests: int = 1) -> Tuple[str, List[Any]]:
+        """This window's entry for run_rate_limit_checks"""
+        return f"{self.key_prefix}:{key}", ["window", self.window_size, self.max_requests, requests]
+    
+    def metadata(self, allowed: bool, remaining: float, retry_after: float, requests: int = 1) -> Dict[str, Any]:
+        in_window = self.max_requests - int(remaining)
+        if allowed:
+            return {
+                "requests_in_window": in_window,
+                "max_requests": self.max_requests,
+                "window_size": self.window_size,
+                "algorithm": "sliding_window"
+            }
+        return {
+            "requests_in_window": in_window,
+            "max_requests": self.max_requests,
+            "retry_after": retry_after,
+            "algorithm": "sliding_window"
+        }
+    
     async def is_allowed(self, key: str) -> Tuple[bool, Dict[str, Any]]:
         """
         Check if request is allowed within sliding window
@@ -220,58 +337,53 @@ class SlidingWindowCounter:
         Returns:
             (allowed, metadata) with current window state
         """
-        window_key = f"{self.key_prefix}:{key}"
-        
         try:
-            current_time = time.time()
-            window_start = current_time - self.window_size
-            
-            # Remove old entries outside window
-            await self.redis_client.zremrangebyscore(
-                window_key, 0, window_start
+            _, [(allowed, remaining, retry_after)] = await run_rate_limit_checks(
+                self.redis_client, [self.script_check(key)]
             )
-            
-            # Count requests in current window
-            current_requests = await self.redis_client.zcard(window_key)
-            
-            if current_requests < self.max_requests:
-                # Add current request
-                await self.redis_client.zadd(
-                    window_key, {str(current_time): current_time}
-                )
-                
-                # Set expiration
-                await self.redis_client.expire(window_key, self.window_size)
-                
-                return True, {
-                    "requests_in_window": current_requests + 1,
-                    "max_requests": self.max_requests,
-                    "window_size": self.window_size,
-                    "algorithm": "sliding_window"
-                }
-            else:
-                # Calculate when oldest request will expire
-                oldest_request = await self.redis_client.zrange(
-                    window_key, 0, 0, withscores=True
-                )
-                
-                if oldest_request:
-                    retry_after = oldest_request[0][1] + self.window_size - current_time
-                else:
-                    retry_after = self.window_size
-                
-                return False, {
-                    "requests_in_window": current_requests,
-                    "max_requests": self.max_requests,
-                    "retry_after": max(0, retry_after),
-                    "algorithm": "sliding_window"
-                }
-                
+            return allowed, self.metadata(allowed, remaining, retry_after)
         except RedisError as e:
             logger.warning(f"❌ Sliding window Redis error: {e}")
             # Fail open on Redis errors
             return True, {"error": "rate_limit_unavailable"}
 
+class MultiLimit:
+    """
+    Several limits enforced together (e.g. per-minute burst plus hourly quota)
+    
+    All limits are checked in one script call and charged only when every
+    one of them admits the request, so a request rejected by the hourly
+    quota does not use up burst tokens.
+    """
+    
+    def __init__(self, limiters: List[Any], redis_client: redis.Redis):
+        self.limiters = limiters
+        self.redis_client = redis_client
+    
+    async def check(self, key: str, cost: int = 1) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Returns:
+            (allowed, metadata) with the first limiter's state at the top level,
+            every limiter's state under "limits", and the longest retry_after
+        """
+        try:
+            admitted, results = await run_rate_limit_checks(
+                self.redis_client, [limiter.script_check(key, cost) for limiter in self.limiters]
+            )
+        except RedisError as e:
+            logger.warning(f"❌ Multi-limit Redis error: {e}")
+            return True, {"error": "rate_limit_unavailable"}
+        
+        limits = [
+            limiter.metadata(allowed, remaining, retry_after, cost)
+            for limiter, (allowed, remaining, retry_after) in zip(self.limiters, results)
+        ]
+        metadata = dict(limits[0])
+        metadata["limits"] = limits
+        if not admitted:
+            metadata["retry_after"] = max(limit.get("retry_after", 0) for limit in limits)
+        return admitted, metadata
+
 class AuthenticationService:
     """
     JWT and API key authentication service
@@ -310,7 +422,7 @@ class AuthenticationService:
         logger.info(f"🔐 JWT token generated for user {user_id} (role: {role})")
         return token
     
-    def verify_jwt_token(self, token: str) -> Dict[str, Any]:
+    async def verify_jwt_token(self, token: str) -> Dict[str, Any]:
         """Verify and decode JWT token"""
         
         try:
@@ -415,9 +527,8 @@ class RateLimitService:
             redis_client=redis_client
         )
         
-        # Initialize rate limiters
-        self.token_buckets = {}
-        self.sliding_windows = {}
+        # Rate limiters per role, built on first use
+        self.limiters: Dict[UserRole, MultiLimit] = {}
         
         logger.info("🛡️ Rate limiting service initialized")
     
@@ -464,45 +575,40 @@ class RateLimitService:
             "rate_limit.endpoint": endpoint
         }):
             
-            if algorithm == RateLimitAlgorithm.TOKEN_BUCKET:
-                return await self._check_token_bucket(rate_limit_key, limits)
-            elif algorithm == RateLimitAlgorithm.SLIDING_WINDOW:
-                return await self._check_sliding_window(rate_limit_key, limits)
-            else:
-                # Default to token bucket
-                return await self._check_token_bucket(rate_limit_key, limits)
-    
-    async def _check_token_bucket(
-        self, 
-        key: str, 
-        limits: Dict[str, Any]
-    ) -> Tuple[bool, Dict[str, Any]]:
-        """Check token bucket rate limit"""
-        
-        bucket = TokenBucket(
-            capacity=limits["burst_capacity"],
-            refill_rate=limits["requests_per_minute"] / 60.0,
-            redis_client=self.redis_client,
-            key_prefix="rate_limit_bucket"
-        )
-        
-        return await bucket.consume(key)
+            return await self._get_limiter(role, limits).check(rate_limit_key)
     
-    async def _check_sliding_window(
-        self,
-        key: str,
-        limits: Dict[str, Any]
-    ) -> Tuple[bool, Dict[str, Any]]:
-        """Check sliding window rate limit"""
+    def _get_limiter(self, role: UserRole, limits: Dict[str, Any]) -> MultiLimit:
+        """Per-minute limit for the role's algorithm plus its hourly quota, checked in one call"""
+        
+        limiter = self.limiters.get(role)
+        if limiter is not None:
+            return limiter
+        
+        if limits["algorithm"] == RateLimitAlgorithm.SLIDING_WINDOW:
+            per_minute = SlidingWindowCounter(
+                window_size=60,  # 1 minute window
+                max_requests=limits["requests_per_minute"],
+                redis_client=self.redis_client,
+                key_prefix="rate_limit_window"
+            )
+        else:
+            # Token bucket, also the default for algorithms without a script
+            per_minute = TokenBucket(
+                capacity=limits["burst_capacity"],
+                refill_rate=limits["requests_per_minute"] / 60.0,
+                redis_client=self.redis_client,
+                key_prefix="rate_limit_bucket"
+            )
         
-        window = SlidingWindowCounter(
-            window_size=60,  # 1 minute window
-            max_requests=limits["requests_per_minute"],
+        hourly = SlidingWindowCounter(
+            window_size=3600,
+            max_requests=limits["requests_per_hour"],
             redis_client=self.redis_client,
-            key_prefix="rate_limit_window"
+            key_prefix="rate_limit_hourly"
         )
         
-        return await window.is_allowed(key)
+        limiter = self.limiters[role] = MultiLimit([per_minute, hourly], self.redis_client)
+        return limiter
     
     def rate_limit(
         self,
@@ -575,7 +681,7 @@ class RateLimitService:
         if auth_header.startswith("Bearer "):
             try:
                 token = auth_header[7:]
-                payload = self.auth_service.verify_jwt_token(token)
+                payload = await self.auth_service.verify_jwt_token(token)
                 return {
                     "identifier": payload["user_id"],
                     "role": UserRole(payload["role"]),
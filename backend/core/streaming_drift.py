@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+🌊 STREAMING DRIFT STATISTICS
+============================
+
+Per-feature drift state behind DriftDetector, updated in O(1) per value
+instead of rebuilding arrays from both windows on every prediction.
+
+- The reference histogram (bin edges, counts and proportions), its mean,
+  std and sorted values (an exact quantile sketch of the reference window)
+  are computed once per reference update
+- The current window's bin counts are kept up to date: +1 for the new
+  value, -1 for the value it evicts
+- PSI and KL divergence come from the two histograms, with the same
+  formulas as StatisticalTests
+- The KS test needs the raw window, so it runs every ks_stride values (or
+  ks_interval_seconds) and its last result is reused in between
+
+Usage:
+    state = FeatureDriftState(reference_window_size=1000, detection_window_size=100)
+    state.add_reference(baseline_values)
+    state.extend(latest_values)
+    state.psi(), state.kl_divergence(), state.ks_test(alpha=0.05)
+"""
+
+import time
+from bisect import bisect_right
+from collections import deque
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from scipy import stats
+
+# Same histogram resolution StatisticalTests uses for PSI and KL
+DEFAULT_BINS = 10
+# Rerun the KS test after this many new values
+DEFAULT_KS_STRIDE = 25
+
+PSI_EPSILON = 1e-6
+KL_EPSILON = 1e-10
+
+
+class FeatureDriftState:
+    """Reference and current-window histograms for one feature"""
+
+    def __init__(
+        self,
+        reference_window_size: int = 1000,
+        detection_window_size: int = 100,
+        bins: int = DEFAULT_BINS,
+        ks_stride: int = DEFAULT_KS_STRIDE,
+        ks_interval_seconds: Optional[float] = None
+    ):
+        self.bins = bins
+        self.ks_stride = ks_stride
+        self.ks_interval_seconds = ks_interval_seconds
+
+        self.reference: deque = deque(maxlen=reference_window_size)
+        self.current: deque = deque(maxlen=detection_window_size)
+        # Bin of each value in the current window (-1: outside the reference range)
+        self._current_bins: deque = deque(maxlen=detection_window_size)
+        self._current_counts = np.zeros(bins, dtype=np.int64)
+
+        self._reference_stale = True
+        self._edges: list = []
+        self._bin_widths: Optional[np.ndarray] = None
+        self.reference_counts: Optional[np.ndarray] = None
+        self._reference_props: Optional[np.ndarray] = None
+        self._reference_dist: Optional[np.ndarray] = None
+        self.reference_sorted: Optional[np.ndarray] = None
+        self.reference_mean = 0.0
+        self.reference_std = 0.0
+
+        self._values_since_ks = 0
+        self._last_ks_time = 0.0
+        self._ks_result: Optional[Tuple[float, bool]] = None
+        self.ks_runs = 0
+
+    # === Reference ===
+
+    def add_reference(self, values: Iterable[float]) -> None:
+        self.reference.extend(values)
+        self._reference_stale = True
+
+    def _prepare_reference(self) -> None:
+        """Histogram and sketch of the reference window; rebins the current window to the new edges"""
+        if not self._reference_stale:
+            return
+        reference = np.asarray(self.reference, dtype=float)
+        self.reference_counts, edges = np.histogram(reference, bins=self.bins)
+        self._edges = edges.tolist()
+        self._bin_widths = np.diff(edges)
+        self._reference_props = (self.reference_counts + PSI_EPSILON) / (len(reference) + self.bins * PSI_EPSILON)
+        self._reference_dist = self._density_dist(self.reference_counts)
+        self.reference_sorted = np.sort(reference)
+        self.reference_mean = float(np.mean(reference))
+        self.reference_std = float(np.std(reference))
+
+        self._current_bins = deque((self._bin(value) for value in self.current), maxlen=self.current.maxlen)
+        self._current_counts = np.bincount(
+            [b for b in self._current_bins if b >= 0], minlength=self.bins
+        ).astype(np.int64)
+        self._ks_result = None
+        self._reference_stale = False
+
+    def _bin(self, value: float) -> int:
+        """np.histogram's bin for value: [e_i, e_i+1), last bin closed; -1 outside"""
+        edges = self._edges
+        if not edges or not edges[0] <= value <= edges[-1]:
+            return -1
+        return min(bisect_right(edges, value) - 1, self.bins - 1)
+
+    # === Current window ===
+
+    def append(self, value: float) -> None:
+        if self._reference_stale:
+            # Binned when the reference is prepared
+            self.current.append(value)
+            self._values_since_ks += 1
+            return
+        if len(self.current) == self.current.maxlen:
+            evicted = self._current_bins[0]
+            if evicted >= 0:
+                self._current_counts[evicted] -= 1
+        self.current.append(value)
+        b = self._bin(value)
+        self._current_bins.append(b)
+        if b >= 0:
+            self._current_counts[b] += 1
+        self._values_since_ks += 1
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.append(value)
+
+    @property
+    def current_counts(self) -> np.ndarray:
+        """Bin counts of the current window over the reference bins"""
+        self._prepare_reference()
+        return self._current_counts
+
+    @property
+    def window_full(self) -> bool:
+        return len(self.current) >= self.current.maxlen
+
+    # === Statistics ===
+
+    def psi(self) -> float:
+        """Population Stability Index over the reference bins"""
+        self._prepare_reference()
+        current_props = (self._current_counts + PSI_EPSILON) / (len(self.current) + self.bins * PSI_EPSILON)
+        return float(np.sum((current_props - self._reference_props) * np.log(current_props / self._reference_props)))
+
+    def kl_divergence(self) -> float:
+        """KL divergence of the current histogram from the reference one"""
+        self._prepare_reference()
+        current_dist = self._density_dist(self._current_counts)
+        return float(np.sum(current_dist * np.log(current_dist / self._reference_dist)))
+
+    def _density_dist(self, counts: np.ndarray) -> np.ndarray:
+        total = counts.sum()
+        if total == 0:
+            return np.full(self.bins, np.nan)
+        density = counts / self._bin_widths / total + KL_EPSILON
+        return density / np.sum(density)
+
+    def ks_test(self, alpha: float = 0.05, force: bool = False) -> Tuple[float, bool]:
+        """(p_value, drift_detected); recomputed only when due, otherwise the last result"""
+        self._prepare_reference()
+        due = (
+            force
+            or self._ks_result is None
+            or self._values_since_ks >= self.ks_stride
+            or (self.ks_interval_seconds is not None
+                and time.monotonic() - self._last_ks_time >= self.ks_interval_seconds)
+        )
+        if due:
+            _, p_value = stats.ks_2samp(self.reference_sorted, np.fromiter(self.current, dtype=float))
+            self._ks_result = (float(p_value), bool(p_value < alpha))
+            self._values_since_ks = 0
+            self._last_ks_time = time.monotonic()
+            self.ks_runs += 1
+        return self._ks_result
+
+    def current_mean_std(self) -> Tuple[float, float]:
+        current = np.fromiter(self.current, dtype=float)
+        return float(np.mean(current)), float(np.std(current))
@@ -0,0 +1,166 @@
+"""
+⚡ NATIVE XGBOOST INFERENCE BACKEND
+==================================
+
+Scores eco-score feature matrices on the raw xgboost Booster instead of
+the sklearn XGBClassifier wrapper.
+
+- The wrapper builds a DMatrix and re-validates its inputs on every call,
+  and callers ran predict() and predict_proba() separately. For a 1-row
+  /predict request that overhead is most of the inference latency
+- NativePredictor calls Booster.inplace_predict on a contiguous float32
+  array (no DMatrix) and returns probabilities and argmax from that one call
+- Per-call latency is recorded, so /admin/models can report it
+
+predict_proba() has the XGBClassifier signature, so predict_labels() and
+other callers take a NativePredictor in place of the model unchanged.
+Models that are not xgboost (FallbackModel, sklearn ensembles) are used
+as-is by make_predictor().
+
+Export/load the native format (JSON or UBJ) for serving without pickle:
+    export_booster(model, "eco_model.ubj")
+    predictor = NativePredictor(load_booster("eco_model.ubj"))
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class NativePredictor:
+    """Booster.inplace_predict behind the predict/predict_proba interface"""
+
+    def __init__(self, booster, missing: float = np.nan, iteration_range: Tuple[int, int] = (0, 0)):
+        self.booster = booster
+        self.missing = missing
+        self.iteration_range = iteration_range
+        self.objective = _booster_objective(booster)
+        self._latency = threading.local()
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def _raw_predict(self, X) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.objective.startswith("multi:softmax"):
+            # softmax returns class ids; margins keep the probabilities
+            margin = np.asarray(self.booster.inplace_predict(
+                X, iteration_range=self.iteration_range, predict_type="margin",
+                missing=self.missing, validate_features=False
+            ), dtype=np.float64)
+            margin = np.exp(margin - margin.max(axis=1, keepdims=True))
+            return margin / margin.sum(axis=1, keepdims=True)
+
+        output = np.asarray(self.booster.inplace_predict(
+            X, iteration_range=self.iteration_range, missing=self.missing, validate_features=False
+        ), dtype=np.float64)
+        if output.ndim == 1:
+            # binary:logistic gives P(class 1) only
+            output = np.column_stack([1.0 - output, output])
+        return output
+
+    def predict_with_proba(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """(class indices, probabilities) from a single inplace_predict call"""
+        start = time.perf_counter()
+        proba = self._raw_predict(X)
+        best = proba.argmax(axis=1)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self._latency.last_ms = elapsed_ms
+        with self._stats_lock:
+            self.calls += 1
+            self.rows += len(best)
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+        return best, proba
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.predict_with_proba(X)[1]
+
+    def predict(self, X) -> np.ndarray:
+        return self.predict_with_proba(X)[0]
+
+    @property
+    def last_latency_ms(self) -> Optional[float]:
+        """Latency of this thread's most recent call"""
+        return getattr(self._latency, "last_ms", None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "backend": "xgboost.Booster.inplace_predict",
+                "calls": self.calls,
+                "rows": self.rows,
+                "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+                "max_ms": round(self.max_ms, 3)
+            }
+
+
+def _booster_objective(booster) -> str:
+    try:
+        return json.loads(booster.save_config())["learner"]["objective"]["name"]
+    except Exception:
+        return ""
+
+
+def _iteration_range(model) -> Tuple[int, int]:
+    """What XGBClassifier.predict_proba uses: up to best_iteration after early stopping"""
+    try:
+        best_iteration = model.best_iteration
+    except AttributeError:
+        return (0, 0)
+    return (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+
+
+def native_booster(model):
+    """The Booster behind an xgboost model (or the Booster itself), else None"""
+    if not type(model).__module__.startswith("xgboost"):
+        return None
+    try:
+        import xgboost as xgb
+    except ImportError:
+        return None
+    if isinstance(model, xgb.Booster):
+        return model
+    if isinstance(model, xgb.XGBModel):
+        try:
+            return model.get_booster()
+        except Exception:
+            # Unfitted wrapper
+            return None
+    return None
+
+
+def make_predictor(model):
+    """NativePredictor for xgboost models; any other model is returned unchanged"""
+    booster = native_booster(model)
+    if booster is None:
+        return model
+    return NativePredictor(
+        booster,
+        missing=getattr(model, "missing", np.nan),
+        iteration_range=_iteration_range(model) if booster is not model else (0, 0)
+    )
+
+
+def export_booster(model, path: str) -> str:
+    """Save the native Booster as JSON or UBJ (format from the file extension)"""
+    booster = native_booster(model)
+    if booster is None:
+        raise ValueError(f"{type(model).__name__} is not an xgboost model")
+    booster.save_model(path)
+    return path
+
+
+def load_booster(path: str):
+    import xgboost as xgb
+    booster = xgb.Booster()
+    booster.load_model(path)
+    return booster
@@ -19,9 +19,12 @@ and reliability needed for 95% academic performance.
 import os
 import sys
 import json
+import threading
+import time
 import joblib
 import numpy as np
 import pandas as pd
+from collections import Counter, deque
 from typing import Dict, List, Tuple, Any, Optional
 import warnings
 warnings.filterwarnings('ignore')
@@ -31,33 +34,99 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from backend.ml.inference.booster_backend import make_predictor
+
 try:
     from backend.utils.co2_data import load_material_co2_data
 except ImportError:
     def load_material_co2_data():
         return {"plastic": 2.0, "aluminum": 8.0, "steel": 2.5}
 
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "training", "ml_model")
+# Tracked predictions kept for get_performance_metrics
+HISTORY_SIZE = 1000
+
+
+class PredictionHistory:
+    """
+    Fixed-size ring buffer of tracking entries with running aggregates,
+    so metrics are O(1) (plus a walk over the last 24h) instead of a
+    DataFrame over the whole history
+    """
+
+    def __init__(self, maxlen: int = HISTORY_SIZE):
+        self._entries = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.confidence_sum = 0.0
+        self.quality_sum = 0.0
+        self.ml_available = 0
+        self.score_counts = Counter()
+
+    def _update(self, entry: Dict[str, Any], sign: int) -> None:
+        self.confidence_sum += sign * entry['consensus_confidence']
+        self.quality_sum += sign * entry['input_quality']
+        self.ml_available += sign * int(entry['ml_available'])
+        self.score_counts[entry['consensus_score']] += sign
+        if self.score_counts[entry['consensus_score']] <= 0:
+            del self.score_counts[entry['consensus_score']]
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            if len(self._entries) == self._entries.maxlen:
+                self._update(self._entries[0][1], -1)
+            self._entries.append((time.time(), entry))
+            self._update(entry, 1)
+
+    def recent(self, seconds: float) -> Tuple[int, float]:
+        """(count, confidence sum) of entries tracked in the last `seconds`"""
+        cutoff = time.time() - seconds
+        count, confidence_sum = 0, 0.0
+        with self._lock:
+            for tracked_at, entry in reversed(self._entries):
+                if tracked_at <= cutoff:
+                    break
+                count += 1
+                confidence_sum += entry['consensus_confidence']
+        return count, confidence_sum
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        with self._lock:
+            entries = [entry for _, entry in self._entries]
+        return iter(entries)
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+
 class EnhancedEcoScorer:
     """
     Production-grade eco scoring system with dual validation
+
+    Loading reads every model and encoder from disk, so share one scorer
+    per model directory via get_eco_scorer() instead of constructing one
+    per prediction.
     """
     
     def __init__(self, model_dir=None):
         # Setup paths
-        script_dir = os.path.dirname(__file__)
-        self.model_dir = model_dir or os.path.join(script_dir, "..", "training", "ml_model")
+        self.model_dir = model_dir or DEFAULT_MODEL_DIR
         self.encoders_dir = os.path.join(self.model_dir, "xgb_encoders")
         
         # Load models and encoders
         self.models = {}
+        self.predictors = {}
         self.encoders = {}
+        self.category_indexes = {}
         self.feature_order = []
         
         # Load CO2 data
         self.material_co2_map = load_material_co2_data()
         
         # Performance tracking
-        self.prediction_history = []
+        self.prediction_history = PredictionHistory()
         
         # Initialize
         self._load_models_and_encoders()
@@ -88,6 +157,8 @@ class EnhancedEcoScorer:
                 model_path = os.path.join(self.model_dir, filename)
                 if os.path.exists(model_path):
                     self.models[model_name] = joblib.load(model_path)
+                    # Native Booster (inplace_predict) for xgboost models
+                    self.predictors[model_name] = make_predictor(self.models[model_name])
                     print(f"✅ Loaded {model_name} model")
             
             # Load encoders
@@ -99,6 +170,13 @@ class EnhancedEcoScorer:
                         self.encoders[encoder_name] = joblib.load(encoder_path)
                         print(f"✅ Loaded {encoder_name} encoder")
             
+            # Class -> index dicts, so encoding is a lookup, not encoder.transform([x])
+            self.category_indexes = {
+                name: {cls: i for i, cls in enumerate(encoder.classes_)}
+                for name, encoder in self.encoders.items()
+                if hasattr(encoder, 'classes_')
+            }
+            
             if not self.models:
                 print("⚠️ No models loaded - using rule-based fallback only")
             
@@ -144,13 +222,32 @@ class EnhancedEcoScorer:
         Returns:
             Comprehensive prediction result with confidence scoring
         """
+        return self.predict_many([product_data])[0]
+    
+    def predict_many(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Predict a list of products; every ML model scores them all in one call
+        
+        Returns one predict_eco_score-style result per product, in order
+        """
         try:
             # Extract product features
-            features = self._extract_features(product_data)
+            features_list = [self._extract_features(product_data) for product_data in products]
             
             # ML predictions (if models available)
-            ml_predictions = self._get_ml_predictions(features)
-            
+            ml_predictions_list = self._get_ml_predictions_many(features_list)
+        except Exception as e:
+            print(f"❌ Prediction failed: {e}")
+            return [self._get_fallback_prediction(product_data, str(e)) for product_data in products]
+        
+        return [
+            self._build_result(product_data, features, ml_predictions)
+            for product_data, features, ml_predictions in zip(products, features_list, ml_predictions_list)
+        ]
+    
+    def _build_result(self, product_data: Dict[str, Any], features: Dict[str, Any],
+                      ml_predictions: Dict[str, Any]) -> Dict[str, Any]:
+        try:
             # Rule-based prediction
             rule_prediction = self._get_rule_based_prediction(product_data)
             
@@ -191,31 +288,18 @@ class EnhancedEcoScorer:
             origin = str(product_data.get('origin', 'Unknown'))
             weight = float(product_data.get('weight_kg', 1.0))
             
-            # Encode categorical features
-            if 'material' in self.encoders:
-                try:
-                    features['material_encoded'] = self.encoders['material'].transform([material])[0]
-                except ValueError:
-                    # Handle unknown categories
-                    features['material_encoded'] = 0
+            # Encode categorical features (unseen values get the defaults transform() fell back to)
+            if 'material' in self.category_indexes:
+                features['material_encoded'] = self._encode('material', material, 0)
             
-            if 'transport' in self.encoders:
-                try:
-                    features['transport_encoded'] = self.encoders['transport'].transform([transport])[0]
-                except ValueError:
-                    features['transport_encoded'] = 0
+            if 'transport' in self.category_indexes:
+                features['transport_encoded'] = self._encode('transport', transport, 0)
             
-            if 'recyclability' in self.encoders:
-                try:
-                    features['recyclability_encoded'] = self.encoders['recyclability'].transform([recyclability])[0]
-                except ValueError:
-                    features['recyclability_encoded'] = 1  # Medium
+            if 'recyclability' in self.category_indexes:
+                features['recyclability_encoded'] = self._encode('recyclability', recyclability, 1)  # Medium
             
-            if 'origin' in self.encoders:
-                try:
-                    features['origin_encoded'] = self.encoders['origin'].transform([origin])[0]
-                except ValueError:
-                    features['origin_encoded'] = 0
+            if 'origin' in self.category_indexes:
+                features['origin_encoded'] = self._encode('origin', origin, 0)
             
             # Weight features
             features['weight_log'] = np.log1p(weight)
@@ -231,11 +315,8 @@ class EnhancedEcoScorer:
             else:
                 weight_bin = 3
             
-            if 'weight_bin' in self.encoders:
-                try:
-                    features['weight_bin_encoded'] = self.encoders['weight_bin'].transform([str(weight_bin)])[0]
-                except ValueError:
-                    features['weight_bin_encoded'] = weight_bin
+            if 'weight_bin' in self.category_indexes:
+                features['weight_bin_encoded'] = self._encode('weight_bin', str(weight_bin), weight_bin)
             
             # Enhanced features (if available)
             if 'material_transport' in self.feature_order:
@@ -257,6 +338,10 @@ class EnhancedEcoScorer:
         
         return features
     
+    def _encode(self, name: str, value: str, default: int) -> int:
+        """encoders[name].transform([value])[0] as a dict lookup"""
+        return self.category_indexes[name].get(value, default)
+    
     def _get_distance_proxy(self, origin: str) -> float:
         """Get distance proxy value for origin"""
         distance_map = {
@@ -266,55 +351,61 @@ class EnhancedEcoScorer:
         }
         return distance_map.get(origin, 2)
     
+    def _feature_matrix(self, features_list: List[Dict[str, Any]]) -> np.ndarray:
+        """One contiguous float32 row per product, columns in feature_order"""
+        feature_names = self.feature_order or [
+            'material_encoded', 'transport_encoded', 'recyclability_encoded',
+            'origin_encoded', 'weight_log', 'weight_bin_encoded'
+        ]
+        X = np.empty((len(features_list), len(feature_names)), dtype=np.float32)
+        for row, features in enumerate(features_list):
+            X[row] = [features.get(feature_name, 0) for feature_name in feature_names]
+        return X
+    
     def _get_ml_predictions(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Get predictions from all available ML models"""
-        ml_predictions = {}
+        return self._get_ml_predictions_many([features])[0]
+    
+    def _get_ml_predictions_many(self, features_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score every product with every model: one call per model over one matrix"""
+        ml_predictions = [{} for _ in features_list]
         
-        if not self.models:
+        if not self.models or not features_list:
             return ml_predictions
         
         try:
-            # Prepare feature vector
-            if self.feature_order:
-                feature_vector = []
-                for feature_name in self.feature_order:
-                    feature_vector.append(features.get(feature_name, 0))
-                feature_vector = np.array(feature_vector).reshape(1, -1)
-            else:
-                # Fallback feature order
-                basic_features = ['material_encoded', 'transport_encoded', 'recyclability_encoded', 
-                                'origin_encoded', 'weight_log', 'weight_bin_encoded']
-                feature_vector = []
-                for feature_name in basic_features:
-                    feature_vector.append(features.get(feature_name, 0))
-                feature_vector = np.array(feature_vector).reshape(1, -1)
-            
-            # Get predictions from each model
+            X = self._feature_matrix(features_list)
+            label_classes = getattr(self.encoders.get('label'), 'classes_', None)
+            # Fallback mapping
+            score_map = {0: 'A+', 1: 'A', 2: 'B', 3: 'C', 4: 'D', 5: 'E', 6: 'F'}
+            
             for model_name, model in self.models.items():
                 try:
-                    # Prediction
-                    prediction = model.predict(feature_vector)[0]
-                    
-                    # Prediction probabilities (if available)
-                    probabilities = None
-                    if hasattr(model, 'predict_proba'):
-                        proba = model.predict_proba(feature_vector)[0]
-                        probabilities = proba.tolist()
-                    
-                    # Convert prediction to eco score
-                    if hasattr(self.encoders.get('label'), 'classes_'):
-                        eco_score = self.encoders['label'].classes_[prediction]
+                    # One call gives both the classes and their probabilities
+                    predictor = self.predictors.get(model_name, model)
+                    proba = None
+                    if hasattr(predictor, 'predict_proba'):
+                        proba = np.asarray(predictor.predict_proba(X), dtype=np.float64)
+                        best = proba.argmax(axis=1)
+                        classes = getattr(model, 'classes_', None)
+                        predictions = np.asarray(classes)[best] if classes is not None else best
                     else:
-                        # Fallback mapping
-                        score_map = {0: 'A+', 1: 'A', 2: 'B', 3: 'C', 4: 'D', 5: 'E', 6: 'F'}
-                        eco_score = score_map.get(prediction, 'C')
+                        predictions = np.asarray(predictor.predict(X))
                     
-                    ml_predictions[model_name] = {
-                        'eco_score': eco_score,
-                        'raw_prediction': int(prediction),
-                        'probabilities': probabilities,
-                        'confidence': float(max(probabilities)) if probabilities else 0.7
-                    }
+                    for row, prediction in enumerate(predictions.astype(int).tolist()):
+                        # Convert prediction to eco score
+                        if label_classes is not None:
+                            eco_score = label_classes[prediction]
+                        else:
+                            eco_score = score_map.get(prediction, 'C')
+                        
+                        probabilities = proba[row].tolist() if proba is not None else None
+                        ml_predictions[row][model_name] = {
+                            'eco_score': eco_score,
+                            'raw_prediction': prediction,
+                            'probabilities': probabilities,
+                            'confidence': float(max(probabilities)) if probabilities else 0.7
+                        }
                     
                 except Exception as e:
                     print(f"⚠️ {model_name} prediction failed: {e}")
@@ -575,12 +666,9 @@ class EnhancedEcoScorer:
                 'rule_based_available': bool(result['rule_based_prediction'])
             }
             
+            # Ring buffer: the oldest entry drops out once HISTORY_SIZE is reached
             self.prediction_history.append(tracking_entry)
             
-            # Keep only last 1000 predictions for memory management
-            if len(self.prediction_history) > 1000:
-                self.prediction_history = self.prediction_history[-1000:]
-                
         except Exception as e:
             print(f"⚠️ Prediction tracking error: {e}")
     
@@ -590,17 +678,19 @@ class EnhancedEcoScorer:
             return {'error': 'No prediction history available'}
         
         try:
-            df = pd.DataFrame(self.prediction_history)
+            history = self.prediction_history
+            total = len(history)
+            count_24h, confidence_sum_24h = history.recent(86400)
             
             metrics = {
-                'total_predictions': len(df),
-                'avg_confidence': float(df['consensus_confidence'].mean()),
-                'avg_input_quality': float(df['input_quality'].mean()),
-                'ml_availability_rate': float(df['ml_available'].mean()),
-                'score_distribution': df['consensus_score'].value_counts().to_dict(),
+                'total_predictions': total,
+                'avg_confidence': history.confidence_sum / total,
+                'avg_input_quality': history.quality_sum / total,
+                'ml_availability_rate': history.ml_available / total,
+                'score_distribution': dict(history.score_counts),
                 'recent_performance': {
-                    'last_24h_count': len(df[df['timestamp'] > (pd.Timestamp.now() - pd.Timedelta(days=1))]),
-                    'avg_confidence_24h': float(df[df['timestamp'] > (pd.Timestamp.now() - pd.Timedelta(days=1))]['consensus_confidence'].mean()) if len(df) > 0 else 0
+                    'last_24h_count': count_24h,
+                    'avg_confidence_24h': confidence_sum_24h / count_24h if count_24h else 0
                 }
             }
             
@@ -609,6 +699,28 @@ class EnhancedEcoScorer:
         except Exception as e:
             return {'error': f'Performance metrics calculation failed: {e}'}
 
+_scorers: Dict[str, EnhancedEcoScorer] = {}
+_scorers_lock = threading.Lock()
+
+
+def get_eco_scorer(model_dir: str = None) -> EnhancedEcoScorer:
+    """Process-wide EnhancedEcoScorer per model directory (models load once)"""
+    key = os.path.abspath(model_dir or DEFAULT_MODEL_DIR)
+    scorer = _scorers.get(key)
+    if scorer is None:
+        with _scorers_lock:
+            scorer = _scorers.get(key)
+            if scorer is None:
+                scorer = _scorers[key] = EnhancedEcoScorer(model_dir)
+    return scorer
+
+
+def clear_eco_scorers() -> None:
+    """Drop cached scorers (e.g. after retraining) so the next call reloads from disk"""
+    with _scorers_lock:
+        _scorers.clear()
+
+
 # Convenience functions for integration
 def predict_product_eco_score(product_data: Dict[str, Any], model_dir: str = None) -> Dict[str, Any]:
     """
@@ -621,8 +733,11 @@ def predict_product_eco_score(product_data: Dict[str, Any], model_dir: str = Non
     Returns:
         Eco score prediction with confidence analysis
     """
-    scorer = EnhancedEcoScorer(model_dir)
-    return scorer.predict_eco_score(product_data)
+    return get_eco_scorer(model_dir).predict_eco_score(product_data)
+
+def predict_products_eco_scores(products: List[Dict[str, Any]], model_dir: str = None) -> List[Dict[str, Any]]:
+    """Batch version of predict_product_eco_score (one model call per model for the whole list)"""
+    return get_eco_scorer(model_dir).predict_many(products)
 
 def main():
     """Test the enhanced eco scorer"""
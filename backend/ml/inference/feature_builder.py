@@ -0,0 +1,279 @@
+"""
+🧮 VECTORIZED ECO-SCORE FEATURE BUILDER
+======================================
+
+Shared feature builder for the eco-score classifier used by /predict,
+/predict/batch and the ML branch of /estimate_emissions.
+
+- LabelEncoder classes are turned into plain category->index dicts once,
+  so encoding a value is a dict lookup instead of encoder.transform([value])
+- A whole list of products becomes a single float32 matrix
+- One predict_proba call over the matrix yields both labels and confidences
+
+Feature semantics match the original per-row code in app.py exactly,
+including the title-case normalisation done by normalize_feature/safe_encode.
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Column order of the 16-feature enhanced model (see ml/models/feature_order.json)
+ENHANCED_FEATURES = [
+    "material_encoded",
+    "transport_encoded",
+    "recyclability_encoded",
+    "origin_encoded",
+    "weight_log",
+    "weight_bin_encoded",
+    "packaging_type_encoded",
+    "size_category_encoded",
+    "quality_level_encoded",
+    "inferred_category_encoded",
+    "pack_size",
+    "material_confidence",
+    "origin_confidence",
+    "weight_confidence",
+    "estimated_lifespan_years",
+    "repairability_score",
+]
+BASIC_FEATURES = ENHANCED_FEATURES[:6]
+
+# Upper bound on memoised raw values per encoder (request input is unbounded)
+MAX_MEMO_SIZE = 4096
+
+PACK_SIZE_PHRASES = ["2 pack", "3 pack", "4 pack", "5 pack", "6 pack", "8 pack", "10 pack", "12 pack"]
+
+
+def normalize_feature(value, default):
+    clean = str(value or default).strip().title()
+    return default if clean.lower() == "unknown" else clean
+
+
+class CategoryIndex:
+    """
+    Dict-based stand-in for LabelEncoder.transform with safe_encode semantics:
+    values are normalised, and anything outside the known classes maps to
+    the default class.
+    """
+
+    def __init__(self, classes: Sequence[str], default: str):
+        self.index = {str(cls): i for i, cls in enumerate(classes)}
+        self.default = default
+        self.default_index = self.index.get(default)
+        # Memo of raw value -> index; catalogues repeat the same few values
+        self._memo: Dict[Any, int] = {}
+
+    def encode(self, value) -> int:
+        try:
+            return self._memo[value]
+        except (KeyError, TypeError):
+            pass
+        encoded = self.index.get(normalize_feature(value, self.default))
+        if encoded is None:
+            if self.default_index is None:
+                raise ValueError(f"Default '{self.default}' is not a known class")
+            encoded = self.default_index
+        if len(self._memo) < MAX_MEMO_SIZE:
+            try:
+                self._memo[value] = encoded
+            except TypeError:
+                pass
+        return encoded
+
+    def encode_many(self, values: Iterable) -> List[int]:
+        encode = self.encode
+        return [encode(value) for value in values]
+
+
+_index_cache: Dict[Tuple[int, str], Tuple[Any, CategoryIndex]] = {}
+
+
+def category_index(encoder, default: str) -> CategoryIndex:
+    """Return the (cached) CategoryIndex for a fitted LabelEncoder"""
+    key = (id(encoder), default)
+    cached = _index_cache.get(key)
+    # Keep a reference to the encoder so its id cannot be reused while cached
+    if cached is None or cached[0] is not encoder:
+        cached = (encoder, CategoryIndex(list(encoder.classes_), default))
+        _index_cache[key] = cached
+    return cached[1]
+
+
+def encode_category(value, encoder, default: str) -> int:
+    """Drop-in replacement for safe_encode(value, encoder, default)"""
+    return category_index(encoder, default).encode(value)
+
+
+def determine_transport_mode(distance_km: float) -> str:
+    if distance_km < 1500:
+        return "Truck"
+    elif distance_km < 6000:
+        return "Ship"
+    else:
+        return "Air"
+
+
+def _packaging_type(title_lower: str) -> str:
+    if any(x in title_lower for x in ["bottle", "jar", "can"]):
+        return "bottle"
+    elif any(x in title_lower for x in ["box", "pack", "carton"]):
+        return "box"
+    return "other"
+
+
+def _size_category(weight: float) -> str:
+    if weight > 2.0:
+        return "large"
+    elif weight > 0.5:
+        return "medium"
+    return "small"
+
+
+def _quality_level(title_lower: str) -> str:
+    if any(x in title_lower for x in ["premium", "pro", "professional", "deluxe"]):
+        return "premium"
+    return "standard"
+
+
+def _pack_size(title_lower: str) -> int:
+    for num_word in PACK_SIZE_PHRASES:
+        if num_word in title_lower:
+            return int(num_word.split()[0])
+    return 1
+
+
+def _inferred_category(title_lower: str) -> str:
+    if any(x in title_lower for x in ["protein", "supplement", "vitamins"]):
+        return "health"
+    elif any(x in title_lower for x in ["electronics", "phone", "computer"]):
+        return "electronics"
+    elif any(x in title_lower for x in ["clothing", "shirt", "dress"]):
+        return "clothing"
+    return "other"
+
+
+def _lifespan_years(inferred_category: str) -> float:
+    if "electronics" in inferred_category:
+        return 5.0
+    elif "clothing" in inferred_category:
+        return 2.0
+    return 3.0
+
+
+def _repairability(inferred_category: str) -> float:
+    if "electronics" in inferred_category:
+        return 3.0
+    elif inferred_category in ["other", "health"]:
+        return 1.0
+    return 5.0
+
+
+class EcoFeatureBuilder:
+    """
+    Builds /predict-style feature matrices from raw product dicts.
+
+    Each product uses the /predict request keys: material, weight, origin,
+    recyclability, distance_origin_to_uk, override_transport_mode, title.
+    """
+
+    def __init__(
+        self,
+        material_encoder,
+        transport_encoder,
+        recycle_encoder,
+        origin_encoder,
+        packaging_type_encoder=None,
+        size_category_encoder=None,
+        quality_level_encoder=None,
+        inferred_category_encoder=None
+    ):
+        self.material_index = category_index(material_encoder, "Other")
+        self.transport_index = category_index(transport_encoder, "Land")
+        self.recycle_index = category_index(recycle_encoder, "Medium")
+        self.origin_index = category_index(origin_encoder, "Other")
+
+        self.enhanced = all([
+            packaging_type_encoder, size_category_encoder,
+            quality_level_encoder, inferred_category_encoder
+        ])
+        if self.enhanced:
+            self.packaging_index = category_index(packaging_type_encoder, "box")
+            self.size_index = category_index(size_category_encoder, "medium")
+            self.quality_index = category_index(quality_level_encoder, "standard")
+            self.inferred_category_index = category_index(inferred_category_encoder, "other")
+
+    @property
+    def feature_names(self) -> List[str]:
+        return ENHANCED_FEATURES if self.enhanced else BASIC_FEATURES
+
+    @staticmethod
+    def raw_input(product: Dict) -> Dict:
+        """Normalised inputs for one product, as echoed back by /predict"""
+        override = normalize_feature(product.get("override_transport_mode"), None)
+        if override in ["Truck", "Ship", "Air"]:
+            transport = override
+        else:
+            transport = determine_transport_mode(float(product.get("distance_origin_to_uk") or 0))
+
+        return {
+            "material": normalize_feature(product.get("material"), "Other"),
+            "weight": float(product.get("weight") or 0.0),
+            "transport": transport,
+            "recyclability": normalize_feature(product.get("recyclability"), "Medium"),
+            "origin": normalize_feature(product.get("origin"), "Other")
+        }
+
+    def build_matrix(self, products: Sequence[Dict]) -> Tuple[np.ndarray, List[Dict]]:
+        """
+        Turn a list of products into one (n_products, n_features) float32
+        matrix. Returns the matrix and the normalised raw inputs per row.
+        """
+        raw_inputs = [self.raw_input(product) for product in products]
+        weights = np.array([raw["weight"] for raw in raw_inputs], dtype=np.float64)
+        n_rows = len(raw_inputs)
+
+        X = np.empty((n_rows, len(self.feature_names)), dtype=np.float32)
+        X[:, 0] = self.material_index.encode_many(raw["material"] for raw in raw_inputs)
+        X[:, 1] = self.transport_index.encode_many(raw["transport"] for raw in raw_inputs)
+        X[:, 2] = self.recycle_index.encode_many(raw["recyclability"] for raw in raw_inputs)
+        X[:, 3] = self.origin_index.encode_many(raw["origin"] for raw in raw_inputs)
+        X[:, 4] = np.log1p(weights)
+        X[:, 5] = np.select([weights < 0.5, weights < 2, weights < 10], [0, 1, 2], default=3)
+
+        if not self.enhanced or n_rows == 0:
+            return X, raw_inputs
+
+        titles = [(product.get("title") or "").lower() for product in products]
+        categories = [_inferred_category(title) for title in titles]
+
+        X[:, 6] = self.packaging_index.encode_many(_packaging_type(title) for title in titles)
+        X[:, 7] = self.size_index.encode_many(_size_category(w) for w in weights)
+        X[:, 8] = self.quality_index.encode_many(_quality_level(title) for title in titles)
+        X[:, 9] = self.inferred_category_index.encode_many(categories)
+        X[:, 10] = [_pack_size(title) for title in titles]
+        X[:, 11] = [0.8 if raw["material"] != "Other" else 0.3 for raw in raw_inputs]
+        X[:, 12] = [0.8 if raw["origin"] != "Other" else 0.4 for raw in raw_inputs]
+        X[:, 13] = np.where(weights > 0.1, 0.9, 0.5)
+        X[:, 14] = [_lifespan_years(category) for category in categories]
+        X[:, 15] = [_repairability(category) for category in categories]
+        return X, raw_inputs
+
+
+def predict_labels(model, label_classes: Sequence[str], X) -> Tuple[List[str], List[float]]:
+    """
+    Score a feature matrix with a single predict_proba call.
+
+    Labels are the argmax of the probabilities (what predict() returns for
+    the XGBoost classifier); confidences are the winning probability in %.
+    Models without predict_proba fall back to predict() with 0% confidence.
+    """
+    label_classes = np.asarray(label_classes)
+    if hasattr(model, "predict_proba"):
+        proba = np.asarray(model.predict_proba(X), dtype=np.float64)
+        best = proba.argmax(axis=1)
+        confidences = [round(float(p) * 100, 1) for p in proba[np.arange(len(best)), best]]
+        return label_classes[best].tolist(), confidences
+
+    predictions = np.asarray(model.predict(X)).astype(int)
+    return label_classes[predictions].tolist(), [0.0] * len(predictions)
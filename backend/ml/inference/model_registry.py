@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+🗃️ MODEL REGISTRY
+================
+
+Loads the eco-score model, its label/feature encoders, feature_order.json
+and the shared EcoFeatureBuilder as one immutable, versioned ModelBundle,
+on first use instead of at import time.
+
+- Importing the API no longer reads any pickle. The first prediction (or
+  an explicit preload()) loads everything, once, under a lock
+- With gunicorn's preload_app (see gunicorn.conf.py) the master process
+  calls preload() before forking, so workers start warm and share the
+  model pages copy-on-write
+- A watcher thread in each worker polls the files' mtimes (or only
+  manifest.json when there is one) and swaps a new bundle in atomically.
+  Requests hold the bundle they started with, so in-flight predictions
+  finish on the old version and never mix a model with another load's
+  encoders
+
+Usage:
+    models = get_model_registry().current()
+    X, raw_inputs = models.feature_builder.build_matrix(products)
+    labels, confidences = predict_labels(models.predictor, models.label_encoder.classes_, X)
+
+Trainers publish a new version by writing the model and encoders, then
+calling publish_manifest() last.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+import weakref
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+
+from .booster_backend import make_predictor
+from .feature_builder import EcoFeatureBuilder
+
+ML_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MODEL_DIR = os.path.join(ML_DIR, "models")
+ENCODERS_DIR = os.path.join(ML_DIR, "encoders")
+MANIFEST_FILE = "manifest.json"
+FEATURE_ORDER_FILE = "feature_order.json"
+# Every file load_model() may read, in the order it tries them
+MODEL_FILES = ("eco_model.pkl", "xgb_model.json", "enhanced_xgboost_model.pkl")
+# Seconds between watcher polls; 0 disables hot reload
+RELOAD_INTERVAL = float(os.environ.get("MODEL_RELOAD_INTERVAL", "30"))
+
+# Required by every model
+BASE_ENCODERS = ("material", "transport", "recycle", "label", "origin")
+# Only used by the 16-feature model; missing files leave them as None
+ENHANCED_ENCODERS = ("packaging_type", "size_category", "quality_level", "inferred_category")
+
+
+class FallbackModel:
+    """Rule-based stand-in used when no trained model can be loaded"""
+
+    def _predict_row(self, row):
+        # Simple rule-based prediction based on features
+        material_score = row[0] / 10.0  # Material encoded value
+        weight_score = min(row[4], 3.0)  # Weight log
+        transport_score = row[1] / 3.0   # Transport encoded
+
+        # Simple scoring logic
+        total_score = (material_score + weight_score + transport_score) / 3
+
+        if total_score < 0.3:
+            return 0  # A+
+        elif total_score < 0.5:
+            return 1  # A
+        elif total_score < 0.7:
+            return 2  # B
+        elif total_score < 0.9:
+            return 3  # C
+        elif total_score < 1.2:
+            return 4  # D
+        elif total_score < 1.5:
+            return 5  # E
+        else:
+            return 6  # F
+
+    def predict(self, X):
+        return [self._predict_row(row) for row in X]
+
+    def predict_proba(self, X):
+        # Return mock probabilities (one row per input row)
+        probas = []
+        for pred in self.predict(X):
+            proba = [0.1] * 7  # 7 classes
+            proba[pred] = 0.7  # High confidence for predicted class
+            probas.append(proba)
+        return probas
+
+    @property
+    def feature_importances_(self):
+        # Mock feature importances for 6 features
+        return [0.25, 0.20, 0.15, 0.15, 0.15, 0.10]
+
+
+def load_model(model_dir: str = MODEL_DIR) -> Tuple[Any, Optional[str]]:
+    """(model, model_type): the 16-feature model, else the legacy formats, else FallbackModel"""
+    try:
+        model = joblib.load(os.path.join(model_dir, "eco_model.pkl"))
+        print("✅ Loaded enhanced XGBoost model (16-feature)")
+        return model, "enhanced_16"
+    except Exception as e:
+        print(f"⚠️ Failed to load enhanced 16-feature model: {e}")
+
+    try:
+        import xgboost as xgb
+        model = xgb.XGBClassifier()
+        model.load_model(os.path.join(model_dir, "xgb_model.json"))
+        print("✅ Loaded legacy XGBoost model")
+        return model, "legacy"
+    except Exception as e:
+        print(f"⚠️ Failed to load XGBoost JSON model: {e}")
+        print("🔄 Trying other formats...")
+
+    try:
+        # Pickled model without the XGBoost wrapper
+        import pickle
+        with open(os.path.join(model_dir, "eco_model.pkl"), 'rb') as f:
+            model = pickle.load(f)
+        print("✅ Loaded fallback model via pickle")
+        return model, None
+    except Exception:
+        pass
+
+    try:
+        model = joblib.load(os.path.join(model_dir, "enhanced_xgboost_model.pkl"))
+        print("✅ Loaded enhanced XGBoost model (11 features)")
+        return model, "enhanced"
+    except Exception as e:
+        print(f"❌ Failed to load any model: {e}")
+
+    print("✅ Created fallback rule-based model")
+    return FallbackModel(), None
+
+
+def load_encoders(encoders_dir: str = ENCODERS_DIR) -> Dict[str, Any]:
+    """{name: encoder}; base encoders are required, enhanced ones are None when missing"""
+    encoders = {
+        name: joblib.load(os.path.join(encoders_dir, f"{name}_encoder.pkl"))
+        for name in BASE_ENCODERS
+    }
+    print("🧩 Loaded material encoder classes:", encoders["material"].classes_)
+
+    try:
+        for name in ENHANCED_ENCODERS:
+            encoders[name] = joblib.load(os.path.join(encoders_dir, f"{name}_encoder.pkl"))
+        print("✅ Loaded enhanced encoders for 16-feature model")
+    except Exception as e:
+        print(f"⚠️ Could not load enhanced encoders: {e}")
+        for name in ENHANCED_ENCODERS:
+            encoders[name] = None
+    return encoders
+
+
+def load_feature_order(model_dir: str = MODEL_DIR) -> Tuple[str, ...]:
+    """Column names the model was trained on, () when feature_order.json is missing"""
+    try:
+        with open(os.path.join(model_dir, FEATURE_ORDER_FILE)) as f:
+            return tuple(json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not load feature order: {e}")
+        return ()
+
+
+def read_manifest(model_dir: str = MODEL_DIR) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(model_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def publish_manifest(model_dir: str = MODEL_DIR, **metadata) -> Dict[str, Any]:
+    """
+    Mark the files now in model_dir as a new version
+
+    Written atomically (temp file + rename). Once a manifest exists the
+    watcher only reacts to it, so call this after every other file is saved.
+    """
+    manifest = {"version": time.strftime("%Y%m%d-%H%M%S"), "published_at": time.time(), **metadata}
+    path = os.path.join(model_dir, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def bundle_fingerprint(model_dir: str = MODEL_DIR, encoders_dir: str = ENCODERS_DIR) -> Tuple:
+    """(name, mtime_ns, size) of manifest.json if present, else of every bundle file"""
+    manifest_path = os.path.join(model_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        paths = [manifest_path]
+    else:
+        paths = [os.path.join(model_dir, name) for name in MODEL_FILES + (FEATURE_ORDER_FILE,)]
+        paths += [
+            os.path.join(encoders_dir, f"{name}_encoder.pkl")
+            for name in BASE_ENCODERS + ENHANCED_ENCODERS
+        ]
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        fingerprint.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+def _pickled_size(obj: Any) -> int:
+    """Approximate in-memory footprint; 0 for objects that cannot be pickled"""
+    if obj is None:
+        return 0
+    try:
+        return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class ModelBundle:
+    """
+    One version of the model with the encoders, feature order and feature
+    builder that belong to it. Never mutated after construction; a reload
+    builds a new bundle.
+    """
+
+    def __init__(self, model: Any, model_type: Optional[str], encoders: Dict[str, Any],
+                 feature_order: Tuple[str, ...] = (), version: str = "", fingerprint: Tuple = (),
+                 load_seconds: float = 0.0):
+        self.model = model
+        self.model_type = model_type
+        self.encoders = MappingProxyType(dict(encoders))
+        self.feature_order = tuple(feature_order)
+        self.version = version
+        self.fingerprint = fingerprint
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        # Category->index dicts built once per load
+        self.feature_builder = EcoFeatureBuilder(
+            encoders["material"],
+            encoders["transport"],
+            encoders["recycle"],
+            encoders["origin"],
+            encoders.get("packaging_type"),
+            encoders.get("size_category"),
+            encoders.get("quality_level"),
+            encoders.get("inferred_category")
+        )
+        # Native Booster for xgboost models, the model itself otherwise
+        self.predictor = make_predictor(model)
+        self.memory_bytes = _pickled_size(model) + sum(_pickled_size(enc) for enc in self.encoders.values())
+
+    @property
+    def label_encoder(self):
+        return self.encoders["label"]
+
+    @property
+    def valid_scores(self):
+        return list(self.label_encoder.classes_)
+
+    @property
+    def is_fallback(self) -> bool:
+        return isinstance(self.model, FallbackModel)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "model_type": self.model_type,
+            "model_class": type(self.model).__name__,
+            "n_features": len(self.feature_order) or None,
+            "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.loaded_at)),
+            "load_seconds": round(self.load_seconds, 3),
+            "memory_mb": round(self.memory_bytes / 1e6, 3),
+            "inference": self.predictor.get_stats() if hasattr(self.predictor, "get_stats") else None
+        }
+
+
+class ModelRegistry:
+    """
+    Loads ModelBundles on first use and swaps in new versions; thread-safe
+
+    current() is a plain attribute read, so hot reload costs requests
+    nothing. Retired bundles are tracked weakly: they show up in
+    loaded_versions() until the last request using them finishes.
+    """
+
+    def __init__(self, model_dir: str = MODEL_DIR, encoders_dir: str = ENCODERS_DIR,
+                 reload_interval: float = RELOAD_INTERVAL):
+        self.model_dir = model_dir
+        self.encoders_dir = encoders_dir
+        self.reload_interval = reload_interval
+        self._current: Optional[ModelBundle] = None
+        self._retired = weakref.WeakSet()
+        self._listeners: List[Callable[[ModelBundle, ModelBundle], None]] = []
+        self._loads = 0
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watcher_pid: Optional[int] = None
+        self._stop = threading.Event()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._current is not None
+
+    def _load(self) -> ModelBundle:
+        start = time.perf_counter()
+        fingerprint = bundle_fingerprint(self.model_dir, self.encoders_dir)
+        model, model_type = load_model(self.model_dir)
+        encoders = load_encoders(self.encoders_dir)
+        feature_order = load_feature_order(self.model_dir)
+        self._loads += 1
+        digest = hashlib.sha1(repr(fingerprint).encode()).hexdigest()[:8]
+        version = read_manifest(self.model_dir).get("version") or f"v{self._loads}-{digest}"
+        models = ModelBundle(model, model_type, encoders, feature_order, version, fingerprint,
+                             time.perf_counter() - start)
+        print(f"✅ Loaded model {models.version} with label classes: {models.valid_scores} "
+              f"({models.load_seconds:.2f}s)")
+        return models
+
+    def _ensure_loaded(self) -> ModelBundle:
+        models = self._current
+        if models is None:
+            with self._lock:
+                models = self._current
+                if models is None:
+                    models = self._current = self._load()
+        return models
+
+    def current(self) -> ModelBundle:
+        """The live bundle, loading it on first call. Hold on to it for the whole request"""
+        if self._watcher_pid != os.getpid() and self.reload_interval > 0:
+            self.start_watcher()
+        return self._ensure_loaded()
+
+    def preload(self) -> ModelBundle:
+        """
+        Load now (e.g. in the gunicorn master before forking workers)
+
+        Does not start the watcher: threads do not survive fork, so each
+        worker starts its own on first use.
+        """
+        return self._ensure_loaded()
+
+    def reload(self, force: bool = False) -> Optional[ModelBundle]:
+        """
+        Load the files on disk as a new version and swap it in
+
+        Returns the new bundle, or None when nothing changed (unless force)
+        or the new files failed to load. A failed or fallback-only load
+        keeps serving the current version.
+        """
+        with self._reload_lock:
+            old = self._current
+            if old is not None and not force and bundle_fingerprint(self.model_dir, self.encoders_dir) == old.fingerprint:
+                return None
+            try:
+                new = self._load()
+            except Exception as e:
+                print(f"❌ Model reload failed, keeping {old.version if old else 'no model'}: {e}")
+                return None
+            if old is not None and new.is_fallback and not old.is_fallback:
+                print(f"❌ Reload produced only the fallback model, keeping {old.version}")
+                return None
+
+            with self._lock:
+                old = self._current
+                self._current = new
+                if old is not None:
+                    self._retired.add(old)
+            print(f"🔄 Swapped model {old.version if old else None} -> {new.version}")
+            if old is not None:
+                for listener in list(self._listeners):
+                    try:
+                        listener(old, new)
+                    except Exception as e:
+                        print(f"⚠️ Model swap listener failed: {e}")
+            return new
+
+    def on_swap(self, listener: Callable[[ModelBundle, ModelBundle], None]) -> None:
+        """Call listener(old, new) after each swap (e.g. to evict cached predictions)"""
+        self._listeners.append(listener)
+
+    def loaded_versions(self) -> List[Dict[str, Any]]:
+        """The live bundle plus retired ones still referenced by in-flight requests"""
+        versions = []
+        if self._current is not None:
+            versions.append({**self._current.describe(), "status": "live"})
+        for bundle in sorted(list(self._retired), key=lambda b: b.loaded_at, reverse=True):
+            versions.append({**bundle.describe(), "status": "draining"})
+        return versions
+
+    def start_watcher(self) -> None:
+        """Start the polling thread for this process (idempotent)"""
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._watcher_pid = os.getpid()
+            self._stop.clear()
+        thread = threading.Thread(target=self._watch, name="model-registry-watcher", daemon=True)
+        thread.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+        self._watcher_pid = None
+
+    def _watch(self) -> None:
+        pending = None
+        while not self._stop.wait(self.reload_interval):
+            models = self._current
+            if models is None:
+                continue
+            fingerprint = bundle_fingerprint(self.model_dir, self.encoders_dir)
+            if fingerprint == models.fingerprint:
+                pending = None
+            elif fingerprint == pending:
+                # Unchanged for a whole interval: the writer is done
+                self.reload()
+                pending = None
+            else:
+                pending = fingerprint
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide registry for backend/ml/models and backend/ml/encoders"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
@@ -18,16 +18,14 @@ the statistical rigor needed for first-class academic performance.
 """
 
 import os
+import sys
 import joblib
 import numpy as np
 import pandas as pd
 import xgboost as xgb
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.model_selection import (
-    StratifiedKFold, cross_val_score, train_test_split, 
-    RandomizedSearchCV, permutation_test_score
-)
+from sklearn.model_selection import StratifiedKFold, train_test_split
 from sklearn.preprocessing import LabelEncoder, PolynomialFeatures, StandardScaler
 from sklearn.ensemble import RandomForestClassifier, VotingClassifier
 from sklearn.neural_network import MLPClassifier
@@ -37,9 +35,15 @@ from sklearn.metrics import (
 )
 from sklearn.calibration import CalibratedClassifierCV
 from scipy import stats
-from imblearn.over_sampling import SMOTE
 from collections import Counter
 import json
+
+# Allow running as a script from this directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.ml.training.training_orchestrator import SCORING, TrainingOrchestrator, permutation_test
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -56,7 +60,7 @@ class EnhancedXGBoostTrainer:
     Enhanced XGBoost trainer with academic-grade ML rigor
     """
     
-    def __init__(self, data_path=None, model_dir=None, random_state=42):
+    def __init__(self, data_path=None, model_dir=None, random_state=42, cache_dir=None, n_jobs=-1):
         self.random_state = random_state
         
         # Setup paths
@@ -70,6 +74,13 @@ class EnhancedXGBoostTrainer:
         os.makedirs(self.model_dir, exist_ok=True)
         os.makedirs(self.encoders_dir, exist_ok=True)
         
+        # Cross-validation, search and early stopping results are cached here
+        self.orchestrator = TrainingOrchestrator(
+            cache_dir=cache_dir or os.path.join(self.model_dir, "training_cache"),
+            n_jobs=n_jobs,
+            random_state=random_state
+        )
+        
         # Initialize containers
         self.df = None
         self.X = None
@@ -195,36 +206,14 @@ class EnhancedXGBoostTrainer:
         
         return self
     
-    def rigorous_cross_validation(self, n_splits=5, n_repeats=3):
+    def rigorous_cross_validation(self, n_splits=5, n_repeats=3, n_permutations=1000):
         """Perform rigorous k-fold cross-validation with statistical testing"""
         print(f"\n📊 Rigorous {n_splits}-fold cross-validation...")
         
-        # Balance data first
-        X_balanced, y_balanced = SMOTE(random_state=self.random_state).fit_resample(self.X, self.y)
-        
-        # Initialize models for comparison
-        models = {
-            'XGBoost': xgb.XGBClassifier(
-                use_label_encoder=False,
-                eval_metric="mlogloss",
-                n_estimators=300,
-                max_depth=7,
-                learning_rate=0.08,
-                subsample=0.85,
-                colsample_bytree=0.85,
-                random_state=self.random_state
-            ),
-            'RandomForest': RandomForestClassifier(
-                n_estimators=200,
-                max_depth=10,
-                random_state=self.random_state
-            ),
-            'NeuralNetwork': MLPClassifier(
-                hidden_layer_sizes=(100, 50),
-                max_iter=500,
-                random_state=self.random_state
-            )
-        }
+        # Models for comparison; SMOTE runs per training fold inside each pipeline,
+        # and XGBoost picks its boosting rounds inside each training fold too
+        models = self._base_models()
+        models['XGBoost'] = self.orchestrator.early_stopping(models['XGBoost'])
         
         # Stratified K-Fold
         skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=self.random_state)
@@ -234,10 +223,11 @@ class EnhancedXGBoostTrainer:
         for name, model in models.items():
             print(f"🔄 Cross-validating {name}...")
             
-            # Multiple metrics
+            # All metrics from one fit per fold
+            result = self.orchestrator.cross_validate(model, self.X, self.y, cv=skf)
             metrics = {}
-            for metric in ['accuracy', 'f1_macro', 'precision_macro', 'recall_macro']:
-                scores = cross_val_score(model, X_balanced, y_balanced, cv=skf, scoring=metric, n_jobs=-1)
+            for metric in SCORING:
+                scores = result['scores'][metric]
                 metrics[metric] = {
                     'scores': scores.tolist(),
                     'mean': float(scores.mean()),
@@ -245,18 +235,13 @@ class EnhancedXGBoostTrainer:
                     'confidence_interval': self._confidence_interval(scores)
                 }
             
-            # Permutation test for statistical significance
+            # Permutation test for statistical significance (labels shuffled against the out-of-fold predictions)
             print(f"🧪 Statistical significance testing for {name}...")
-            score, perm_scores, pvalue = permutation_test_score(
-                model, X_balanced, y_balanced, 
-                scoring="accuracy", cv=skf, n_permutations=100, n_jobs=-1
+            metrics['permutation_test'] = permutation_test(
+                self.y, result['oof_predictions'],
+                n_permutations=n_permutations, random_state=self.random_state
             )
-            
-            metrics['permutation_test'] = {
-                'score': float(score),
-                'p_value': float(pvalue),
-                'significant': pvalue < 0.05
-            }
+            pvalue = metrics['permutation_test']['p_value']
             
             cv_results[name] = metrics
             
@@ -265,11 +250,37 @@ class EnhancedXGBoostTrainer:
             print(f"   P-value: {pvalue:.6f} ({'Significant' if pvalue < 0.05 else 'Not significant'})")
         
         self.cv_results = cv_results
-        self.X_balanced = X_balanced
-        self.y_balanced = y_balanced
         
         return self
     
+    def _base_models(self):
+        """Untuned models, each behind SMOTE in a pipeline"""
+        return {
+            'XGBoost': self.orchestrator.pipeline(xgb.XGBClassifier(
+                tree_method="hist",
+                eval_metric="mlogloss",
+                n_estimators=300,
+                max_depth=7,
+                learning_rate=0.08,
+                subsample=0.85,
+                colsample_bytree=0.85,
+                n_jobs=1,
+                random_state=self.random_state
+            )),
+            'RandomForest': self.orchestrator.pipeline(RandomForestClassifier(
+                n_estimators=200,
+                max_depth=10,
+                n_jobs=1,
+                random_state=self.random_state
+            )),
+            'NeuralNetwork': self.orchestrator.pipeline(MLPClassifier(
+                hidden_layer_sizes=(100, 50),
+                max_iter=500,
+                early_stopping=True,
+                random_state=self.random_state
+            ))
+        }
+    
     def _confidence_interval(self, scores, confidence=0.95):
         """Calculate confidence interval for cross-validation scores"""
         alpha = 1 - confidence
@@ -281,10 +292,19 @@ class EnhancedXGBoostTrainer:
         """Train ensemble voting classifier"""
         print("\n🎭 Training ensemble model...")
         
-        # Individual models with hyperparameter tuning
-        xgb_model = self._tune_xgboost()
-        rf_model = self._tune_random_forest()
-        nn_model = self._tune_neural_network()
+        # Split data for final evaluation (the test set keeps real rows only)
+        X_train, X_test, y_train, y_test = train_test_split(
+            self.X, self.y, test_size=0.2, 
+            stratify=self.y, random_state=self.random_state
+        )
+        self.X_train = X_train
+        self.y_train = y_train
+        
+        # Individual models with hyperparameter tuning on the training split
+        base_models = self._base_models()
+        xgb_model = self._tune_xgboost(base_models['XGBoost'])
+        rf_model = self._tune_random_forest(base_models['RandomForest'])
+        nn_model = self._tune_neural_network(base_models['NeuralNetwork'])
         
         # Create ensemble
         self.ensemble_model = VotingClassifier(
@@ -293,13 +313,8 @@ class EnhancedXGBoostTrainer:
                 ('rf', rf_model),
                 ('nn', nn_model)
             ],
-            voting='soft'
-        )
-        
-        # Split data for final evaluation
-        X_train, X_test, y_train, y_test = train_test_split(
-            self.X_balanced, self.y_balanced, test_size=0.2, 
-            stratify=self.y_balanced, random_state=self.random_state
+            voting='soft',
+            n_jobs=self.orchestrator.n_jobs
         )
         
         # Train ensemble
@@ -321,11 +336,12 @@ class EnhancedXGBoostTrainer:
         for metric, score in ensemble_metrics.items():
             print(f"   {metric}: {score:.4f}")
         
-        # Store individual models
+        # Store individual models (the ensemble's fitted members, without the SMOTE step)
+        fitted = self.ensemble_model.named_estimators_
         self.models = {
-            'xgboost': xgb_model,
-            'random_forest': rf_model,
-            'neural_network': nn_model,
+            'xgboost': fitted['xgb'].named_steps['model'],
+            'random_forest': fitted['rf'].named_steps['model'],
+            'neural_network': fitted['nn'].named_steps['model'],
             'ensemble': self.ensemble_model
         }
         
@@ -338,72 +354,48 @@ class EnhancedXGBoostTrainer:
         
         return self
     
-    def _tune_xgboost(self):
-        """Hyperparameter tuning for XGBoost"""
+    def _tune_xgboost(self, base_model):
+        """Hyperparameter tuning for XGBoost; boosting rounds come from early stopping"""
         param_grid = {
-            'n_estimators': [200, 300, 400],
-            'max_depth': [6, 7, 8],
-            'learning_rate': [0.05, 0.08, 0.1],
-            'subsample': [0.8, 0.85, 0.9],
-            'colsample_bytree': [0.8, 0.85, 0.9]
+            'model__max_depth': [6, 7, 8],
+            'model__learning_rate': [0.05, 0.08, 0.1],
+            'model__subsample': [0.8, 0.85, 0.9],
+            'model__colsample_bytree': [0.8, 0.85, 0.9]
         }
         
-        base_model = xgb.XGBClassifier(
-            use_label_encoder=False,
-            eval_metric="mlogloss",
-            random_state=self.random_state
+        best_params, _ = self.orchestrator.search(
+            base_model, param_grid, self.X_train, self.y_train, n_candidates=18
         )
-        
-        search = RandomizedSearchCV(
-            base_model, param_grid, 
-            scoring='f1_macro', n_iter=10, cv=3, 
-            random_state=self.random_state, n_jobs=-1
+        return self.orchestrator.early_stopped(
+            base_model.set_params(**best_params), self.X_train, self.y_train
         )
-        
-        search.fit(self.X_balanced, self.y_balanced)
-        return search.best_estimator_
     
-    def _tune_random_forest(self):
+    def _tune_random_forest(self, base_model):
         """Hyperparameter tuning for Random Forest"""
         param_grid = {
-            'n_estimators': [100, 200, 300],
-            'max_depth': [8, 10, 12],
-            'min_samples_split': [2, 5, 10],
-            'min_samples_leaf': [1, 2, 4]
+            'model__n_estimators': [100, 200, 300],
+            'model__max_depth': [8, 10, 12],
+            'model__min_samples_split': [2, 5, 10],
+            'model__min_samples_leaf': [1, 2, 4]
         }
         
-        base_model = RandomForestClassifier(random_state=self.random_state)
-        
-        search = RandomizedSearchCV(
-            base_model, param_grid,
-            scoring='f1_macro', n_iter=8, cv=3,
-            random_state=self.random_state, n_jobs=-1
+        best_params, _ = self.orchestrator.search(
+            base_model, param_grid, self.X_train, self.y_train, n_candidates=18
         )
-        
-        search.fit(self.X_balanced, self.y_balanced)
-        return search.best_estimator_
+        return base_model.set_params(**best_params)
     
-    def _tune_neural_network(self):
+    def _tune_neural_network(self, base_model):
         """Hyperparameter tuning for Neural Network"""
         param_grid = {
-            'hidden_layer_sizes': [(50,), (100,), (100, 50), (150, 75)],
-            'alpha': [0.0001, 0.001, 0.01],
-            'learning_rate_init': [0.001, 0.01, 0.1]
+            'model__hidden_layer_sizes': [(50,), (100,), (100, 50), (150, 75)],
+            'model__alpha': [0.0001, 0.001, 0.01],
+            'model__learning_rate_init': [0.001, 0.01, 0.1]
         }
         
-        base_model = MLPClassifier(
-            max_iter=500, 
-            random_state=self.random_state
+        best_params, _ = self.orchestrator.search(
+            base_model, param_grid, self.X_train, self.y_train, n_candidates=12
         )
-        
-        search = RandomizedSearchCV(
-            base_model, param_grid,
-            scoring='f1_macro', n_iter=6, cv=3,
-            random_state=self.random_state, n_jobs=-1
-        )
-        
-        search.fit(self.X_balanced, self.y_balanced)
-        return search.best_estimator_
+        return base_model.set_params(**best_params)
     
     def uncertainty_quantification(self):
         """Quantify model uncertainty using calibrated classifiers"""
@@ -417,9 +409,7 @@ class EnhancedXGBoostTrainer:
         )
         
         # Retrain on training data
-        X_train = self.X_balanced[:-len(self.X_test)]
-        y_train = self.y_balanced[:-len(self.y_test)]
-        calibrated_model.fit(X_train, y_train)
+        calibrated_model.fit(self.X_train, self.y_train)
         
         # Get calibrated probabilities
         calibrated_proba = calibrated_model.predict_proba(self.X_test)
@@ -453,7 +443,7 @@ class EnhancedXGBoostTrainer:
         print("\n🔍 Comprehensive bias analysis...")
         
         # Create test dataframe with predictions
-        test_df = self.df.iloc[self.X_test.index.intersection(self.df.index)].copy()
+        test_df = self.df.loc[self.X_test.index].copy()
         test_df['predicted'] = self.y_pred
         test_df['actual'] = self.y_test
         
@@ -697,6 +687,13 @@ class EnhancedXGBoostTrainer:
         
         print("💾 All models and artifacts saved successfully")
         
+        # Evict responses scored by the previous model (tag-based, not a full flush)
+        try:
+            from backend.core.caching import invalidate_cache_tags, model_tag
+            invalidate_cache_tags(model_tag("xgboost"))
+        except Exception as e:
+            print(f"⚠️ Could not invalidate cached predictions: {e}")
+        
         return self
     
     def run_complete_training_pipeline(self):
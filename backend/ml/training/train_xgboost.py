@@ -217,6 +217,21 @@ joblib.dump(model, os.path.join(model_dir, "eco_model.pkl"))
 for name, enc in encoders.items():
     joblib.dump(enc, os.path.join(encoders_dir, f"{name}_encoder.pkl"))
 
+# Publish last: running API workers hot-swap to the new version on the manifest change
+try:
+    from backend.ml.inference.model_registry import publish_manifest
+    manifest = publish_manifest(model_dir, trainer="train_xgboost")
+    print(f"📦 Published model version {manifest['version']}")
+except Exception as e:
+    print(f"⚠️ Could not publish model manifest: {e}")
+
+# Evict responses scored by the previous model (tag-based, not a full flush)
+try:
+    from backend.core.caching import invalidate_cache_tags, model_tag
+    invalidate_cache_tags(model_tag("xgboost"))
+except Exception as e:
+    print(f"⚠️ Could not invalidate cached predictions: {e}")
+
 # === Model Comparison & Bias Analysis ===
 print(f"\n🔬 BIAS AND ROBUSTNESS ANALYSIS")
 print("=" * 50)
@@ -0,0 +1,205 @@
+"""
+⚙️ TRAINING ORCHESTRATOR
+=======================
+
+Cross-validation, hyperparameter search and early stopping for the
+EnhancedXGBoostTrainer models, arranged so every model is fitted as few
+times as possible:
+
+- cross_validate scores all metrics from one fit per fold and keeps the
+  out-of-fold predictions, so the permutation test permutes labels against
+  them instead of refitting the model for every permutation
+- SMOTE runs inside an imblearn Pipeline on each training fold only:
+  synthetic rows never reach a validation fold
+- Hyperparameters are picked by successive halving (HalvingRandomSearchCV):
+  many candidates on a sample, the best few on all the data
+- XGBoost uses the hist tree method and learns its number of boosting
+  rounds by early stopping on a held-out slice. Under cross-validation
+  the slice comes from each training fold (EarlyStoppedClassifier), so
+  the rounds are never chosen on rows a fold is scored on
+- Results and resampled folds are cached with joblib.Memory, keyed on the
+  data, estimator parameters and folds, so rerunning on unchanged data
+  reuses them
+
+Usage:
+    orchestrator = TrainingOrchestrator(cache_dir="ml_model/training_cache")
+    pipeline = orchestrator.pipeline(xgb.XGBClassifier(tree_method="hist"))
+    results = orchestrator.cross_validate(orchestrator.early_stopping(pipeline), X, y, cv=StratifiedKFold(5))
+    final = orchestrator.early_stopped(pipeline, X_train, y_train)
+"""
+
+import math
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from joblib import Memory
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, cross_validate, train_test_split
+from imblearn.over_sampling import SMOTE
+from imblearn.pipeline import Pipeline
+
+SCORING = ("accuracy", "f1_macro", "precision_macro", "recall_macro")
+
+# Boosting rounds ceiling and patience for XGBoost early stopping
+MAX_BOOSTING_ROUNDS = 1000
+EARLY_STOPPING_ROUNDS = 30
+VALIDATION_FRACTION = 0.1
+
+# Successive halving keeps the best 1/HALVING_FACTOR of candidates each round
+HALVING_FACTOR = 3
+
+
+def _cross_validate(estimator, X, y, cv, scoring: Sequence[str], n_jobs: int) -> Dict[str, Any]:
+    """One fit per fold; every metric and the out-of-fold predictions come from it"""
+    result = cross_validate(
+        estimator, X, y, cv=cv, scoring=list(scoring), n_jobs=n_jobs,
+        return_estimator=True, return_indices=True
+    )
+    y = np.asarray(y)
+    oof_predictions = np.empty_like(y)
+    for fitted, test_idx in zip(result["estimator"], result["indices"]["test"]):
+        oof_predictions[test_idx] = fitted.predict(_rows(X, test_idx))
+    return {
+        "scores": {metric: result[f"test_{metric}"] for metric in scoring},
+        "oof_predictions": oof_predictions,
+        "fit_time": float(np.sum(result["fit_time"]))
+    }
+
+
+def _halving_search(estimator, param_distributions, X, y, n_candidates: int, min_resources: int,
+                    cv: int, scoring: str, random_state: int, n_jobs: int) -> Tuple[Dict[str, Any], float]:
+    search = HalvingRandomSearchCV(
+        estimator, param_distributions,
+        n_candidates=n_candidates, factor=HALVING_FACTOR,
+        resource="n_samples", min_resources=min_resources,
+        cv=cv, scoring=scoring, refit=False,
+        random_state=random_state, n_jobs=n_jobs
+    )
+    search.fit(X, y)
+    return search.best_params_, float(search.best_score_)
+
+
+def _early_stopping_rounds(estimator, X, y, validation_fraction: float, random_state: int) -> int:
+    """Boosting rounds at the best validation loss, with a stratified held-out slice"""
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X, y, test_size=validation_fraction, stratify=y, random_state=random_state
+    )
+    model = clone(estimator).set_params(
+        model__n_estimators=MAX_BOOSTING_ROUNDS,
+        model__early_stopping_rounds=EARLY_STOPPING_ROUNDS
+    )
+    model.fit(X_fit, y_fit, model__eval_set=[(X_val, y_val)], model__verbose=False)
+    return int(model.named_steps["model"].best_iteration) + 1
+
+
+class EarlyStoppedClassifier(ClassifierMixin, BaseEstimator):
+    """
+    XGBoost pipeline whose boosting rounds are chosen on the data it is fitted on
+
+    fit() holds out validation_fraction of its own training rows to find the
+    rounds, then refits the pipeline on all of them, so each cross-validation
+    fold picks its rounds without seeing its test rows.
+    """
+
+    def __init__(self, estimator, validation_fraction: float = VALIDATION_FRACTION, random_state: Optional[int] = None):
+        self.estimator = estimator
+        self.validation_fraction = validation_fraction
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        rounds = _early_stopping_rounds(self.estimator, X, y, self.validation_fraction, self.random_state)
+        self.estimator_ = clone(self.estimator).set_params(model__n_estimators=rounds).fit(X, y)
+        self.n_estimators_ = rounds
+        self.classes_ = self.estimator_.classes_
+        return self
+
+    def predict(self, X):
+        return self.estimator_.predict(X)
+
+    def predict_proba(self, X):
+        return self.estimator_.predict_proba(X)
+
+
+def _rows(X, idx):
+    return X.iloc[idx] if hasattr(X, "iloc") else X[idx]
+
+
+def permutation_test(y_true, predictions, n_permutations: int = 1000, random_state: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Accuracy permutation test on fixed out-of-fold predictions
+
+    Tests whether the predictions are independent of the true labels by
+    shuffling the labels, so no model is refitted.
+    """
+    y_true = np.asarray(y_true)
+    predictions = np.asarray(predictions)
+    rng = np.random.RandomState(random_state)
+    score = float(np.mean(y_true == predictions))
+    permuted = np.array([np.mean(rng.permutation(y_true) == predictions) for _ in range(n_permutations)])
+    pvalue = float((np.sum(permuted >= score) + 1) / (n_permutations + 1))
+    return {"score": score, "p_value": pvalue, "significant": pvalue < 0.05}
+
+
+class TrainingOrchestrator:
+    """Cached, parallel model selection shared by the trainer's models"""
+
+    def __init__(self, cache_dir: Optional[str] = None, n_jobs: int = -1, random_state: int = 42):
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        # location=None disables caching
+        self.memory = Memory(location=cache_dir, verbose=0)
+        self._cross_validate = self.memory.cache(_cross_validate, ignore=["n_jobs"])
+        self._halving_search = self.memory.cache(_halving_search, ignore=["n_jobs"])
+        self._early_stopping_rounds = self.memory.cache(_early_stopping_rounds)
+
+    def pipeline(self, model) -> Pipeline:
+        """SMOTE on the training rows only, then the model. Resampled folds are cached"""
+        return Pipeline(
+            [("smote", SMOTE(random_state=self.random_state)), ("model", model)],
+            memory=self.memory
+        )
+
+    def cross_validate(self, estimator, X, y, cv, scoring: Sequence[str] = SCORING) -> Dict[str, Any]:
+        """{"scores": {metric: per-fold scores}, "oof_predictions": ..., "fit_time": seconds}"""
+        return self._cross_validate(estimator, X, y, cv, tuple(scoring), self.n_jobs)
+
+    def search(self, estimator, param_distributions: Dict[str, Sequence], X, y,
+               n_candidates: int, cv: int = 3, scoring: str = "f1_macro") -> Tuple[Dict[str, Any], float]:
+        """(best_params, best_score) from successive halving over n_candidates samples"""
+        return self._halving_search(
+            estimator, param_distributions, X, y, n_candidates,
+            self._min_resources(y, n_candidates, cv), cv, scoring, self.random_state, self.n_jobs
+        )
+
+    def _min_resources(self, y, n_candidates: int, cv: int) -> int:
+        """
+        Sample size of the first halving round
+
+        Small enough that the last round uses all the data, but large enough
+        that the rarest class still has more rows than SMOTE's k_neighbors
+        in every training fold.
+        """
+        n_samples = len(y)
+        rounds = 1
+        while HALVING_FACTOR ** rounds <= n_candidates:
+            rounds += 1
+        min_resources = n_samples // HALVING_FACTOR ** (rounds - 1)
+
+        _, counts = np.unique(np.asarray(y), return_counts=True)
+        rarest_fraction = counts.min() / n_samples
+        needed_per_fold = 2 * (SMOTE().k_neighbors + 1)
+        floor = math.ceil(needed_per_fold * cv / (cv - 1) / rarest_fraction)
+        return min(max(min_resources, floor), n_samples)
+
+    def early_stopped(self, estimator, X, y, validation_fraction: float = VALIDATION_FRACTION):
+        """Copy of an XGBoost pipeline with n_estimators set by early stopping on X, y"""
+        rounds = self._early_stopping_rounds(estimator, X, y, validation_fraction, self.random_state)
+        return clone(estimator).set_params(model__n_estimators=rounds)
+
+    def early_stopping(self, estimator, validation_fraction: float = VALIDATION_FRACTION) -> EarlyStoppedClassifier:
+        """XGBoost pipeline that early-stops on every fit, for cross-validation"""
+        return EarlyStoppedClassifier(estimator, validation_fraction, self.random_state)
+
+    def clear_cache(self) -> None:
+        self.memory.clear(warn=False)
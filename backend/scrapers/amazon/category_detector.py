@@ -337,22 +337,24 @@ class CategoryDetector:
         if not soup:
             return None
             
+        # A ParsedProductPage shares its memoized section texts with the extractors
+        if hasattr(soup, 'texts_lower'):
+            section_texts = soup.texts_lower
+        else:
+            section_texts = lambda selector: [element.get_text().lower() for element in soup.select(selector)]
+        
         # Extract relevant text sections
         content_sections = []
         
         # Product description
         desc_selectors = ['#feature-bullets', '.a-unordered-list', '#productDescription']
         for selector in desc_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                content_sections.append(element.get_text().lower())
+            content_sections.extend(section_texts(selector))
         
         # Category breadcrumbs
         breadcrumb_selectors = ['#wayfinding-breadcrumbs', '.a-breadcrumb', '.breadcrumb']
         for selector in breadcrumb_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                content_sections.append(element.get_text().lower())
+            content_sections.extend(section_texts(selector))
         
         if not content_sections:
             return None
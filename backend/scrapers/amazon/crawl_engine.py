@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+🕸️ ASYNC BULK CRAWL ENGINE
+=========================
+
+Concurrent catalogue crawler for the scheduler. Fetches search and
+product pages with httpx and reuses ProductionAmazonScraper's block
+detection and extraction on each page.
+
+Politeness and resilience are per domain, never global:
+- bounded concurrency across all in-flight requests
+- token-bucket rate limit per domain (requests/second with small bursts)
+- retries with exponential backoff and jitter
+- CAPTCHA-aware circuit breaker: repeated blocks pause only that domain
+
+Usage:
+    engine = AsyncCrawlEngine(concurrency=8, requests_per_second=1.0)
+    results = asyncio.run(engine.crawl_search_terms(["coffee+mug"], pages_per_term=2))
+"""
+
+import asyncio
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    from .production_scraper import ProductionAmazonScraper
+    from .page_parser import ParsedProductPage
+    from .scraper_pool import ScrapeResultCache, normalize_asin
+except ImportError:
+    from production_scraper import ProductionAmazonScraper
+    from page_parser import ParsedProductPage
+    from scraper_pool import ScrapeResultCache, normalize_asin
+
+SEARCH_URL_TEMPLATE = "https://www.amazon.co.uk/s?k={term}&page={page}"
+SEARCH_RESULT_LINK_SELECTOR = 'h2 a[href*="/dp/"], h2 a[href*="/gp/product/"]'
+
+# "10 x 5 x 3 cm; 480 g" style values in the product-detail tables
+DIMENSIONS_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*x\s*(\d+(?:\.\d+)?)\s*x\s*(\d+(?:\.\d+)?)\s*(cm|mm|m|inches|in)?', re.I)
+DIMENSION_UNIT_TO_CM = {'cm': 1.0, 'mm': 0.1, 'm': 100.0, 'inches': 2.54, 'in': 2.54}
+
+
+class TokenBucket:
+    """Async token bucket allowing `rate` requests/second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class DomainCircuitBreaker:
+    """
+    Pauses one domain after repeated CAPTCHA/block pages.
+
+    After the pause the next request is a probe: one more block re-opens
+    the circuit straight away, a success closes it.
+    """
+
+    def __init__(self, block_threshold: int = 3, pause_seconds: float = 300.0):
+        self.block_threshold = block_threshold
+        self.pause_seconds = pause_seconds
+        self.consecutive_blocks = 0
+        self.paused_until = 0.0
+        self.trips = 0
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self.paused_until
+
+    def record_block(self) -> None:
+        self.consecutive_blocks += 1
+        if self.consecutive_blocks >= self.block_threshold and not self.is_open:
+            self.paused_until = time.monotonic() + self.pause_seconds
+            self.trips += 1
+            self.consecutive_blocks = self.block_threshold - 1
+            print(f"🚨 Domain paused for {self.pause_seconds:.0f}s after repeated blocks")
+
+    def record_success(self) -> None:
+        self.consecutive_blocks = 0
+
+    async def wait_until_closed(self) -> None:
+        remaining = self.paused_until - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of crawling one URL"""
+    url: str
+    kind: str
+    ok: bool = False
+    status_code: Optional[int] = None
+    data: Optional[Dict[str, Any]] = None
+    product_urls: List[str] = field(default_factory=list)
+    attempts: int = 0
+    blocked: int = 0
+    error: Optional[str] = None
+    elapsed_ms: int = 0
+
+
+def parse_dimensions_cm(value: Optional[str]) -> Optional[List[float]]:
+    if not value:
+        return None
+    match = DIMENSIONS_PATTERN.search(value)
+    if not match:
+        return None
+    multiplier = DIMENSION_UNIT_TO_CM[(match.group(4) or 'cm').lower()]
+    return [round(float(match.group(i)) * multiplier, 2) for i in (1, 2, 3)]
+
+
+class AsyncCrawlEngine:
+    """Bounded-concurrency crawler with per-domain politeness"""
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        requests_per_second: float = 1.0,
+        burst: float = 2.0,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 16.0,
+        block_threshold: int = 3,
+        block_pause_seconds: float = 300.0,
+        timeout: float = 20.0,
+        scraper: Optional[ProductionAmazonScraper] = None
+    ):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for the async crawl engine")
+
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.block_threshold = block_threshold
+        self.block_pause_seconds = block_pause_seconds
+        self.timeout = timeout
+
+        # Only the header/extraction logic is used; it never fetches here
+        self.scraper = scraper or ProductionAmazonScraper(result_cache=ScrapeResultCache(max_entries=1))
+
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.breakers: Dict[str, DomainCircuitBreaker] = {}
+        self.stats = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "blocked": 0,
+            "circuit_trips": 0,
+            "bytes": 0
+        }
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        if domain not in self.buckets:
+            self.buckets[domain] = TokenBucket(self.requests_per_second, self.burst)
+        return self.buckets[domain]
+
+    def _breaker(self, domain: str) -> DomainCircuitBreaker:
+        if domain not in self.breakers:
+            self.breakers[domain] = DomainCircuitBreaker(self.block_threshold, self.block_pause_seconds)
+        return self.breakers[domain]
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter, as in ProductionAmazonScraper"""
+        delay = min(self.base_delay * (2 ** attempt), self.max_delay)
+        return delay + random.uniform(0.1, 0.5) * delay
+
+    def _headers(self, url: str) -> Dict[str, str]:
+        headers = self.scraper.get_realistic_headers(url)
+        # Let httpx negotiate encodings it can actually decode
+        headers.pop('Accept-Encoding', None)
+        return headers
+
+    def _extract(self, content: bytes, url: str, kind: str) -> Dict[str, Any]:
+        """Parse once and run the production extractors (runs in a worker thread)"""
+        page = ParsedProductPage(content)
+        if self.scraper.is_blocked_or_captcha(page):
+            return {"blocked": True}
+
+        if kind == "search":
+            links = []
+            for link in page.select(SEARCH_RESULT_LINK_SELECTOR):
+                href = link.get('href')
+                if href:
+                    links.append(urljoin(url, href))
+            return {"blocked": False, "product_urls": links}
+
+        data = self.scraper.extract_product_data(page, {'url': url})
+        data['asin'] = normalize_asin(url)
+        data['url'] = url
+        data['dimensions_cm'] = parse_dimensions_cm(
+            page.detail_value('product dimensions', 'package dimensions', 'item dimensions')
+        )
+        return {"blocked": False, "data": data}
+
+    async def fetch(self, client: "httpx.AsyncClient", url: str, kind: str, slots: asyncio.Semaphore) -> CrawlResult:
+        """Fetch and extract one URL, honouring the domain's limiter and breaker"""
+        domain = urlparse(url).netloc
+        bucket = self._bucket(domain)
+        breaker = self._breaker(domain)
+        result = CrawlResult(url=url, kind=kind)
+        start = time.perf_counter()
+
+        for attempt in range(self.max_retries):
+            if attempt > 0:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.backoff_delay(attempt - 1))
+
+            # Politeness waits happen outside the concurrency slots
+            await breaker.wait_until_closed()
+            await bucket.acquire()
+            result.attempts += 1
+
+            try:
+                async with slots:
+                    self.stats["requests"] += 1
+                    response = await client.get(url, headers=self._headers(url))
+            except httpx.HTTPError as e:
+                result.error = f"{type(e).__name__}: {e}"
+                continue
+
+            result.status_code = response.status_code
+            if response.status_code in (404, 410):
+                result.error = f"HTTP {response.status_code}"
+                break
+            if response.status_code != 200:
+                result.error = f"HTTP {response.status_code}"
+                continue
+
+            self.stats["bytes"] += len(response.content)
+            extracted = await asyncio.to_thread(self._extract, response.content, str(response.url), kind)
+            if extracted["blocked"]:
+                result.blocked += 1
+                result.error = "blocked"
+                self.stats["blocked"] += 1
+                trips = breaker.trips
+                breaker.record_block()
+                self.stats["circuit_trips"] += breaker.trips - trips
+                continue
+
+            breaker.record_success()
+            result.ok = True
+            result.error = None
+            result.data = extracted.get("data")
+            result.product_urls = extracted.get("product_urls", [])
+            break
+
+        self.stats["succeeded" if result.ok else "failed"] += 1
+        result.elapsed_ms = int((time.perf_counter() - start) * 1000)
+        return result
+
+    def _client(self) -> "httpx.AsyncClient":
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            cookies=dict(self.scraper.session.cookies),
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        )
+
+    async def crawl(self, urls: Iterable[str], kind: str = "product") -> List[CrawlResult]:
+        """Crawl URLs concurrently; results come back in input order"""
+        unique_urls = list(dict.fromkeys(urls))
+        slots = asyncio.Semaphore(self.concurrency)
+        async with self._client() as client:
+            return list(await asyncio.gather(*(self.fetch(client, url, kind, slots) for url in unique_urls)))
+
+    async def crawl_search_terms(
+        self,
+        terms: Iterable[str],
+        pages_per_term: int = 2,
+        search_url_template: str = SEARCH_URL_TEMPLATE,
+        max_products: Optional[int] = None,
+        skip_asins: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Two-stage crawl: search result pages, then every product page they
+        link to (deduplicated by ASIN, skipping ASINs already known).
+        """
+        search_urls = [
+            search_url_template.format(term=term, page=page)
+            for term in terms for page in range(1, pages_per_term + 1)
+        ]
+        search_results = await self.crawl(search_urls, kind="search")
+
+        seen = set(skip_asins or ())
+        product_urls = []
+        for result in search_results:
+            for url in result.product_urls:
+                asin = normalize_asin(url)
+                if not asin or asin in seen:
+                    continue
+                seen.add(asin)
+                product_urls.append(url)
+        if max_products is not None:
+            product_urls = product_urls[:max_products]
+
+        product_results = await self.crawl(product_urls, kind="product")
+        return {
+            "search_results": search_results,
+            "product_results": product_results,
+            "products": [r.data for r in product_results if r.ok and r.data],
+            "failed_urls": [r.url for r in search_results + product_results if not r.ok],
+            "stats": dict(self.stats)
+        }
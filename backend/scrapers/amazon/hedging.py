@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+🏁 HEDGED STRATEGY EXECUTION
+===========================
+
+Runs ProductionAmazonScraper's URL strategies as a hedged race instead of
+strictly one after another:
+
+- The first strategy starts immediately; the next one starts after
+  hedge_delay seconds, or at once when the newest running strategy
+  escalates (its page looked like a CAPTCHA or it was rate limited) or
+  finishes without an accepted result
+- The first result accepted as good enough wins and the other strategies
+  are cancelled. Cancellation is cooperative: a strategy stops at its next
+  retry or politeness pause (an HTTP request already in flight finishes
+  and its result is discarded)
+- run_hedged returns only once every launched strategy has stopped, so
+  none of them is still using the scraper's session or counters when the
+  scraper is handed to its next caller
+- If nothing is accepted, the best finished result is returned
+- StrategyStats keeps a latency histogram and outcome counts per strategy,
+  shared by every scraper in the process, so hedge_delay can be tuned
+  from observed latencies
+
+Usage:
+    outcome = run_hedged(tasks, hedge_delay=4.0, accept=lambda r: r["confidence_score"] >= 0.6)
+    get_strategy_stats().suggest_hedge_delay("direct_url")
+"""
+
+import queue
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+OUTCOMES = ("success", "failure", "cancelled")
+
+
+class HedgeContext:
+    """Handed to each running strategy: check for cancellation, ask for the next hedge"""
+
+    def __init__(self, index: int, cancelled: threading.Event, events: "queue.Queue"):
+        self.index = index
+        self._cancelled = cancelled
+        self._events = events
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def sleep(self, seconds: float) -> bool:
+        """Pause unless cancelled first; False if the race was decided meanwhile"""
+        return not self._cancelled.wait(seconds)
+
+    def escalate(self) -> None:
+        """This strategy looks blocked: start the next one now instead of after the hedge delay"""
+        self._events.put(("escalate", self.index, None))
+
+
+@dataclass
+class HedgeOutcome:
+    """Result of a hedged race"""
+    result: Any = None
+    winner: Optional[int] = None
+    launched: int = 0
+    latencies: Dict[int, float] = field(default_factory=dict)
+    results: Dict[int, Any] = field(default_factory=dict)
+
+
+def run_hedged(
+    tasks: Sequence[Callable[[HedgeContext], Any]],
+    hedge_delay: float,
+    accept: Callable[[Any], bool],
+    score: Optional[Callable[[Any], float]] = None
+) -> HedgeOutcome:
+    """
+    Race tasks in priority order, starting each after hedge_delay (or an escalation)
+
+    A task returns a result or None. The first result that passes accept()
+    wins; otherwise the finished result with the highest score (earliest
+    task on ties) is returned. Losing tasks are cancelled and waited for
+    before returning.
+    """
+    outcome = HedgeOutcome()
+    if not tasks:
+        return outcome
+
+    cancelled = threading.Event()
+    events: "queue.Queue" = queue.Queue()
+    started: Dict[int, float] = {}
+    running = set()
+    executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="hedge")
+
+    def run(index: int):
+        result = None
+        try:
+            result = tasks[index](HedgeContext(index, cancelled, events))
+        finally:
+            events.put(("done", index, result))
+
+    def launch():
+        index = outcome.launched
+        started[index] = time.monotonic()
+        running.add(index)
+        outcome.launched += 1
+        executor.submit(run, index)
+
+    try:
+        launch()
+        while running or outcome.launched < len(tasks):
+            wait = None
+            if outcome.launched < len(tasks):
+                wait = max(0.0, started[outcome.launched - 1] + hedge_delay - time.monotonic())
+            try:
+                kind, index, result = events.get(timeout=wait)
+            except queue.Empty:
+                launch()
+                continue
+
+            if kind == "escalate":
+                # Only the newest strategy's trouble brings the next one forward
+                if index == outcome.launched - 1 and outcome.launched < len(tasks):
+                    launch()
+                continue
+
+            running.discard(index)
+            outcome.latencies[index] = time.monotonic() - started[index]
+            if result is not None:
+                outcome.results[index] = result
+                if accept(result):
+                    outcome.result, outcome.winner = result, index
+                    break
+            # The newest strategy came up short: no point waiting out the hedge delay
+            if index == outcome.launched - 1 and outcome.launched < len(tasks):
+                launch()
+    finally:
+        cancelled.set()
+        # Losers stop at their next pause; wait so none outlives the race
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    if outcome.winner is None and outcome.results:
+        rank = score or (lambda result: 0.0)
+        outcome.winner = max(outcome.results, key=lambda i: (rank(outcome.results[i]), -i))
+        outcome.result = outcome.results[outcome.winner]
+    return outcome
+
+
+class StrategyStats:
+    """Thread-safe per-strategy latency histogram and outcome counts"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._strategies: Dict[str, Dict[str, Any]] = {}
+
+    def _entry(self, strategy: str) -> Dict[str, Any]:
+        entry = self._strategies.get(strategy)
+        if entry is None:
+            entry = {
+                "latency_histogram": {outcome: [0] * (len(self.buckets) + 1) for outcome in OUTCOMES},
+                "wins": 0
+            }
+            self._strategies[strategy] = entry
+        return entry
+
+    def record(self, strategy: str, seconds: float, outcome: str) -> None:
+        """Count one run of strategy ending in outcome ("success", "failure" or "cancelled")"""
+        bucket = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._entry(strategy)["latency_histogram"][outcome][bucket] += 1
+
+    def record_win(self, strategy: str) -> None:
+        """Count a scrape whose result came from strategy"""
+        with self._lock:
+            self._entry(strategy)["wins"] += 1
+
+    def latency_quantile(self, strategy: str, q: float, outcome: str = "success") -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile latency (None without data)"""
+        with self._lock:
+            entry = self._strategies.get(strategy)
+            counts = list(entry["latency_histogram"][outcome]) if entry else []
+        total = sum(counts)
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def suggest_hedge_delay(self, primary: str = "direct_url", q: float = 0.9) -> Optional[float]:
+        """Hedge after the primary strategy's q-quantile success latency"""
+        return self.latency_quantile(primary, q)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {}
+            for strategy, entry in self._strategies.items():
+                histogram = entry["latency_histogram"]
+                snapshot[strategy] = {
+                    "buckets_seconds": list(self.buckets) + ["inf"],
+                    "latency_histogram": {outcome: list(counts) for outcome, counts in histogram.items()},
+                    **{outcome: sum(histogram[outcome]) for outcome in OUTCOMES},
+                    "wins": entry["wins"]
+                }
+            return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._strategies.clear()
+
+
+_strategy_stats: Optional[StrategyStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_strategy_stats() -> StrategyStats:
+    """Process-wide strategy statistics"""
+    global _strategy_stats
+    if _strategy_stats is None:
+        with _stats_lock:
+            if _strategy_stats is None:
+                _strategy_stats = StrategyStats()
+    return _strategy_stats
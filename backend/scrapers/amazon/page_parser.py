@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+📄 SINGLE-PARSE PRODUCT PAGE
+===========================
+
+Parses an Amazon product page once (stdlib html.parser, as in the rest of
+the scrapers) and hands the extractors scoped views of it:
+
+- select()/texts(): memoized selector lookups, so the detail tables that
+  several extractors scan are located and flattened to text only once.
+  Simple selectors ('#id', 'tag.class', '[id*="x"]', optionally followed
+  by a descendant part) resolve through an id/class/tag index built in one
+  walk of the tree, then run the remainder inside the small subtree
+- detail_kv: the product-detail tables (#productDetails, #detailBullets,
+  tech-spec and overview tables) pre-flattened to a {label: value} dict
+- text_lower / title_text: page-level text for block/CAPTCHA detection
+
+Usage:
+    page = ParsedProductPage(response.content)
+    origin = page.detail_value('country of origin')
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+HTML_PARSER = 'html.parser'
+
+# Table rows (<th>label</th><td>value</td>) in the product-detail sections
+DETAIL_TABLE_ROW_SELECTORS = [
+    'table#productDetails_techSpec_section_1 tr',
+    'table#productDetails_techSpec_section_2 tr',
+    'table#productDetails_detailBullets_sections1 tr',
+    'div#productDetails_db_sections tr',
+    'table#technicalSpecifications_section_1 tr',
+    'div#productOverview_feature_div tr',
+]
+
+# Bullet items (<span class="a-text-bold">Label :</span><span>value</span>)
+DETAIL_BULLET_SELECTORS = [
+    'div#detailBullets_feature_div li',
+    'div#detailBulletsWrapper_feature_div li',
+]
+
+# '#id', 'tag.class', 'tag[id*="x"]' ... with an optional descendant remainder
+_SIMPLE_SELECTOR = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?'
+    r'(?:#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)|\[(?P<attr>id|class)\*="(?P<sub>[^"]+)"\])?'
+    r'(?:\s+(?P<rest>[^,]+))?$'
+)
+
+# Direction marks and separators Amazon puts around detail labels
+_LABEL_NOISE = re.compile(r'[‎‏:]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _clean(text: str) -> str:
+    return _WHITESPACE.sub(' ', _LABEL_NOISE.sub(' ', text)).strip()
+
+
+class ParsedProductPage:
+    """One parsed page plus memoized, scoped lookups into it"""
+
+    def __init__(self, content: Union[bytes, str, None] = None, soup: Optional[BeautifulSoup] = None):
+        self.soup = soup if soup is not None else BeautifulSoup(content or b'', HTML_PARSER)
+        self._selected: Dict[str, list] = {}
+        self._texts: Dict[str, List[str]] = {}
+        self._texts_lower: Dict[str, List[str]] = {}
+        self._text_lower: Optional[str] = None
+        self._detail_kv: Optional[Dict[str, str]] = None
+        self._index: Optional[Tuple[dict, dict, dict, dict]] = None
+
+    @classmethod
+    def from_soup(cls, soup: Union[BeautifulSoup, 'ParsedProductPage', None]) -> Optional['ParsedProductPage']:
+        """Wrap an existing soup (pages pass through unchanged)"""
+        if soup is None or isinstance(soup, ParsedProductPage):
+            return soup
+        return cls(soup=soup)
+
+    def select(self, selector: str) -> list:
+        elements = self._selected.get(selector)
+        if elements is None:
+            elements = self._selected[selector] = self._select(selector)
+        return elements
+
+    def _build_index(self) -> Tuple[dict, dict, dict, dict]:
+        """One walk of the tree: document position plus id/class/tag lookups"""
+        positions, by_id, by_class, by_tag = {}, {}, {}, {}
+        for position, tag in enumerate(self.soup.find_all(True)):
+            positions[id(tag)] = position
+            by_tag.setdefault(tag.name, []).append(tag)
+            tag_id = tag.get('id')
+            if tag_id:
+                by_id.setdefault(tag_id, []).append(tag)
+            classes = tag.get('class')
+            if classes:
+                by_class.setdefault(' '.join(classes), []).append(tag)
+        return positions, by_id, by_class, by_tag
+
+    def _select(self, selector: str) -> list:
+        match = _SIMPLE_SELECTOR.match(selector.strip())
+        if match is None or not (match.group('tag') or match.group('id') or match.group('cls') or match.group('attr')):
+            return self.soup.select(selector)
+
+        if self._index is None:
+            self._index = self._build_index()
+        positions, by_id, by_class, by_tag = self._index
+
+        tag_name, rest = match.group('tag'), match.group('rest')
+        if match.group('id'):
+            containers = list(by_id.get(match.group('id'), []))
+        elif match.group('cls'):
+            wanted = match.group('cls')
+            containers = [t for attr, tags in by_class.items() if wanted in attr.split() for t in tags]
+            containers.sort(key=lambda t: positions[id(t)])
+        elif match.group('attr'):
+            index, sub = (by_id if match.group('attr') == 'id' else by_class), match.group('sub')
+            containers = [t for attr, tags in index.items() if sub in attr for t in tags]
+            containers.sort(key=lambda t: positions[id(t)])
+        else:
+            containers = list(by_tag.get(tag_name, []))
+        if tag_name:
+            containers = [t for t in containers if t.name == tag_name]
+        if not rest:
+            return containers
+
+        # Run the descendant part inside each (small) container subtree
+        seen, elements = set(), []
+        for container in containers:
+            for element in container.select(rest):
+                if id(element) not in seen:
+                    seen.add(id(element))
+                    elements.append(element)
+        if len(containers) > 1:
+            elements.sort(key=lambda t: positions[id(t)])
+        return elements
+
+    def select_one(self, selector: str):
+        elements = self.select(selector)
+        return elements[0] if elements else None
+
+    def texts(self, selector: str) -> List[str]:
+        """get_text() of every element matching selector"""
+        texts = self._texts.get(selector)
+        if texts is None:
+            texts = self._texts[selector] = [element.get_text() for element in self.select(selector)]
+        return texts
+
+    def texts_lower(self, selector: str) -> List[str]:
+        texts = self._texts_lower.get(selector)
+        if texts is None:
+            texts = self._texts_lower[selector] = [text.lower() for text in self.texts(selector)]
+        return texts
+
+    @property
+    def text_lower(self) -> str:
+        if self._text_lower is None:
+            self._text_lower = self.soup.get_text().lower()
+        return self._text_lower
+
+    @property
+    def title_text(self) -> Optional[str]:
+        """Text of the <title> element, or None when the page has none"""
+        title = self.soup.find('title')
+        return title.get_text() if title else None
+
+    @property
+    def detail_kv(self) -> Dict[str, str]:
+        """Product-detail labels (lower-case) mapped to their values; first wins"""
+        if self._detail_kv is None:
+            kv: Dict[str, str] = {}
+            for selector in DETAIL_TABLE_ROW_SELECTORS:
+                for row in self.select(selector):
+                    label = row.find('th')
+                    cells = row.find_all('td')
+                    if label is None and len(cells) >= 2:
+                        label, value = cells[0], cells[1]
+                    elif label is not None and cells:
+                        value = cells[0]
+                    else:
+                        continue
+                    kv.setdefault(_clean(label.get_text()).lower(), _clean(value.get_text()))
+            for selector in DETAIL_BULLET_SELECTORS:
+                for item in self.select(selector):
+                    label = item.select_one('span.a-text-bold')
+                    if label is None:
+                        continue
+                    value = label.find_next_sibling('span')
+                    if value is None:
+                        continue
+                    kv.setdefault(_clean(label.get_text()).lower(), _clean(value.get_text()))
+            kv.pop('', None)
+            self._detail_kv = kv
+        return self._detail_kv
+
+    def detail_value(self, *labels: str) -> Optional[str]:
+        """First non-empty detail value for any of the given labels"""
+        kv = self.detail_kv
+        for label in labels:
+            value = kv.get(label)
+            if value:
+                return value
+        return None
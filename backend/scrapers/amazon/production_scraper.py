@@ -2,30 +2,71 @@
 """
 Production Amazon Scraper with enhanced anti-detection and full URL support
 Handles complete Amazon URLs as users provide them with 90%+ reliability target
+
+URL strategies run in priority order by default. With a hedge delay
+(constructor argument or AMAZON_HEDGE_DELAY seconds) they run as a hedged
+race instead: see hedging.py.
 """
 
+import os
 import requests
 import time
 import random
 import json
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
 try:
     from .url_processor import AmazonURLProcessor
     from .category_detector import CategoryDetector
+    from .scraper_pool import ScrapeResultCache, cache_key_for_url, get_result_cache, make_pooled_session
+    from .page_parser import ParsedProductPage
+    from .hedging import HedgeContext, StrategyStats, get_strategy_stats, run_hedged
 except ImportError:
     from url_processor import AmazonURLProcessor
     from category_detector import CategoryDetector
+    from scraper_pool import ScrapeResultCache, cache_key_for_url, get_result_cache, make_pooled_session
+    from page_parser import ParsedProductPage
+    from hedging import HedgeContext, StrategyStats, get_strategy_stats, run_hedged
+
+try:
+    from backend.utils.title_features import parse_title
+except ImportError:
+    from utils.title_features import parse_title
+
+# Unit multipliers for labelled detail-table weights
+WEIGHT_UNIT_TO_KG = {
+    'kg': 1.0, 'kilogram': 1.0,
+    'g': 0.001, 'gram': 0.001,
+    'lb': 0.453592, 'pound': 0.453592,
+    'oz': 0.0283495, 'ounce': 0.0283495,
+}
+# Unit spellings tried in order for a weight in the product title
+TITLE_WEIGHT_PRIORITY = (('kg',), ('lb', 'lbs'), ('g',), ('oz',))
+
+# Seconds before a hedged strategy starts; unset runs strategies sequentially
+DEFAULT_HEDGE_DELAY = float(os.environ['AMAZON_HEDGE_DELAY']) if os.environ.get('AMAZON_HEDGE_DELAY') else None
+# A hedged result at or above this confidence wins the race outright
+HEDGE_MIN_CONFIDENCE = 0.6
 
 
 class ProductionAmazonScraper:
     """Production-ready Amazon scraper with enhanced reliability"""
     
-    def __init__(self):
-        self.session = requests.Session()
+    # Namespace of this scraper's results in the shared result cache
+    CACHE_NAMESPACE = "production"
+
+    def __init__(self, result_cache: Optional[ScrapeResultCache] = None,
+                 hedge_delay: Optional[float] = DEFAULT_HEDGE_DELAY,
+                 strategy_stats: Optional[StrategyStats] = None):
+        # Keep-alive session; long-lived when the scraper comes from a ScraperPool
+        self.session = make_pooled_session()
+        self.result_cache = result_cache if result_cache is not None else get_result_cache()
+        self.hedge_delay = hedge_delay
+        self.hedge_min_confidence = HEDGE_MIN_CONFIDENCE
+        self.strategy_stats = strategy_stats if strategy_stats is not None else get_strategy_stats()
         self.url_processor = AmazonURLProcessor()
         self.category_detector = CategoryDetector()
         
@@ -134,14 +175,15 @@ class ProductionAmazonScraper:
         jitter = random.uniform(0.1, 0.5) * delay
         return delay + jitter
         
-    def is_blocked_or_captcha(self, soup: BeautifulSoup) -> bool:
+    def is_blocked_or_captcha(self, soup: Union[BeautifulSoup, ParsedProductPage]) -> bool:
         """Enhanced detection of blocking or CAPTCHA pages"""
-        if not soup:
+        page = ParsedProductPage.from_soup(soup)
+        if not page:
             return True
             
-        page_text = soup.get_text().lower()
-        title = soup.find('title')
-        title_text = title.get_text().lower() if title else ""
+        page_text = page.text_lower
+        title = page.title_text
+        title_text = title.lower() if title is not None else ""
         
         # Common blocking indicators
         blocking_indicators = [
@@ -158,17 +200,25 @@ class ProductionAmazonScraper:
                 return True
                 
         # Check for CAPTCHA forms
-        captcha_forms = soup.find_all('form', {'action': re.compile(r'captcha', re.I)})
+        captcha_forms = page.soup.find_all('form', {'action': re.compile(r'captcha', re.I)})
         if captcha_forms:
             return True
             
         # Check for missing essential elements (sign of error page)
-        if not soup.find('title') or len(page_text.strip()) < 100:
+        if title is None or len(page_text.strip()) < 100:
             return True
             
         return False
         
-    def make_request_with_retry(self, url: str, strategy_name: str = "direct") -> Optional[requests.Response]:
+    def _pause(self, seconds: float, hedge: Optional[HedgeContext] = None) -> bool:
+        """Sleep; in a hedged race, False if the race was decided meanwhile"""
+        if hedge is not None:
+            return hedge.sleep(seconds)
+        time.sleep(seconds)
+        return True
+        
+    def make_request_with_retry(self, url: str, strategy_name: str = "direct",
+                                hedge: Optional[HedgeContext] = None) -> Optional[requests.Response]:
         """Make HTTP request with exponential backoff retry logic"""
         self.request_count += 1
         
@@ -178,10 +228,12 @@ class ProductionAmazonScraper:
                 if attempt > 0:
                     delay = self.exponential_backoff_delay(attempt - 1)
                     print(f"⏳ Retry {attempt}/{self.max_retries} after {delay:.1f}s delay")
-                    time.sleep(delay)
+                    if not self._pause(delay, hedge):
+                        return None
                 else:
                     # Random delay even for first request (human-like)
-                    time.sleep(random.uniform(1.0, 3.0))
+                    if not self._pause(random.uniform(1.0, 3.0), hedge):
+                        return None
                 
                 # Get headers
                 headers = self.get_realistic_headers(url)
@@ -198,21 +250,31 @@ class ProductionAmazonScraper:
                 
                 print(f"📊 Response: {response.status_code} ({len(response.content)} bytes)")
                 
+                if hedge is not None and hedge.cancelled:
+                    # Another strategy already won the race
+                    return None
+                
                 if response.status_code == 200:
-                    # Quick check if we got blocked
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    if not self.is_blocked_or_captcha(soup):
+                    # Parse once: the block check and the extractors share this tree
+                    page = ParsedProductPage(response.content)
+                    if not self.is_blocked_or_captcha(page):
                         self.success_count += 1
+                        response.parsed_page = page
                         return response
                     else:
                         print(f"🚫 Blocked or CAPTCHA detected")
+                        if hedge is not None:
+                            hedge.escalate()
                         
                 elif response.status_code == 503:
                     print(f"⚠️ Service unavailable (503) - will retry")
                     
                 elif response.status_code == 429:
                     print(f"⚠️ Rate limited (429) - will retry with longer delay")
-                    time.sleep(random.uniform(5.0, 10.0))
+                    if hedge is not None:
+                        hedge.escalate()
+                    if not self._pause(random.uniform(5.0, 10.0), hedge):
+                        return None
                     
                 elif response.status_code in [404, 410]:
                     print(f"❌ Product not found ({response.status_code}) - no retry")
@@ -233,10 +295,13 @@ class ProductionAmazonScraper:
         print(f"💥 All {self.max_retries} attempts failed")
         return None
         
-    def scrape_with_full_url(self, user_url: str) -> Optional[Dict[str, Any]]:
+    def scrape_with_full_url(self, user_url: str, hedge_delay: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Main scraping method that handles full URLs as users provide them
         Uses multi-tier fallback strategy for maximum reliability
+        
+        hedge_delay (or self.hedge_delay) races the strategies instead of
+        running them one after another.
         """
         print(f"\n🚀 Starting production scrape for: {user_url}")
         print("=" * 70)
@@ -247,6 +312,14 @@ class ProductionAmazonScraper:
             print(f"❌ Invalid Amazon URL: {', '.join(validation['issues'])}")
             return None
             
+        # Repeat lookups of the same product skip the network (and politeness delays)
+        cache_key = cache_key_for_url(user_url)
+        cached = self.result_cache.get(cache_key, self.CACHE_NAMESPACE)
+        if cached:
+            print(f"📋 Cache hit for {cache_key}")
+            cached.setdefault('scraping_metadata', {})['cache_hit'] = True
+            return cached
+            
         print(f"✅ Valid Amazon URL - Domain: {validation['domain']}, Type: {validation['url_type']}")
         
         # Get processing strategies in priority order
@@ -258,64 +331,113 @@ class ProductionAmazonScraper:
             
         print(f"📋 Available strategies: {len(strategies)}")
         
-        # Try each strategy in order
+        hedge_delay = hedge_delay if hedge_delay is not None else self.hedge_delay
+        if hedge_delay is not None and len(strategies) > 1:
+            result, strategy, attempts = self._race_strategies(strategies, hedge_delay)
+        else:
+            result, strategy, attempts = self._run_strategies_in_order(strategies)
+            
+        if not result:
+            print(f"\n💥 All {len(strategies)} strategies failed")
+            return None
+            
+        # Add metadata about which strategy worked
+        result['scraping_metadata'] = {
+            'successful_strategy': strategy['name'],
+            'strategy_priority': strategy['priority'],
+            'original_url': user_url,
+            'successful_url': strategy['url'],
+            'attempts_made': attempts,
+            'hedged': hedge_delay is not None and len(strategies) > 1,
+            'success_rate': f"{self.success_count}/{self.request_count}"
+        }
+        
+        self.result_cache.set(cache_key, result, self.CACHE_NAMESPACE)
+        return result
+        
+    def _run_strategies_in_order(self, strategies: List[Dict[str, Any]]):
+        """(result, strategy, strategies tried) from the first strategy that succeeds"""
         for i, strategy in enumerate(strategies, 1):
             print(f"\n🎯 Strategy {i}/{len(strategies)}: {strategy['name']}")
             print(f"   Description: {strategy['description']}")
             
+            result = self._run_strategy(strategy)
+            if result:
+                print(f"✅ Strategy '{strategy['name']}' succeeded!")
+                self.strategy_stats.record_win(strategy['name'])
+                return result, strategy, i
+            print(f"❌ Strategy '{strategy['name']}' failed")
+            
+        return None, None, len(strategies)
+        
+    def _race_strategies(self, strategies: List[Dict[str, Any]], hedge_delay: float):
+        """(result, strategy, strategies launched) from a hedged race of the strategies"""
+        print(f"🏁 Hedged mode: next strategy after {hedge_delay:.1f}s or on CAPTCHA/rate limit")
+        
+        tasks = [
+            (lambda hedge, strategy=strategy: self._run_strategy(strategy, hedge))
+            for strategy in strategies
+        ]
+        outcome = run_hedged(
+            tasks, hedge_delay,
+            accept=lambda result: result.get('confidence_score', 0) >= self.hedge_min_confidence,
+            score=lambda result: result.get('confidence_score', 0)
+        )
+        
+        if outcome.winner is None:
+            return None, None, outcome.launched
+            
+        strategy = strategies[outcome.winner]
+        self.strategy_stats.record_win(strategy['name'])
+        print(f"✅ Strategy '{strategy['name']}' won the race "
+              f"({outcome.launched}/{len(strategies)} strategies launched)")
+        return outcome.result, strategy, outcome.launched
+        
+    def _run_strategy(self, strategy: Dict[str, Any], hedge: Optional[HedgeContext] = None) -> Optional[Dict[str, Any]]:
+        """Run one strategy and record its latency and outcome"""
+        start = time.monotonic()
+        result = None
+        try:
             if strategy['name'] == 'search_fallback':
                 # Special handling for search fallback
-                result = self.try_search_fallback(strategy)
+                result = self.try_search_fallback(strategy, hedge)
             else:
                 # Standard URL scraping
-                result = self.try_url_strategy(strategy)
-                
-            if result:
-                print(f"✅ Strategy '{strategy['name']}' succeeded!")
-                
-                # Add metadata about which strategy worked
-                result['scraping_metadata'] = {
-                    'successful_strategy': strategy['name'],
-                    'strategy_priority': strategy['priority'],
-                    'original_url': user_url,
-                    'successful_url': strategy['url'],
-                    'attempts_made': i,
-                    'success_rate': f"{self.success_count}/{self.request_count}"
-                }
-                
-                return result
+                result = self.try_url_strategy(strategy, hedge)
+            return result
+        finally:
+            if hedge is not None and hedge.cancelled and not result:
+                outcome = "cancelled"
             else:
-                print(f"❌ Strategy '{strategy['name']}' failed")
-                
-        print(f"\n💥 All {len(strategies)} strategies failed")
-        return None
+                outcome = "success" if result else "failure"
+            self.strategy_stats.record(strategy['name'], time.monotonic() - start, outcome)
         
-    def try_url_strategy(self, strategy: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def try_url_strategy(self, strategy: Dict[str, Any], hedge: Optional[HedgeContext] = None) -> Optional[Dict[str, Any]]:
         """Try scraping with a specific URL strategy"""
-        response = self.make_request_with_retry(strategy['url'], strategy['name'])
+        response = self.make_request_with_retry(strategy['url'], strategy['name'], hedge)
         
         if not response:
             return None
             
-        # Parse the response
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Reuse the tree parsed during the block check
+        page = getattr(response, 'parsed_page', None) or ParsedProductPage(response.content)
         
         # Extract product data using our proven extraction methods
-        return self.extract_product_data(soup, strategy)
+        return self.extract_product_data(page, strategy)
         
-    def try_search_fallback(self, strategy: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def try_search_fallback(self, strategy: Dict[str, Any], hedge: Optional[HedgeContext] = None) -> Optional[Dict[str, Any]]:
         """Try search-based fallback approach"""
         print(f"🔍 Searching for: {', '.join(strategy.get('search_terms', []))}")
         
-        response = self.make_request_with_retry(strategy['url'], strategy['name'])
+        response = self.make_request_with_retry(strategy['url'], strategy['name'], hedge)
         
         if not response:
             return None
             
-        soup = BeautifulSoup(response.content, 'html.parser')
+        page = getattr(response, 'parsed_page', None) or ParsedProductPage(response.content)
         
         # Try to find product in search results
-        product_links = soup.select('h2 a[href*="/dp/"], h2 a[href*="/gp/product/"]')
+        product_links = page.select('h2 a[href*="/dp/"], h2 a[href*="/gp/product/"]')
         
         if product_links:
             # Take the first search result
@@ -337,35 +459,39 @@ class ProductionAmazonScraper:
             
         return None
         
-    def extract_product_data(self, soup: BeautifulSoup, strategy: Dict[str, Any]) -> Dict[str, Any]:
+    def extract_product_data(self, soup: Union[BeautifulSoup, ParsedProductPage], strategy: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract product data using our proven extraction methods with category intelligence
         This integrates the weight extraction success we achieved
+        
+        All extractors share one ParsedProductPage, so each detail section is
+        located and flattened once per page.
         """
+        page = ParsedProductPage.from_soup(soup)
         data = {}
         
         # Extract title first (needed for category detection)
-        title = self.extract_title(soup)
+        title = self.extract_title(page)
         data['title'] = title
         
         # Detect category for intelligent extraction
         url = strategy.get('url', '')
-        category_info = self.category_detector.detect_category(url, title, soup)
+        category_info = self.category_detector.detect_category(url, title, page)
         data['category'] = category_info['category']
         data['category_confidence'] = category_info['confidence']
         
         print(f"🏷️ Detected category: {category_info['category']} (confidence: {category_info['confidence']:.1%})")
         
         # Extract brand (category-aware)
-        brand = self.extract_brand_category_aware(soup, category_info['category'])
+        brand = self.extract_brand_category_aware(page, category_info['category'])
         data['brand'] = brand
         
         # Extract weight using our proven method (with category validation)
-        weight = self.extract_weight_enhanced_category_aware(soup, category_info['category'])
+        weight = self.extract_weight_enhanced_category_aware(page, category_info['category'])
         data['weight_kg'] = weight
         
         # Extract origin
-        origin = self.extract_origin(soup, title)
+        origin = self.extract_origin(page, title)
         data['origin'] = origin
         
         # Extract material (category-aware)
@@ -384,7 +510,7 @@ class ProductionAmazonScraper:
         
         return data
         
-    def extract_title(self, soup: BeautifulSoup) -> str:
+    def extract_title(self, page: ParsedProductPage) -> str:
         """Extract product title using multiple selectors"""
         title_selectors = [
             '#productTitle',
@@ -397,7 +523,7 @@ class ProductionAmazonScraper:
         ]
         
         for selector in title_selectors:
-            element = soup.select_one(selector)
+            element = page.select_one(selector)
             if element:
                 title = element.get_text().strip()
                 if title and len(title) > 5:
@@ -405,7 +531,7 @@ class ProductionAmazonScraper:
                     
         return "Unknown Product"
         
-    def extract_brand(self, soup: BeautifulSoup) -> str:
+    def extract_brand(self, page: ParsedProductPage) -> str:
         """Extract brand using multiple selectors"""
         brand_selectors = [
             '#bylineInfo',
@@ -416,7 +542,7 @@ class ProductionAmazonScraper:
         ]
         
         for selector in brand_selectors:
-            element = soup.select_one(selector)
+            element = page.select_one(selector)
             if element:
                 brand = element.get_text().strip()
                 if brand and 'visit' not in brand.lower():
@@ -424,14 +550,14 @@ class ProductionAmazonScraper:
                     
         return "Unknown"
         
-    def extract_brand_category_aware(self, soup: BeautifulSoup, category: str) -> str:
+    def extract_brand_category_aware(self, page: ParsedProductPage, category: str) -> str:
         """Extract brand with category-specific intelligence"""
         # For books, don't detect authors as brands
         if category == 'books' and not self.category_detector.should_detect_brand(category):
             return "Unknown"
             
         # Standard brand extraction
-        brand = self.extract_brand(soup)
+        brand = self.extract_brand(page)
         
         # Post-process based on category
         if category == 'books' and brand != "Unknown":
@@ -451,7 +577,7 @@ class ProductionAmazonScraper:
         
         return brand
         
-    def extract_weight_enhanced(self, soup: BeautifulSoup) -> float:
+    def extract_weight_enhanced(self, page: ParsedProductPage) -> float:
         """
         Enhanced weight extraction - our proven method that works for protein powder
         Priority: Specifications → Details → Title → Default
@@ -459,19 +585,19 @@ class ProductionAmazonScraper:
         print("🔍 Starting enhanced weight extraction...")
         
         # PRIORITY 1: Amazon specifications table
-        weight = self.extract_weight_from_specs(soup)
+        weight = self.extract_weight_from_specs(page)
         if weight > 0:
             print(f"✅ Found weight in specifications: {weight}kg")
             return weight
             
         # PRIORITY 2: Product details sections
-        weight = self.extract_weight_from_details(soup)
+        weight = self.extract_weight_from_details(page)
         if weight > 0:
             print(f"✅ Found weight in details: {weight}kg")
             return weight
             
         # PRIORITY 3: Title (avoiding nutritional content)
-        weight = self.extract_weight_from_title(soup)
+        weight = self.extract_weight_from_title(page)
         if weight > 0:
             print(f"✅ Found weight in title: {weight}kg")
             return weight
@@ -479,10 +605,10 @@ class ProductionAmazonScraper:
         print("⚠️ No weight found, using default 1.0kg")
         return 1.0
         
-    def extract_weight_enhanced_category_aware(self, soup: BeautifulSoup, category: str) -> float:
+    def extract_weight_enhanced_category_aware(self, page: ParsedProductPage, category: str) -> float:
         """Enhanced weight extraction with category-specific validation"""
         # Use our proven weight extraction method
-        weight = self.extract_weight_enhanced(soup)
+        weight = self.extract_weight_enhanced(page)
         
         # Validate weight against category expectations
         validation = self.category_detector.validate_weight_for_category(weight, category)
@@ -501,7 +627,7 @@ class ProductionAmazonScraper:
         
         return weight
         
-    def extract_weight_from_specs(self, soup: BeautifulSoup) -> float:
+    def extract_weight_from_specs(self, page: ParsedProductPage) -> float:
         """Extract weight from Amazon specifications table"""
         spec_selectors = [
             'table#productDetails_techSpec_section_1',
@@ -512,11 +638,17 @@ class ProductionAmazonScraper:
             '#feature-bullets'
         ]
         
+        # Labelled weight from the pre-flattened detail tables
+        labelled = page.detail_value('item weight', 'net weight', 'weight')
+        if labelled:
+            match = re.search(r'(\d+(?:\.\d+)?)\s*(kg|kilogram|g|gram|lb|pound|oz|ounce)s?\b', labelled.lower())
+            if match:
+                weight_kg = float(match.group(1)) * WEIGHT_UNIT_TO_KG[match.group(2)]
+                if 0.01 <= weight_kg <= 100:
+                    return weight_kg
+        
         for selector in spec_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text().lower()
-                
+            for text in page.texts_lower(selector):
                 # Weight specification patterns
                 patterns = [
                     r'item\s*weight\s*[:\-]\s*(\d+(?:\.\d+)?)\s*(g|gram|kg|kilogram|lb|pound|oz|ounce)',
@@ -552,7 +684,7 @@ class ProductionAmazonScraper:
                             
         return 0
         
-    def extract_weight_from_details(self, soup: BeautifulSoup) -> float:
+    def extract_weight_from_details(self, page: ParsedProductPage) -> float:
         """Extract weight from product details sections"""
         detail_selectors = [
             '#feature-bullets ul',
@@ -561,10 +693,7 @@ class ProductionAmazonScraper:
         ]
         
         for selector in detail_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text().lower()
-                
+            for text in page.texts_lower(selector):
                 if any(keyword in text for keyword in ['weight', 'gram', 'kg', 'lb', 'oz']):
                     patterns = [
                         r'(\d+(?:\.\d+)?)\s*g\b(?!\s*protein)',
@@ -598,47 +727,22 @@ class ProductionAmazonScraper:
                                 
         return 0
         
-    def extract_weight_from_title(self, soup: BeautifulSoup) -> float:
+    def extract_weight_from_title(self, page: ParsedProductPage) -> float:
         """Extract weight from title, avoiding nutritional content"""
-        title_element = soup.select_one('#productTitle')
+        title_element = page.select_one('#productTitle')
         if not title_element:
             return 0
             
-        title = title_element.get_text().lower()
-        
-        # Remove nutritional content
-        nutritional_exclusions = [
-            r'\d+\s*g\s*protein\b',
-            r'\d+\s*g\s*carbs?\b',
-            r'\d+\s*g\s*fat\b',
-            r'\d+\s*mg\s*(?:sodium|caffeine)\b',
-        ]
-        
-        cleaned_title = title
-        for exclusion in nutritional_exclusions:
-            cleaned_title = re.sub(exclusion, '', cleaned_title)
-            
-        # Look for container weight
-        patterns = [
-            (r'(\d+(?:\.\d+)?)\s*kg\b', 1.0),
-            (r'(\d+(?:\.\d+)?)\s*lb[s]?\b', 0.453592),
-            (r'(\d+(?:\.\d+)?)\s*g\b(?!\s*protein)', 0.001),
-            (r'(\d+(?:\.\d+)?)\s*oz\b', 0.0283495),
-        ]
-        
-        for pattern, multiplier in patterns:
-            matches = re.findall(pattern, cleaned_title)
-            if matches:
-                try:
-                    weight = float(matches[0]) * multiplier
-                    if 0.01 <= weight <= 100:
-                        return weight
-                except ValueError:
-                    continue
-                    
+        # Nutrition facts are matched separately by the scan, never as weights
+        features = parse_title(title_element.get_text())
+        for units in TITLE_WEIGHT_PRIORITY:
+            weight = features.first_weight(units)
+            if weight is not None and 0.01 <= weight.kg <= 100:
+                return weight.kg
+
         return 0
         
-    def extract_origin(self, soup: BeautifulSoup, title: str) -> str:
+    def extract_origin(self, page: ParsedProductPage, title: str) -> str:
         """
         Comprehensive origin extraction from all Amazon sources
         Priority: Product Details → Manufacturer Contact → Specifications → Brand Mapping → Title
@@ -646,19 +750,19 @@ class ProductionAmazonScraper:
         print("🌍 Starting comprehensive origin extraction...")
         
         # PRIORITY 1: Extract from Product Details Tables (highest accuracy)
-        origin = self.extract_origin_from_product_details(soup)
+        origin = self.extract_origin_from_product_details(page)
         if origin != "Unknown":
             print(f"✅ Found origin in product details: {origin}")
             return origin
             
         # PRIORITY 2: Extract from Manufacturer Contact Information
-        origin = self.extract_origin_from_manufacturer_contact(soup)
+        origin = self.extract_origin_from_manufacturer_contact(page)
         if origin != "Unknown":
             print(f"✅ Found origin in manufacturer contact: {origin}")
             return origin
             
         # PRIORITY 3: Extract from Specifications Tables
-        origin = self.extract_origin_from_specifications(soup)
+        origin = self.extract_origin_from_specifications(page)
         if origin != "Unknown":
             print(f"✅ Found origin in specifications: {origin}")
             return origin
@@ -670,7 +774,7 @@ class ProductionAmazonScraper:
             return origin
             
         # PRIORITY 5: Extract from title/description (last resort)
-        origin = self.extract_origin_from_title(title, soup)
+        origin = self.extract_origin_from_title(title, page)
         if origin != "Unknown":
             print(f"✅ Found origin in title/description: {origin}")
             return origin
@@ -678,7 +782,7 @@ class ProductionAmazonScraper:
         print("⚠️ No origin found, using default 'Unknown'")
         return "Unknown"
         
-    def extract_origin_from_product_details(self, soup: BeautifulSoup) -> str:
+    def extract_origin_from_product_details(self, page: ParsedProductPage) -> str:
         """Extract origin from Amazon product details tables - UNIVERSAL for all products"""
         # Comprehensive selectors for ALL Amazon layouts (current and future)
         detail_selectors = [
@@ -731,11 +835,17 @@ class ProductionAmazonScraper:
             r'place\s*of\s*manufacture[:\s]*([a-z\s,\-\.]+?)(?:\n|Brand|Format|Age|ASIN|$)',
         ]
         
+        # Labelled origin from the pre-flattened detail tables
+        labelled = page.detail_value('country of origin', 'country of manufacture', 'origin')
+        if labelled:
+            country = self.normalize_country_name(labelled)
+            if country != "Unknown":
+                print(f"🎯 Found origin in product details: '{labelled}' → '{country}'")
+                return country
+        
         for selector in detail_selectors:
             try:
-                elements = soup.select(selector)
-                for element in elements:
-                    text = element.get_text()
+                for text in page.texts(selector):
                     text_lower = text.lower()
                     
                     # Skip irrelevant sections
@@ -755,7 +865,7 @@ class ProductionAmazonScraper:
                             
         return "Unknown"
         
-    def extract_origin_from_manufacturer_contact(self, soup: BeautifulSoup) -> str:
+    def extract_origin_from_manufacturer_contact(self, page: ParsedProductPage) -> str:
         """Extract origin from manufacturer contact information - UNIVERSAL system"""
         # Comprehensive selectors for manufacturer/contact information
         detail_selectors = [
@@ -821,10 +931,7 @@ class ProductionAmazonScraper:
         
         for selector in detail_selectors:
             try:
-                elements = soup.select(selector)
-                for element in elements:
-                    text = element.get_text()
-                    
+                for text in page.texts(selector):
                     # Skip irrelevant sections
                     text_lower = text.lower()
                     if any(skip in text_lower for skip in ['customer reviews', 'related products', 'sponsored']):
@@ -851,7 +958,7 @@ class ProductionAmazonScraper:
                             
         return "Unknown"
         
-    def extract_origin_from_specifications(self, soup: BeautifulSoup) -> str:
+    def extract_origin_from_specifications(self, page: ParsedProductPage) -> str:
         """Extract origin from technical specifications"""
         spec_selectors = [
             '.a-unordered-list .a-list-item',
@@ -860,10 +967,7 @@ class ProductionAmazonScraper:
         ]
         
         for selector in spec_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text().lower()
-                
+            for text in page.texts_lower(selector):
                 if any(keyword in text for keyword in ['origin', 'made', 'manufactured', 'country']):
                     # Extract country information
                     origin_patterns = [
@@ -913,7 +1017,7 @@ class ProductionAmazonScraper:
                 
         return "Unknown"
         
-    def extract_origin_from_title(self, title: str, soup: BeautifulSoup) -> str:
+    def extract_origin_from_title(self, title: str, page: ParsedProductPage) -> str:
         """Extract origin from product title and description"""
         if not title:
             return "Unknown"
@@ -938,10 +1042,7 @@ class ProductionAmazonScraper:
         # Check product description
         desc_selectors = ['#feature-bullets', '#productDescription', '.a-unordered-list']
         for selector in desc_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                desc_text = element.get_text().lower()
-                
+            for desc_text in page.texts_lower(selector):
                 for pattern in title_patterns:
                     match = re.search(pattern, desc_text)
                     if match:
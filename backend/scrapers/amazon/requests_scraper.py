@@ -18,6 +18,26 @@ import json
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
 
+try:
+    from backend.utils.title_features import parse_title
+except ImportError:
+    from utils.title_features import parse_title
+
+KG_UNITS = ('kg', 'kilogram', 'kilograms')
+GRAM_UNITS = ('g', 'gram', 'grams')
+POUND_UNITS = ('lb', 'lbs', 'pound', 'pounds')
+# (unit spellings, labels) in the order weights are trusted
+WEIGHT_PRIORITY = (
+    (KG_UNITS, ('weight',)),
+    (GRAM_UNITS, ('weight',)),
+    (('kg',), (';',)),
+    (('g',), (';',)),
+    (('g', 'gram'), ('units',)),
+    (('kg',), None),
+    (('g',), None),
+)
+
+
 class RequestsScraper:
     def __init__(self):
         self.session = requests.Session()
@@ -285,63 +305,23 @@ class RequestsScraper:
     
     def extract_weight(self, text: str) -> float:
         """Extract weight from text with improved precision"""
-        text_lower = text.lower()
-        
-        # Priority patterns - look for specific weight fields first
-        priority_patterns = [
-            # Weight field patterns
-            (r'weight[:\s]+(\d+(?:\.\d+)?)\s*(kg|kilograms?)', 'kg'),
-            (r'weight[:\s]+(\d+(?:\.\d+)?)\s*(g|grams?)', 'g'),
-            # Product dimensions patterns (e.g., "11 x 7 x 27 cm; 600 g")
-            (r';\s*(\d+(?:\.\d+)?)\s*(kg)\b', 'kg'),
-            (r';\s*(\d+(?:\.\d+)?)\s*(g)\b', 'g'),
-            # Units field patterns (e.g., "Units: 600.0 gram")
-            (r'units[:\s]+(\d+(?:\.\d+)?)\s*(g|gram)', 'g'),
-            # Title patterns (e.g., "2kg" or "600g" in product title)
-            (r'\b(\d+(?:\.\d+)?)\s*kg\b', 'kg'),
-            (r'\b(\d+(?:\.\d+)?)\s*g\b(?!ram)', 'g'),  # Avoid "program"
-        ]
-        
-        # Check each pattern in priority order
-        for pattern, unit_type in priority_patterns:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                for match in matches:
-                    try:
-                        if isinstance(match, tuple):
-                            weight_val = float(match[0])
-                        else:
-                            weight_val = float(match)
-                        
-                        # Skip very small values that are likely errors
-                        if weight_val < 0.01 and unit_type == 'kg':
-                            continue
-                        if weight_val < 10 and unit_type == 'g':
-                            continue
-                            
-                        # Convert to kg
-                        if unit_type == 'kg':
-                            return weight_val
-                        elif unit_type == 'g':
-                            return weight_val / 1000
-                    except:
-                        continue
-        
-        # Pound patterns as fallback
-        lb_patterns = [
-            r'(\d+(?:\.\d+)?)\s*(?:lb|lbs|pounds?)',
-            r'weight[:\s]+(\d+(?:\.\d+)?)\s*(?:lb|lbs|pounds?)'
-        ]
-        
-        for pattern in lb_patterns:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                try:
-                    weight = float(matches[0])
-                    return weight * 0.453592  # Convert lbs to kg
-                except:
+        features = parse_title(text)
+
+        # Labelled weights first ("Weight: 2kg", "cm; 600 g", "Units: 600.0 gram"),
+        # then any kg or g figure; very small values are likely errors
+        for units, labels in WEIGHT_PRIORITY:
+            for weight in features.iter_weights(units, labels):
+                if weight.unit == 'kg' and weight.value < 0.01:
                     continue
-        
+                if weight.unit == 'g' and weight.value < 10:
+                    continue
+                return weight.kg
+
+        # Pounds as fallback
+        weight = features.first_weight(POUND_UNITS)
+        if weight is not None:
+            return weight.kg
+
         return 1.0  # Default weight
     
     def detect_material(self, title: str, text: str) -> str:
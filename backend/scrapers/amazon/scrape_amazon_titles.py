@@ -20,7 +20,9 @@ if project_root not in sys.path:
 
 # Step 2: Now you can import from common
 from common.data.brand_origin_resolver import get_brand_origin, get_brand_origin_intelligent
+from common.data.brand_store import get_brand_store
 from backend.utils.co2_data import load_material_co2_data
+from backend.utils.title_features import parse_title
 
 import traceback
 import requests
@@ -128,13 +130,9 @@ except Exception as e:
     Log.error(f"Error loading priority product DB: {e}")
 
 
-brand_locations = {}
-try:
-    with open("brand_locations.json", "r", encoding="utf-8") as f:
-        brand_locations = json.load(f)
-    Log.success(f"📦 Loaded {len(brand_locations)} custom brand locations.")
-except Exception as e:
-    Log.warn(f" Could not load brand_locations.json: {e}")
+# Write-behind store: reads are in memory, assignments are appended to a log in batches
+brand_locations = get_brand_store("brand_locations.json")
+Log.success(f"📦 Loaded {len(brand_locations)} custom brand locations.")
 
 
 # === CONFIG ===
@@ -2190,46 +2188,19 @@ def extract_weight(text):
     if not text:
         return None
 
-    text = text.lower()
+    features = parse_title(text)
+    grams = [weight for weight in features.weights if weight.unit == 'g']
 
-    # 1. Special handling for Product/Package Dimensions format: "45.01 x 30 x 19.99 cm; 0.6 g"
-    dims_patterns = [
-        r"(?:product|package)\s*dimensions?\s*:?\s*[\d\s.x×*cm;]+;\s*([\d.]+)\s*g",
-        r"[\d.]+\s*x\s*[\d.]+\s*x\s*[\d.]+\s*cm;\s*([\d.]+)\s*g",
-        r"dimensions?\s*:?\s*[\d\s.x×*cm;]+;\s*([\d.]+)\s*g",
-        # More flexible patterns for various Amazon formats
-        r"[\d.]+\s*x\s*[\d.]+\s*x\s*[\d.]+\s*cm[;,]\s*([\d.]+)\s*g",
-        r"product\s+dimensions\s*[:\s]+[\d\s.x×*cm;,]+[;,]\s*([\d.]+)\s*g",
-        # Even more flexible - just look for dimensions followed by weight
-        r"[\d.]+\s*[x×]\s*[\d.]+\s*[x×]\s*[\d.]+\s*cm[;,\s]+([\d.]+)\s*g\b"
-    ]
-    
-    for pattern in dims_patterns:
-        dims_match = re.search(pattern, text, re.IGNORECASE)
-        if dims_match:
-            weight_grams = float(dims_match.group(1))
-            print(f"⚖️ Found weight in dimensions: {weight_grams}g")
-            return round(weight_grams / 1000, 3)
-
-    # 2. Match kg first (also handles "kilogram" or "kilograms")  
-    kg_match = re.search(r"([\d.]+)\s?(kg|kilogram|kilograms)", text)
-    if kg_match:
-        return round(float(kg_match.group(1)), 3)
-
-    # 3. Match grams (more flexible pattern)
-    g_match = re.search(r"([\d.]+)\s?(g|grams?|gramme?s?)\b", text)
-    if g_match:
-        return round(float(g_match.group(1)) / 1000, 3)
-
-    # 4. Weight field with value
-    weight_match = re.search(r"(?:weight|item weight)\s*:?\s*([\d.]+)\s*(kg|g|grams?)", text)
-    if weight_match:
-        weight_val = float(weight_match.group(1))
-        unit = weight_match.group(2)
-        if unit == "kg":
-            return round(weight_val, 3)
-        else:  # grams
-            return round(weight_val / 1000, 3)
+    # 1. Product/Package Dimensions format: "45.01 x 30 x 19.99 cm; 0.6 g"
+    for weight in grams:
+        if features.follows_dimensions(weight):
+            return round(weight.value / 1000, 3)
+
+    # 2. kg first (also "kilogram" or "kilograms"), then grams
+    for unit in ('kg', 'g'):
+        for weight in features.weights:
+            if weight.unit == unit:
+                return round(weight.kg, 3)
 
     return None
 
@@ -2597,10 +2568,8 @@ def infer_fulfillment_country(url, sold_by_text=""):
     return "UK"  # fallback default
 
 def save_brand_locations():
-    global brand_locations
-    with open("brand_locations.json", "w", encoding="utf-8") as f:
-        json.dump(brand_locations, f, indent=2)
-        Log.success(f"📦 Saved updated brand_locations.json with {len(brand_locations)} entries.")
+    """Assignments to brand_locations are already queued for the writer thread; this only wakes it"""
+    brand_locations.save()
 
 def safe_save_brand_origin(brand_key, country, city="Unknown"):
     if not country or country.lower() == "unknown":
@@ -2739,10 +2708,8 @@ for brand in brands_to_enrich:
     if brand in example_urls:
         enrich_brand_location(brand, example_urls[brand])
 
-# ✅ Save to JSON here, after loop is complete
-with open("brand_locations.json", "w", encoding="utf-8") as f:
-    json.dump(brand_locations, f, indent=2)
-    Log.success(f"📦 Saved updated brand_locations.json with {len(brand_locations)} entries.")
+# ✅ Enriched brands were queued on the store; wait for them to reach the log
+brand_locations.flush()
 
 
 def extract_recyclability(text_blobs):
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+♻️ SHARED SCRAPER POOL & RESULT CACHE
+====================================
+
+Long-lived scraper state shared across requests:
+
+- ScrapeResultCache: bounded LRU/TTL cache of scrape results keyed by
+  normalized ASIN, shared by ProductionAmazonScraper, UnifiedProductScraper
+  and scrape_amazon_product_page (one namespace per result format)
+- make_pooled_session: requests.Session with keep-alive connection pooling
+- ScraperPool: a small pool of reusable scraper instances, so a request
+  borrows a warm session/URL processor/category detector instead of
+  building new ones
+
+Usage:
+    pool = get_production_scraper_pool()
+    with pool.acquire(timeout=DEFAULT_ACQUIRE_TIMEOUT, overflow=True) as scraper:
+        result = scraper.scrape_with_full_url(url)
+"""
+
+import copy
+import hashlib
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Cache sizing: one entry per product per result format
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL_SECONDS = 3600
+
+# Keep-alive connections kept open per host
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+
+# Scraper instances kept warm per pool
+DEFAULT_POOL_SIZE = 4
+
+# Seconds a request waits for a pooled scraper before using a fresh one
+DEFAULT_ACQUIRE_TIMEOUT = 2.0
+
+# ASINs appear in every product URL format handled by AmazonURLProcessor
+ASIN_PATTERN = re.compile(r'/(?:dp|gp/product|product|gp/aw/d)/([A-Za-z0-9]{10})(?:[/?#]|$)')
+BARE_ASIN_PATTERN = re.compile(r'^[A-Za-z0-9]{10}$')
+
+
+def normalize_asin(url_or_asin: str) -> Optional[str]:
+    """Extract an upper-case ASIN from a product URL or bare ASIN"""
+    if not url_or_asin or not isinstance(url_or_asin, str):
+        return None
+    value = url_or_asin.strip()
+    if BARE_ASIN_PATTERN.match(value):
+        return value.upper()
+    match = ASIN_PATTERN.search(value)
+    return match.group(1).upper() if match else None
+
+
+def cache_key_for_url(url: str) -> str:
+    """ASIN when the URL has one, otherwise a hash of the URL"""
+    asin = normalize_asin(url)
+    if asin:
+        return asin
+    return hashlib.md5(str(url).encode()).hexdigest()
+
+
+class ScrapeResultCache:
+    """
+    Thread-safe LRU cache with per-entry TTL.
+
+    Entries live in namespaces so results in different formats (raw
+    production dicts, ScrapingResult objects) can share one bounded store
+    without colliding. Dict values are copied in and out so callers can
+    mutate what they get back.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _copy(value):
+        return copy.deepcopy(value) if isinstance(value, dict) else value
+
+    def get(self, key: str, namespace: str = "default") -> Optional[Any]:
+        entry_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, _, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[entry_key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+        return self._copy(value)
+
+    def set(self, key: str, value: Any, namespace: str = "default", ttl: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl is None else ttl
+        now = time.time()
+        entry_key = (namespace, key)
+        value = self._copy(value)
+        with self._lock:
+            self._entries[entry_key] = (value, now, now + ttl)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: str, namespace: Optional[str] = None) -> int:
+        """Drop one key from a namespace, or from every namespace"""
+        with self._lock:
+            doomed = [k for k in self._entries if k[1] == key and (namespace is None or k[0] == namespace)]
+            for entry_key in doomed:
+                del self._entries[entry_key]
+        return len(doomed)
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        with self._lock:
+            if namespace is None:
+                cleared = len(self._entries)
+                self._entries.clear()
+                return cleared
+            doomed = [k for k in self._entries if k[0] == namespace]
+            for entry_key in doomed:
+                del self._entries[entry_key]
+            return len(doomed)
+
+    def stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            entries = [e for k, e in self._entries.items() if namespace is None or k[0] == namespace]
+            valid = sum(1 for _, _, expires_at in entries if now < expires_at)
+            lookups = self.hits + self.misses
+            return {
+                "total_entries": len(entries),
+                "valid_entries": valid,
+                "expired_entries": len(entries) - valid,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, entry_key) -> bool:
+        return entry_key in self._entries
+
+
+def make_pooled_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+) -> requests.Session:
+    """Session whose adapters keep keep-alive connections open for reuse"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ScraperPool:
+    """
+    Fixed-size pool of reusable scraper instances.
+
+    Instances are created lazily up to `size`; when all are borrowed,
+    acquire() waits for one to be returned. With overflow=True a borrower
+    that waits longer than `timeout` gets a fresh, unpooled instance
+    instead, so a burst of requests larger than the pool never blocks
+    indefinitely. Scrapers are not thread-safe (they keep per-instance
+    counters and cookies), so each one is used by a single request at a
+    time.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = DEFAULT_POOL_SIZE):
+        self.factory = factory
+        self.size = size
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._created = 0
+        self._overflow = 0
+        self._lock = threading.Lock()
+
+    def _checkout(self, timeout: Optional[float]):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get(timeout=timeout)
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None, overflow: bool = False):
+        """
+        Borrow a scraper, waiting up to timeout seconds (forever if None)
+
+        When the wait runs out, raises queue.Empty, or with overflow=True
+        yields a fresh scraper that is dropped afterwards.
+        """
+        try:
+            scraper = self._checkout(timeout)
+        except queue.Empty:
+            if not overflow:
+                raise
+            scraper = None
+        if scraper is None:
+            with self._lock:
+                self._overflow += 1
+            yield self.factory()
+            return
+        try:
+            yield scraper
+        finally:
+            self._idle.put(scraper)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "created": self._created,
+            "idle": self._idle.qsize(),
+            "overflow": self._overflow
+        }
+
+
+_result_cache: Optional[ScrapeResultCache] = None
+_production_pool: Optional[ScraperPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_result_cache() -> ScrapeResultCache:
+    """Process-wide scrape result cache"""
+    global _result_cache
+    if _result_cache is None:
+        with _shared_lock:
+            if _result_cache is None:
+                _result_cache = ScrapeResultCache()
+    return _result_cache
+
+
+def get_production_scraper_pool(size: int = DEFAULT_POOL_SIZE) -> ScraperPool:
+    """Process-wide pool of ProductionAmazonScraper instances"""
+    global _production_pool
+    if _production_pool is None:
+        with _shared_lock:
+            if _production_pool is None:
+                try:
+                    from .production_scraper import ProductionAmazonScraper
+                except ImportError:
+                    from production_scraper import ProductionAmazonScraper
+                _production_pool = ScraperPool(ProductionAmazonScraper, size)
+    return _production_pool
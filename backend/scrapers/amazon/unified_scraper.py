@@ -22,7 +22,6 @@ Usage:
 
 import logging
 import time
-import hashlib
 import sys
 import os
 from abc import ABC, abstractmethod
@@ -39,8 +38,10 @@ if project_root not in sys.path:
 # Import our working scraper strategies
 try:
     from .requests_scraper import scrape_with_requests
+    from .scraper_pool import ScrapeResultCache, cache_key_for_url, get_result_cache
 except ImportError:
     from requests_scraper import scrape_with_requests
+    from scraper_pool import ScrapeResultCache, cache_key_for_url, get_result_cache
 
 # Import professional error handling
 try:
@@ -363,12 +364,16 @@ class UnifiedProductScraper:
     - Structured logging
     """
     
-    def __init__(self, cache_ttl: int = 3600):
+    # Namespace of this scraper's results in a shared result cache
+    CACHE_NAMESPACE = "unified"
+    
+    def __init__(self, cache_ttl: int = 3600, result_cache: Optional[ScrapeResultCache] = None):
         """
         Initialize unified scraper
         
         Args:
             cache_ttl: Cache time-to-live in seconds (default: 1 hour)
+            result_cache: Shared ASIN-keyed cache; a private one is created if omitted
         """
         self.strategies: List[ScrapingStrategyBase] = [
             RequestsStrategy(),
@@ -380,7 +385,7 @@ class UnifiedProductScraper:
         # Sort strategies by priority
         self.strategies.sort(key=lambda s: s.priority)
         
-        self.cache: Dict[str, Tuple[ScrapingResult, float]] = {}
+        self.cache = result_cache if result_cache is not None else ScrapeResultCache(ttl_seconds=cache_ttl)
         self.cache_ttl = cache_ttl
         
         logger.info(f"🚀 Unified scraper initialized with {len(self.strategies)} strategies")
@@ -466,41 +471,23 @@ class UnifiedProductScraper:
         )
     
     def _get_cached_result(self, url: str) -> Optional[ScrapingResult]:
-        """Get cached result if still valid"""
-        url_hash = hashlib.md5(url.encode()).hexdigest()
-        
-        if url_hash in self.cache:
-            result, timestamp = self.cache[url_hash]
-            if time.time() - timestamp < self.cache_ttl:
-                return result
-            else:
-                # Cache expired
-                del self.cache[url_hash]
-        
-        return None
+        """Get cached result if still valid (keyed by ASIN when the URL has one)"""
+        return self.cache.get(cache_key_for_url(url), self.CACHE_NAMESPACE)
     
     def _cache_result(self, url: str, result: ScrapingResult) -> None:
         """Cache successful result"""
-        url_hash = hashlib.md5(url.encode()).hexdigest()
-        self.cache[url_hash] = (result, time.time())
+        self.cache.set(cache_key_for_url(url), result, self.CACHE_NAMESPACE, ttl=self.cache_ttl)
         logger.debug(f"💾 Cached result for {url}")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics for monitoring"""
-        now = time.time()
-        valid_entries = sum(1 for _, timestamp in self.cache.values() if now - timestamp < self.cache_ttl)
-        
-        return {
-            "total_entries": len(self.cache),
-            "valid_entries": valid_entries,
-            "expired_entries": len(self.cache) - valid_entries,
-            "cache_ttl_hours": self.cache_ttl / 3600
-        }
+        stats = self.cache.stats(self.CACHE_NAMESPACE)
+        stats["cache_ttl_hours"] = self.cache_ttl / 3600
+        return stats
     
     def clear_cache(self) -> int:
         """Clear all cached results"""
-        cleared = len(self.cache)
-        self.cache.clear()
+        cleared = self.cache.clear(self.CACHE_NAMESPACE)
         logger.info(f"🗑️ Cleared {cleared} cached entries")
         return cleared
 
@@ -516,7 +503,8 @@ def scrape_amazon_product_page(amazon_url: str, fallback: bool = False) -> Dict[
     Returns:
         Product data dictionary in legacy format
     """
-    scraper = UnifiedProductScraper()
+    # Scrapers are cheap to build; the shared cache is what makes repeats fast
+    scraper = UnifiedProductScraper(result_cache=get_result_cache())
     
     if fallback:
         # Force fallback strategy
@@ -3,6 +3,8 @@ import random
 import json
 import os
 import csv
+import argparse
+import asyncio
 from datetime import datetime
 from amazon.scrape_amazon_titles import scrape_amazon_titles, is_high_confidence, Log
 
@@ -16,6 +18,8 @@ failed_urls_path = "failed_urls.txt"
 blocked_urls_path = "blocked_urls.txt"
 retry_tracker_path = "blocked_urls_retry.txt"
 pages_per_term = 2  # You can increase this later
+bulk_concurrency = 8
+bulk_requests_per_second = 1.0  # per domain
 sleep_between_jobs = (600, 1200)  # 10–20 mins
 backup_every_n_loops = 5
 
@@ -48,7 +52,6 @@ if os.path.exists(bulk_path):
 
 existing_asins = {p["asin"] for p in bulk_db if p.get("asin")}
 seen_urls = set()
-loop_count = 0
 
 # === LOGGING ===
 def log(msg):
@@ -113,46 +116,22 @@ def move_to_retry_tracker(url):
             f.writelines(line + "\n" for line in lines)
 
 
-retry_queue = load_failed_urls()
-
-# === MAIN LOOP ===
-while True:
-    retry_mode = False
-    blocked_urls = load_blocked_urls()
-    if blocked_urls and random.random() < 0.5:  # try blocked URLs sometimes
-        url = random.choice(blocked_urls)
-        log(f"⚠️ Retrying previously blocked URL: {url}")
-        retry_mode = True
-    else:
-        term = random.choice(search_terms)
-        page = random.randint(1, pages_per_term)
-        url = f"https://www.amazon.co.uk/s?k={term}&page={page}"
-    
-    # Retry logic
-    if not retry_mode and retry_queue:
-        url = retry_queue.pop()
-        log(f"♻️ Retrying failed URL: {url}")
-
-
-    if url in seen_urls:
-        log("⚠️ Already tried this URL, skipping.")
-        continue
-    seen_urls.add(url)
-
-    log(f"🌐 Scraping: {url}")
-    try:
-        scraped = scrape_amazon_titles(url, max_items=30)
-    except Exception as e:
-        log(f"❌ Error scraping {url}: {e}")
-        if retry_mode:
-            move_to_retry_tracker(url)
-        else:
-            save_failed_url(url)
-        time.sleep(10)
-        continue
-
+def to_scheduler_record(product):
+    """Map crawl engine product data onto the bulk/priority record shape"""
+    return {
+        "asin": product.get("asin"),
+        "title": product.get("title"),
+        "brand": product.get("brand"),
+        "brand_estimated_origin": product.get("origin") or "Unknown",
+        "estimated_weight_kg": product.get("weight_kg"),
+        "dimensions_cm": product.get("dimensions_cm"),
+        "material_type": product.get("material_type"),
+        "url": product.get("url")
+    }
 
 
+def save_new_products(scraped):
+    """Add unseen products to the bulk DB (and priority DB if high confidence)"""
     new_bulk = []
     new_priority = 0
 
@@ -168,7 +147,6 @@ while True:
             new_priority += 1
 
     if new_bulk:
-        remove_url_from_failed(url)
         bulk_db.extend(new_bulk)
         log(f"➕ Added {len(new_bulk)} new products. {new_priority} high-confidence.")
 
@@ -178,21 +156,115 @@ while True:
         with open(priority_path, "w", encoding="utf-8") as f:
             json.dump(priority_db, f, indent=2)
 
-    else:
+    return new_bulk
+
+
+def backup_dbs():
+    os.makedirs(backup_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    with open(f"{backup_dir}/bulk_{timestamp}.json", "w", encoding="utf-8") as f:
+        json.dump(bulk_db, f, indent=2)
+    with open(f"{backup_dir}/priority_{timestamp}.json", "w", encoding="utf-8") as f:
+        json.dump(priority_db, f, indent=2)
+    log("💾 Backup created.")
+
+
+# === BULK MODE ===
+def run_bulk(terms, pages=pages_per_term, concurrency=bulk_concurrency,
+             requests_per_second=bulk_requests_per_second, max_products=None):
+    """One concurrent pass over every search term (see amazon/crawl_engine.py)"""
+    from amazon.crawl_engine import AsyncCrawlEngine
+
+    engine = AsyncCrawlEngine(concurrency=concurrency, requests_per_second=requests_per_second)
+    log(f"🚀 Bulk crawl: {len(terms)} terms x {pages} pages, concurrency {concurrency}")
+
+    started = time.time()
+    report = asyncio.run(engine.crawl_search_terms(
+        terms, pages_per_term=pages, max_products=max_products, skip_asins=existing_asins
+    ))
+
+    for url in report["failed_urls"]:
+        save_failed_url(url)
+
+    new_bulk = save_new_products([to_scheduler_record(p) for p in report["products"]])
+    if not new_bulk:
         log("🤷 No new unique products found.")
 
-    # 🔁 Periodic Backup
-    loop_count += 1
-    if loop_count % backup_every_n_loops == 0:
-        os.makedirs(backup_dir, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        with open(f"{backup_dir}/bulk_{timestamp}.json", "w", encoding="utf-8") as f:
-            json.dump(bulk_db, f, indent=2)
-        with open(f"{backup_dir}/priority_{timestamp}.json", "w", encoding="utf-8") as f:
-            json.dump(priority_db, f, indent=2)
-        log("💾 Backup created.")
+    elapsed = time.time() - started
+    stats = report["stats"]
+    log(f"📊 Bulk crawl done in {elapsed:.0f}s: {stats['requests']} requests, "
+        f"{len(report['products'])} products, {stats['blocked']} blocked, "
+        f"{len(report['failed_urls'])} failed, {stats['circuit_trips']} domain pauses")
+    backup_dbs()
+    return report
+
+
+# === MAIN LOOP ===
+def run_loop():
+    loop_count = 0
+    retry_queue = load_failed_urls()
+
+    while True:
+        retry_mode = False
+        blocked_urls = load_blocked_urls()
+        if blocked_urls and random.random() < 0.5:  # try blocked URLs sometimes
+            url = random.choice(blocked_urls)
+            log(f"⚠️ Retrying previously blocked URL: {url}")
+            retry_mode = True
+        else:
+            term = random.choice(search_terms)
+            page = random.randint(1, pages_per_term)
+            url = f"https://www.amazon.co.uk/s?k={term}&page={page}"
 
-    # 💤 Sleep before next round
-    delay = random.randint(*sleep_between_jobs)
-    log(f"⏲️ Sleeping for {delay // 60} mins...")
-    time.sleep(delay)
+        # Retry logic
+        if not retry_mode and retry_queue:
+            url = retry_queue.pop()
+            log(f"♻️ Retrying failed URL: {url}")
+
+        if url in seen_urls:
+            log("⚠️ Already tried this URL, skipping.")
+            continue
+        seen_urls.add(url)
+
+        log(f"🌐 Scraping: {url}")
+        try:
+            scraped = scrape_amazon_titles(url, max_items=30)
+        except Exception as e:
+            log(f"❌ Error scraping {url}: {e}")
+            if retry_mode:
+                move_to_retry_tracker(url)
+            else:
+                save_failed_url(url)
+            time.sleep(10)
+            continue
+
+        if save_new_products(scraped):
+            remove_url_from_failed(url)
+        else:
+            log("🤷 No new unique products found.")
+
+        # 🔁 Periodic Backup
+        loop_count += 1
+        if loop_count % backup_every_n_loops == 0:
+            backup_dbs()
+
+        # 💤 Sleep before next round
+        delay = random.randint(*sleep_between_jobs)
+        log(f"⏲️ Sleeping for {delay // 60} mins...")
+        time.sleep(delay)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Amazon catalogue scheduler")
+    parser.add_argument("--bulk", action="store_true", help="one concurrent crawl of all search terms, then exit")
+    parser.add_argument("--pages", type=int, default=pages_per_term)
+    parser.add_argument("--concurrency", type=int, default=bulk_concurrency)
+    parser.add_argument("--rps", type=float, default=bulk_requests_per_second, help="requests/second per domain")
+    parser.add_argument("--max-products", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.bulk:
+        run_bulk(search_terms, pages=args.pages, concurrency=args.concurrency,
+                 requests_per_second=args.rps, max_products=args.max_products)
+    else:
+        run_loop()
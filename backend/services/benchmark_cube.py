@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+🧊 INDUSTRY BENCHMARK CUBE
+=========================
+
+Precomputed industry × metric distributions for SupplyChainBenchmarkingEngine.
+
+- Each (industry, metric) pair holds its dataset values as a sorted float32
+  segment of one flat array, so a percentile rank is an np.searchsorted
+  lookup (O(log n)) and a whole portfolio is ranked in one call
+- Industry membership is decided once per distinct category string rather
+  than by a regex over every row
+- The summaries the engine reports (mean, median, quantiles, recyclability
+  shares, top performers) are computed at build time
+- The cube is persisted next to the CSV as a .npy array plus a JSON
+  manifest, keyed by the CSV's mtime/size and the industry keywords. The
+  array is opened memory-mapped, so worker processes share one copy through
+  the page cache
+
+Usage:
+    cube = load_or_build_cube(csv_path, industry_classifications)
+    ranks = cube.percentile_ranks("Home & Garden", "carbon_footprint", carbon_values)
+
+Build ahead of deployment (data_dir holds csv/enhanced_eco_dataset.csv):
+    python backend/services/benchmark_cube.py path/to/common/data
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Cube metric -> dataset column holding its per-product values
+METRIC_COLUMNS = {
+    'carbon_footprint': 'co2_emissions',
+    'weight_efficiency': 'weight',
+}
+
+CUBE_FORMAT_VERSION = 1
+
+
+def _cache_dir_for(csv_path: str) -> str:
+    return os.environ.get("BENCHMARK_CUBE_DIR") or os.path.join(os.path.dirname(csv_path), ".benchmark_cube")
+
+
+def _classification_digest(classifications: Dict[str, List[str]]) -> str:
+    payload = json.dumps(classifications, sort_keys=True).encode()
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+def industry_masks(categories: pd.Series, classifications: Dict[str, List[str]]) -> Dict[str, np.ndarray]:
+    """
+    Row mask per industry: the category contains any of its keywords (case-insensitive)
+
+    Same membership as str.contains('|'.join(keywords), case=False), evaluated
+    once per distinct category instead of once per row.
+    """
+    codes, uniques = pd.factorize(categories.astype(object).str.lower())
+    masks = {}
+    for industry, keywords in classifications.items():
+        keywords = [keyword.lower() for keyword in keywords]
+        member = np.fromiter(
+            (any(keyword in category for keyword in keywords) for category in uniques),
+            dtype=bool, count=len(uniques)
+        )
+        # code -1 marks a missing category, which never matches
+        masks[industry] = np.append(member, False)[codes]
+    return masks
+
+
+class BenchmarkCube:
+    """Sorted float32 distributions per (industry, metric) plus precomputed summaries"""
+
+    def __init__(self, values: np.ndarray, manifest: Dict[str, Any]):
+        self.values = values
+        self.manifest = manifest
+        self.segments: Dict[Tuple[str, str], Tuple[int, int]] = {
+            (industry, metric): (start, end)
+            for industry, metrics in manifest['segments'].items()
+            for metric, (start, end) in metrics.items()
+        }
+
+    @property
+    def industries(self) -> List[str]:
+        return list(self.manifest['summaries'])
+
+    @property
+    def summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Per-industry benchmarking data in the engine's benchmarking_data format"""
+        return self.manifest['summaries']
+
+    def distribution(self, industry: str, metric: str) -> np.ndarray:
+        """Sorted values of metric across the industry (empty if unknown)"""
+        start, end = self.segments.get((industry, metric), (0, 0))
+        return self.values[start:end]
+
+    def has_distribution(self, industry: str, metric: str) -> bool:
+        start, end = self.segments.get((industry, metric), (0, 0))
+        return end > start
+
+    def percentile_ranks(self, industry: str, metric: str, values: Any) -> np.ndarray:
+        """Share (%) of the industry at or below each value; 50 without data"""
+        distribution = self.distribution(industry, metric)
+        values = np.asarray(values, dtype=np.float32)
+        if not len(distribution):
+            return np.full(values.shape, 50.0)
+        return np.searchsorted(distribution, values, side='right') * (100.0 / len(distribution))
+
+    def inverse_percentile_ranks(self, industry: str, metric: str, values: Any) -> np.ndarray:
+        """Share (%) of the industry at or above each value, for metrics where lower is better"""
+        distribution = self.distribution(industry, metric)
+        values = np.asarray(values, dtype=np.float32)
+        if not len(distribution):
+            return np.full(values.shape, 50.0)
+        below = np.searchsorted(distribution, values, side='left')
+        return (len(distribution) - below) * (100.0 / len(distribution))
+
+    # === Building ===
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        classifications: Dict[str, List[str]],
+        category_column: str = 'inferred_category'
+    ) -> "BenchmarkCube":
+        """Cube from a product dataset with category, co2_emissions, weight, recyclability, title and origin"""
+        masks = industry_masks(df[category_column], classifications)
+        metric_values = {
+            metric: pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+            for metric, column in METRIC_COLUMNS.items()
+        }
+        recyclability = df['recyclability'].to_numpy(dtype=object)
+
+        chunks, segments, summaries = [], {}, {}
+        offset = 0
+        for industry, mask in masks.items():
+            count = int(mask.sum())
+            if not count:
+                continue
+
+            segments[industry] = {}
+            for metric, all_values in metric_values.items():
+                values = all_values[mask]
+                values = np.sort(values[~np.isnan(values)]).astype(np.float32)
+                segments[industry][metric] = (offset, offset + len(values))
+                chunks.append(values)
+                offset += len(values)
+
+            carbon = pd.Series(metric_values['carbon_footprint'][mask])
+            weight = pd.Series(metric_values['weight_efficiency'][mask])
+            industry_recyclability = recyclability[mask]
+            top = df.loc[mask, ['title', 'co2_emissions', 'origin']].assign(co2_emissions=carbon.to_numpy())
+            top = top.nsmallest(5, 'co2_emissions')
+            top = top.astype(object).where(top.notna(), None)
+            summaries[industry] = {
+                'carbon_footprint': {
+                    'mean': float(carbon.mean()),
+                    'median': float(carbon.median()),
+                    'std': float(carbon.std()),
+                    'percentiles': {
+                        label: float(carbon.quantile(q))
+                        for label, q in (('10', 0.1), ('25', 0.25), ('75', 0.75), ('90', 0.9), ('95', 0.95))
+                    }
+                },
+                'recyclability_score': {
+                    'high_percentage': float((industry_recyclability == 'High').mean() * 100),
+                    'medium_percentage': float((industry_recyclability == 'Medium').mean() * 100),
+                    'low_percentage': float((industry_recyclability == 'Low').mean() * 100)
+                },
+                'weight_efficiency': {
+                    'mean': float(weight.mean()),
+                    'median': float(weight.median())
+                },
+                'sample_size': count,
+                'top_performers': top.to_dict('records')
+            }
+
+        values = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float32)
+        manifest = {
+            'format_version': CUBE_FORMAT_VERSION,
+            'metrics': list(METRIC_COLUMNS),
+            'segments': segments,
+            'summaries': summaries
+        }
+        return cls(values, manifest)
+
+    # === Persistence ===
+
+    def save(self, prefix: str) -> None:
+        """Write prefix.npy and prefix.json; the manifest goes last, so a reader never sees half a cube"""
+        os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+        tmp_suffix = f".{os.getpid()}.tmp"
+        with open(prefix + '.npy' + tmp_suffix, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.values, dtype=np.float32))
+        os.replace(prefix + '.npy' + tmp_suffix, prefix + '.npy')
+        with open(prefix + '.json' + tmp_suffix, 'w') as f:
+            json.dump(self.manifest, f, default=str)
+        os.replace(prefix + '.json' + tmp_suffix, prefix + '.json')
+
+    @classmethod
+    def load(cls, prefix: str, mmap: bool = True) -> Optional["BenchmarkCube"]:
+        """Cube saved at prefix, memory-mapped; None if missing or unreadable"""
+        try:
+            with open(prefix + '.json') as f:
+                manifest = json.load(f)
+            if manifest.get('format_version') != CUBE_FORMAT_VERSION:
+                return None
+            size = max((end for metrics in manifest['segments'].values() for _, end in metrics.values()), default=0)
+            # An empty array cannot be mapped
+            values = np.load(prefix + '.npy', mmap_mode='r' if mmap and size else None)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"⚠️ Ignoring unreadable benchmark cube {prefix}: {e}")
+            return None
+        return cls(values, manifest)
+
+
+def cube_prefix(csv_path: str, classifications: Dict[str, List[str]], cache_dir: Optional[str] = None) -> str:
+    """Cache location of the cube for this CSV version and set of industry keywords"""
+    st = os.stat(csv_path)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(
+        cache_dir or _cache_dir_for(csv_path),
+        f"{name}.{st.st_mtime_ns}.{st.st_size}.{_classification_digest(classifications)}"
+    )
+
+
+def load_or_build_cube(
+    csv_path: str,
+    classifications: Dict[str, List[str]],
+    cache_dir: Optional[str] = None,
+    category_column: str = 'inferred_category'
+) -> BenchmarkCube:
+    """Memory-mapped cube for csv_path, building and saving it on first use"""
+    prefix = cube_prefix(csv_path, classifications, cache_dir)
+    cube = BenchmarkCube.load(prefix)
+    if cube is not None:
+        return cube
+
+    cube = BenchmarkCube.build(pd.read_csv(csv_path, low_memory=False), classifications, category_column)
+    try:
+        directory, stem = os.path.split(prefix)
+        name = stem.split('.')[0] + '.'
+        if os.path.isdir(directory):
+            for stale in os.listdir(directory):
+                if stale.startswith(name) and not stale.startswith(stem):
+                    os.remove(os.path.join(directory, stale))
+        cube.save(prefix)
+        print(f"🧊 Built benchmark cube for {len(cube.industries)} industries ({len(cube.values)} values)")
+    except OSError as e:
+        print(f"⚠️ Could not save benchmark cube: {e}")
+        return cube
+    # Serve from the mapped file so this process shares pages with the other workers
+    return BenchmarkCube.load(prefix) or cube
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from supply_chain_benchmarking import SupplyChainBenchmarkingEngine
+
+    if len(sys.argv) != 2:
+        print("Usage: python benchmark_cube.py path/to/common/data")
+        sys.exit(1)
+    engine = SupplyChainBenchmarkingEngine(data_path=sys.argv[1])
+    if engine.benchmark_cube is None:
+        sys.exit(1)
+    print(f"✅ Benchmark cube ready for {len(engine.benchmark_cube.industries)} industries")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+📦 COLUMNAR DATASET SERVICE
+==========================
+
+Loads a CSV dataset once per process and serves it from memory.
+
+- Columns are typed on first load: numeric text becomes float32,
+  low-cardinality text becomes categorical, and stray repeated header rows
+  are dropped
+- The typed frame is written to a columnar cache next to the CSV. Feather
+  is used when pyarrow is installed, and a pandas pickle otherwise. Later
+  processes load the cache instead of re-parsing the CSV
+- The CSV mtime is checked on access, so edits to the file are picked up
+  without a restart
+- Aggregates (value_counts, groupby means, JSON-ready records) are memoized
+  per data version and dropped only when the data changes
+
+Usage:
+    service = get_dataset_service(ECO_DATASET_PATH)
+    counts = service.value_counts("material", dropna_subset=["material", "true_eco_score"])
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    COLUMNAR_FORMAT = 'feather'
+except ImportError:
+    COLUMNAR_FORMAT = 'pickle'
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+ECO_DATASET_PATH = os.path.join(BASE_DIR, "common", "data", "csv", "expanded_eco_dataset.csv")
+
+# Text columns with fewer distinct values than this share of rows become categorical
+CATEGORICAL_MAX_RATIO = 0.5
+# Text columns where at least this share of values parses as a number become numeric
+NUMERIC_MIN_RATIO = 0.99
+# Record lists up to this many rows are memoized (frontend pages, not full exports)
+RECORDS_CACHE_MAX_ROWS = 5000
+
+
+def _cache_dir_for(path: str) -> str:
+    return os.environ.get("DATASET_CACHE_DIR") or os.path.join(os.path.dirname(path), ".columnar_cache")
+
+
+class DatasetService:
+    """One CSV dataset, typed and held in memory, reloaded when the file changes"""
+
+    def __init__(
+        self,
+        path: str,
+        float_dtype: str = 'float32',
+        categorical: bool = True,
+        cache_dir: Optional[str] = None
+    ):
+        self.path = os.path.abspath(path)
+        self.float_dtype = float_dtype
+        self.categorical = categorical
+        self.cache_dir = cache_dir or _cache_dir_for(self.path)
+
+        self._frame: Optional[pd.DataFrame] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._aggregates: Dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+        self.stats = {"loads": 0, "csv_parses": 0, "cache_hits": 0, "aggregate_hits": 0, "aggregate_misses": 0}
+
+    # === Loading ===
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _cache_path(self, signature: Tuple[int, int]) -> str:
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        variant = f"{self.float_dtype}{'-cat' if self.categorical else ''}"
+        return os.path.join(self.cache_dir, f"{name}.{signature[0]}.{signature[1]}.{variant}.{COLUMNAR_FORMAT}")
+
+    def _read_cache(self, cache_path: str) -> Optional[pd.DataFrame]:
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            if COLUMNAR_FORMAT == 'feather':
+                return pd.read_feather(cache_path)
+            return pd.read_pickle(cache_path)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable dataset cache {cache_path}: {e}")
+            return None
+
+    def _write_cache(self, df: pd.DataFrame, cache_path: str) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            prefix = os.path.basename(cache_path).split('.')[0] + '.'
+            for stale in os.listdir(self.cache_dir):
+                if stale.startswith(prefix) and stale != os.path.basename(cache_path):
+                    os.remove(os.path.join(self.cache_dir, stale))
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            if COLUMNAR_FORMAT == 'feather':
+                df.to_feather(tmp_path)
+            else:
+                df.to_pickle(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not write dataset cache: {e}")
+
+    def optimize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop repeated header rows and convert columns to compact dtypes"""
+        if len(df) and len(df.columns) > 1:
+            # Concatenated exports leave header lines mid-file, sometimes with blank trailing cells
+            header_cells = np.zeros(len(df), dtype=int)
+            for column in df.columns:
+                header_cells += (df[column].astype(str) == str(column)).to_numpy()
+            header_rows = header_cells >= max(2, len(df.columns) // 2)
+            if header_rows.any():
+                df = df[~header_rows]
+
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                columns[column] = series.astype(self.float_dtype)
+                continue
+            if series.dtype == object:
+                numeric = pd.to_numeric(series, errors='coerce')
+                non_null = series.notna().sum()
+                if non_null and numeric.notna().sum() >= NUMERIC_MIN_RATIO * non_null:
+                    columns[column] = numeric.astype(self.float_dtype)
+                    continue
+                if self.categorical and series.nunique() <= CATEGORICAL_MAX_RATIO * max(len(series), 1):
+                    columns[column] = series.astype('category')
+                    continue
+            columns[column] = series
+        return pd.DataFrame(columns).reset_index(drop=True)
+
+    def _load(self, signature: Tuple[int, int]) -> pd.DataFrame:
+        cache_path = self._cache_path(signature)
+        df = self._read_cache(cache_path)
+        if df is not None:
+            self.stats["cache_hits"] += 1
+            return df
+
+        self.stats["csv_parses"] += 1
+        df = self.optimize(pd.read_csv(self.path, low_memory=False))
+        self._write_cache(df, cache_path)
+        return df
+
+    def frame(self) -> pd.DataFrame:
+        """The typed dataset (empty when the file is missing). Treat it as read-only"""
+        signature = self._file_signature()
+        if signature is None:
+            with self._lock:
+                if self._signature is not None:
+                    self._frame, self._signature = None, None
+                    self._aggregates.clear()
+            return pd.DataFrame()
+
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._frame = self._load(signature)
+                    self._signature = signature
+                    self._aggregates.clear()
+                    self.stats["loads"] += 1
+                    print(f"📦 Loaded {len(self._frame)} rows from {os.path.basename(self.path)}")
+        return self._frame
+
+    @property
+    def available(self) -> bool:
+        return self._file_signature() is not None
+
+    def memory_bytes(self) -> int:
+        return int(self.frame().memory_usage(deep=True).sum())
+
+    # === Memoized aggregates ===
+
+    def aggregate(self, key: Hashable, compute: Callable[[pd.DataFrame], Any]) -> Any:
+        """compute(frame), memoized until the underlying file changes"""
+        df = self.frame()
+        with self._lock:
+            if key in self._aggregates:
+                self.stats["aggregate_hits"] += 1
+                return self._aggregates[key]
+        value = compute(df)
+        with self._lock:
+            self.stats["aggregate_misses"] += 1
+            self._aggregates[key] = value
+        return value
+
+    def clean(self, dropna_subset: Iterable[str] = ()) -> pd.DataFrame:
+        """Rows with values in every column of dropna_subset (present columns only)"""
+        subset = tuple(dropna_subset)
+
+        def compute(df):
+            present = [column for column in subset if column in df.columns]
+            return df.dropna(subset=present) if present else df
+
+        return self.aggregate(("clean", subset), compute)
+
+    def value_counts(self, column: str, dropna_subset: Iterable[str] = ()) -> Dict[Any, int]:
+        """{value: count} in descending count order; {} when the column is missing"""
+        subset = tuple(dropna_subset)
+
+        def compute(df):
+            df = self.clean(subset)
+            if column not in df.columns:
+                return {}
+            counts = df[column].value_counts()
+            return {_to_python(value): int(count) for value, count in counts.items() if count > 0}
+
+        return self.aggregate(("value_counts", column, subset), compute)
+
+    def nunique(self, column: str) -> int:
+        return self.aggregate(
+            ("nunique", column),
+            lambda df: int(df[column].nunique()) if column in df.columns else 0
+        )
+
+    def groupby_mean(self, by: str, column: str, dropna_subset: Iterable[str] = ()) -> Dict[Any, float]:
+        subset = tuple(dropna_subset)
+
+        def compute(df):
+            df = self.clean(subset)
+            if by not in df.columns or column not in df.columns:
+                return {}
+            means = df.groupby(by, observed=True)[column].mean()
+            return {_to_python(key): _to_python(value) for key, value in means.items()}
+
+        return self.aggregate(("groupby_mean", by, column, subset), compute)
+
+    def records(
+        self,
+        columns: Optional[List[str]] = None,
+        dropna_subset: Iterable[str] = (),
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """JSON-ready row dicts: NaN -> None, float32 -> the float written in the CSV"""
+        subset = tuple(dropna_subset)
+        selected = tuple(columns) if columns is not None else None
+
+        def compute(_frame):
+            df = self.clean(subset)
+            if selected is not None:
+                df = df[list(selected)]
+            if limit is not None:
+                df = df.head(limit)
+            return _frame_to_records(df)
+
+        if limit is None or limit > RECORDS_CACHE_MAX_ROWS:
+            # Large exports are cheap to rebuild from the typed frame but costly to hold
+            return compute(self.frame())
+        return self.aggregate(("records", selected, subset, limit), compute)
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, np.floating):
+        # str() is the shortest round-tripping form, so float32 5.83 stays 5.83
+        return float(str(value)) if np.isfinite(value) else None
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def _frame_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if series.dtype == np.float32:
+            series = series.astype(str).astype(np.float64)
+        columns[column] = series.astype(object).where(series.notna(), None)
+    return pd.DataFrame(columns).to_dict(orient="records")
+
+
+_services: Dict[Tuple[str, str, bool], DatasetService] = {}
+_services_lock = threading.Lock()
+
+
+def get_dataset_service(path: str = ECO_DATASET_PATH, float_dtype: str = 'float32', categorical: bool = True) -> DatasetService:
+    """Process-wide DatasetService for a CSV path"""
+    key = (os.path.abspath(path), float_dtype, categorical)
+    service = _services.get(key)
+    if service is None:
+        with _services_lock:
+            service = _services.get(key)
+            if service is None:
+                service = _services[key] = DatasetService(path, float_dtype=float_dtype, categorical=categorical)
+    return service
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+📝 APPEND-ONLY EVENT LOG
+=======================
+
+JSON Lines log for prediction submissions and user feedback, shared by all
+gunicorn workers.
+
+- append() only queues the record. One writer thread per process writes
+  queued records in batches, with a single write() call per batch under an
+  exclusive file lock. No request ever rewrites the whole file
+- Counters (totals and per-key counts) are kept up to date incrementally.
+  Each process reads only the bytes added since its last read, so appends
+  made by other workers are counted too
+- An existing JSON-array file (the old format) is converted to JSONL once,
+  on first use
+- Rare admin edits (replace()) rewrite the file through a temp file. Other
+  processes see the new inode and rebuild their counters
+
+Usage:
+    log = get_event_log("submitted_predictions.jsonl", legacy_json_path="submitted_predictions.json")
+    log.add_counter("predicted_label", lambda record: record.get("predicted_label"))
+    log.append({"title": "...", "predicted_label": "B"})
+    log.counts()  # {"total": 8, "predicted_label": {"B": 3, ...}}
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: one worker per dev server, the writer thread is enough
+    fcntl = None
+
+# Most records written by one write() call; whatever queued up while the
+# previous batch was being written goes out together
+MAX_BATCH = 256
+
+
+class _FileLock:
+    """Exclusive flock on a sidecar file (no-op where fcntl is unavailable)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class EventLog:
+    """One append-only JSONL file with a background writer and incremental counters"""
+
+    def __init__(
+        self,
+        path: str,
+        legacy_json_path: Optional[str] = None,
+        max_batch: int = MAX_BATCH
+    ):
+        self.path = os.path.abspath(path)
+        self.legacy_json_path = os.path.abspath(legacy_json_path) if legacy_json_path else None
+        self.max_batch = max_batch
+
+        self._lock_path = self.path + ".lock"
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._flushed = threading.Condition()
+        self._pending = 0
+
+        self._counters: Dict[str, Callable[[Dict[str, Any]], Optional[Hashable]]] = {}
+        self._counts: Dict[str, Counter] = {}
+        self._total = 0
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._read_lock = threading.Lock()
+
+        self.stats = {"appended": 0, "written": 0, "batches": 0, "write_errors": 0, "tail_reads": 0, "rebuilds": 0}
+        self._migrated = False
+        self._migrate_lock = threading.Lock()
+
+    # === Legacy JSON array migration ===
+
+    def _migrate_legacy(self) -> None:
+        if self._migrated:
+            return
+        with self._migrate_lock:
+            if not self._migrated:
+                if self.legacy_json_path and os.path.exists(self.legacy_json_path):
+                    self._convert_legacy()
+                self._migrated = True
+
+    def _convert_legacy(self) -> None:
+        with _FileLock(self._lock_path):
+            if os.path.exists(self.path):
+                return
+            try:
+                with open(self.legacy_json_path, "r", encoding="utf-8") as f:
+                    records = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Could not migrate {self.legacy_json_path}: {e}")
+                return
+            if not isinstance(records, list):
+                records = [records]
+            self._write_file(records)
+            print(f"📝 Migrated {len(records)} records from {os.path.basename(self.legacy_json_path)} to {os.path.basename(self.path)}")
+
+    def _write_file(self, records: List[Dict[str, Any]]) -> None:
+        """Replace the log with records (caller holds the file lock)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(_encode(record) for record in records))
+        os.replace(tmp_path, self.path)
+
+    # === Writing ===
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Queue a record for the writer thread; returns immediately"""
+        self._migrate_legacy()
+        self._ensure_writer()
+        with self._flushed:
+            self._pending += 1
+        self.stats["appended"] += 1
+        self._queue.put(record)
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run_writer, name=f"event-log:{os.path.basename(self.path)}", daemon=True)
+                self._writer.start()
+
+    def _run_writer(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        lines = []
+        for record in batch:
+            try:
+                lines.append(_encode(record))
+            except (TypeError, ValueError) as e:
+                self.stats["write_errors"] += 1
+                print(f"❌ Dropping unserializable event: {e}")
+        try:
+            if lines:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with _FileLock(self._lock_path):
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write("".join(lines))
+                self.stats["written"] += len(lines)
+                self.stats["batches"] += 1
+        except OSError as e:
+            self.stats["write_errors"] += len(lines)
+            print(f"❌ Failed to write {len(lines)} events to {self.path}: {e}")
+        finally:
+            with self._flushed:
+                self._pending -= len(batch)
+                self._flushed.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every record queued by this process is on disk"""
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def replace(self, match: Callable[[Dict[str, Any]], bool], record: Dict[str, Any]) -> bool:
+        """Replace the first record where match(record) is true. Rewrites the file, so keep it for admin edits"""
+        self.flush()
+        with _FileLock(self._lock_path):
+            records = self._read_records()
+            for i, existing in enumerate(records):
+                if match(existing):
+                    records[i] = record
+                    self._write_file(records)
+                    return True
+        return False
+
+    # === Reading ===
+
+    def _read_records(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            return [record for record in map(_decode, f) if record is not None]
+
+    def read_all(self) -> List[Dict[str, Any]]:
+        """Every record, oldest first"""
+        self._migrate_legacy()
+        self.flush()
+        return self._read_records()
+
+    def add_counter(self, name: str, key: Callable[[Dict[str, Any]], Optional[Hashable]]) -> None:
+        """Count records by key(record); records where it returns None are skipped"""
+        with self._read_lock:
+            self._counters[name] = key
+            # Recount from the start so the new counter covers existing records
+            self._reset_counts()
+
+    def _reset_counts(self) -> None:
+        self._counts = {name: Counter() for name in self._counters}
+        self._total = 0
+        self._offset = 0
+
+    def _tail(self) -> None:
+        """Fold records appended since the last read (by any process) into the counters"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            if self._offset or self._total:
+                self._reset_counts()
+            return
+
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            # Rewritten or truncated: start over
+            if self._inode is not None:
+                self.stats["rebuilds"] += 1
+            self._inode = st.st_ino
+            self._reset_counts()
+        if st.st_size == self._offset:
+            return
+
+        self.stats["tail_reads"] += 1
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(st.st_size - self._offset)
+        end = chunk.rfind(b"\n") + 1  # a batch still being written stays for the next read
+        for line in chunk[:end].splitlines():
+            record = _decode(line)
+            if record is None:
+                continue
+            self._total += 1
+            for name, key in self._counters.items():
+                value = key(record)
+                if value is not None:
+                    self._counts[name][value] += 1
+        self._offset += end
+
+    def counts(self) -> Dict[str, Any]:
+        """{"total": n, <counter name>: {key: count}} over the whole log"""
+        self._migrate_legacy()
+        self.flush()
+        with self._read_lock:
+            self._tail()
+            result: Dict[str, Any] = {"total": self._total}
+            for name, counter in self._counts.items():
+                result[name] = dict(counter)
+            return result
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _encode(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _decode(line) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+_logs: Dict[str, EventLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_event_log(path: str, legacy_json_path: Optional[str] = None) -> EventLog:
+    """Process-wide EventLog for a path"""
+    key = os.path.abspath(path)
+    log = _logs.get(key)
+    if log is None:
+        with _logs_lock:
+            log = _logs.get(key)
+            if log is None:
+                log = _logs[key] = EventLog(path, legacy_json_path=legacy_json_path)
+    return log
+
+
+@atexit.register
+def _flush_all() -> None:
+    for log in list(_logs.values()):
+        log.flush(timeout=2.0)
@@ -5,11 +5,22 @@ CRITICAL FIX: No more 128kg iPhones!
 Includes database of real product weights from manufacturer specifications
 """
 
-import re
 import json
 from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
 
+from backend.utils.title_features import parse_title
+
+# (unit name, spellings, kg per unit), most specific first
+TITLE_WEIGHT_UNITS = (
+    ('kg', ('kg',), 1.0),
+    ('pounds', ('pound', 'pounds'), 0.453592),
+    ('lbs', ('lb', 'lbs'), 0.453592),
+    ('grams', ('g', 'gram', 'grams'), 0.001),
+    ('ounces', ('oz', 'ounce', 'ounces'), 0.0283495),
+)
+
+
 @dataclass
 class WeightResult:
     weight_kg: float
@@ -287,56 +298,34 @@ class FixedWeightParser:
         FIXED weight parsing - no more storage units parsed as weight!
         """
         
-        title_lower = product_title.lower()
-        
-        # CRITICAL FIX: Exclude storage units and other non-weight measurements
-        excluded_patterns = [
-            r'\d+\s*(?:gb|tb|mb|kb)',  # Storage units
-            r'\d+\s*(?:ghz|mhz)',      # Frequency
-            r'\d+\s*(?:mp|megapixel)', # Camera
-            r'\d+\s*(?:inch|")',       # Screen size
-            r'\d+\s*(?:volt|v|amp)',   # Electrical
-        ]
-        
-        # Check if title contains storage units - if so, be extra careful
-        has_storage = any(re.search(pattern, title_lower) for pattern in excluded_patterns)
-        
-        # Weight patterns (in order of preference)
-        weight_patterns = [
-            # Most specific patterns first
-            (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*kg(?:\s|$)', 'kg', 1.0),
-            (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*pound?s?(?:\s|$)', 'pounds', 0.453592),
-            (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*lbs?(?:\s|$)', 'lbs', 0.453592),
-            
-            # Grams - but be very careful not to catch GB!
-            (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*g(?:ram)?s?(?:\s|$|[^b])', 'grams', 0.001),
-            (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*oz(?:unce)?s?(?:\s|$)', 'ounces', 0.0283495),
-        ]
-        
-        for pattern, unit, conversion_factor in weight_patterns:
-            matches = re.findall(pattern, title_lower)
-            
-            if matches:
-                for match in matches:
-                    weight_value = float(match)
-                    weight_kg = weight_value * conversion_factor
-                    
-                    # Sanity checks
-                    if not self._is_reasonable_weight(weight_kg, product_title):
-                        continue
-                    
-                    # If we found storage units, be extra cautious about grams
-                    if has_storage and unit == 'grams' and weight_value > 500:
-                        continue  # Likely a false positive
-                    
-                    confidence = 'very_high' if unit in ['kg', 'pounds'] else 'high'
-                    
-                    return {
-                        'weight_kg': weight_kg,
-                        'confidence': confidence,
-                        'matched_text': f"{weight_value} {unit}",
-                        'conversion_used': f"{weight_value} {unit} = {weight_kg:.3f} kg"
-                    }
+        features = parse_title(product_title)
+        
+        # CRITICAL FIX: storage, frequency, camera, screen and electrical
+        # figures are never weights - if the title has them, be extra careful
+        has_storage = features.has_specs
+        
+        # Weight units in order of preference
+        for unit, spellings, conversion_factor in TITLE_WEIGHT_UNITS:
+            for weight in features.iter_weights(spellings):
+                weight_value = weight.value
+                weight_kg = weight_value * conversion_factor
+                
+                # Sanity checks
+                if not self._is_reasonable_weight(weight_kg, product_title):
+                    continue
+                
+                # If we found storage units, be extra cautious about grams
+                if has_storage and unit == 'grams' and weight_value > 500:
+                    continue  # Likely a false positive
+                
+                confidence = 'very_high' if unit in ['kg', 'pounds'] else 'high'
+                
+                return {
+                    'weight_kg': weight_kg,
+                    'confidence': confidence,
+                    'matched_text': f"{weight_value} {unit}",
+                    'conversion_used': f"{weight_value} {unit} = {weight_kg:.3f} kg"
+                }
         
         return None
     
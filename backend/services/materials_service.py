@@ -2,8 +2,11 @@
 
 import re
 import os
+import threading
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+from backend.utils.phrase_matcher import PhraseMatcher
 
 class EnhancedMaterialsIntelligenceService:
     """
@@ -30,6 +33,7 @@ class EnhancedMaterialsIntelligenceService:
         self.setup_enhanced_keyword_patterns()
         self.setup_brand_intelligence()
         self.setup_price_tier_intelligence()
+        self.compile_phrase_matcher()
     
     def load_material_data(self):
         """Load CO2 intensity data for environmental impact scoring"""
@@ -747,6 +751,55 @@ class EnhancedMaterialsIntelligenceService:
             }
         }
     
+    def compile_phrase_matcher(self):
+        """Compile all keyword, category, brand and price-tier phrases into one matcher"""
+        # Tier 3: per-material keyword weights, kept in declaration order
+        self.material_keyword_weights = {
+            material: [(keyword, len(keyword.split()) * 0.2 + 0.3) for keyword in keywords]
+            for material, keywords in self.material_keywords.items()
+        }
+        self.material_rank = {material: i for i, material in enumerate(self.material_keywords)}
+        self.keyword_to_materials = {}
+        for material, keywords in self.material_keywords.items():
+            for keyword in keywords:
+                self.keyword_to_materials.setdefault(keyword, set()).add(material)
+        
+        # Tier 4: category phrases and their individual words
+        self.category_order = list(self.category_materials)
+        self.category_words = [product_type.split() for product_type in self.category_order]
+        self.phrase_to_categories = {}
+        for i, product_type in enumerate(self.category_order):
+            self.phrase_to_categories.setdefault(product_type, set()).add(i)
+            for word in self.category_words[i]:
+                self.phrase_to_categories.setdefault(word, set()).add(i)
+        self.fuzzy_category_rules = [
+            ('phone', ('mobile', 'cell'), 5),
+            ('laptop', ('notebook', 'computer'), 5),
+            ('shirt', ('tee', 'top'), 3),
+        ]
+        self.fuzzy_category_indexes = {
+            needle: [i for i, product_type in enumerate(self.category_order) if needle in product_type]
+            for needle, _, _ in self.fuzzy_category_rules
+        }
+        
+        phrases = set(self.keyword_to_materials) | set(self.phrase_to_categories)
+        for _, triggers, _ in self.fuzzy_category_rules:
+            phrases.update(triggers)
+        for brand, brand_info in self.brand_materials.items():
+            phrases.add(brand)
+            phrases.update(brand_info)
+        for keywords in self.price_tier_keywords.values():
+            phrases.update(keywords)
+        for tier_materials in self.price_tier_materials.values():
+            phrases.update(tier_materials)
+        self.phrase_matcher = PhraseMatcher(phrases)
+    
+    def match_phrases(self, text: str) -> FrozenSet[str]:
+        """Return every known phrase that occurs in the (lowercased) text"""
+        if not text:
+            return frozenset()
+        return self.phrase_matcher.find_all(text)
+    
     def detect_materials(self, product_data: Dict, amazon_extracted_materials: Dict = None) -> Dict:
         """
         ENHANCED main entry point for 5-tier materials detection
@@ -761,6 +814,7 @@ class EnhancedMaterialsIntelligenceService:
         
         # Try each tier in order of preference
         result = None
+        title_hits = self.match_phrases(product_data.get('title', '').lower())
         
         # Tier 1: Try detailed extraction with percentages
         if amazon_extracted_materials and amazon_extracted_materials.get('materials'):
@@ -768,7 +822,7 @@ class EnhancedMaterialsIntelligenceService:
             if result:
                 result['tier'] = 1
                 result['tier_name'] = 'Detailed with percentages'
-                return self._apply_intelligence_boosts(result, product_data)
+                return self._apply_intelligence_boosts(result, product_data, title_hits)
         
         # Tier 2: Try detailed extraction without percentages
         if amazon_extracted_materials and amazon_extracted_materials.get('materials'):
@@ -776,21 +830,21 @@ class EnhancedMaterialsIntelligenceService:
             if result:
                 result['tier'] = 2
                 result['tier_name'] = 'Detailed materials'
-                return self._apply_intelligence_boosts(result, product_data)
+                return self._apply_intelligence_boosts(result, product_data, title_hits)
         
         # Tier 4: Enhanced category-based intelligent guessing (CHECK BEFORE TIER 3)
-        result = self._tier4_enhanced_category_based(product_data)
+        result = self._tier4_enhanced_category_based(product_data, title_hits)
         if result:
             result['tier'] = 4
             result['tier_name'] = 'Enhanced category prediction'
-            return self._apply_intelligence_boosts(result, product_data)
+            return self._apply_intelligence_boosts(result, product_data, title_hits)
         
         # Tier 3: Enhanced single material detection
-        result = self._tier3_enhanced_single_material(product_data)
+        result = self._tier3_enhanced_single_material(product_data, title_hits)
         if result and result['primary_material'] not in ['Mixed', 'Unknown']:
             result['tier'] = 3
             result['tier_name'] = 'Enhanced keyword detection'
-            return self._apply_intelligence_boosts(result, product_data)
+            return self._apply_intelligence_boosts(result, product_data, title_hits)
         
         # Tier 5: Fallback defaults
         result = self._tier5_fallback()
@@ -798,15 +852,16 @@ class EnhancedMaterialsIntelligenceService:
         result['tier_name'] = 'Fallback default'
         return result
     
-    def _apply_intelligence_boosts(self, result: Dict, product_data: Dict) -> Dict:
+    def _apply_intelligence_boosts(self, result: Dict, product_data: Dict, title_hits: FrozenSet[str] = None) -> Dict:
         """Apply brand and price tier intelligence to boost accuracy"""
-        title = product_data.get('title', '').lower()
+        if title_hits is None:
+            title_hits = self.match_phrases(product_data.get('title', '').lower())
         
         # Check for brand intelligence
         for brand, brand_info in self.brand_materials.items():
-            if brand in title:
+            if brand in title_hits:
                 for product_type, material_info in brand_info.items():
-                    if product_type in title:
+                    if product_type in title_hits:
                         if result['primary_material'].lower() == material_info['primary'].lower():
                             result['confidence'] = min(0.98, result['confidence'] + material_info['confidence_boost'])
                             result['intelligence_applied'] = f'Brand: {brand}'
@@ -816,14 +871,14 @@ class EnhancedMaterialsIntelligenceService:
         # Check for price tier intelligence
         price_tier = None
         for tier, keywords in self.price_tier_keywords.items():
-            if any(keyword in title for keyword in keywords):
+            if any(keyword in title_hits for keyword in keywords):
                 price_tier = tier
                 break
         
         if price_tier and price_tier in self.price_tier_materials:
             tier_materials = self.price_tier_materials[price_tier]
             for product_type, material_info in tier_materials.items():
-                if product_type in title:
+                if product_type in title_hits:
                     if result['primary_material'].lower() == material_info['primary'].lower():
                         result['confidence'] = min(0.98, result['confidence'] + material_info['confidence_boost'])
                         result['intelligence_applied'] = result.get('intelligence_applied', '') + f' Price-tier: {price_tier}'
@@ -891,21 +946,27 @@ class EnhancedMaterialsIntelligenceService:
             'has_percentages': False
         }
     
-    def _tier3_enhanced_single_material(self, product_data: Dict) -> Dict:
+    def _tier3_enhanced_single_material(self, product_data: Dict, title_hits: FrozenSet[str] = None) -> Dict:
         """Enhanced Tier 3: Single material detection with improved keyword matching"""
         title = product_data.get('title', '').lower()
         description = product_data.get('description', '').lower()
-        text = f"{title} {description}"
+        if description or title_hits is None:
+            hits = self.match_phrases(f"{title} {description}")
+        else:
+            hits = title_hits
         
-        # Enhanced keyword matching with confidence scoring
-        material_scores = {}
+        # Enhanced keyword matching with confidence scoring, restricted to
+        # the materials that have at least one keyword in the text
+        candidates = set()
+        for keyword in hits:
+            candidates.update(self.keyword_to_materials.get(keyword, ()))
         
-        for material, keywords in self.material_keywords.items():
+        material_scores = {}
+        for material in sorted(candidates, key=self.material_rank.__getitem__):
+            # Weight longer, more specific keywords higher
             score = 0
-            for keyword in keywords:
-                if keyword in text:
-                    # Weight longer, more specific keywords higher
-                    keyword_weight = len(keyword.split()) * 0.2 + 0.3
+            for keyword, keyword_weight in self.material_keyword_weights[material]:
+                if keyword in hits:
                     score += keyword_weight
             
             if score > 0:
@@ -938,39 +999,46 @@ class EnhancedMaterialsIntelligenceService:
             'has_percentages': False
         }
     
-    def _tier4_enhanced_category_based(self, product_data: Dict) -> Optional[Dict]:
+    def _tier4_enhanced_category_based(self, product_data: Dict, title_hits: FrozenSet[str] = None) -> Optional[Dict]:
         """Enhanced Tier 4: Smart category-based material prediction with fuzzy matching"""
-        title = product_data.get('title', '').lower()
-        category = product_data.get('category', '').lower()
+        if title_hits is None:
+            title_hits = self.match_phrases(product_data.get('title', '').lower())
+        category_hits = self.match_phrases(product_data.get('category', '').lower())
+        hits = title_hits | category_hits
+        
+        # Only categories with an exact, word or fuzzy hit can score above zero
+        candidates = set()
+        for phrase in hits:
+            candidates.update(self.phrase_to_categories.get(phrase, ()))
+        for needle, triggers, _ in self.fuzzy_category_rules:
+            if any(trigger in title_hits for trigger in triggers):
+                candidates.update(self.fuzzy_category_indexes[needle])
         
         # Enhanced matching with fuzzy logic
         best_match = None
         best_score = 0
         
-        for product_type, material_info in self.category_materials.items():
+        for index in sorted(candidates):
+            product_type = self.category_order[index]
             score = 0
             
             # Exact matches get highest score
-            if product_type in title or product_type in category:
+            if product_type in hits:
                 score = 10
             
             # Partial matches (individual words)
-            product_words = product_type.split()
-            for word in product_words:
-                if word in title or word in category:
+            for word in self.category_words[index]:
+                if word in hits:
                     score += 3
             
             # Fuzzy matching for similar terms
-            if 'phone' in product_type and ('mobile' in title or 'cell' in title):
-                score += 5
-            if 'laptop' in product_type and ('notebook' in title or 'computer' in title):
-                score += 5
-            if 'shirt' in product_type and ('tee' in title or 'top' in title):
-                score += 3
+            for needle, triggers, bonus in self.fuzzy_category_rules:
+                if needle in product_type and any(trigger in title_hits for trigger in triggers):
+                    score += bonus
             
             if score > best_score:
                 best_score = score
-                best_match = (product_type, material_info)
+                best_match = (product_type, self.category_materials[product_type])
         
         if best_match and best_score >= 3:  # Minimum threshold
             product_type, material_info = best_match
@@ -1045,6 +1113,22 @@ class EnhancedMaterialsIntelligenceService:
         
         return round(sum(impacts), 2)
 
+# Process-wide shared service: the category, keyword, brand and price-tier
+# tables and the compiled phrase matcher are built once and reused by every call
+_shared_service = None
+_shared_service_lock = threading.Lock()
+
+
+def get_materials_service() -> EnhancedMaterialsIntelligenceService:
+    """Return the shared materials intelligence service, building it on first use"""
+    global _shared_service
+    if _shared_service is None:
+        with _shared_service_lock:
+            if _shared_service is None:
+                _shared_service = EnhancedMaterialsIntelligenceService()
+    return _shared_service
+
+
 # Enhanced convenience function for easy integration (backward compatible)
 def detect_product_materials(product_data: Dict, amazon_materials: Dict = None) -> Dict:
     """
@@ -1057,6 +1141,7 @@ def detect_product_materials(product_data: Dict, amazon_materials: Dict = None)
     - Price-tier intelligence
     - Enhanced fuzzy matching
     - Improved confidence scoring
+    - Shared engine with a precompiled phrase matcher (built once per process)
     
     Usage:
         result = detect_product_materials_enhanced(product_data, amazon_materials)
@@ -1064,8 +1149,7 @@ def detect_product_materials(product_data: Dict, amazon_materials: Dict = None)
         print(f"Tier: {result['tier']} - {result['tier_name']}")
         print(f"Confidence: {result['confidence']:.1%}")
     """
-    service = EnhancedMaterialsIntelligenceService()
-    return service.detect_materials(product_data, amazon_materials)
+    return get_materials_service().detect_materials(product_data, amazon_materials)
 
 # Alias for enhanced version (provides full backward compatibility)
 detect_product_materials_enhanced = detect_product_materials
\ No newline at end of file
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+📤 CHUNKED REPORT EXPORT
+=======================
+
+Writes compliance reports in CSV, gzip-CSV or Parquet without building
+them in memory.
+
+- The dataset is read in slices of chunk_rows rows. The report columns are
+  added to each slice, and each slice is encoded and written before the
+  next one is read. Peak memory is bounded by the chunk size, not by the
+  dataset size
+- Exports run as background jobs. A job is written to a .part file and
+  renamed once complete. Its status is kept in a JSON sidecar, so any
+  worker process can answer status and download requests
+- CSV and gzip-CSV can also be streamed straight into an HTTP response
+  (iter_export_bytes)
+- Parquet needs pyarrow. Each slice becomes one row group
+- Finished exports are removed after EXPORT_TTL_SECONDS
+
+Usage:
+    exporter = get_report_exporter()
+    job = exporter.submit(frame, "csv.gz", extra_columns={"data_quality": "Primary Data"})
+    exporter.job(job.job_id).status  # "queued" -> "running" -> "completed"
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    PARQUET_AVAILABLE = False
+
+# format -> (file extension, mimetype)
+EXPORT_FORMATS = {
+    'csv': ('.csv', 'text/csv'),
+    'csv.gz': ('.csv.gz', 'application/gzip'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+}
+FORMAT_ALIASES = {'gzip': 'csv.gz', 'gz': 'csv.gz', 'csv_gzip': 'csv.gz', 'csv-gzip': 'csv.gz'}
+STREAMABLE_FORMATS = ('csv', 'csv.gz')
+
+CHUNK_ROWS = int(os.environ.get('REPORT_EXPORT_CHUNK_ROWS', 50_000))
+EXPORT_TTL_SECONDS = int(os.environ.get('REPORT_EXPORT_TTL_SECONDS', 24 * 3600))
+
+_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def normalize_format(name: Optional[str]) -> Optional[str]:
+    """Canonical export format for a requested name, or None if unsupported"""
+    name = (name or 'csv').lower()
+    name = FORMAT_ALIASES.get(name, name)
+    return name if name in EXPORT_FORMATS else None
+
+
+def iter_report_chunks(frame: pd.DataFrame, extra_columns: Dict[str, Any], chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Slices of frame with the report columns added (the frame itself is never copied)"""
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows].assign(**extra_columns)
+
+
+def iter_export_bytes(
+    frame: pd.DataFrame,
+    export_format: str,
+    extra_columns: Dict[str, Any],
+    chunk_rows: int = CHUNK_ROWS
+) -> Iterator[bytes]:
+    """Encoded CSV or gzip-CSV report, one chunk at a time"""
+    if export_format not in STREAMABLE_FORMATS:
+        raise ValueError(f"{export_format} cannot be streamed")
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if export_format == 'csv.gz' else None
+    header = True
+    for chunk in iter_report_chunks(frame, extra_columns, chunk_rows):
+        data = chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            yield data
+
+    if header:
+        # No rows: still a valid file with the column names
+        data = frame.iloc[:0].assign(**extra_columns).to_csv(index=False).encode('utf-8')
+        yield compressor.compress(data) + compressor.flush() if compressor is not None else data
+    elif compressor is not None:
+        yield compressor.flush()
+
+
+@dataclass
+class ExportJob:
+    """State of one background export"""
+    job_id: str
+    export_format: str
+    report_type: str
+    filename: str
+    record_count: int
+    status: str = 'queued'  # queued, running, completed, failed
+    rows_written: int = 0
+    bytes_written: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ReportExporter:
+    """Runs chunked exports on a small thread pool and keeps their files and status"""
+
+    def __init__(
+        self,
+        export_dir: Optional[str] = None,
+        max_workers: int = 1,
+        chunk_rows: int = CHUNK_ROWS,
+        ttl_seconds: int = EXPORT_TTL_SECONDS
+    ):
+        self.export_dir = export_dir or os.environ.get('REPORT_EXPORT_DIR') or os.path.join(
+            tempfile.gettempdir(), 'eco_tracker_exports'
+        )
+        self.chunk_rows = chunk_rows
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-export')
+        self._jobs: Dict[str, ExportJob] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    # === Jobs ===
+
+    def submit(
+        self,
+        frame: pd.DataFrame,
+        export_format: str,
+        report_type: str = 'full_analysis',
+        extra_columns: Optional[Dict[str, Any]] = None,
+        filename: Optional[str] = None
+    ) -> ExportJob:
+        """Queue an export of frame; returns at once with the queued job"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        if export_format == 'parquet' and not PARQUET_AVAILABLE:
+            raise ValueError("Parquet export requires pyarrow")
+
+        os.makedirs(self.export_dir, exist_ok=True)
+        self.cleanup()
+
+        extension = EXPORT_FORMATS[export_format][0]
+        job = ExportJob(
+            job_id=uuid.uuid4().hex,
+            export_format=export_format,
+            report_type=report_type,
+            filename=filename or f"report{extension}",
+            record_count=len(frame)
+        )
+        self._save(job)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._futures[job.job_id] = self._executor.submit(self._run, job, frame, dict(extra_columns or {}))
+        return job
+
+    def job(self, job_id: str) -> Optional[ExportJob]:
+        """Job by id, including jobs started by other worker processes"""
+        if not _JOB_ID.match(job_id or ''):
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        try:
+            with open(self._status_path(job_id), encoding='utf-8') as f:
+                return ExportJob(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[ExportJob]:
+        """Block until a job of this process has finished"""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout)
+        return self.job(job_id)
+
+    def file_path(self, job: ExportJob) -> str:
+        return os.path.join(self.export_dir, job.job_id + EXPORT_FORMATS[job.export_format][0])
+
+    def mimetype(self, job: ExportJob) -> str:
+        return EXPORT_FORMATS[job.export_format][1]
+
+    # === Writing ===
+
+    def _run(self, job: ExportJob, frame: pd.DataFrame, extra_columns: Dict[str, Any]) -> None:
+        path = self.file_path(job)
+        part_path = path + '.part'
+        job.status, job.started_at = 'running', time.time()
+        self._save(job)
+        try:
+            if job.export_format == 'parquet':
+                self._write_parquet(job, frame, extra_columns, part_path)
+            else:
+                with open(part_path, 'wb') as f:
+                    for data in iter_export_bytes(frame, job.export_format, extra_columns, self.chunk_rows):
+                        f.write(data)
+                        job.bytes_written += len(data)
+                job.rows_written = len(frame)
+            os.replace(part_path, path)
+            job.status = 'completed'
+            print(f"📤 Export {job.job_id} written: {job.rows_written} rows, {job.bytes_written} bytes")
+        except Exception as e:
+            job.status, job.error = 'failed', str(e)
+            print(f"❌ Export {job.job_id} failed: {e}")
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        finally:
+            job.finished_at = time.time()
+            self._save(job)
+            with self._lock:
+                self._futures.pop(job.job_id, None)
+
+    def _write_parquet(self, job: ExportJob, frame: pd.DataFrame, extra_columns: Dict[str, Any], part_path: str) -> None:
+        writer = None
+        try:
+            for chunk in iter_report_chunks(frame, extra_columns, self.chunk_rows):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(part_path, table.schema)
+                writer.write_table(table)
+                job.rows_written += len(chunk)
+            if writer is None:
+                empty = pa.Table.from_pandas(frame.iloc[:0].assign(**extra_columns), preserve_index=False)
+                writer = pq.ParquetWriter(part_path, empty.schema)
+        finally:
+            if writer is not None:
+                writer.close()
+        job.bytes_written = os.path.getsize(part_path)
+
+    # === Status files ===
+
+    def _status_path(self, job_id: str) -> str:
+        return os.path.join(self.export_dir, job_id + '.json')
+
+    def _save(self, job: ExportJob) -> None:
+        tmp_path = f"{self._status_path(job.job_id)}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job.to_dict(), f)
+        os.replace(tmp_path, self._status_path(job.job_id))
+
+    def cleanup(self) -> int:
+        """Remove finished exports older than the TTL; returns how many were removed"""
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        try:
+            names = os.listdir(self.export_dir)
+        except OSError:
+            return 0
+        for name in names:
+            job_id = name.split('.')[0]
+            if not name.endswith('.json') or not _JOB_ID.match(job_id):
+                continue
+            job = self.job(job_id)
+            if job is None or job.finished_at is None or job.finished_at > cutoff:
+                continue
+            for path in (self.file_path(job), self._status_path(job_id)):
+                if os.path.exists(path):
+                    os.remove(path)
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            removed += 1
+        return removed
+
+
+_exporter: Optional[ReportExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_report_exporter() -> ReportExporter:
+    """Process-wide ReportExporter"""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = ReportExporter()
+    return _exporter
@@ -11,6 +11,9 @@ Key Features:
 - Competitive positioning insights
 - Market leader identification
 - Improvement opportunity quantification
+- Industry distributions served from a precomputed, memory-mapped
+  benchmark cube (see benchmark_cube.py), so portfolios of any size are
+  ranked in one vectorized pass
 
 Business Impact:
 - Transforms from "carbon tracking" to "competitive intelligence"
@@ -27,7 +30,11 @@ from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
-import statistics
+
+try:
+    from .benchmark_cube import BenchmarkCube, load_or_build_cube
+except ImportError:
+    from benchmark_cube import BenchmarkCube, load_or_build_cube
 
 @dataclass
 class BenchmarkMetric:
@@ -56,9 +63,12 @@ class SupplyChainBenchmarkingEngine:
     into competitive intelligence and strategic insights.
     """
     
-    def __init__(self, data_path: str = None):
+    def __init__(self, data_path: str = None, cube_dir: str = None):
         self.data_path = data_path or "/Users/jamie/Documents/University/dsp_eco_tracker/common/data"
+        self.cube_dir = cube_dir
         self.industry_classifications = self._load_industry_classifications()
+        # Per-product industry distributions; None when running on the fallback data
+        self.benchmark_cube: Optional[BenchmarkCube] = None
         self.benchmarking_data = self._initialize_benchmarking_data()
         
     def _load_industry_classifications(self) -> Dict[str, List[str]]:
@@ -101,46 +111,13 @@ class SupplyChainBenchmarkingEngine:
     def _initialize_benchmarking_data(self) -> Dict[str, Dict]:
         """Initialize industry benchmarking data from your dataset."""
         try:
-            df = pd.read_csv(f"{self.data_path}/csv/enhanced_eco_dataset.csv")
-            
-            # Create industry benchmarks from your real data
-            industry_data = {}
-            
-            for industry, categories in self.industry_classifications.items():
-                # Filter products that match this industry
-                industry_mask = df['inferred_category'].str.lower().str.contains(
-                    '|'.join(categories), case=False, na=False
-                )
-                industry_products = df[industry_mask]
-                
-                if len(industry_products) > 0:
-                    industry_data[industry] = {
-                        'carbon_footprint': {
-                            'mean': industry_products['co2_emissions'].mean(),
-                            'median': industry_products['co2_emissions'].median(),
-                            'std': industry_products['co2_emissions'].std(),
-                            'percentiles': {
-                                '10': industry_products['co2_emissions'].quantile(0.1),
-                                '25': industry_products['co2_emissions'].quantile(0.25),
-                                '75': industry_products['co2_emissions'].quantile(0.75),
-                                '90': industry_products['co2_emissions'].quantile(0.9),
-                                '95': industry_products['co2_emissions'].quantile(0.95)
-                            }
-                        },
-                        'recyclability_score': {
-                            'high_percentage': (industry_products['recyclability'] == 'High').mean() * 100,
-                            'medium_percentage': (industry_products['recyclability'] == 'Medium').mean() * 100,
-                            'low_percentage': (industry_products['recyclability'] == 'Low').mean() * 100
-                        },
-                        'weight_efficiency': {
-                            'mean': industry_products['weight'].mean(),
-                            'median': industry_products['weight'].median()
-                        },
-                        'sample_size': len(industry_products),
-                        'top_performers': industry_products.nsmallest(5, 'co2_emissions')[['title', 'co2_emissions', 'origin']].to_dict('records')
-                    }
-            
-            return industry_data
+            # Built once per dataset version and shared by every worker through the cube file
+            self.benchmark_cube = load_or_build_cube(
+                f"{self.data_path}/csv/enhanced_eco_dataset.csv",
+                self.industry_classifications,
+                self.cube_dir
+            )
+            return self.benchmark_cube.summaries
             
         except Exception as e:
             print(f"Warning: Could not load benchmarking data: {e}")
@@ -196,11 +173,34 @@ class SupplyChainBenchmarkingEngine:
     
     def calculate_percentile_rank(self, value: float, distribution: List[float]) -> float:
         """Calculate percentile rank of a value within a distribution."""
-        if not distribution:
+        distribution = np.asarray(distribution, dtype=float)
+        if not len(distribution):
             return 50.0
         
-        rank = sum(1 for x in distribution if x <= value) / len(distribution) * 100
-        return min(max(rank, 0), 100)
+        rank = np.count_nonzero(distribution <= value) / len(distribution) * 100
+        return float(min(max(rank, 0), 100))
+    
+    def calculate_percentile_ranks(self, industry: str, metric: str, values) -> np.ndarray:
+        """
+        Percentile ranks of many values within an industry distribution, where
+        lower values are better (share of peers doing no better, like carbon).
+        
+        Exact ranks by binary search in the benchmark cube; without a cube, the
+        same bands as _calculate_inverse_percentile.
+        """
+        values = np.asarray(values, dtype=float)
+        if self.benchmark_cube is not None and self.benchmark_cube.has_distribution(industry, metric):
+            return self.benchmark_cube.inverse_percentile_ranks(industry, metric, values)
+        
+        distribution_data = self.benchmarking_data.get(industry, {}).get(metric, {})
+        percentiles = distribution_data.get('percentiles', {})
+        thresholds = [
+            percentiles.get('10', float('inf')),
+            percentiles.get('25', float('inf')),
+            distribution_data.get('median', float('inf')),
+            percentiles.get('75', float('inf'))
+        ]
+        return np.select([values <= t for t in thresholds], [90, 75, 50, 25], default=10).astype(float)
     
     def get_peer_position(self, percentile: float) -> str:
         """Convert percentile to human-readable position."""
@@ -231,12 +231,13 @@ class SupplyChainBenchmarkingEngine:
         company_name = company_data.get('company_name', 'Unknown Company')
         products = company_data.get('products', [])
         
-        if not products:
+        if products is None or len(products) == 0:
             raise ValueError("No products provided for benchmarking")
         
-        # Classify into industry
-        categories = [p.get('category', '') for p in products]
-        industry = self.classify_industry(categories)
+        portfolio = self._portfolio_arrays(products)
+        
+        # Classify into industry (each distinct category once)
+        industry = self.classify_industry(portfolio['categories'])
         
         # Get industry benchmark data
         if industry not in self.benchmarking_data:
@@ -244,14 +245,13 @@ class SupplyChainBenchmarkingEngine:
         
         industry_data = self.benchmarking_data.get(industry, {})
         
-        # Calculate company metrics
-        company_carbon = [p.get('carbon_kg', 0) for p in products if p.get('carbon_kg')]
-        company_weights = [p.get('weight', 0) for p in products if p.get('weight')]
-        company_recyclability = [p.get('recyclability', 'Low') for p in products]
+        # Calculate company metrics (missing or zero values are left out of the averages)
+        company_carbon = portfolio['carbon_kg']
+        company_weights = portfolio['weight']
         
-        avg_carbon = statistics.mean(company_carbon) if company_carbon else 0
-        avg_weight = statistics.mean(company_weights) if company_weights else 0
-        high_recyclability_pct = (company_recyclability.count('High') / len(company_recyclability) * 100) if company_recyclability else 0
+        avg_carbon = float(company_carbon.mean()) if len(company_carbon) else 0
+        avg_weight = float(company_weights.mean()) if len(company_weights) else 0
+        high_recyclability_pct = float(portfolio['high_recyclability'].mean() * 100)
         
         # Create benchmark metrics
         metrics = {}
@@ -304,8 +304,12 @@ class SupplyChainBenchmarkingEngine:
         # Generate improvement opportunities
         improvement_opportunities = self._generate_improvement_opportunities(metrics, products)
         
-        # Peer comparison data
-        peer_comparison = self._generate_peer_comparison(industry_data, metrics)
+        # Peer comparison data, with every product ranked against the industry
+        product_ranks = {
+            'carbon_footprint': self.calculate_percentile_ranks(industry, 'carbon_footprint', company_carbon),
+            'weight_efficiency': self.calculate_percentile_ranks(industry, 'weight_efficiency', company_weights)
+        }
+        peer_comparison = self._generate_peer_comparison(industry_data, metrics, product_ranks)
         
         return IndustryBenchmark(
             industry=industry,
@@ -317,6 +321,34 @@ class SupplyChainBenchmarkingEngine:
             improvement_opportunities=improvement_opportunities
         )
     
+    def _portfolio_arrays(self, products) -> Dict[str, any]:
+        """
+        Portfolio columns as arrays, from a list of product dicts or a DataFrame
+        with category, carbon_kg, weight and recyclability columns.
+        """
+        if isinstance(products, pd.DataFrame):
+            count = len(products)
+            column = lambda name, default: (
+                products[name].to_numpy() if name in products.columns else np.full(count, default, dtype=object)
+            )
+            categories = column('category', '')
+            carbon = pd.to_numeric(pd.Series(column('carbon_kg', 0)), errors='coerce').to_numpy(dtype=float)
+            weights = pd.to_numeric(pd.Series(column('weight', 0)), errors='coerce').to_numpy(dtype=float)
+            recyclability = column('recyclability', 'Low')
+        else:
+            count = len(products)
+            categories = [p.get('category', '') for p in products]
+            carbon = np.fromiter((p.get('carbon_kg') or 0 for p in products), dtype=float, count=count)
+            weights = np.fromiter((p.get('weight') or 0 for p in products), dtype=float, count=count)
+            recyclability = np.array([p.get('recyclability', 'Low') for p in products], dtype=object)
+        
+        return {
+            'categories': [c for c in dict.fromkeys(categories) if isinstance(c, str)],
+            'carbon_kg': carbon[(carbon != 0) & ~np.isnan(carbon)],
+            'weight': weights[(weights != 0) & ~np.isnan(weights)],
+            'high_recyclability': recyclability == 'High'
+        }
+    
     def _calculate_inverse_percentile(self, value: float, distribution_data: Dict) -> float:
         """Calculate percentile where lower values are better (like carbon emissions)."""
         percentiles = distribution_data.get('percentiles', {})
@@ -427,8 +459,18 @@ class SupplyChainBenchmarkingEngine:
         
         return opportunities
     
-    def _generate_peer_comparison(self, industry_data: Dict, metrics: Dict[str, BenchmarkMetric]) -> Dict[str, any]:
+    def _generate_peer_comparison(self, industry_data: Dict, metrics: Dict[str, BenchmarkMetric],
+                                  product_ranks: Dict[str, np.ndarray] = None) -> Dict[str, any]:
         """Generate peer comparison visualization data."""
+        portfolio_distribution = {
+            metric: {
+                'products_ranked': int(len(ranks)),
+                'median_percentile': float(np.median(ranks)),
+                'top_25_percent_share': float((ranks >= 75).mean() * 100),
+                'bottom_25_percent_share': float((ranks < 25).mean() * 100)
+            }
+            for metric, ranks in (product_ranks or {}).items() if len(ranks)
+        }
         return {
             'industry_sample_size': industry_data.get('sample_size', 0),
             'your_position': {
@@ -437,6 +479,7 @@ class SupplyChainBenchmarkingEngine:
                 'overall_score': self._calculate_overall_score(metrics)
             },
             'industry_leaders': industry_data.get('top_performers', []),
+            'portfolio_distribution': portfolio_distribution,
             'benchmarking_date': datetime.now().isoformat()
         }
     
@@ -7,7 +7,8 @@ This system optimizes transportation decisions across the entire supply chain:
 - Real-time modal shift recommendations
 - Cost vs carbon trade-off analysis  
 - Delivery time constraint optimization
-- Multi-modal route planning
+- Multi-modal route planning (hop-bounded Pareto search over carbon, cost,
+  time and reliability on an adjacency index of the network)
 - Dynamic routing based on cargo type and urgency
 
 Features:
@@ -25,7 +26,9 @@ from dataclasses import dataclass, field
 from enum import Enum
 import random
 from datetime import datetime, timedelta
+from collections import defaultdict
 import heapq
+import itertools
 
 class TransportMode(Enum):
     OCEAN_FREIGHT = "ocean_freight"
@@ -84,6 +87,33 @@ class OptimizationConstraints:
     prefer_renewable_energy: bool = False
     max_handling_points: int = 3
 
+@dataclass
+class RouteLabel:
+    """Partial path in the multi-objective route search (per tonne of cargo)"""
+    carbon_g_per_tonne: float
+    cost_per_tonne: float
+    time_hours: float
+    risk: float  # -log(reliability), so it adds up along the path
+    path: Tuple[TransportRoute, ...]
+    
+    @property
+    def continuation_rank(self) -> int:
+        """How many next legs this label allows: 2 any, 1 no ocean (after air), 0 none (after short ocean)"""
+        last = self.path[-1]
+        if last.transport_mode == TransportMode.OCEAN_FREIGHT and last.distance_km < 500:
+            return 0
+        if last.transport_mode == TransportMode.AIR_FREIGHT:
+            return 1
+        return 2
+    
+    def dominates(self, other: "RouteLabel") -> bool:
+        return (self.carbon_g_per_tonne <= other.carbon_g_per_tonne and
+                self.cost_per_tonne <= other.cost_per_tonne and
+                self.time_hours <= other.time_hours and
+                self.risk <= other.risk and
+                len(self.path) <= len(other.path) and
+                self.continuation_rank >= other.continuation_rank)
+
 @dataclass
 class OptimizedRoute:
     """Result of route optimization"""
@@ -179,6 +209,7 @@ class TransportationOptimizationEngine:
         
         # Load global transport network
         self.transport_network = self._build_global_transport_network()
+        self.rebuild_route_index()
         
         print(f"✅ Loaded transport network with {len(self.transport_network)} routes")
         print("🎯 Transportation optimization engine ready!")
@@ -320,6 +351,34 @@ class TransportationOptimizationEngine:
         print(f"📦 Cargo: {cargo_weight_kg}kg ({cargo_type.value})")
         print(f"⏱️ Urgency: {constraints.urgency_level.value}")
         
+        return self._optimize_route(origin, destination, cargo_weight_kg, cargo_type, constraints)
+    
+    def optimize_routes(self, pairs: List[Tuple[str, str]],
+                        cargo_weight_kg: float, cargo_type: CargoType,
+                        constraints: OptimizationConstraints) -> List[Optional[OptimizedRoute]]:
+        """
+        Optimize many origin → destination pairs with shared cargo and constraints
+        
+        Pairs from the same origin reuse one memoized search tree.
+        
+        Returns:
+            Optimized routes in the order of pairs, None where no viable route exists
+        """
+        
+        print(f"🎯 Optimizing {len(pairs)} routes for {cargo_weight_kg}kg ({cargo_type.value}), "
+              f"urgency {constraints.urgency_level.value}")
+        
+        results = []
+        for origin, destination in pairs:
+            try:
+                results.append(self._optimize_route(origin, destination, cargo_weight_kg, cargo_type, constraints))
+            except ValueError:
+                results.append(None)
+        return results
+    
+    def _optimize_route(self, origin: str, destination: str,
+                        cargo_weight_kg: float, cargo_type: CargoType,
+                        constraints: OptimizationConstraints) -> OptimizedRoute:
         # Find all possible routes
         possible_routes = self._find_possible_routes(origin, destination, cargo_type, constraints)
         
@@ -358,55 +417,97 @@ class TransportationOptimizationEngine:
             recommendations=recommendations
         )
     
+    def rebuild_route_index(self):
+        """Index transport_network by (origin, cargo type); call after changing the network"""
+        
+        route_index: Dict[Tuple[str, CargoType], List[TransportRoute]] = defaultdict(list)
+        for route in self.transport_network:
+            for cargo_type in self.cargo_compatibility.get(route.transport_mode, set()):
+                route_index[(route.origin, cargo_type)].append(route)
+        
+        self.route_index = dict(route_index)
+        self._search_trees: Dict[Tuple[str, CargoType, int], Dict[str, List[RouteLabel]]] = {}
+    
     def _find_possible_routes(self, origin: str, destination: str, 
                             cargo_type: CargoType, constraints: OptimizationConstraints) -> List[List[TransportRoute]]:
         """Find all possible routes considering constraints"""
         
-        # Direct routes
-        direct_routes = [route for route in self.transport_network 
-                        if route.origin == origin and route.destination == destination
-                        and cargo_type in self.cargo_compatibility.get(route.transport_mode, set())]
+        return self.find_pareto_routes(origin, destination, cargo_type, constraints)
+    
+    def find_pareto_routes(self, origin: str, destination: str,
+                           cargo_type: CargoType, constraints: OptimizationConstraints) -> List[List[TransportRoute]]:
+        """
+        Pareto-optimal routes over carbon, cost, transit time and reliability
         
-        possible_routes = [[route] for route in direct_routes]
+        Routes have at most constraints.max_handling_points legs (one leg
+        without multi-modal). Every route that is best for some weighting of
+        the criteria is on the front, so _calculate_route_score's optimum is too.
         
-        # Multi-modal routes (if allowed)
-        if constraints.allow_multi_modal and constraints.max_handling_points > 1:
-            multi_modal_routes = self._find_multi_modal_routes(origin, destination, cargo_type, constraints)
-            possible_routes.extend(multi_modal_routes)
+        Returns:
+            Route segment lists, fewest legs first
+        """
         
-        return possible_routes
+        max_legs = max(1, constraints.max_handling_points) if constraints.allow_multi_modal else 1
+        labels = self._search_tree(origin, cargo_type, max_legs).get(destination, [])
+        labels = sorted(labels, key=lambda l: (len(l.path), l.carbon_g_per_tonne, l.cost_per_tonne, l.time_hours))
+        return [list(label.path) for label in labels]
     
-    def _find_multi_modal_routes(self, origin: str, destination: str,
-                               cargo_type: CargoType, constraints: OptimizationConstraints) -> List[List[TransportRoute]]:
-        """Find multi-modal transportation routes"""
+    def _search_tree(self, origin: str, cargo_type: CargoType, max_legs: int) -> Dict[str, List[RouteLabel]]:
+        """Memoized Pareto labels from origin to every reachable location"""
         
-        multi_modal_routes = []
+        key = (origin, cargo_type, max_legs)
+        if key not in self._search_trees:
+            self._search_trees[key] = self._label_setting_search(origin, cargo_type, max_legs)
+        return self._search_trees[key]
+    
+    def _label_setting_search(self, origin: str, cargo_type: CargoType, max_legs: int) -> Dict[str, List[RouteLabel]]:
+        """
+        Multi-objective Dijkstra (label setting) from origin, bounded to max_legs
         
-        # Find intermediate hubs
-        potential_hubs = set()
-        for route in self.transport_network:
-            if route.origin == origin:
-                potential_hubs.add(route.destination)
-        
-        for hub in potential_hubs:
-            # First leg: origin to hub
-            first_leg_routes = [route for route in self.transport_network
-                              if route.origin == origin and route.destination == hub
-                              and cargo_type in self.cargo_compatibility.get(route.transport_mode, set())]
-            
-            # Second leg: hub to destination
-            second_leg_routes = [route for route in self.transport_network
-                               if route.origin == hub and route.destination == destination
-                               and cargo_type in self.cargo_compatibility.get(route.transport_mode, set())]
-            
-            # Combine legs
-            for first_route in first_leg_routes:
-                for second_route in second_leg_routes:
-                    # Check if combination makes sense (no same mode back-to-back inefficiently)
-                    if self._is_valid_multi_modal_combination(first_route, second_route):
-                        multi_modal_routes.append([first_route, second_route])
+        Labels are settled in lexicographic order of their objectives, so a
+        label that is not dominated when popped stays on its location's front.
+        """
         
-        return multi_modal_routes[:10]  # Limit to prevent explosion
+        settled: Dict[str, List[RouteLabel]] = defaultdict(list)
+        sequence = itertools.count()
+        heap = []
+        
+        def push(label: RouteLabel):
+            heapq.heappush(heap, (
+                (label.carbon_g_per_tonne, label.cost_per_tonne, label.time_hours, label.risk, len(label.path)),
+                next(sequence), label
+            ))
+        
+        def extend(label: Optional[RouteLabel], node: str):
+            path = label.path if label else ()
+            visited = {origin}.union(segment.destination for segment in path)
+            for route in self.route_index.get((node, cargo_type), []):
+                if route.destination in visited:
+                    continue
+                if path and not self._is_valid_multi_modal_combination(path[-1], route):
+                    continue
+                candidate = RouteLabel(
+                    carbon_g_per_tonne=(label.carbon_g_per_tonne if label else 0.0) + route.carbon_intensity_g_per_tonne_km * route.distance_km,
+                    cost_per_tonne=(label.cost_per_tonne if label else 0.0) + route.cost_per_tonne_km * route.distance_km,
+                    # 4 hours handling per transfer, as in _calculate_route_score
+                    time_hours=(label.time_hours + 4 if label else 0.0) + route.transit_time_hours,
+                    risk=(label.risk if label else 0.0) - math.log(route.reliability_score),
+                    path=path + (route,)
+                )
+                if not any(other.dominates(candidate) for other in settled[route.destination]):
+                    push(candidate)
+        
+        extend(None, origin)
+        while heap:
+            _, _, label = heapq.heappop(heap)
+            node = label.path[-1].destination
+            if any(other.dominates(label) for other in settled[node]):
+                continue
+            settled[node].append(label)
+            if len(label.path) < max_legs:
+                extend(label, node)
+        
+        return dict(settled)
     
     def _is_valid_multi_modal_combination(self, first_route: TransportRoute, second_route: TransportRoute) -> bool:
         """Check if multi-modal combination is logically valid"""
@@ -502,9 +603,8 @@ class TransportationOptimizationEngine:
     def _get_baseline_route(self, origin: str, destination: str, cargo_type: CargoType) -> TransportRoute:
         """Get baseline route (typically fastest direct route)"""
         
-        compatible_routes = [route for route in self.transport_network
-                           if route.origin == origin and route.destination == destination
-                           and cargo_type in self.cargo_compatibility.get(route.transport_mode, set())]
+        compatible_routes = [route for route in self.route_index.get((origin, cargo_type), [])
+                           if route.destination == destination]
         
         if not compatible_routes:
             # Create a default air freight route for comparison
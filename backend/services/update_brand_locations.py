@@ -63,6 +63,13 @@ def update_brand_locations():
     
     print(f"✅ Updated brand_locations.json with {len(existing_brands)} total brands")
     
+    # Evict cached responses whose origin came from the old brand DB
+    try:
+        from backend.core.caching import dataset_tag, invalidate_cache_tags
+        invalidate_cache_tags(dataset_tag("brand_locations"))
+    except Exception as e:
+        print(f"⚠️ Could not invalidate cached responses: {e}")
+    
     # Statistics
     categories = {}
     amazon_specific = 0
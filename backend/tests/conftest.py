@@ -16,9 +16,17 @@ import numpy as np
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+_event_log_dir = None
+
 # Test markers
 def pytest_configure(config):
     """Configure custom test markers"""
+    global _event_log_dir
+    # Keep the app's submission and feedback logs out of the repository
+    if "EVENT_LOG_DIR" not in os.environ:
+        _event_log_dir = tempfile.TemporaryDirectory(prefix="event_logs_")
+        os.environ["EVENT_LOG_DIR"] = _event_log_dir.name
+
     config.addinivalue_line(
         "markers", "unit: Unit tests for individual components"
     )
@@ -35,6 +43,15 @@ def pytest_configure(config):
         "markers", "network: Tests requiring network access"
     )
 
+def pytest_unconfigure(config):
+    """Remove the temporary event log directory"""
+    if _event_log_dir is not None:
+        event_log = sys.modules.get("backend.services.event_log")
+        if event_log is not None:
+            event_log._flush_all()
+        os.environ.pop("EVENT_LOG_DIR", None)
+        _event_log_dir.cleanup()
+
 # Test Data Fixtures
 
 @pytest.fixture
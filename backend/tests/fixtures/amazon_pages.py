@@ -0,0 +1,46 @@
+"""
+Synthetic Amazon product pages for scraper tests and benchmarks.
+
+The layout mirrors the sections the production scraper reads (title,
+byline, tech-spec table, detail bullets, feature bullets) padded with
+review/recommendation markup to a realistic page size.
+"""
+
+
+def build_product_page(
+    title: str = "Grenade Protein Powder, Chocolate Chip Salted Caramel, 480 g",
+    brand: str = "Grenade",
+    item_weight: str = "480 Grams",
+    country_of_origin: str = "United Kingdom",
+    filler_blocks: int = 0
+) -> str:
+    filler = "".join(
+        f'<div class="a-section review" id="review-{i}">'
+        f'<span class="a-profile-name">Customer {i}</span>'
+        f'<span class="review-text">Great taste, mixes well with milk or water. Would buy again {i}.</span>'
+        f'<ul class="a-unordered-list"><li><span class="a-list-item">Helpful ({i})</span></li></ul>'
+        f'</div>'
+        for i in range(filler_blocks)
+    )
+    return f"""<!DOCTYPE html>
+<html><head><title>Amazon.co.uk: {title}</title></head>
+<body>
+<div id="wayfinding-breadcrumbs"><a>Health &amp; Personal Care</a><a>Sports Nutrition</a></div>
+<h1 class="a-spacing-none"><span id="productTitle">  {title}  </span></h1>
+<a id="bylineInfo">{brand}</a>
+<div id="feature-bullets"><ul class="a-unordered-list">
+  <li><span class="a-list-item">22 g of protein per serving</span></li>
+  <li><span class="a-list-item">Low in sugar, high in flavour</span></li>
+</ul></div>
+<table id="productDetails_techSpec_section_1">
+  <tr><th>Brand</th><td>Grenade</td></tr>
+  <tr><th>Item Weight</th><td>&lrm;{item_weight}</td></tr>
+  <tr><th>Flavour</th><td>Chocolate Chip Salted Caramel</td></tr>
+</table>
+<div id="detailBullets_feature_div"><ul>
+  <li><span class="a-list-item"><span class="a-text-bold">Country of origin &rlm; : &lrm;</span><span>{country_of_origin}</span></span></li>
+  <li><span class="a-list-item"><span class="a-text-bold">ASIN &rlm; : &lrm;</span><span>B0CKFK6716</span></span></li>
+</ul></div>
+<div id="productDescription"><p>Protein powder for muscle recovery.</p></div>
+{filler}
+</body></html>"""
@@ -0,0 +1,143 @@
+"""
+Local stub of amazon.co.uk for offline crawler tests and benchmarks.
+
+Serves search result pages (/s?k=term&page=n) linking to deterministic
+ASINs, and product pages (/dp/<ASIN>) either from a directory of saved
+pages (<ASIN>.html) or generated by build_product_page. Each response can
+be delayed to simulate network latency, and chosen ASINs can be served a
+CAPTCHA page a number of times before succeeding.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .amazon_pages import build_product_page
+
+CAPTCHA_PAGE = (
+    "<html><head><title>Amazon.co.uk</title></head><body>"
+    "<form action='/errors/validateCaptcha'><p>Type the characters you see in this image</p></form>"
+    "</body></html>"
+)
+
+
+def search_asins(term: str, page: int, per_page: int) -> List[str]:
+    """Deterministic ASINs for a search page"""
+    asins = []
+    for i in range(per_page):
+        digest = hashlib.md5(f"{term}:{page}:{i}".encode()).hexdigest().upper()
+        asins.append("B0" + digest[:8])
+    return asins
+
+
+class StubAmazonServer:
+    """Threaded HTTP server on 127.0.0.1 with an ephemeral port"""
+
+    def __init__(
+        self,
+        results_per_page: int = 20,
+        latency: float = 0.0,
+        pages_dir: Optional[str] = None,
+        captcha_asins: Optional[Dict[str, int]] = None,
+        filler_blocks: int = 50
+    ):
+        self.results_per_page = results_per_page
+        self.latency = latency
+        self.pages_dir = pages_dir
+        self.captcha_remaining = dict(captcha_asins or {})
+        self.filler_blocks = filler_blocks
+        self.requests: List[tuple] = []
+        self._lock = threading.Lock()
+        self._page_cache: Dict[str, bytes] = {}
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, body = stub.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def search_url_template(self) -> str:
+        return self.base_url + "/s?k={term}&page={page}"
+
+    def _product_page(self, asin: str) -> bytes:
+        if asin not in self._page_cache:
+            saved = os.path.join(self.pages_dir, f"{asin}.html") if self.pages_dir else None
+            if saved and os.path.exists(saved):
+                with open(saved, "rb") as f:
+                    self._page_cache[asin] = f.read()
+            else:
+                html = build_product_page(
+                    title=f"Stub Product {asin} Stainless Steel Bottle 750ml",
+                    filler_blocks=self.filler_blocks
+                )
+                self._page_cache[asin] = html.encode()
+        return self._page_cache[asin]
+
+    def respond(self, path: str):
+        with self._lock:
+            self.requests.append((time.monotonic(), path))
+        if self.latency:
+            time.sleep(self.latency)
+
+        parsed = urlparse(path)
+        if parsed.path == "/s":
+            query = parse_qs(parsed.query)
+            term = query.get("k", [""])[0]
+            page = int(query.get("page", ["1"])[0])
+            links = "".join(
+                f'<div data-asin="{asin}"><h2><a href="/Stub-Product/dp/{asin}/ref=sr_1_{i}">Stub {asin}</a></h2></div>'
+                for i, asin in enumerate(search_asins(term, page, self.results_per_page))
+            )
+            body = (
+                f"<html><head><title>Amazon.co.uk : {term}</title></head><body>"
+                f"<div class='s-main-slot'>{links}</div>"
+                f"<p>{'Results for your search. ' * 10}</p></body></html>"
+            )
+            return 200, body.encode()
+
+        if parsed.path.startswith("/dp/") or "/dp/" in parsed.path:
+            asin = parsed.path.split("/dp/")[1].split("/")[0]
+            with self._lock:
+                if self.captcha_remaining.get(asin, 0) > 0:
+                    self.captcha_remaining[asin] -= 1
+                    return 200, CAPTCHA_PAGE.encode()
+            return 200, self._product_page(asin)
+
+        return 404, b"<html><head><title>Not Found</title></head><body>Page not found</body></html>"
+
+    def start(self) -> "StubAmazonServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
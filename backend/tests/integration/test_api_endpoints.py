@@ -8,9 +8,8 @@ import pytest
 import sys
 import os
 import json
-import tempfile
+from contextlib import contextmanager
 from unittest.mock import Mock, patch, MagicMock
-import requests
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
@@ -18,9 +17,22 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 # Import Flask app
 try:
     from backend.api.app import app
+    app_module = sys.modules['backend.api.app']
 except ImportError:
     # Fallback if imports fail
     app = None
+    app_module = None
+
+SCRAPED_PRODUCT = {
+    'title': 'USN Pure Protein GF-1 Growth & Repair Protein Powder, Chocolate Flavour, 476g',
+    'weight_kg': 0.476,
+    'origin': 'South Africa',
+    'country_of_origin': 'South Africa',
+    'material_type': 'Plastic',
+    'materials': {'primary_material': 'Plastic'},
+    'recyclability': 'Medium',
+    'brand': 'USN'
+}
 
 
 @pytest.fixture
@@ -28,16 +40,45 @@ def client():
     """Flask test client"""
     if app is None:
         pytest.skip("Flask app not available for testing")
-    
+
     app.config['TESTING'] = True
     app.config['WTF_CSRF_ENABLED'] = False
-    
+    # Responses are cached per ASIN + postcode district; start every test cold
+    app_module.emissions_cache.clear_local()
+
     with app.test_client() as client:
         with app.app_context():
             yield client
 
 
-@pytest.fixture 
+@pytest.fixture
+def scraper():
+    """
+    Offline /estimate_emissions: the pooled production scraper, the fallback
+    scrapers and the postcode geocoder are mocked, so nothing leaves the box
+    """
+    scraper = Mock()
+    scraper.scrape_with_full_url.return_value = dict(SCRAPED_PRODUCT)
+
+    @contextmanager
+    def acquire(*args, **kwargs):
+        yield scraper
+
+    geocoder = Mock()
+    geocoder.query_postal_code.return_value = Mock(latitude=51.5, longitude=-0.14, empty=False)
+    enhanced = Mock(available=True)
+    enhanced.EnhancedAmazonScraper.return_value.scrape_product_enhanced.return_value = None
+
+    with patch.object(app_module, 'get_production_scraper_pool', return_value=MagicMock(acquire=acquire)), \
+            patch.object(app_module, 'enhanced_scraper_fix', enhanced), \
+            patch.object(app_module, 'unified_scraper') as unified, \
+            patch.object(app_module, 'uk_geocoder', geocoder), \
+            patch.object(app_module, 'log_submission'):
+        scraper.unified = unified
+        yield scraper
+
+
+@pytest.fixture
 def sample_request_data():
     """Sample request data for testing"""
     return {
@@ -47,82 +88,83 @@ def sample_request_data():
     }
 
 
+@pytest.fixture
+def admin_client(client):
+    """Test client with an admin session"""
+    with client.session_transaction() as sess:
+        sess['user'] = {'username': 'admin', 'role': 'admin'}
+    return client
+
+
 class TestHealthEndpoints:
     """Test basic health and status endpoints"""
-    
+
     def test_health_check(self, client):
         """Test health check endpoint"""
         response = client.get('/health')
         assert response.status_code == 200
-        
+
         data = json.loads(response.data)
-        assert data['status'] == 'healthy'
-        assert 'timestamp' in data
+        assert data['status'] == '✅ Server is up'
+
+    def test_root_and_test_pages(self, client):
+        """Test the plain-text liveness pages"""
+        assert client.get('/').status_code == 200
 
-    def test_api_version(self, client):
-        """Test API version endpoint"""
-        response = client.get('/version')
+        response = client.get('/test')
         assert response.status_code == 200
-        
-        data = json.loads(response.data)
-        assert 'version' in data
-        assert 'api_name' in data
+        assert b'Flask test OK' in response.data
 
 
 class TestEmissionEstimationEndpoint:
     """Test the main /estimate_emissions endpoint"""
-    
-    def test_estimate_emissions_success(self, client, sample_request_data):
+
+    def test_estimate_emissions_success(self, client, scraper, sample_request_data):
         """Test successful emission estimation"""
-        with patch('backend.scrapers.amazon.unified_scraper.UnifiedAmazonScraper') as mock_scraper_class:
-            # Mock successful scraping
-            mock_scraper = Mock()
-            mock_scraper.scrape_product.return_value = {
-                'title': 'USN Pure Protein GF-1 Growth & Repair Protein Powder, Chocolate Flavour, 476g',
-                'weight_kg': 0.476,
-                'origin': 'South Africa',
-                'material_type': 'Mixed',
-                'brand': 'USN'
-            }
-            mock_scraper_class.return_value = mock_scraper
-            
-            # Mock ML prediction
-            with patch('pickle.load') as mock_pickle:
-                mock_model = Mock()
-                mock_model.predict.return_value = ['B']
-                mock_model.predict_proba.return_value = [[0.1, 0.8, 0.1]]
-                mock_pickle.return_value = mock_model
-                
-                response = client.post('/estimate_emissions', 
-                                     data=json.dumps(sample_request_data),
-                                     content_type='application/json')
-                
-                assert response.status_code == 200
-                data = json.loads(response.data)
-                
-                # Check response structure
-                assert 'success' in data
-                assert 'data' in data
-                assert 'title' in data
-                
-                # Check emission data
-                emission_data = data['data']
-                assert 'eco_score_ml' in emission_data['attributes']
-                assert 'carbon_kg' in emission_data['attributes']
-                assert 'trees_to_offset' in emission_data['attributes']
-
-    def test_estimate_emissions_invalid_url(self, client):
+        response = client.post('/estimate_emissions',
+                             data=json.dumps(sample_request_data),
+                             content_type='application/json')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+
+        # Check response structure
+        assert data['title'] == SCRAPED_PRODUCT['title']
+        assert 'data' in data
+
+        # Check emission data
+        attributes = data['data']['attributes']
+        assert attributes['eco_score_ml'] in ['A+', 'A', 'B', 'C', 'D', 'E', 'F']
+        assert attributes['carbon_kg'] > 0
+        assert 'trees_to_offset' in attributes
+        assert attributes['origin'] == 'South Africa'
+        scraper.scrape_with_full_url.assert_called_once_with(sample_request_data['amazon_url'])
+
+    def test_estimate_emissions_is_cached(self, client, scraper, sample_request_data):
+        """Test a repeat request for the same ASIN and district is served from cache"""
+        for postcode in ["SW1A 1AA", "SW1A 2BB"]:
+            response = client.post('/estimate_emissions',
+                                 data=json.dumps(dict(sample_request_data, postcode=postcode)),
+                                 content_type='application/json')
+            assert response.status_code == 200
+
+        assert scraper.scrape_with_full_url.call_count == 1
+
+    def test_estimate_emissions_invalid_url(self, client, scraper):
         """Test emission estimation with invalid URL"""
         invalid_data = {
             "amazon_url": "not-a-valid-url",
             "postcode": "SW1A 1AA"
         }
-        
+        # No scraper can read it
+        scraper.scrape_with_full_url.return_value = None
+        scraper.unified.scrape_amazon_product_page.side_effect = ValueError("Invalid URL 'not-a-valid-url'")
+
         response = client.post('/estimate_emissions',
                              data=json.dumps(invalid_data),
                              content_type='application/json')
-        
-        assert response.status_code == 400
+
+        assert response.status_code == 500
         data = json.loads(response.data)
         assert 'error' in data
         assert 'invalid' in data['error'].lower() or 'url' in data['error'].lower()
@@ -133,228 +175,322 @@ class TestEmissionEstimationEndpoint:
             "postcode": "SW1A 1AA"
             # Missing amazon_url
         }
-        
+
         response = client.post('/estimate_emissions',
                              data=json.dumps(incomplete_data),
                              content_type='application/json')
-        
+
         assert response.status_code == 400
         data = json.loads(response.data)
         assert 'error' in data
 
-    def test_estimate_emissions_scraping_failure(self, client, sample_request_data):
+    def test_estimate_emissions_scraping_failure(self, client, scraper, sample_request_data):
         """Test handling of scraping failures"""
-        with patch('backend.scrapers.amazon.unified_scraper.UnifiedAmazonScraper') as mock_scraper_class:
-            # Mock scraping failure
-            mock_scraper = Mock()
-            mock_scraper.scrape_product.return_value = None
-            mock_scraper_class.return_value = mock_scraper
-            
-            response = client.post('/estimate_emissions',
-                                 data=json.dumps(sample_request_data),
-                                 content_type='application/json')
-            
-            assert response.status_code == 400
-            data = json.loads(response.data)
-            assert 'error' in data
-            assert 'scraping' in data['error'].lower() or 'failed' in data['error'].lower()
+        # Production and enhanced scrapers find nothing, the unified fallback fails
+        scraper.scrape_with_full_url.return_value = {'title': 'Unknown Product'}
+        scraper.unified.scrape_amazon_product_page.side_effect = RuntimeError("Scraping failed: blocked")
+
+        response = client.post('/estimate_emissions',
+                             data=json.dumps(sample_request_data),
+                             content_type='application/json')
 
-    def test_estimate_emissions_postcode_processing(self, client):
+        assert response.status_code == 500
+        data = json.loads(response.data)
+        assert 'error' in data
+        assert 'scraping' in data['error'].lower() or 'failed' in data['error'].lower()
+
+        # Failures are not cached: the next request scrapes again
+        scraper.unified.scrape_amazon_product_page.side_effect = None
+        scraper.scrape_with_full_url.return_value = dict(SCRAPED_PRODUCT)
+        response = client.post('/estimate_emissions',
+                             data=json.dumps(sample_request_data),
+                             content_type='application/json')
+        assert response.status_code == 200
+
+    def test_estimate_emissions_postcode_processing(self, client, scraper):
         """Test different postcode formats"""
         test_postcodes = [
             "SW1A 1AA",  # Standard format
             "sw1a1aa",   # No spaces, lowercase
             "SW1A1AA",   # No spaces, uppercase
             "M1 1AA",    # Different area
-            ""           # Empty (should use default)
         ]
-        
+
         for postcode in test_postcodes:
             request_data = {
                 "amazon_url": "https://www.amazon.co.uk/test/dp/B0DG5V9BWQ/",
                 "postcode": postcode
             }
-            
-            with patch('backend.scrapers.amazon.unified_scraper.UnifiedAmazonScraper'):
-                response = client.post('/estimate_emissions',
-                                     data=json.dumps(request_data),
-                                     content_type='application/json')
-                
-                # Should handle all postcode formats gracefully
-                assert response.status_code in [200, 400], f"Failed for postcode: {postcode}"
+
+            response = client.post('/estimate_emissions',
+                                 data=json.dumps(request_data),
+                                 content_type='application/json')
+
+            # Should handle all postcode formats gracefully
+            assert response.status_code == 200, f"Failed for postcode: {postcode}"
+
+        # Empty postcode is rejected
+        response = client.post('/estimate_emissions',
+                             data=json.dumps({"amazon_url": "https://www.amazon.co.uk/test/dp/B0DG5V9BWQ/", "postcode": ""}),
+                             content_type='application/json')
+        assert response.status_code == 400
 
 
 class TestPredictionEndpoint:
     """Test the /predict endpoint for direct ML predictions"""
-    
+
     def test_predict_endpoint_success(self, client):
         """Test successful prediction"""
         prediction_data = {
-            "material_type": "Plastic",
-            "transport_mode": "ship", 
+            "material": "Plastic",
+            "transport": "Ship",
             "recyclability": "Medium",
             "origin": "China",
-            "weight_kg": 0.5
+            "weight": 0.5
         }
-        
-        with patch('pickle.load') as mock_pickle:
-            mock_model = Mock()
-            mock_model.predict.return_value = ['B']
-            mock_model.predict_proba.return_value = [[0.1, 0.8, 0.1]]
-            mock_pickle.return_value = mock_model
-            
+
+        with patch.object(app_module, 'log_submission') as log:
             response = client.post('/predict',
                                  data=json.dumps(prediction_data),
                                  content_type='application/json')
-            
-            assert response.status_code == 200
-            data = json.loads(response.data)
-            
-            assert 'prediction' in data
-            assert 'confidence' in data
-            assert data['prediction'] in ['A+', 'A', 'B', 'C', 'D', 'E', 'F']
-            assert 0 <= data['confidence'] <= 100
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+
+        assert data['predicted_label'] in ['A+', 'A', 'B', 'C', 'D', 'E', 'F']
+        assert 0 <= float(data['confidence'].rstrip('%')) <= 100
+        assert data['raw_input']['material'] == 'Plastic'
+        assert data['raw_input']['origin'] == 'China'
+        log.assert_called_once()
 
     def test_predict_endpoint_missing_features(self, client):
         """Test prediction with missing features"""
         incomplete_data = {
-            "material_type": "Plastic"
-            # Missing other required features
+            "material": "Plastic"
+            # Missing other features: the builder fills in defaults
         }
-        
-        response = client.post('/predict',
-                             data=json.dumps(incomplete_data),
-                             content_type='application/json')
-        
-        assert response.status_code == 400
+
+        with patch.object(app_module, 'log_submission'):
+            response = client.post('/predict',
+                                 data=json.dumps(incomplete_data),
+                                 content_type='application/json')
+
+        assert response.status_code == 200
         data = json.loads(response.data)
-        assert 'error' in data
+        assert data['predicted_label'] in ['A+', 'A', 'B', 'C', 'D', 'E', 'F']
+        assert data['raw_input']['material'] == 'Plastic'
+        assert data['raw_input']['recyclability'] == 'Medium'
 
     def test_predict_endpoint_invalid_values(self, client):
         """Test prediction with invalid feature values"""
         invalid_data = {
-            "material_type": "InvalidMaterial",
-            "transport_mode": "teleportation",
-            "weight_kg": -5  # Negative weight
+            "material": "InvalidMaterial",
+            "origin": "Atlantis"
         }
-        
-        response = client.post('/predict',
-                             data=json.dumps(invalid_data),
-                             content_type='application/json')
-        
-        assert response.status_code == 400
+
+        with patch.object(app_module, 'log_submission'):
+            response = client.post('/predict',
+                                 data=json.dumps(invalid_data),
+                                 content_type='application/json')
+            other = client.post('/predict',
+                              data=json.dumps({"material": "Other", "origin": "Other"}),
+                              content_type='application/json')
+
+        # Unknown categories are encoded as "Other" instead of failing
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        other_data = json.loads(other.data)
+        assert data['encoded_input']['material'] == other_data['encoded_input']['material']
+        assert data['encoded_input']['origin'] == other_data['encoded_input']['origin']
+        assert data['predicted_label'] == other_data['predicted_label']
+
+    def test_predict_endpoint_rejects_non_json(self, client):
+        """Test prediction without a JSON body"""
+        response = client.post('/predict', data="material=Plastic", content_type='text/plain')
+
+        assert response.status_code == 500
         data = json.loads(response.data)
         assert 'error' in data
 
 
+class TestBatchPredictionEndpoint:
+    """Test the /predict/batch endpoint for catalogue scoring"""
+
+    def test_batch_predict_success(self, client):
+        """Test that every product gets a label and confidence"""
+        products = [
+            {"material": "Plastic", "weight": 0.5, "origin": "China", "title": "Protein powder"},
+            {"material": "Glass", "weight": 2.5, "origin": "UK", "title": "Glass jar 2 pack"},
+            {"material": "Steel", "weight": 12, "recyclability": "High"}
+        ]
+
+        response = client.post('/predict/batch',
+                               data=json.dumps({"products": products}),
+                               content_type='application/json')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+
+        assert data['count'] == 3
+        assert len(data['predictions']) == 3
+        for prediction in data['predictions']:
+            assert prediction['predicted_label'] in ['A+', 'A', 'B', 'C', 'D', 'E', 'F']
+            assert prediction['confidence'].endswith('%')
+
+    def test_batch_predict_matches_single_predictions(self, client):
+        """Test that batch scoring agrees with /predict row by row"""
+        products = [
+            {"material": "Plastic", "weight": 0.3, "origin": "China", "distance_origin_to_uk": 8000},
+            {"material": "Cardboard", "weight": 1.5, "origin": "Germany", "override_transport_mode": "Truck"}
+        ]
+
+        batch = json.loads(client.post('/predict/batch',
+                                       data=json.dumps(products),
+                                       content_type='application/json').data)
+
+        with patch.object(app_module, 'log_submission'):
+            for product, batch_prediction in zip(products, batch['predictions']):
+                single = json.loads(client.post('/predict',
+                                                data=json.dumps(product),
+                                                content_type='application/json').data)
+                assert single['predicted_label'] == batch_prediction['predicted_label']
+                assert single['confidence'] == batch_prediction['confidence']
+
+    def test_batch_predict_rejects_non_list(self, client):
+        """Test that malformed bodies are rejected"""
+        response = client.post('/predict/batch',
+                               data=json.dumps({"products": "not-a-list"}),
+                               content_type='application/json')
+
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
+
+
 class TestInsightsEndpoint:
     """Test the /insights endpoint for analytics"""
-    
-    def test_insights_endpoint_success(self, client):
+
+    def test_insights_endpoint_success(self, client, tmp_path):
         """Test successful insights retrieval"""
-        with patch('os.path.exists') as mock_exists:
-            mock_exists.return_value = True
-            
-            with patch('pandas.read_csv') as mock_read_csv:
-                # Mock dataset
-                import pandas as pd
-                mock_df = pd.DataFrame({
-                    'eco_score_ml': ['A', 'B', 'C', 'A', 'B'],
-                    'material_type': ['Plastic', 'Metal', 'Wood', 'Plastic', 'Metal'],
-                    'carbon_kg': [1.2, 2.5, 0.8, 1.1, 2.3],
-                    'recyclability': ['High', 'Medium', 'High', 'Medium', 'Low']
-                })
-                mock_read_csv.return_value = mock_df
-                
-                response = client.get('/insights')
-                
-                assert response.status_code == 200
-                data = json.loads(response.data)
-                
-                # Check insights structure
-                assert 'total_products' in data
-                assert 'eco_score_distribution' in data
-                assert 'material_breakdown' in data
-                assert 'carbon_stats' in data
-
-    def test_insights_endpoint_no_data(self, client):
+        dataset = tmp_path / "eco_dataset.csv"
+        dataset.write_text(
+            "material,true_eco_score,co2_emissions,origin\n"
+            "Plastic,A,1.2,China\n"
+            "Metal,B,2.5,UK\n"
+            "Wood,,0.8,UK\n"
+            "Plastic,C,1.1,China\n"
+        )
+
+        with patch.object(app_module, 'ECO_DATASET_PATH', str(dataset)):
+            response = client.get('/insights')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+
+        # Rows missing a needed field are dropped, only needed fields are sent
+        assert len(data) == 3
+        assert set(data[0]) == {'material', 'true_eco_score', 'co2_emissions'}
+        assert data[0] == {'material': 'Plastic', 'true_eco_score': 'A', 'co2_emissions': 1.2}
+
+    def test_insights_endpoint_no_data(self, client, tmp_path):
         """Test insights when no data available"""
-        with patch('os.path.exists') as mock_exists:
-            mock_exists.return_value = False
-            
+        with patch.object(app_module, 'ECO_DATASET_PATH', str(tmp_path / "missing.csv")):
             response = client.get('/insights')
-            
-            # Should handle gracefully
-            assert response.status_code in [200, 404]
-            
-            if response.status_code == 200:
-                data = json.loads(response.data)
-                assert 'total_products' in data
-                assert data['total_products'] == 0
+
+        assert response.status_code == 500
+        data = json.loads(response.data)
+        assert 'error' in data
 
 
 class TestAdminEndpoints:
     """Test admin endpoints for data management"""
-    
-    def test_admin_submissions_endpoint(self, client):
+
+    def test_admin_submissions_endpoint(self, admin_client):
         """Test admin submissions retrieval"""
-        with patch('os.path.exists') as mock_exists:
-            mock_exists.return_value = True
-            
-            with patch('json.load') as mock_json_load:
-                mock_submissions = [
-                    {
-                        'url': 'https://amazon.co.uk/test1',
-                        'timestamp': '2024-01-01T12:00:00',
-                        'status': 'completed'
-                    },
-                    {
-                        'url': 'https://amazon.co.uk/test2', 
-                        'timestamp': '2024-01-02T12:00:00',
-                        'status': 'failed'
-                    }
-                ]
-                mock_json_load.return_value = mock_submissions
-                
-                response = client.get('/admin/submissions')
-                
-                assert response.status_code == 200
-                data = json.loads(response.data)
-                
-                assert 'submissions' in data
-                assert len(data['submissions']) == 2
-                assert data['submissions'][0]['status'] == 'completed'
-
-    def test_admin_clear_cache_endpoint(self, client):
-        """Test admin cache clearing"""
-        response = client.post('/admin/clear-cache')
-        
+        mock_submissions = [
+            {
+                'title': 'Test product 1',
+                'predicted_label': 'B',
+                'confidence': '80.0%'
+            },
+            {
+                'title': 'Test product 2',
+                'predicted_label': 'D',
+                'confidence': '65.0%'
+            }
+        ]
+
+        with patch.object(app_module.submission_log, 'read_all', return_value=mock_submissions):
+            response = admin_client.get('/admin/submissions')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+
+        assert len(data) == 2
+        assert data[0]['predicted_label'] == 'B'
+
+    def test_submission_logs_stay_out_of_the_repo(self):
+        """Test submission and feedback logs are written under EVENT_LOG_DIR"""
+        log_dir = os.environ['EVENT_LOG_DIR']
+        assert app_module.app.config['EVENT_LOG_DIR'] == log_dir
+        assert app_module.submission_log.path.startswith(log_dir)
+        assert app_module.feedback_log.path.startswith(log_dir)
+
+        app_module.log_submission({'title': 'Test product', 'predicted_label': 'B'})
+        app_module.submission_log.flush(timeout=2.0)
+        assert os.path.exists(os.path.join(log_dir, 'submitted_predictions.jsonl'))
+
+    @pytest.mark.parametrize("path", ['/admin/submissions', '/admin/cache-stats', '/admin/models'])
+    def test_admin_endpoints_require_admin(self, client, path):
+        """Test admin endpoints reject anonymous and non-admin users"""
+        assert client.get(path).status_code == 401
+
+        with client.session_transaction() as sess:
+            sess['user'] = {'username': 'someone', 'role': 'user'}
+        assert client.get(path).status_code == 401
+
+    def test_admin_cache_stats_endpoint(self, admin_client):
+        """Test admin cache statistics"""
+        response = admin_client.get('/admin/cache-stats')
+
         assert response.status_code == 200
         data = json.loads(response.data)
-        assert 'message' in data
-        assert 'cache' in data['message'].lower()
+        assert 'l1_hits' in data['estimate_emissions']
 
 
 class TestCORSAndSecurity:
     """Test CORS headers and security measures"""
-    
+
+    ORIGIN = "http://localhost:5173"
+
+    @pytest.mark.network
     def test_cors_headers_present(self, client, sample_request_data):
-        """Test CORS headers are properly set"""
+        """Test CORS headers are properly set on a live scrape"""
         response = client.post('/estimate_emissions',
                              data=json.dumps(sample_request_data),
-                             content_type='application/json')
-        
+                             content_type='application/json',
+                             headers={'Origin': self.ORIGIN})
+
         # Should have CORS headers
-        assert 'Access-Control-Allow-Origin' in response.headers
-        assert 'Access-Control-Allow-Methods' in response.headers
-        assert 'Access-Control-Allow-Headers' in response.headers
+        assert response.headers['Access-Control-Allow-Origin'] == self.ORIGIN
+        assert response.headers['Access-Control-Allow-Credentials'] == 'true'
 
     def test_options_request_handling(self, client):
         """Test OPTIONS request for CORS preflight"""
-        response = client.options('/estimate_emissions')
-        
+        response = client.options('/estimate_emissions',
+                                headers={'Origin': self.ORIGIN,
+                                         'Access-Control-Request-Method': 'POST',
+                                         'Access-Control-Request-Headers': 'Content-Type'})
+
         assert response.status_code == 200
-        assert 'Access-Control-Allow-Origin' in response.headers
+        assert response.headers['Access-Control-Allow-Origin'] == self.ORIGIN
+        assert 'POST' in response.headers['Access-Control-Allow-Methods']
+        assert 'Content-Type' in response.headers['Access-Control-Allow-Headers']
+
+    def test_unknown_origin_gets_no_cors_headers(self, client):
+        """Test origins outside the allow list are not echoed back"""
+        response = client.get('/health', headers={'Origin': 'https://evil.example.com'})
+
+        assert 'Access-Control-Allow-Origin' not in response.headers
 
     def test_content_type_validation(self, client):
         """Test Content-Type header validation"""
@@ -362,92 +498,91 @@ class TestCORSAndSecurity:
         response = client.post('/estimate_emissions',
                              data="invalid data",
                              content_type='text/plain')
-        
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert 'error' in data
 
-    def test_request_size_limits(self, client):
+        assert response.status_code == 415
+
+    def test_request_size_limits(self, client, scraper):
         """Test request size limitations"""
         large_data = {
             "amazon_url": "https://amazon.co.uk/test",
             "postcode": "SW1A 1AA",
             "large_field": "x" * 10000  # Very large field
         }
-        
+
         response = client.post('/estimate_emissions',
                              data=json.dumps(large_data),
                              content_type='application/json')
-        
+
         # Should handle large requests appropriately
         assert response.status_code in [200, 400, 413]  # 413 = Payload Too Large
 
 
 class TestPerformanceAndReliability:
     """Test performance and reliability aspects"""
-    
-    def test_concurrent_requests_handling(self, client, sample_request_data):
+
+    def test_concurrent_requests_handling(self, client, scraper, sample_request_data):
         """Test handling of concurrent requests"""
         import threading
-        import time
-        
+
         results = []
-        
+
         def make_request():
             try:
-                with patch('backend.scrapers.amazon.unified_scraper.UnifiedAmazonScraper'):
-                    response = client.post('/estimate_emissions',
-                                         data=json.dumps(sample_request_data),
-                                         content_type='application/json')
-                    results.append(response.status_code)
+                # One client per thread, like separate browsers
+                response = app.test_client().post('/estimate_emissions',
+                                     data=json.dumps(sample_request_data),
+                                     content_type='application/json')
+                results.append(response.status_code)
             except Exception as e:
                 results.append(f"Error: {e}")
-        
+
         # Start multiple threads
         threads = []
         for _ in range(5):
             thread = threading.Thread(target=make_request)
             threads.append(thread)
             thread.start()
-        
+
         # Wait for all threads
         for thread in threads:
             thread.join(timeout=10)
-        
+
         # All requests should complete
         assert len(results) == 5
-        assert all(isinstance(r, int) for r in results)
+        assert results == [200] * 5
+        # Concurrent misses for the same product share one scrape
+        assert scraper.scrape_with_full_url.call_count == 1
 
-    def test_response_time_performance(self, client, sample_request_data):
+    def test_response_time_performance(self, client, scraper, sample_request_data):
         """Test API response time"""
         import time
-        
-        with patch('backend.scrapers.amazon.unified_scraper.UnifiedAmazonScraper'):
-            start_time = time.time()
-            
-            response = client.post('/estimate_emissions',
-                                 data=json.dumps(sample_request_data),
-                                 content_type='application/json')
-            
-            response_time = time.time() - start_time
-            
-            # API should respond within reasonable time
-            assert response_time < 30.0, f"API response too slow: {response_time:.2f}s"
 
-    def test_memory_usage_stability(self, client, sample_request_data):
+        start_time = time.time()
+
+        response = client.post('/estimate_emissions',
+                             data=json.dumps(sample_request_data),
+                             content_type='application/json')
+
+        response_time = time.time() - start_time
+
+        assert response.status_code == 200
+        # API should respond within reasonable time
+        assert response_time < 30.0, f"API response too slow: {response_time:.2f}s"
+
+    def test_memory_usage_stability(self, client, scraper, sample_request_data):
         """Test memory usage doesn't grow excessively"""
         import gc
-        
+
         # Make multiple requests
         for _ in range(10):
-            with patch('backend.scrapers.amazon.unified_scraper.UnifiedAmazonScraper'):
-                response = client.post('/estimate_emissions',
-                                     data=json.dumps(sample_request_data),
-                                     content_type='application/json')
-            
+            response = client.post('/estimate_emissions',
+                                 data=json.dumps(sample_request_data),
+                                 content_type='application/json')
+            assert response.status_code == 200
+
             # Force garbage collection
             gc.collect()
-        
+
         # Memory usage should be stable (no easy way to test this in unit tests)
         # This is more of a placeholder for manual testing
         assert True
@@ -455,4 +590,4 @@ class TestPerformanceAndReliability:
 
 if __name__ == "__main__":
     # Run tests with coverage
-    pytest.main([__file__, "-v", "--tb=short", "--cov=backend/api"])
\ No newline at end of file
+    pytest.main([__file__, "-v", "--tb=short", "--cov=backend/api"])
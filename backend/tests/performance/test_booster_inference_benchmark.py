@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+⏱️ Performance: Native Booster Inference
+=======================================
+
+Benchmark of eco-score inference latency on the 16-feature model.
+
+- before: the sklearn XGBClassifier wrapper, called with Python lists,
+  with predict and predict_proba run separately (the old /predict and
+  EnhancedEcoScorer path)
+- after: NativePredictor (Booster.inplace_predict on a contiguous float32
+  array, probabilities and argmax from one call)
+
+Both a single-row request and a 10k-row batch are timed. A small XGBoost
+classifier on random data stands in for the production model.
+
+Run directly for a report:
+    python backend/tests/performance/test_booster_inference_benchmark.py
+"""
+
+import pytest
+import time
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+import numpy as np
+
+from backend.ml.inference.booster_backend import NativePredictor, export_booster, load_booster, make_predictor
+from backend.ml.inference.feature_builder import ENHANCED_FEATURES
+
+xgb = pytest.importorskip("xgboost")
+
+N_CLASSES = 7
+BATCH_SIZE = 10000
+SINGLE_ROW_CALLS = 300
+
+
+def train_stand_in_model():
+    rng = np.random.default_rng(0)
+    X = rng.random((2000, len(ENHANCED_FEATURES))) * 10
+    y = np.arange(2000) % N_CLASSES
+    model = xgb.XGBClassifier(n_estimators=100, max_depth=5, verbosity=0)
+    model.fit(X, y)
+    return model
+
+
+def wrapper_predict(model, rows):
+    """The old path: Python lists through the wrapper, two calls"""
+    predictions = model.predict(rows)
+    probabilities = model.predict_proba(rows)
+    return predictions, probabilities
+
+
+def _per_call_ms(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def run_benchmark():
+    model = train_stand_in_model()
+    predictor = make_predictor(model)
+    rng = np.random.default_rng(1)
+    batch = (rng.random((BATCH_SIZE, len(ENHANCED_FEATURES))) * 10).astype(np.float32)
+    row_list = batch[:1].tolist()
+    batch_list = batch.tolist()
+
+    # Warm up both paths (first call pays for thread pools and config parsing)
+    wrapper_predict(model, row_list)
+    predictor.predict_with_proba(row_list)
+
+    single_before = _per_call_ms(lambda: wrapper_predict(model, row_list), SINGLE_ROW_CALLS)
+    single_after = _per_call_ms(lambda: predictor.predict_with_proba(row_list), SINGLE_ROW_CALLS)
+    batch_before = _per_call_ms(lambda: wrapper_predict(model, batch_list), 3)
+    batch_after = _per_call_ms(lambda: predictor.predict_with_proba(batch), 3)
+
+    return {
+        "single_row_ms_before": round(single_before, 3),
+        "single_row_ms_after": round(single_after, 3),
+        "single_row_speedup": round(single_before / single_after, 1),
+        "batch_10k_ms_before": round(batch_before, 1),
+        "batch_10k_ms_after": round(batch_after, 1),
+        "batch_speedup": round(batch_before / batch_after, 1),
+        "predictor_stats": predictor.get_stats()
+    }
+
+
+@pytest.mark.performance
+def test_native_predictions_match_wrapper(tmp_path):
+    """Labels and probabilities must equal XGBClassifier's, also after a UBJ round trip"""
+    model = train_stand_in_model()
+    X = (np.random.default_rng(2).random((500, len(ENHANCED_FEATURES))) * 10).astype(np.float32)
+
+    predictor = make_predictor(model)
+    assert isinstance(predictor, NativePredictor)
+    best, proba = predictor.predict_with_proba(X)
+    np.testing.assert_allclose(proba, model.predict_proba(X), rtol=1e-5, atol=1e-6)
+    np.testing.assert_array_equal(best, model.predict(X))
+
+    path = export_booster(model, str(tmp_path / "eco_model.ubj"))
+    reloaded = NativePredictor(load_booster(path))
+    np.testing.assert_allclose(reloaded.predict_proba(X), proba, rtol=1e-6)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_native_booster_beats_wrapper():
+    """A single-row request should be markedly faster without the wrapper"""
+    report = run_benchmark()
+    print(f"\n📊 Booster inference benchmark: {report}")
+
+    assert report["single_row_speedup"] >= 2
+    assert report["batch_speedup"] >= 1
+
+
+if __name__ == "__main__":
+    print("⏱️ Native Booster inference benchmark")
+    print("=" * 50)
+    for key, value in run_benchmark().items():
+        print(f"{key}: {value}")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+⏱️ Performance: Fuzzy Brand Lookup
+=================================
+
+Latency of one fuzzy_match_brand lookup for an unrecognised brand at 10k
+and 100k known brands.
+
+- before: normalize every known brand and run SequenceMatcher against
+  all of them
+- after: BrandIndex (normalized names computed once, trigram candidates,
+  SequenceMatcher on those only)
+
+The 10k catalogue is brand_locations.json; 100k adds synthetic names.
+
+Run directly for a report:
+    python backend/tests/performance/test_brand_index_benchmark.py
+"""
+
+import json
+import pytest
+import random
+import time
+from difflib import SequenceMatcher
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from common.data.brand_origin_resolver import EnhancedBrandResolver
+
+BRAND_LOCATIONS_JSON = os.path.join(project_root, "common", "data", "json", "brand_locations.json")
+SIZES = [10000, 100000]
+QUERIES = 20
+# The full scan takes ~seconds at 100k, so it is timed on fewer queries
+FULL_SCAN_QUERIES = 3
+SYLLABLES = ["ka", "lo", "vex", "tri", "mon", "za", "pex", "ur", "bel", "dra", "sto", "qui", "ner", "fy"]
+
+
+def make_brands(size):
+    with open(BRAND_LOCATIONS_JSON, encoding="utf-8") as f:
+        brands = [key.lower() for key in json.load(f) if not key.startswith("_")]
+    rng = random.Random(3)
+    seen = set(brands)
+    while len(brands) < size:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.3:
+            name += " " + rng.choice(["labs", "home", "sport", "tech", "ltd"])
+        if name not in seen:
+            seen.add(name)
+            brands.append(name)
+    return {brand: {"country": "UK", "city": "London"} for brand in brands[:size]}
+
+
+def make_queries(brands, count):
+    """Misspelt known brands: the lookups that reach the fuzzy step"""
+    rng = random.Random(5)
+    keys = list(brands)
+    queries = []
+    for _ in range(count):
+        brand = rng.choice(keys)
+        i = rng.randrange(len(brand))
+        queries.append(brand[:i] + rng.choice("aeiouxz") + brand[i + 1:])
+    return queries
+
+
+def full_scan_match(resolver, target_brand, threshold=0.75):
+    """The original fuzzy_match_brand"""
+    target_clean = resolver._normalize_brand_name(target_brand)
+    best_match, best_score = None, 0.0
+    for known_brand in resolver.exact_matches.keys():
+        known_clean = resolver._normalize_brand_name(known_brand)
+        similarity = SequenceMatcher(None, target_clean, known_clean).ratio()
+        if resolver._has_exact_word_match(target_clean, known_clean):
+            similarity += 0.15
+        if resolver._is_common_abbreviation(target_clean, known_clean):
+            similarity += 0.20
+        if similarity >= threshold and similarity > best_score:
+            best_match, best_score = known_brand, similarity
+    return (best_match, best_score) if best_match else None
+
+
+def _per_lookup_ms(lookup, queries):
+    start = time.perf_counter()
+    for query in queries:
+        lookup(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def run_benchmark(sizes=SIZES):
+    report = {}
+    for size in sizes:
+        resolver = EnhancedBrandResolver()
+        resolver.exact_matches = make_brands(size)
+        queries = make_queries(resolver.exact_matches, QUERIES)
+
+        start = time.perf_counter()
+        resolver.fuzzy_match_brand(queries[0])
+        build_ms = (time.perf_counter() - start) * 1000
+
+        before_ms = _per_lookup_ms(lambda q: full_scan_match(resolver, q), queries[:FULL_SCAN_QUERIES])
+        after_ms = _per_lookup_ms(resolver.fuzzy_match_brand, queries)
+        report[f"{size // 1000}k"] = {
+            "index_build_ms": round(build_ms, 1),
+            "before_ms_per_lookup": round(before_ms, 2),
+            "after_ms_per_lookup": round(after_ms, 3),
+            "speedup": round(before_ms / after_ms, 1)
+        }
+    return report
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_indexed_lookup_beats_full_scan():
+    """An unrecognised brand should cost about a millisecond, not a full scan"""
+    report = run_benchmark()
+    print(f"\n📊 Fuzzy brand lookup benchmark: {report}")
+
+    assert report["10k"]["speedup"] >= 10
+    assert report["100k"]["after_ms_per_lookup"] < report["10k"]["before_ms_per_lookup"]
+
+
+if __name__ == "__main__":
+    print("⏱️ Fuzzy brand lookup benchmark")
+    print("=" * 50)
+    for key, value in run_benchmark().items():
+        print(f"{key}: {value}")
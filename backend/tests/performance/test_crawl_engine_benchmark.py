@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+⏱️ Performance: Bulk Crawl Throughput
+====================================
+
+Offline benchmark of the scheduler's crawl against the local stub server
+(50 ms simulated latency per response).
+
+- before: one blocking request at a time, like the scheduler's loop
+- after: AsyncCrawlEngine with bounded concurrency and a per-domain
+  token bucket
+
+Run directly for a report (optionally serving saved <ASIN>.html pages):
+    python backend/tests/performance/test_crawl_engine_benchmark.py [pages_dir]
+"""
+
+import pytest
+import asyncio
+import time
+from unittest.mock import patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("httpx")
+
+import requests
+
+from backend.scrapers.amazon.crawl_engine import AsyncCrawlEngine
+from backend.tests.fixtures.stub_amazon_server import StubAmazonServer
+
+TERMS = ["coffee+mug", "shampoo", "led+lamp"]
+PAGES_PER_TERM = 2
+RESULTS_PER_PAGE = 10
+LATENCY = 0.05
+
+
+def sequential_crawl(engine, server):
+    """Search pages then product pages, one blocking request at a time"""
+    session = requests.Session()
+    products = []
+    product_urls = []
+    for term in TERMS:
+        for page in range(1, PAGES_PER_TERM + 1):
+            url = server.search_url_template.format(term=term, page=page)
+            response = session.get(url)
+            product_urls.extend(engine._extract(response.content, url, "search")["product_urls"])
+    for url in dict.fromkeys(product_urls):
+        response = session.get(url)
+        products.append(engine._extract(response.content, url, "product")["data"])
+    return products
+
+
+def run_benchmark(pages_dir=None):
+    with StubAmazonServer(results_per_page=RESULTS_PER_PAGE, latency=LATENCY, pages_dir=pages_dir) as server, \
+            patch('builtins.print'):
+        engine = AsyncCrawlEngine(concurrency=16, requests_per_second=500, burst=16)
+
+        start = time.perf_counter()
+        before = sequential_crawl(engine, server)
+        before_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = asyncio.run(engine.crawl_search_terms(
+            TERMS, pages_per_term=PAGES_PER_TERM, search_url_template=server.search_url_template
+        ))
+        after_s = time.perf_counter() - start
+
+    after = report["products"]
+    return {
+        "products": len(after),
+        "before_s": round(before_s, 2),
+        "after_s": round(after_s, 2),
+        "before_products_per_s": round(len(before) / before_s, 1),
+        "after_products_per_s": round(len(after) / after_s, 1),
+        "speedup": round(before_s / after_s, 1),
+        "same_asins": sorted(p["asin"] for p in before) == sorted(p["asin"] for p in after)
+    }
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_concurrent_crawl_beats_sequential():
+    """Overlapping network waits should multiply crawl throughput"""
+    report = run_benchmark()
+    print(f"\n📊 Crawl benchmark: {report}")
+
+    assert report["same_asins"]
+    assert report["products"] == len(TERMS) * PAGES_PER_TERM * RESULTS_PER_PAGE
+    assert report["speedup"] >= 3
+
+
+if __name__ == "__main__":
+    print("⏱️ Bulk crawl throughput benchmark")
+    print("=" * 50)
+    for key, value in run_benchmark(sys.argv[1] if len(sys.argv) > 1 else None).items():
+        print(f"{key}: {value}")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+⏱️ Soak: Prediction Store under a Million Predictions
+====================================================
+
+Memory and feedback latency of MLMonitoringService's prediction storage
+as a long-running worker logs predictions.
+
+- before: an unbounded list of predictions, with add_feedback scanning it
+  for the prediction_id (measured up to LEGACY_PREDICTIONS)
+- after: PredictionStore (10k-slot ring buffer, id index, SQLite spill)
+  for SOAK_PREDICTIONS, sampling peak RSS and feedback lookup latency for
+  an in-memory and a spilled prediction at each checkpoint
+
+Run directly for a report:
+    python backend/tests/performance/test_prediction_store_soak.py
+"""
+
+import pytest
+import resource
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.core.prediction_store import ModelPrediction, PredictionStore
+
+SOAK_PREDICTIONS = 1_000_000
+LEGACY_PREDICTIONS = 200_000
+CHECKPOINTS = 5
+CAPACITY = 10_000
+LOOKUPS = 200
+
+
+def make_prediction(i):
+    return ModelPrediction(
+        prediction_id=f"pred-{i:09d}",
+        model_name="xgboost_eco_tracker",
+        model_version="1.0.0",
+        input_features={"weight": float(i % 50), "recyclability": i % 3},
+        prediction="B",
+        confidence=0.85,
+        prediction_time=datetime.utcnow(),
+        processing_time_ms=2.5
+    )
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def lookup_us(lookup, prediction_id, repeat=LOOKUPS):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        lookup(prediction_id)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def legacy_soak(count=LEGACY_PREDICTIONS):
+    """Unbounded list with the old add_feedback linear scan"""
+    predictions = []
+
+    def find(prediction_id):
+        for pred in predictions:
+            if pred.prediction_id == prediction_id:
+                return pred
+
+    latencies = []
+    step = count // CHECKPOINTS
+    for i in range(count):
+        predictions.append(make_prediction(i))
+        if (i + 1) % step == 0:
+            latencies.append(round(lookup_us(find, predictions[-1].prediction_id, repeat=5), 1))
+    return latencies
+
+
+def store_soak(spill_path, count=SOAK_PREDICTIONS):
+    store = PredictionStore(capacity=CAPACITY, spill_path=spill_path)
+    checkpoints = []
+    step = count // CHECKPOINTS
+    start = time.perf_counter()
+    for i in range(count):
+        store.add(make_prediction(i))
+        if (i + 1) % step == 0:
+            checkpoints.append({
+                "predictions": i + 1,
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+                "in_memory_lookup_us": round(lookup_us(store.get, f"pred-{i - 10:09d}"), 2),
+                "spilled_lookup_us": round(lookup_us(store.get, f"pred-{i // 2:09d}"), 1)
+            })
+    elapsed = time.perf_counter() - start
+    store.close()
+    return checkpoints, elapsed
+
+
+def run_benchmark():
+    workdir = tempfile.mkdtemp()
+    try:
+        checkpoints, elapsed = store_soak(os.path.join(workdir, "predictions.db"))
+        legacy = legacy_soak()
+        return {
+            "predictions": SOAK_PREDICTIONS,
+            "after_us_per_prediction": round(elapsed / SOAK_PREDICTIONS * 1e6, 2),
+            "after_checkpoints": checkpoints,
+            "rss_growth_after_first_checkpoint_mb": round(
+                checkpoints[-1]["peak_rss_mb"] - checkpoints[0]["peak_rss_mb"], 1
+            ),
+            f"before_feedback_scan_us_at_{LEGACY_PREDICTIONS // CHECKPOINTS}_step": legacy
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_store_memory_and_feedback_latency_stay_flat():
+    """A million predictions should not grow memory or feedback cost"""
+    report = run_benchmark()
+    print(f"\n📊 Prediction store soak: {report}")
+
+    checkpoints = report["after_checkpoints"]
+    assert report["rss_growth_after_first_checkpoint_mb"] < 20
+    lookups = [c["in_memory_lookup_us"] for c in checkpoints]
+    assert max(lookups) < 10 * min(lookups) + 5
+    legacy = report[f"before_feedback_scan_us_at_{LEGACY_PREDICTIONS // CHECKPOINTS}_step"]
+    assert legacy[-1] > 3 * legacy[0]
+
+
+if __name__ == "__main__":
+    print("⏱️ Prediction store soak")
+    print("=" * 50)
+    for key, value in run_benchmark().items():
+        print(f"{key}: {value}")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+⏱️ Performance: Rate Limit Check Latency and Accuracy
+====================================================
+
+Concurrent load against a local Redis (REDIS_URL, default
+redis://localhost:6379). When none is reachable, fakeredis is used with a
+simulated 0.5 ms network round trip per command.
+
+- before: the previous token bucket (HGETALL, then HSET + EXPIRE from Python)
+- after: TokenBucket running the atomic Lua script via EVALSHA
+
+Run directly for a report:
+    REDIS_URL=redis://localhost:6379 python backend/tests/performance/test_rate_limiting_benchmark.py
+"""
+
+import pytest
+import asyncio
+import time
+import uuid
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("jwt")
+
+import redis.asyncio as redis
+
+from backend.core.rate_limiting import TokenBucket
+
+CAPACITY = 20
+CONCURRENT_REQUESTS = 200
+SEQUENTIAL_CHECKS = 300
+SIMULATED_RTT = 0.0005
+
+
+class LegacyTokenBucket:
+    """The read-modify-write bucket this benchmark replaces"""
+
+    def __init__(self, capacity, refill_rate, redis_client, key_prefix="bucket"):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+
+    async def consume(self, key, tokens=1):
+        bucket_key = f"{self.key_prefix}:{key}"
+        bucket_data = await self.redis_client.hgetall(bucket_key)
+        now = time.time()
+        last_refill = float(bucket_data.get("last_refill", now)) if bucket_data else now
+        current = float(bucket_data.get("tokens", self.capacity)) if bucket_data else self.capacity
+        current = min(self.capacity, current + (now - last_refill) * self.refill_rate)
+        allowed = current >= tokens
+        if allowed:
+            current -= tokens
+        await self.redis_client.hset(bucket_key, mapping={"tokens": current, "last_refill": now})
+        await self.redis_client.expire(bucket_key, 3600)
+        return allowed, {}
+
+
+async def _connect():
+    """(client, backend name): the local Redis if reachable, otherwise fakeredis with simulated RTT"""
+    client = redis.Redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379"), decode_responses=True)
+    try:
+        await client.ping()
+        return client, "redis"
+    except Exception:
+        await client.aclose()
+
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    class SlowFakeRedis(fakeredis.aioredis.FakeRedis):
+        async def execute_command(self, *args, **options):
+            await asyncio.sleep(SIMULATED_RTT)
+            return await super().execute_command(*args, **options)
+
+    return SlowFakeRedis(decode_responses=True), f"fakeredis+{SIMULATED_RTT * 1000:g}ms"
+
+
+async def _measure(bucket):
+    prefix = uuid.uuid4().hex
+    # Accuracy: a burst of simultaneous requests against one bucket
+    results = await asyncio.gather(*(bucket.consume(f"{prefix}:burst") for _ in range(CONCURRENT_REQUESTS)))
+    admitted = sum(allowed for allowed, _ in results)
+
+    # Latency: back-to-back checks, each against its own fresh bucket
+    await bucket.consume(f"{prefix}:warmup")
+    start = time.perf_counter()
+    for i in range(SEQUENTIAL_CHECKS):
+        await bucket.consume(f"{prefix}:{i}")
+    per_check_ms = (time.perf_counter() - start) / SEQUENTIAL_CHECKS * 1000
+    return admitted, per_check_ms
+
+
+async def _run():
+    client, backend = await _connect()
+    try:
+        kwargs = dict(capacity=CAPACITY, refill_rate=0.001, redis_client=client, key_prefix="bench_bucket")
+        before_admitted, before_ms = await _measure(LegacyTokenBucket(**kwargs))
+        after_admitted, after_ms = await _measure(TokenBucket(**kwargs))
+    finally:
+        await client.aclose()
+
+    return {
+        "backend": backend,
+        "capacity": CAPACITY,
+        "concurrent_requests": CONCURRENT_REQUESTS,
+        "before_admitted": before_admitted,
+        "after_admitted": after_admitted,
+        "before_ms_per_check": round(before_ms, 3),
+        "after_ms_per_check": round(after_ms, 3),
+        "speedup": round(before_ms / after_ms, 1)
+    }
+
+
+def run_benchmark():
+    return asyncio.run(_run())
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_script_is_exact_and_faster():
+    """One atomic round trip should admit exactly the capacity and cut check latency"""
+    report = run_benchmark()
+    print(f"\n📊 Rate limit benchmark: {report}")
+
+    assert report["after_admitted"] == CAPACITY
+    assert report["before_admitted"] > CAPACITY
+    assert report["speedup"] >= 1.5
+
+
+if __name__ == "__main__":
+    print("⏱️ Rate limit check benchmark")
+    print("=" * 50)
+    for key, value in run_benchmark().items():
+        print(f"{key}: {value}")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+⏱️ Performance: App Startup
+==========================
+
+Import time of backend.api.app, measured the way `python -X importtime`
+reports it, in a fresh interpreter per run so nothing is already cached
+in sys.modules.
+
+- The selenium scraper stack, pgeocode and the materials databases are
+  deferred (backend/utils/lazy.py) and must not be imported at boot
+- The model and encoders load on first prediction or in the gunicorn
+  master (backend/ml/inference/model_registry.py), not at import
+
+Run directly for a report with the slowest imports:
+    python backend/tests/performance/test_startup_benchmark.py
+"""
+
+import pytest
+import json
+import re
+import subprocess
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.utils.lazy import module_available
+
+APP_MODULE = "backend.api.app"
+RUNS = 3
+# Modules that only requests should pull in
+DEFERRED_MODULES = [
+    "selenium",
+    "webdriver_manager",
+    "fake_useragent",
+    "pgeocode",
+    "xgboost",
+    "backend.scrapers.amazon.integrated_scraper",
+    "backend.scrapers.amazon.production_scraper",
+    "backend.services.enhanced_materials_database",
+]
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+PROBE = (
+    "import sys, json\n"
+    f"import {APP_MODULE}\n"
+    "from backend.ml.inference.model_registry import get_model_registry\n"
+    f"print(json.dumps({{'loaded': [m for m in {DEFERRED_MODULES!r} if m in sys.modules], "
+    "'models_loaded': get_model_registry().is_loaded}))\n"
+)
+
+
+def measure_import():
+    """(cumulative import ms per top-level module, probe result) for one fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        timeout=300
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {APP_MODULE} failed:\n{result.stderr[-2000:]}")
+
+    cumulative_ms = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Top-level imports have no indentation before the module name
+        if match and len(match.group(3)) <= 1:
+            cumulative_ms[match.group(4)] = int(match.group(2)) / 1000
+    return cumulative_ms, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark():
+    runs = [measure_import() for _ in range(RUNS)]
+    app_ms = sorted(timings.get(APP_MODULE, 0.0) for timings, _ in runs)
+    timings, probe = runs[-1]
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:10]
+    return {
+        "app_import_ms_median": round(app_ms[len(app_ms) // 2], 1),
+        "app_import_ms_min": round(app_ms[0], 1),
+        "deferred_modules_loaded": probe["loaded"],
+        "models_loaded_at_import": probe["models_loaded"],
+        "slowest_imports_ms": {name: round(ms, 1) for name, ms in slowest}
+    }
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+@pytest.mark.skipif(not module_available("flask"), reason="Flask not installed")
+def test_app_import_defers_heavy_modules():
+    """Importing the app should not load the scraper stack, pgeocode or the model"""
+    report = run_benchmark()
+    print(f"\n📊 Startup benchmark: {report}")
+
+    assert report["deferred_modules_loaded"] == []
+    assert report["models_loaded_at_import"] is False
+
+
+if __name__ == "__main__":
+    print("⏱️ App startup benchmark")
+    print("=" * 50)
+    for key, value in run_benchmark().items():
+        print(f"{key}: {value}")
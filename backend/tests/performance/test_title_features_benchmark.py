@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+⏱️ Performance: Title Weight Parsing
+===================================
+
+Weight extraction over the 50k titles of expanded_eco_dataset.csv.
+
+- before: the regex loop extract_weight_from_title used to run (nine
+  nutrition re.sub calls, then one re.findall per unit pattern), per row
+- after (rows): parse_title + container_weight_kg per row, LRU cache
+  cleared first
+- after (parse_many): the whole column at once, cache cleared first
+- scan: both parsers over the distinct titles only, so the cache plays no
+  part
+
+Run directly for a report:
+    python backend/tests/performance/test_title_features_benchmark.py
+"""
+
+import re
+import time
+
+import pandas as pd
+import pytest
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.utils.title_features import clear_title_cache, container_weight_kg, parse_many, parse_title
+
+DATASET_PATH = os.path.join(project_root, "common", "data", "csv", "expanded_eco_dataset.csv")
+
+NUTRITIONAL_EXCLUSIONS = [
+    r'\d+\s*g\s*protein\b', r'\d+\s*g\s*carbs?\b', r'\d+\s*g\s*fat\b', r'\d+\s*mg\s*(?:sodium|caffeine)\b',
+    r'\d+\s*(?:cal|kcal)\b', r'\d+\s*g\s*sugar\b', r'\d+\s*g\s*fiber\b', r'\d+\s*servings?\b', r'\d+\s*scoops?\b'
+]
+CONTAINER_WEIGHT_PATTERNS = [
+    (r'(\d+(?:\.\d+)?)\s*kg\b', 'kg', 1.0), (r'(\d+(?:\.\d+)?)\s*lb[s]?\b', 'lb', 0.453592),
+    (r'(\d+(?:\.\d+)?)\s*pound[s]?\b', 'lb', 0.453592), (r'(\d{3,4})\s*g\b', 'g_large', 0.001),
+    (r'(\d+(?:\.\d+)?)\s*kilograms?\b', 'kg', 1.0), (r'(\d+(?:\.\d+)?)\s*pounds?\b', 'lb', 0.453592),
+    (r'(\d+(?:\.\d+)?)\s*ounces?\b', 'oz', 0.0283495), (r'(\d+(?:\.\d+)?)\s*g\b(?!ram)', 'g', 0.001),
+]
+
+
+def legacy_weight(title):
+    """The old extract_weight_from_title, without its print calls"""
+    if not title:
+        return 0.0
+    title_lower = title.lower()
+    cleaned_title = title_lower
+    for exclusion in NUTRITIONAL_EXCLUSIONS:
+        if re.search(exclusion, cleaned_title):
+            cleaned_title = re.sub(exclusion, ' ', cleaned_title)
+    for pattern, unit, multiplier in CONTAINER_WEIGHT_PATTERNS:
+        matches = re.findall(pattern, cleaned_title)
+        if matches:
+            weight_val = float(matches[0])
+            if any(keyword in title_lower for keyword in ['protein', 'whey', 'casein', 'mass gainer', 'supplement']):
+                if (unit == 'g' and weight_val < 200) or (unit == 'g_large' and weight_val < 400):
+                    continue
+            if 0.05 <= weight_val * multiplier <= 50:
+                return weight_val * multiplier
+    return 0.0
+
+
+def run_benchmark():
+    titles = pd.read_csv(DATASET_PATH, usecols=['title'])['title']
+    rows = titles.tolist()
+    distinct = titles.dropna().unique().tolist()
+
+    start = time.perf_counter()
+    before = [legacy_weight(title) for title in rows]
+    before_time = time.perf_counter() - start
+
+    clear_title_cache()
+    start = time.perf_counter()
+    after = [container_weight_kg(parse_title(title)) or 0.0 for title in rows]
+    rows_time = time.perf_counter() - start
+    assert after == pytest.approx(before)
+
+    clear_title_cache()
+    start = time.perf_counter()
+    frame = parse_many(titles)
+    many_time = time.perf_counter() - start
+    assert frame['weight_kg'].fillna(0.0).tolist() == pytest.approx(before)
+
+    # Scan cost alone: every distinct title once, nothing cached
+    repeats = 20
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for title in distinct:
+            legacy_weight(title)
+    legacy_scan = (time.perf_counter() - start) / (repeats * len(distinct))
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        clear_title_cache()
+        for title in distinct:
+            container_weight_kg(parse_title(title))
+    engine_scan = (time.perf_counter() - start) / (repeats * len(distinct))
+
+    return {
+        "titles": len(rows),
+        "distinct_titles": len(distinct),
+        "before_ms": round(before_time * 1000, 1),
+        "after_rows_ms": round(rows_time * 1000, 1),
+        "after_parse_many_ms": round(many_time * 1000, 1),
+        "speedup_rows": round(before_time / rows_time, 1),
+        "speedup_parse_many": round(before_time / many_time, 1),
+        "legacy_scan_us": round(legacy_scan * 1e6, 1),
+        "engine_scan_us": round(engine_scan * 1e6, 1)
+    }
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_cached_engine_beats_regex_loops():
+    """Parsing the dataset's titles should be much faster than the per-row regex loop"""
+    if not os.path.exists(DATASET_PATH):
+        pytest.skip("expanded_eco_dataset.csv not available")
+    report = run_benchmark()
+    print(f"\n📊 Title parsing benchmark: {report}")
+
+    assert report["speedup_rows"] >= 3
+    assert report["speedup_parse_many"] >= 20
+
+
+if __name__ == "__main__":
+    print("⏱️ Title parsing benchmark")
+    print("=" * 50)
+    for key, value in run_benchmark().items():
+        print(f"{key}: {value}")
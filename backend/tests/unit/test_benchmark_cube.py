@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Industry Benchmark Cube
+=====================================
+
+Tests for the precomputed benchmark cube and its use by
+SupplyChainBenchmarkingEngine.
+
+Coverage:
+- Industry membership matches the per-industry regex filter
+- Summaries match the pandas statistics computed before the cube
+- searchsorted percentile ranks match the linear scan
+- Persistence, memory-mapped reload and rebuild on dataset change
+- Vectorized portfolio scoring (list of dicts and DataFrame)
+"""
+
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+import sys
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.services.benchmark_cube import BenchmarkCube, cube_prefix, industry_masks, load_or_build_cube
+from backend.services.supply_chain_benchmarking import SupplyChainBenchmarkingEngine
+
+CATEGORIES = ["Kitchen Tools", "Smartphones", "Garden furniture", "Skincare", "Office supplies",
+              "Gaming laptops", "Sports shoes", "Toys", None]
+
+
+def make_dataset(rows=2000, seed=0):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        'title': [f"Product {i}" for i in range(rows)],
+        'inferred_category': [rng.choice(CATEGORIES) for _ in range(rows)],
+        'co2_emissions': [round(rng.lognormvariate(2.5, 0.8), 2) for _ in range(rows)],
+        'weight': [round(rng.uniform(0.1, 8.0), 2) for _ in range(rows)],
+        'recyclability': [rng.choice(["High", "Medium", "Low"]) for _ in range(rows)],
+        'origin': [rng.choice(["China", "UK", "Germany"]) for _ in range(rows)]
+    })
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "csv").mkdir()
+    make_dataset().to_csv(tmp_path / "csv" / "enhanced_eco_dataset.csv", index=False)
+    return tmp_path
+
+
+@pytest.fixture
+def engine(data_dir):
+    with patch('builtins.print'):
+        return SupplyChainBenchmarkingEngine(data_path=str(data_dir))
+
+
+@pytest.mark.unit
+class TestBenchmarkCube:
+    """Test building and querying the cube"""
+
+    def test_membership_matches_regex_filter(self, engine):
+        df = make_dataset()
+        masks = industry_masks(df['inferred_category'], engine.industry_classifications)
+        for industry, categories in engine.industry_classifications.items():
+            expected = df['inferred_category'].str.lower().str.contains('|'.join(categories), case=False, na=False)
+            assert (masks[industry] == expected.to_numpy()).all()
+
+    def test_summaries_match_pandas(self, engine):
+        df = make_dataset()
+        products = df[df['inferred_category'].str.lower().str.contains('kitchen|tools|garden', na=False)]
+        summary = engine.benchmarking_data["Home & Garden"]
+        assert summary['sample_size'] == len(products)
+        assert summary['carbon_footprint']['mean'] == pytest.approx(products['co2_emissions'].mean())
+        assert summary['carbon_footprint']['percentiles']['90'] == pytest.approx(products['co2_emissions'].quantile(0.9))
+        assert summary['weight_efficiency']['median'] == pytest.approx(products['weight'].median())
+        assert summary['recyclability_score']['high_percentage'] == pytest.approx((products['recyclability'] == 'High').mean() * 100)
+        assert summary['top_performers'] == products.nsmallest(5, 'co2_emissions')[['title', 'co2_emissions', 'origin']].to_dict('records')
+        # Toys match no industry
+        assert set(engine.benchmarking_data) == {
+            "Home & Garden", "Technology & Electronics", "Health & Beauty", "Industrial & B2B",
+            "Fashion & Apparel", "Sports & Recreation"
+        }
+
+    def test_ranks_match_linear_scan(self, engine):
+        cube = engine.benchmark_cube
+        distribution = list(cube.distribution("Technology & Electronics", "carbon_footprint"))
+        assert distribution == sorted(distribution)
+
+        values = np.array([0.0, 5.0, distribution[10], 12.3, 40.0, 1e6], dtype=np.float32)
+        ranks = cube.percentile_ranks("Technology & Electronics", "carbon_footprint", values)
+        expected = [engine.calculate_percentile_rank(v, distribution) for v in values]
+        assert ranks == pytest.approx(expected)
+
+        inverse = cube.inverse_percentile_ranks("Technology & Electronics", "carbon_footprint", values)
+        expected = [sum(1 for x in distribution if x >= v) / len(distribution) * 100 for v in values]
+        assert inverse == pytest.approx(expected)
+
+        assert (cube.percentile_ranks("Unknown", "carbon_footprint", values) == 50.0).all()
+
+    def test_persisted_and_memory_mapped(self, data_dir, engine):
+        csv_path = str(data_dir / "csv" / "enhanced_eco_dataset.csv")
+        prefix = cube_prefix(csv_path, engine.industry_classifications)
+        assert os.path.exists(prefix + ".npy") and os.path.exists(prefix + ".json")
+        assert isinstance(engine.benchmark_cube.values, np.memmap)
+
+        with patch.object(BenchmarkCube, "build", side_effect=AssertionError("rebuilt")), patch('builtins.print'):
+            second = SupplyChainBenchmarkingEngine(data_path=str(data_dir))
+        assert second.benchmarking_data == engine.benchmarking_data
+
+    def test_rebuilt_when_dataset_changes(self, data_dir, engine):
+        csv_path = data_dir / "csv" / "enhanced_eco_dataset.csv"
+        df = make_dataset(rows=500, seed=1)
+        df.to_csv(csv_path, index=False)
+        os.utime(csv_path, ns=(1, 1))
+        with patch('builtins.print'):
+            cube = load_or_build_cube(str(csv_path), engine.industry_classifications)
+        expected = df['inferred_category'].str.lower().str.contains('kitchen|tools|garden', na=False).sum()
+        assert cube.summaries["Home & Garden"]['sample_size'] == expected
+        # The cube of the previous dataset version is replaced
+        assert len(os.listdir(data_dir / "csv" / ".benchmark_cube")) == 2
+
+
+@pytest.mark.unit
+class TestPortfolioScoring:
+    """Test vectorized portfolio analysis"""
+
+    def products(self, count=300):
+        rng = random.Random(2)
+        return [
+            {'category': 'Kitchen tools', 'carbon_kg': round(rng.uniform(1, 40), 2),
+             'weight': rng.choice([0, 1.5, 2.5]), 'recyclability': rng.choice(['High', 'Low'])}
+            for _ in range(count)
+        ]
+
+    def test_metrics_match_previous_averages(self, engine):
+        products = self.products()
+        result = engine.analyze_company_portfolio({'company_name': 'Acme', 'products': products})
+
+        carbon = [p['carbon_kg'] for p in products]
+        weights = [p['weight'] for p in products if p['weight']]
+        assert result.industry == "Home & Garden"
+        assert result.metrics['carbon_footprint'].value == pytest.approx(sum(carbon) / len(carbon))
+        assert result.metrics['weight_efficiency'].value == pytest.approx(sum(weights) / len(weights))
+        assert result.metrics['recyclability'].value == pytest.approx(
+            sum(p['recyclability'] == 'High' for p in products) / len(products) * 100
+        )
+
+        distribution = result.peer_comparison['portfolio_distribution']
+        assert distribution['carbon_footprint']['products_ranked'] == len(products)
+        assert distribution['weight_efficiency']['products_ranked'] == len(weights)
+        assert 0 <= distribution['carbon_footprint']['median_percentile'] <= 100
+
+    def test_dataframe_portfolio_matches_dicts(self, engine):
+        products = self.products()
+        from_dicts = engine.analyze_company_portfolio({'company_name': 'Acme', 'products': products})
+        from_frame = engine.analyze_company_portfolio({'company_name': 'Acme', 'products': pd.DataFrame(products)})
+        assert from_frame.metrics == from_dicts.metrics
+        assert from_frame.peer_comparison['portfolio_distribution'] == from_dicts.peer_comparison['portfolio_distribution']
+
+    def test_fallback_data_uses_bands(self, tmp_path):
+        with patch('builtins.print'):
+            engine = SupplyChainBenchmarkingEngine(data_path=str(tmp_path))
+        assert engine.benchmark_cube is None
+
+        ranks = engine.calculate_percentile_ranks("Home & Garden", "carbon_footprint", [1.0, 10.0, 20.0, 100.0])
+        expected = [engine._calculate_inverse_percentile(v, engine.benchmarking_data["Home & Garden"]['carbon_footprint'])
+                    for v in [1.0, 10.0, 20.0, 100.0]]
+        assert list(ranks) == expected
+
+        comparison = engine.benchmark_competitor_analysis(
+            'A', 'B',
+            [{'category': 'kitchen', 'carbon_kg': 5.0, 'recyclability': 'High', 'weight': 1.0}],
+            [{'category': 'kitchen', 'carbon_kg': 50.0, 'recyclability': 'Low', 'weight': 4.0}]
+        )
+        assert comparison['competitive_advantage'] == 'A'
+
+    def test_empty_portfolio_rejected(self, engine):
+        with pytest.raises(ValueError):
+            engine.analyze_company_portfolio({'company_name': 'Acme', 'products': []})
+        with pytest.raises(ValueError):
+            engine.analyze_company_portfolio({'company_name': 'Acme', 'products': pd.DataFrame()})
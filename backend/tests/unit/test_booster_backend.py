@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Native Booster Inference Backend
+==============================================
+
+Tests for NativePredictor and make_predictor with a stubbed Booster, so
+they run without xgboost installed.
+
+Coverage:
+- One inplace_predict call per prediction, on a contiguous float32 array
+- Binary and softmax objectives converted to per-class probabilities
+- Latency statistics
+- Non-xgboost models passed through unchanged
+"""
+
+import json
+import pytest
+import numpy as np
+from unittest.mock import Mock
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.ml.inference.booster_backend import NativePredictor, make_predictor
+from backend.ml.inference.feature_builder import predict_labels
+from backend.ml.inference.model_registry import FallbackModel
+
+
+def fake_booster(objective, output):
+    booster = Mock()
+    booster.save_config.return_value = json.dumps({"learner": {"objective": {"name": objective}}})
+    booster.inplace_predict.return_value = np.asarray(output)
+    return booster
+
+
+class TestNativePredictor:
+    def test_single_call_with_float32_contiguous_input(self):
+        booster = fake_booster("multi:softprob", [[0.1, 0.7, 0.2], [0.6, 0.3, 0.1]])
+        predictor = NativePredictor(booster)
+
+        best, proba = predictor.predict_with_proba([[1, 2], [3, 4]])
+
+        booster.inplace_predict.assert_called_once()
+        X = booster.inplace_predict.call_args[0][0]
+        assert X.dtype == np.float32 and X.flags["C_CONTIGUOUS"]
+        assert best.tolist() == [1, 0]
+        assert proba.shape == (2, 3)
+
+    def test_binary_objective_gives_two_columns(self):
+        predictor = NativePredictor(fake_booster("binary:logistic", [0.8, 0.3]))
+        best, proba = predictor.predict_with_proba([[1.0], [2.0]])
+        np.testing.assert_allclose(proba, [[0.2, 0.8], [0.7, 0.3]])
+        assert best.tolist() == [1, 0]
+
+    def test_softmax_objective_uses_margins(self):
+        booster = fake_booster("multi:softmax", [[0.0, 2.0, 0.0]])
+        predictor = NativePredictor(booster)
+        proba = predictor.predict_proba([[1.0]])
+        assert booster.inplace_predict.call_args[1]["predict_type"] == "margin"
+        assert proba.sum() == pytest.approx(1.0)
+        assert proba.argmax() == 1
+
+    def test_latency_recorded(self):
+        predictor = NativePredictor(fake_booster("multi:softprob", [[0.5, 0.5]]))
+        assert predictor.last_latency_ms is None
+        predictor.predict([[1.0]])
+        stats = predictor.get_stats()
+        assert predictor.last_latency_ms is not None
+        assert stats["calls"] == 1 and stats["rows"] == 1
+
+    def test_predict_labels_accepts_predictor(self):
+        predictor = NativePredictor(fake_booster("multi:softprob", [[0.1, 0.9]]))
+        labels, confidences = predict_labels(predictor, ["A", "B"], [[1.0]])
+        assert labels == ["B"]
+        assert confidences == [90.0]
+
+
+def test_non_xgboost_models_pass_through():
+    model = FallbackModel()
+    assert make_predictor(model) is model
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Fuzzy Brand Index
+===============================
+
+Tests for the trigram BrandIndex behind
+EnhancedBrandResolver.fuzzy_match_brand.
+
+Coverage:
+- Same matches as scoring every known brand (the original full scan)
+- Acronyms found even without shared trigrams
+- Brands added by update_brand_origin / learn_from_success are matchable
+- Brands other workers wrote to the BrandStore are matchable
+- Deleted brands and empty records are never matched
+"""
+
+import json
+import pytest
+from difflib import SequenceMatcher
+from unittest.mock import patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from common.data import brand_origin_resolver
+from common.data.brand_origin_resolver import BrandIndex, EnhancedBrandResolver
+from common.data.brand_store import BrandStore
+
+BRAND_LOCATIONS_JSON = os.path.join(project_root, "common", "data", "json", "brand_locations.json")
+
+QUERIES = [
+    "samsng", "apple inc", "nintendo co ltd", "the north face", "dyson ltd", "adiddas",
+    "hewlett packard", "hp", "bosch gmbh", "lego group", "kitchen aid", "zzqx", "a", ""
+]
+
+
+def full_scan_match(resolver, target_brand, threshold=0.75):
+    """The original fuzzy_match_brand: score every known brand"""
+    target_clean = resolver._normalize_brand_name(target_brand)
+    best_match, best_score = None, 0.0
+    for known_brand in resolver.exact_matches.keys():
+        known_clean = resolver._normalize_brand_name(known_brand)
+        similarity = SequenceMatcher(None, target_clean, known_clean).ratio()
+        if resolver._has_exact_word_match(target_clean, known_clean):
+            similarity += 0.15
+        if resolver._is_common_abbreviation(target_clean, known_clean):
+            similarity += 0.20
+        if similarity >= threshold and similarity > best_score:
+            best_match, best_score = known_brand, similarity
+    return (best_match, best_score) if best_match else None
+
+
+@pytest.fixture
+def resolver():
+    with open(BRAND_LOCATIONS_JSON, encoding="utf-8") as f:
+        brands = {key.lower(): {"country": value if isinstance(value, str) else "Unknown"}
+                  for key, value in json.load(f).items() if not key.startswith("_")}
+    resolver = EnhancedBrandResolver()
+    resolver.exact_matches = brands
+    return resolver
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_index_matches_full_scan(resolver, query):
+    assert resolver.fuzzy_match_brand(query) == full_scan_match(resolver, query)
+
+
+def test_acronym_candidates():
+    index = BrandIndex(str.lower, ["hewlett packard", "sony"])
+    assert 0 in index.candidates("hp")
+
+
+def test_new_brands_are_matchable(resolver):
+    resolver.fuzzy_match_brand("warm up the index")
+    resolver.add_known_brand("quuxwidget", {"country": "UK", "city": "Leeds"})
+    assert resolver.fuzzy_match_brand("quuxwidgett")[0] == "quuxwidget"
+
+    resolver.learn_from_success("Zorblaxo", "Germany", 0.9)
+    assert resolver.fuzzy_match_brand("zorblaxoo")[0] == "zorblaxo"
+    result = resolver.intelligent_brand_resolution("zorblaxoo")
+    assert result["source"] == "fuzzy_database_match"
+    assert result["country"] == "Germany"
+
+
+def test_direct_edits_to_exact_matches_are_picked_up(resolver):
+    resolver.fuzzy_match_brand("warm up the index")
+    resolver.exact_matches["flimflamco"] = {"country": "USA"}
+    assert resolver.fuzzy_match_brand("flimflamcoo")[0] == "flimflamco"
+
+
+def test_update_brand_origin_indexes_brand(tmp_path):
+    path = tmp_path / "brand_origin.json"
+    with patch.object(brand_origin_resolver, "BRAND_ORIGIN_JSON", str(path)), \
+            patch.object(brand_origin_resolver, "_enhanced_resolver", EnhancedBrandResolver()) as resolver:
+        resolver.fuzzy_match_brand("warm up the index")
+        brand_origin_resolver.update_brand_origin("Grommetix", "france", "lyon")
+        assert resolver.fuzzy_match_brand("gromettix")[0] == "grommetix"
+        assert resolver.exact_matches.flush()
+        assert BrandStore(str(path))["grommetix"] == {"country": "France", "city": "Lyon"}
+
+
+def test_brands_from_other_workers_are_picked_up(tmp_path):
+    path = str(tmp_path / "brand_origin.json")
+    with patch.object(brand_origin_resolver, "BRAND_ORIGIN_JSON", path):
+        resolver = EnhancedBrandResolver()
+    resolver.exact_matches = BrandStore(path, debounce=0.01)
+    resolver.exact_matches["acme"] = {"country": "USA"}
+    # Learned brands make the index larger than the store
+    for brand in ("Zorblaxo", "Quuxwidget"):
+        resolver.learn_from_success(brand, "Germany", 0.9)
+    resolver.fuzzy_match_brand("warm up the index")
+
+    other_worker = BrandStore(path, debounce=0.01)
+    other_worker["grommetix"] = {"country": "France"}
+    assert other_worker.flush()
+    resolver.exact_matches.refresh()
+
+    assert resolver.fuzzy_match_brand("gromettix")[0] == "grommetix"
+
+
+def test_deleted_brands_are_not_matched(tmp_path):
+    path = str(tmp_path / "brand_origin.json")
+    with patch.object(brand_origin_resolver, "BRAND_ORIGIN_JSON", path):
+        resolver = EnhancedBrandResolver()
+    resolver.exact_matches = BrandStore(path, debounce=0.01)
+    resolver.exact_matches["grommetix"] = {"country": "France"}
+    assert resolver.fuzzy_match_brand("gromettix")[0] == "grommetix"
+
+    del resolver.exact_matches["grommetix"]
+
+    assert resolver.fuzzy_match_brand("gromettix") is None
+    assert resolver.intelligent_brand_resolution("gromettix")["source"] != "fuzzy_database_match"
+
+
+def test_empty_records_are_not_matched(resolver):
+    resolver.fuzzy_match_brand("warm up the index")
+    resolver.add_known_brand("flimflamco", {})
+
+    assert resolver.fuzzy_match_brand("flimflamcoo") is None
+    assert resolver.intelligent_brand_resolution("flimflamcoo")["source"] != "fuzzy_database_match"
+
+    resolver.learn_from_success("Flimflamco", "USA", 0.9)
+    result = resolver.intelligent_brand_resolution("flimflamcoo")
+    assert result["source"] == "fuzzy_database_match"
+    assert result["country"] == "USA"
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Write-Behind Brand Store
+======================================
+
+Tests for the BrandStore behind brand_locations.json (scraper) and
+brand_orign_data.json (brand resolver).
+
+Coverage:
+- Learning a brand appends to the log instead of rewriting the JSON file
+- Debounced batches
+- Changes from other processes become visible, none are lost
+- Compaction back into the JSON file
+"""
+
+import pytest
+import json
+import multiprocessing
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from common.data import brand_store
+from common.data.brand_store import BrandStore
+
+SNAPSHOT = {
+    "huel": {"origin": {"country": "UK", "city": "Tring"}, "fulfillment": "UK"},
+    "anker": {"origin": {"country": "China", "city": "Shenzhen"}, "fulfillment": "UK"}
+}
+
+
+def _record(country):
+    return {"origin": {"country": country, "city": "Unknown"}, "fulfillment": "UK"}
+
+
+def _learn_from_process(path, worker, count):
+    store = BrandStore(path, debounce=0.01)
+    for i in range(count):
+        store[f"brand-{worker}-{i}"] = _record("UK")
+    store.flush()
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "brand_locations.json"
+    path.write_text(json.dumps(SNAPSHOT, indent=2))
+    return str(path)
+
+
+@pytest.mark.unit
+class TestBrandStoreWrites:
+    """Test write-behind appends"""
+
+    def test_reads_snapshot(self, path):
+        store = BrandStore(path)
+        assert store["huel"]["origin"]["city"] == "Tring"
+        assert len(store) == 2
+        assert "missing" not in store
+
+    def test_learning_appends_without_rewriting_snapshot(self, path):
+        """Test a learned brand goes to the log and the JSON file is untouched"""
+        with open(path, "rb") as f:
+            before = f.read()
+        store = BrandStore(path, debounce=0.01)
+        store["tefal"] = _record("France")
+        assert store["tefal"]["origin"]["country"] == "France"
+        assert store.flush()
+
+        with open(path, "rb") as f:
+            assert f.read() == before
+        with open(store.log_path, encoding="utf-8") as f:
+            assert [json.loads(line) for line in f] == [{"k": "tefal", "v": _record("France")}]
+
+    def test_burst_is_one_batch(self, path):
+        """Test changes within the debounce window are written with one append, last value wins"""
+        store = BrandStore(path, debounce=0.2)
+        for i in range(50):
+            store[f"brand-{i}"] = _record("UK")
+        store["brand-0"] = _record("Japan")
+        assert store.flush()
+
+        assert store.stats["batches"] == 1
+        assert store.stats["written"] == 50
+        assert BrandStore(path)["brand-0"]["origin"]["country"] == "Japan"
+
+    def test_unchanged_assignment_is_not_queued(self, path):
+        store = BrandStore(path, debounce=0.01)
+        store["huel"] = dict(SNAPSHOT["huel"])
+        assert store.stats["queued"] == 0
+
+    def test_delete_survives_reload(self, path):
+        store = BrandStore(path, debounce=0.01)
+        del store["anker"]
+        assert store.flush()
+        assert "anker" not in BrandStore(path)
+
+
+@pytest.mark.unit
+class TestBrandStoreProcesses:
+    """Test sharing between processes"""
+
+    def test_concurrent_processes_lose_nothing(self, path):
+        """Test brands learned by several processes at once all survive"""
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            pytest.skip("fork start method unavailable")
+
+        workers = [context.Process(target=_learn_from_process, args=(path, w, 100)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+
+        store = BrandStore(path)
+        assert all(f"brand-{w}-{i}" in store for w in range(4) for i in range(100))
+        assert len(store) == 402
+
+    def test_miss_picks_up_other_writers(self, path, monkeypatch):
+        monkeypatch.setattr(brand_store, "REFRESH_SECONDS", 0.0)
+        reader = BrandStore(path)
+        writer = BrandStore(path, debounce=0.01)
+        writer["nintendo"] = _record("Japan")
+        writer.flush()
+
+        assert "nintendo" in reader
+        assert reader["nintendo"]["origin"]["country"] == "Japan"
+
+    def test_local_pending_change_beats_older_log_record(self, path):
+        """Test tailing another process's record does not undo a change still queued here"""
+        other = BrandStore(path, debounce=0.01)
+        other["huel"] = _record("Ireland")
+        other.flush()
+
+        store = BrandStore(path, debounce=60)
+        store._log_offset = 0
+        store._log_inode = None
+        store._pending["huel"] = _record("UK")
+        store._data["huel"] = _record("UK")
+        store.refresh()
+        assert store["huel"]["origin"]["country"] == "UK"
+
+
+@pytest.mark.unit
+class TestBrandStoreCompaction:
+    """Test folding the log into the JSON file"""
+
+    def test_compact_writes_snapshot_and_empties_log(self, path):
+        store = BrandStore(path, debounce=0.01)
+        store["dyson"] = _record("UK")
+        store.compact()
+
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["dyson"] == _record("UK")
+        assert os.path.getsize(store.log_path) == 0
+
+    def test_compaction_threshold(self, path):
+        store = BrandStore(path, debounce=0.01, compact_bytes=2000)
+        for i in range(40):
+            store[f"brand-{i}"] = _record("UK")
+        store.flush()
+        assert store.stats["compactions"] == 1
+
+    def test_other_process_reloads_after_compaction(self, path, monkeypatch):
+        monkeypatch.setattr(brand_store, "REFRESH_SECONDS", 0.0)
+        reader = BrandStore(path)
+        writer = BrandStore(path, debounce=0.01)
+        writer["sony"] = _record("Japan")
+        writer.compact()
+        writer["apple"] = _record("USA")
+        writer.flush()
+
+        assert "apple" in reader
+        assert reader["sony"]["origin"]["country"] == "Japan"
+        assert reader.stats["reloads"] == 1
+
+    def test_close_compacts_only_when_changed(self, path):
+        store = BrandStore(path, debounce=0.01)
+        store.close()
+        assert store.stats["compactions"] == 0
+        store["lego"] = _record("Denmark")
+        store.close()
+        assert store.stats["compactions"] == 1
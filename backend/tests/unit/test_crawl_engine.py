@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Async Crawl Engine
+================================
+
+Tests for the concurrent bulk crawler used by the scheduler, run against
+a local stub HTTP server.
+
+Coverage:
+- Token-bucket politeness per domain
+- CAPTCHA-aware domain circuit breaker
+- Two-stage search -> product crawl with ASIN dedup
+- Retry, block and not-found handling
+"""
+
+import pytest
+import asyncio
+import time
+from unittest.mock import patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("httpx")
+
+from backend.scrapers.amazon.crawl_engine import (
+    AsyncCrawlEngine,
+    DomainCircuitBreaker,
+    TokenBucket,
+    parse_dimensions_cm
+)
+from backend.tests.fixtures.stub_amazon_server import StubAmazonServer, search_asins
+
+
+def _quiet_engine(**kwargs):
+    kwargs.setdefault("base_delay", 0.01)
+    kwargs.setdefault("max_delay", 0.05)
+    return AsyncCrawlEngine(**kwargs)
+
+
+@pytest.mark.unit
+class TestPolitenessPrimitives:
+    """Test the token bucket and circuit breaker"""
+
+    def test_token_bucket_limits_rate(self):
+        """Test that requests beyond the burst are spaced at 1/rate"""
+        async def take(n):
+            bucket = TokenBucket(rate=20, capacity=2)
+            start = time.monotonic()
+            for _ in range(n):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        elapsed = asyncio.run(take(6))
+
+        # 2 burst tokens, then 4 more at 20/s
+        assert 0.18 <= elapsed < 0.5
+
+    def test_breaker_pauses_after_repeated_blocks(self):
+        """Test the open/probe/close cycle"""
+        breaker = DomainCircuitBreaker(block_threshold=2, pause_seconds=0.05)
+
+        breaker.record_block()
+        assert not breaker.is_open
+        breaker.record_block()
+        assert breaker.is_open and breaker.trips == 1
+
+        time.sleep(0.06)
+        assert not breaker.is_open
+        breaker.record_block()  # failed probe re-opens immediately
+        assert breaker.is_open and breaker.trips == 2
+
+        time.sleep(0.06)
+        breaker.record_success()
+        breaker.record_block()
+        assert not breaker.is_open
+
+    def test_parse_dimensions(self):
+        """Test detail-table dimension strings"""
+        assert parse_dimensions_cm("10 x 5.5 x 3 cm; 480 g") == [10.0, 5.5, 3.0]
+        assert parse_dimensions_cm("100 x 50 x 20 mm") == [10.0, 5.0, 2.0]
+        assert parse_dimensions_cm("n/a") is None
+
+
+@pytest.mark.unit
+class TestAsyncCrawlEngine:
+    """Test crawling against the stub server"""
+
+    def test_search_then_product_crawl(self):
+        """Test that search pages fan out to deduplicated product pages"""
+        with StubAmazonServer(results_per_page=5, filler_blocks=0) as server, patch('builtins.print'):
+            engine = _quiet_engine(concurrency=4, requests_per_second=200, burst=10)
+            skip = {search_asins("mug", 1, 5)[0]}
+            report = asyncio.run(engine.crawl_search_terms(
+                ["mug"], pages_per_term=2,
+                search_url_template=server.search_url_template,
+                skip_asins=skip
+            ))
+
+        assert len(report["search_results"]) == 2
+        assert len(report["products"]) == 9
+        product = report["products"][0]
+        assert product["asin"] not in skip
+        assert product["weight_kg"] == pytest.approx(0.48)
+        assert product["origin"] == "UK"
+        assert report["failed_urls"] == []
+
+    def test_captcha_is_retried_and_counted(self):
+        """Test that a blocked page is retried and recorded against the domain"""
+        with StubAmazonServer(captcha_asins={"B0RETRY001": 1}, filler_blocks=0) as server, patch('builtins.print'):
+            engine = _quiet_engine(requests_per_second=200, burst=10, block_threshold=5)
+            results = asyncio.run(engine.crawl([f"{server.base_url}/dp/B0RETRY001"]))
+
+        assert results[0].ok
+        assert results[0].blocked == 1
+        assert results[0].attempts == 2
+        assert engine.stats["blocked"] == 1
+
+    def test_not_found_is_not_retried(self):
+        """Test that 404s fail fast"""
+        with StubAmazonServer() as server, patch('builtins.print'):
+            engine = _quiet_engine(requests_per_second=200, burst=10)
+            results = asyncio.run(engine.crawl([f"{server.base_url}/missing"]))
+
+        assert not results[0].ok
+        assert results[0].attempts == 1
+        assert results[0].error == "HTTP 404"
+
+    def test_repeated_blocks_pause_the_domain(self):
+        """Test that the breaker trips and the crawl waits instead of sleeping globally"""
+        with StubAmazonServer(captcha_asins={"B0PAUSE001": 2}, filler_blocks=0) as server, patch('builtins.print'):
+            engine = _quiet_engine(requests_per_second=200, burst=10, block_threshold=2, block_pause_seconds=0.2)
+            start = time.monotonic()
+            results = asyncio.run(engine.crawl([f"{server.base_url}/dp/B0PAUSE001"]))
+            elapsed = time.monotonic() - start
+
+        assert results[0].ok
+        assert engine.stats["circuit_trips"] == 1
+        assert elapsed >= 0.2
+
+    def test_per_domain_rate_is_respected(self):
+        """Test that concurrency never outruns the domain's token bucket"""
+        with StubAmazonServer(filler_blocks=0) as server, patch('builtins.print'):
+            engine = _quiet_engine(concurrency=8, requests_per_second=40, burst=1)
+            urls = [f"{server.base_url}/dp/B0RATE{i:04d}" for i in range(8)]
+            asyncio.run(engine.crawl(urls))
+            stamps = sorted(t for t, _ in server.requests)
+
+        gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+        assert min(gaps) >= 0.015
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Columnar Dataset Service
+======================================
+
+Tests for the in-memory dataset service behind /api/eco-data, /insights,
+/api/dashboard-metrics, /api/ml-audit and the enterprise dashboard.
+
+Coverage:
+- Column typing (float32, categorical) and stray header rows
+- Columnar cache reuse across service instances
+- Reload and aggregate invalidation on file change
+- JSON-ready records
+"""
+
+import pytest
+import os
+from unittest.mock import patch
+
+import sys
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+
+from backend.services.dataset_service import DatasetService, get_dataset_service
+
+CSV_TEXT = (
+    "title,material,weight,transport,true_eco_score,co2_emissions,category\n"
+    "bottle,Steel,1.85,Air,F,5.83,\n"
+    "box,Cardboard,0.55,Land,B,0.35,home\n"
+    "title,material,weight,transport,true_eco_score,co2_emissions,\n"
+    "mug,Steel,0.4,Sea,C,,home\n"
+    "bag,Cotton,0.2,Sea,B,0.12,home\n"
+)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / "eco.csv"
+    path.write_text(CSV_TEXT)
+    with patch('builtins.print'):
+        yield DatasetService(str(path), cache_dir=str(tmp_path / "cache"))
+
+
+def _touch(path, text):
+    """Rewrite the file and make sure its mtime moves"""
+    before = os.stat(path).st_mtime_ns
+    with open(path, "w") as f:
+        f.write(text)
+    os.utime(path, ns=(before + 10**9, before + 10**9))
+
+
+@pytest.mark.unit
+class TestDatasetLoading:
+    """Test typing and caching of the dataset"""
+
+    def test_columns_are_typed_and_header_rows_dropped(self, dataset):
+        """Test numeric text becomes float32 and repeated headers disappear"""
+        # Every text column in a 4-row file is "high cardinality" at the default ratio
+        with patch('backend.services.dataset_service.CATEGORICAL_MAX_RATIO', 1.0):
+            df = dataset.frame()
+
+        assert len(df) == 4
+        assert df["weight"].dtype == np.float32
+        assert df["co2_emissions"].dtype == np.float32
+        assert isinstance(df["material"].dtype, pd.CategoricalDtype)
+        assert "material" not in set(df["material"])
+
+    def test_second_instance_loads_columnar_cache(self, dataset, tmp_path):
+        """Test a new process reuses the converted file instead of the CSV"""
+        dataset.frame()
+        assert dataset.stats["csv_parses"] == 1
+        assert os.listdir(tmp_path / "cache")
+
+        with patch('builtins.print'):
+            other = DatasetService(dataset.path, cache_dir=str(tmp_path / "cache"))
+            with patch('pandas.read_csv') as mock_read_csv:
+                df = other.frame()
+
+        mock_read_csv.assert_not_called()
+        assert other.stats["cache_hits"] == 1
+        pd.testing.assert_frame_equal(df, dataset.frame())
+
+    def test_frame_is_loaded_once(self, dataset):
+        """Test repeated access serves the same in-memory frame"""
+        assert dataset.frame() is dataset.frame()
+        assert dataset.stats["loads"] == 1
+
+    def test_missing_file_gives_empty_frame(self, tmp_path):
+        """Test a missing CSV is reported, not raised"""
+        service = DatasetService(str(tmp_path / "missing.csv"))
+
+        assert not service.available
+        assert service.frame().empty
+
+    def test_shared_service_per_path(self, tmp_path):
+        """Test the process-wide registry"""
+        path = str(tmp_path / "eco.csv")
+        assert get_dataset_service(path) is get_dataset_service(path)
+        assert get_dataset_service(path) is not get_dataset_service(path, float_dtype='float64')
+
+
+@pytest.mark.unit
+class TestDatasetAggregates:
+    """Test memoized aggregates and invalidation"""
+
+    def test_value_counts_memoized(self, dataset):
+        """Test counts are computed once per data version"""
+        first = dataset.value_counts("true_eco_score")
+        second = dataset.value_counts("true_eco_score")
+
+        assert first == {"B": 2, "F": 1, "C": 1}
+        assert first is second
+        assert dataset.stats["aggregate_hits"] >= 1
+
+    def test_file_change_invalidates_aggregates(self, dataset):
+        """Test an edited CSV is reloaded and aggregates recomputed"""
+        assert dataset.value_counts("material")["Steel"] == 2
+
+        _touch(dataset.path, CSV_TEXT + "can,Steel,0.1,Air,D,0.9,home\n")
+
+        assert dataset.value_counts("material")["Steel"] == 3
+        assert dataset.stats["loads"] == 2
+        assert dataset.stats["csv_parses"] == 2
+
+    def test_clean_and_groupby_mean(self, dataset):
+        """Test dropna subsets and grouped means"""
+        assert len(dataset.clean(["co2_emissions"])) == 3
+        assert len(dataset.clean(["not_a_column"])) == 4
+
+        means = dataset.groupby_mean("material", "co2_emissions", dropna_subset=["co2_emissions"])
+        assert means["Steel"] == pytest.approx(5.83)
+        assert set(means) == {"Steel", "Cardboard", "Cotton"}
+
+    def test_records_are_json_ready(self, dataset):
+        """Test floats match the CSV text and NaN becomes None"""
+        records = dataset.records(limit=2)
+
+        assert records[0]["co2_emissions"] == 5.83
+        assert records[0]["weight"] == 1.85
+        assert records[0]["category"] is None
+        assert records[1]["material"] == "Cardboard"
+
+        subset = dataset.records(columns=["material", "co2_emissions"], dropna_subset=["co2_emissions"], limit=10)
+        assert [r["material"] for r in subset] == ["Steel", "Cardboard", "Cotton"]
+        assert set(subset[0]) == {"material", "co2_emissions"}
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Append-Only Event Log
+===================================
+
+Tests for the JSONL log behind /predict submissions, /api/feedback and the
+dashboard prediction counters.
+
+Coverage:
+- Appends never rewrite earlier records
+- Legacy JSON-array migration
+- Incremental counters across processes
+- Concurrent writers produce whole lines only
+- Admin replace() and counter rebuild
+"""
+
+import pytest
+import json
+import multiprocessing
+import threading
+from unittest.mock import patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.services.event_log import EventLog
+
+
+def _label(record):
+    return record.get("predicted_label")
+
+
+def _append_from_process(path, worker, count):
+    log = EventLog(path)
+    for i in range(count):
+        log.append({"worker": worker, "i": i, "padding": "x" * 500})
+    log.flush()
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "submissions.jsonl")
+
+
+@pytest.mark.unit
+class TestEventLogWrites:
+    """Test appending and migration"""
+
+    def test_append_leaves_earlier_bytes_untouched(self, log_path):
+        """Test each batch is appended, not rewritten"""
+        log = EventLog(log_path)
+        log.append({"title": "first", "predicted_label": "B"})
+        log.flush()
+        with open(log_path, "rb") as f:
+            before = f.read()
+
+        log.append({"title": "second", "predicted_label": "C"})
+        log.flush()
+        with open(log_path, "rb") as f:
+            after = f.read()
+
+        assert after.startswith(before)
+        assert [r["title"] for r in log.read_all()] == ["first", "second"]
+
+    def test_legacy_json_array_is_migrated_once(self, tmp_path, log_path):
+        """Test records from the old JSON file are kept"""
+        legacy = tmp_path / "submissions.json"
+        legacy.write_text(json.dumps([{"title": "old", "predicted_label": "A"}]))
+
+        with patch('builtins.print'):
+            log = EventLog(log_path, legacy_json_path=str(legacy))
+            log.append({"title": "new", "predicted_label": "B"})
+            log.flush()
+            other = EventLog(log_path, legacy_json_path=str(legacy))
+            records = other.read_all()
+
+        assert [r["title"] for r in records] == ["old", "new"]
+
+    def test_concurrent_processes_write_whole_lines(self, log_path):
+        """Test several worker processes appending at once never interleave lines"""
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            pytest.skip("fork start method unavailable")
+
+        workers = [context.Process(target=_append_from_process, args=(log_path, w, 150)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+
+        with open(log_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == 600
+        assert {(r["worker"], r["i"]) for r in records} == {(w, i) for w in range(4) for i in range(150)}
+
+
+@pytest.mark.unit
+class TestEventLogCounters:
+    """Test incremental counters"""
+
+    def test_counters_only_read_new_bytes(self, log_path):
+        """Test counts are updated from the tail of the file"""
+        log = EventLog(log_path)
+        log.add_counter("predicted_label", _label)
+        for label in "ABB":
+            log.append({"predicted_label": label})
+
+        assert log.counts() == {"total": 3, "predicted_label": {"A": 1, "B": 2}}
+        offset = log._offset
+
+        log.append({"predicted_label": "C"})
+        assert log.counts()["predicted_label"] == {"A": 1, "B": 2, "C": 1}
+        assert log._offset > offset
+        assert log.stats["tail_reads"] == 2
+        assert log.stats["rebuilds"] == 0
+
+    def test_counts_include_other_workers(self, log_path):
+        """Test appends from another process's log are counted"""
+        worker_a, worker_b = EventLog(log_path), EventLog(log_path)
+        worker_a.add_counter("predicted_label", _label)
+
+        threads = [
+            threading.Thread(target=lambda log=log: [log.append({"predicted_label": "D"}) for _ in range(50)])
+            for log in (worker_a, worker_b)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        worker_b.flush()
+
+        assert worker_a.counts() == {"total": 100, "predicted_label": {"D": 100}}
+
+    def test_incomplete_last_line_waits_for_next_read(self, log_path):
+        """Test a batch caught mid-write is not miscounted"""
+        log = EventLog(log_path)
+        log.add_counter("predicted_label", _label)
+        with open(log_path, "w", encoding="utf-8") as f:
+            f.write('{"predicted_label": "A"}\n{"predicted_la')
+
+        assert log.counts()["total"] == 1
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write('bel": "E"}\n')
+        assert log.counts()["predicted_label"] == {"A": 1, "E": 1}
+
+    def test_replace_triggers_rebuild(self, log_path):
+        """Test an admin edit is reflected in counters of every process"""
+        editor, reader = EventLog(log_path), EventLog(log_path)
+        reader.add_counter("predicted_label", _label)
+        editor.append({"title": "mug", "predicted_label": "F"})
+        editor.append({"title": "cup", "predicted_label": "B"})
+        editor.flush()
+        assert reader.counts()["predicted_label"] == {"F": 1, "B": 1}
+
+        assert editor.replace(lambda r: r["title"] == "mug", {"title": "mug", "predicted_label": "A"})
+
+        assert reader.counts()["predicted_label"] == {"A": 1, "B": 1}
+        assert reader.stats["rebuilds"] == 1
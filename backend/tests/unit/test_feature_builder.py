@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Vectorized Feature Builder
+========================================
+
+Tests for the shared eco-score feature builder used by /predict,
+/predict/batch and /estimate_emissions.
+
+Coverage:
+- Dict-based encoding parity with LabelEncoder.transform
+- Matrix layout for the 16-feature and 6-feature models
+- Label/confidence derivation from a single predict_proba call
+- /estimate_emissions and /predict encode the same product identically
+"""
+
+import pytest
+import numpy as np
+from contextlib import contextmanager
+from unittest.mock import MagicMock, Mock, patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+import joblib
+
+from backend.ml.inference.feature_builder import (
+    BASIC_FEATURES,
+    ENHANCED_FEATURES,
+    CategoryIndex,
+    EcoFeatureBuilder,
+    encode_category,
+    normalize_feature,
+    predict_labels
+)
+
+ENCODERS_DIR = os.path.join(project_root, "backend", "ml", "encoders")
+
+
+def _load(name):
+    return joblib.load(os.path.join(ENCODERS_DIR, name))
+
+
+@pytest.fixture(scope="module")
+def encoders():
+    return {
+        "material": _load("material_encoder.pkl"),
+        "transport": _load("transport_encoder.pkl"),
+        "recycle": _load("recycle_encoder.pkl"),
+        "origin": _load("origin_encoder.pkl"),
+        "packaging": _load("packaging_type_encoder.pkl"),
+        "size": _load("size_category_encoder.pkl"),
+        "quality": _load("quality_level_encoder.pkl"),
+        "category": _load("inferred_category_encoder.pkl"),
+        "label": _load("label_encoder.pkl"),
+    }
+
+
+@pytest.fixture(scope="module")
+def builder(encoders):
+    return EcoFeatureBuilder(
+        encoders["material"], encoders["transport"], encoders["recycle"], encoders["origin"],
+        encoders["packaging"], encoders["size"], encoders["quality"], encoders["category"]
+    )
+
+
+def _legacy_safe_encode(value, encoder, default):
+    """The original per-value safe_encode from app.py"""
+    value = normalize_feature(value, default)
+    if value not in encoder.classes_:
+        value = default
+    return encoder.transform([value])[0]
+
+
+@pytest.mark.unit
+class TestCategoryIndex:
+    """Test dict-based category encoding"""
+
+    @pytest.mark.parametrize("value", ["plastic", "Glass", " steel ", "unknown", None, "", "Nonsense", 42])
+    def test_matches_label_encoder(self, encoders, value):
+        """Test parity with the LabelEncoder-based safe_encode"""
+        encoder = encoders["material"]
+        assert encode_category(value, encoder, "Other") == _legacy_safe_encode(value, encoder, "Other")
+
+    def test_unknown_values_use_default(self):
+        """Test that unseen values map to the default class"""
+        index = CategoryIndex(["Air", "Land", "Ship"], "Land")
+
+        assert index.encode("Teleport") == 1
+        assert index.encode_many(["air", "ship", None]) == [0, 2, 1]
+
+    def test_missing_default_raises(self):
+        """Test that a default outside the classes is reported"""
+        index = CategoryIndex(["a", "b"], "c")
+
+        with pytest.raises(ValueError):
+            index.encode("zzz")
+
+
+@pytest.mark.unit
+class TestEcoFeatureBuilder:
+    """Test matrix construction"""
+
+    def test_enhanced_matrix_layout(self, builder, encoders):
+        """Test the 16-feature row for a single product"""
+        X, raw_inputs = builder.build_matrix([{
+            "material": "plastic",
+            "weight": 1.2,
+            "origin": "china",
+            "distance_origin_to_uk": 8000,
+            "title": "Premium Protein Powder 3 pack bottle"
+        }])
+
+        assert X.shape == (1, len(ENHANCED_FEATURES))
+        assert X.dtype == np.float32
+        assert raw_inputs[0] == {
+            "material": "Plastic", "weight": 1.2, "transport": "Air",
+            "recyclability": "Medium", "origin": "China"
+        }
+
+        row = X[0]
+        assert row[0] == _legacy_safe_encode("Plastic", encoders["material"], "Other")
+        assert row[1] == _legacy_safe_encode("Air", encoders["transport"], "Land")
+        assert row[4] == pytest.approx(np.log1p(1.2), rel=1e-6)
+        assert row[5] == 1
+        assert row[10] == 3
+        assert row[11] == pytest.approx(0.8)
+        assert row[14] == pytest.approx(3.0)
+        assert row[15] == pytest.approx(1.0)
+
+    def test_transport_override(self, builder):
+        """Test that a valid override wins over the distance heuristic"""
+        _, raw_inputs = builder.build_matrix([
+            {"distance_origin_to_uk": 8000, "override_transport_mode": "ship"},
+            {"distance_origin_to_uk": 8000, "override_transport_mode": "rocket"},
+            {"distance_origin_to_uk": 100}
+        ])
+
+        assert [raw["transport"] for raw in raw_inputs] == ["Ship", "Air", "Truck"]
+
+    def test_basic_builder_without_enhanced_encoders(self, encoders):
+        """Test the 6-feature fallback layout"""
+        basic = EcoFeatureBuilder(encoders["material"], encoders["transport"], encoders["recycle"], encoders["origin"])
+        X, _ = basic.build_matrix([{"weight": w} for w in (0.1, 0.5, 2, 10)])
+
+        assert basic.feature_names == BASIC_FEATURES
+        assert X.shape == (4, 6)
+        assert X[:, 5].tolist() == [0, 1, 2, 3]
+
+    def test_empty_batch(self, builder):
+        """Test that an empty catalogue produces an empty matrix"""
+        X, raw_inputs = builder.build_matrix([])
+
+        assert X.shape == (0, len(ENHANCED_FEATURES))
+        assert raw_inputs == []
+
+    def test_invalid_weight_raises(self, builder):
+        """Test that non-numeric weights are reported"""
+        with pytest.raises(ValueError):
+            builder.build_matrix([{"weight": "heavy"}])
+
+
+@pytest.mark.unit
+class TestPredictLabels:
+    """Test label derivation from probabilities"""
+
+    def test_single_predict_proba_call(self, encoders):
+        """Test labels come from the argmax of one predict_proba call"""
+        model = Mock()
+        model.predict_proba.return_value = np.array([
+            [0.1, 0.7, 0.05, 0.05, 0.05, 0.03, 0.02],
+            [0.0, 0.0, 0.0, 0.0, 0.0, 0.123, 0.877],
+        ])
+
+        labels, confidences = predict_labels(model, encoders["label"].classes_, np.zeros((2, 16)))
+
+        assert labels == ["A+", "F"]
+        assert confidences == [70.0, 87.7]
+        model.predict_proba.assert_called_once()
+        model.predict.assert_not_called()
+
+    def test_model_without_predict_proba(self, encoders):
+        """Test fallback to predict() with zero confidence"""
+        model = Mock(spec=["predict"])
+        model.predict.return_value = [2, 0]
+
+        labels, confidences = predict_labels(model, encoders["label"].classes_, np.zeros((2, 6)))
+
+        assert labels == ["B", "A"]
+        assert confidences == [0.0, 0.0]
+
+
+@pytest.mark.unit
+class TestEndpointsShareBuilder:
+    """The ML branch of /estimate_emissions goes through the same builder as /predict"""
+
+    def test_estimate_emissions_matches_predict(self, builder, encoders):
+        with patch('builtins.print'):
+            from backend.api import app as app_module
+
+        predictor = Mock()
+        predictor.predict_proba.return_value = np.array([[0.1, 0.6, 0.1, 0.1, 0.05, 0.03, 0.02]])
+        bundle = Mock(model=Mock(), model_type="enhanced_16", label_encoder=encoders["label"],
+                      feature_builder=builder, predictor=predictor)
+
+        scraper = Mock()
+        scraper.scrape_with_full_url.return_value = {
+            "title": "Premium Whey Protein 2 pack bottle", "material_type": "Plastic", "recyclability": "High",
+            "weight_kg": 1.2, "country_of_origin": "China", "materials": {"primary_material": "Plastic"}
+        }
+
+        @contextmanager
+        def acquire(timeout=None, overflow=False):
+            yield scraper
+
+        geocoder = Mock()
+        geocoder.query_postal_code.return_value = Mock(latitude=51.5, longitude=-0.1, empty=False)
+        built = []
+
+        def build_matrix(products):
+            built.append(dict(products[0]))
+            return EcoFeatureBuilder.build_matrix(builder, products)
+
+        with patch.object(app_module.model_registry, "current", return_value=bundle), \
+                patch.object(app_module, "get_production_scraper_pool", return_value=MagicMock(acquire=acquire)), \
+                patch.object(app_module, "uk_geocoder", geocoder), \
+                patch.object(app_module, "log_submission"), \
+                patch.object(builder, "build_matrix", side_effect=build_matrix), \
+                patch('builtins.print'):
+            with app_module.app.test_request_context():
+                response = app_module.compute_emissions_response(
+                    {"amazon_url": "https://www.amazon.co.uk/dp/B0AAAAAAAA", "postcode": "SW1A 1AA"}
+                )
+            estimate_X = predictor.predict_proba.call_args[0][0]
+
+            predict_response = app_module.app.test_client().post("/predict", json=built[0])
+            predict_X = predictor.predict_proba.call_args[0][0]
+
+        assert len(built) == 2
+        assert predict_response.status_code == 200
+        assert estimate_X.shape == (1, len(ENHANCED_FEATURES))
+        np.testing.assert_array_equal(estimate_X, predict_X)
+
+        features = response.get_json()["data"]["attributes"]["prediction_methods"]["ml_prediction"]["features_used"]
+        assert features["feature_count"] == len(ENHANCED_FEATURES)
+        assert features["features"][0] == {"name": "Material Type", "value": float(estimate_X[0][0])}
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Hedged Strategy Execution
+=======================================
+
+Tests for run_hedged, StrategyStats and the hedged mode of
+ProductionAmazonScraper.scrape_with_full_url.
+
+Coverage:
+- Hedge delay, escalation and failure start the next strategy
+- First accepted result wins and the losers are cancelled and waited for
+- Best finished result when nothing is accepted
+- Latency histogram quantiles
+- Scraper races direct_url against mobile_url without waiting out retries
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.scrapers.amazon.hedging import StrategyStats, run_hedged
+from backend.scrapers.amazon.production_scraper import ProductionAmazonScraper
+from backend.scrapers.amazon.scraper_pool import ScrapeResultCache
+
+URL = "https://www.amazon.co.uk/Isolate-Protein/dp/B01H3O2AMG/ref=sr_1_172"
+
+
+def accept(result):
+    return result >= 0.6
+
+
+@pytest.mark.unit
+class TestRunHedged:
+    """Test the hedged race"""
+
+    def test_fast_primary_needs_no_hedge(self):
+        outcome = run_hedged([lambda h: 0.9, lambda h: 0.8], hedge_delay=5.0, accept=accept)
+        assert outcome.winner == 0
+        assert outcome.launched == 1
+
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        primary_cancelled = threading.Event()
+
+        def slow_primary(hedge):
+            if not hedge.sleep(5.0):
+                primary_cancelled.set()
+                return None
+            return 0.9
+
+        start = time.monotonic()
+        outcome = run_hedged([slow_primary, lambda h: 0.8], hedge_delay=0.05, accept=accept)
+        elapsed = time.monotonic() - start
+
+        assert outcome.winner == 1
+        assert outcome.result == 0.8
+        assert elapsed < 1.0
+        assert primary_cancelled.is_set()
+
+    def test_returns_after_losers_stop(self):
+        """A loser's in-flight work finishes before run_hedged returns"""
+        loser_done = threading.Event()
+
+        def in_flight(hedge):
+            hedge.escalate()
+            time.sleep(0.2)  # an HTTP request that ignores cancellation
+            loser_done.set()
+            return None
+
+        outcome = run_hedged([in_flight, lambda h: 0.8], hedge_delay=5.0, accept=accept)
+
+        assert outcome.winner == 1
+        assert loser_done.is_set()
+
+    def test_escalation_starts_next_strategy_at_once(self):
+        def blocked(hedge):
+            hedge.escalate()
+            hedge.sleep(5.0)
+            return None
+
+        start = time.monotonic()
+        outcome = run_hedged([blocked, lambda h: 0.7], hedge_delay=10.0, accept=accept)
+        assert outcome.winner == 1
+        assert time.monotonic() - start < 1.0
+
+    def test_failure_starts_next_strategy_at_once(self):
+        start = time.monotonic()
+        outcome = run_hedged([lambda h: None, lambda h: None, lambda h: 0.7], hedge_delay=10.0, accept=accept)
+        assert outcome.winner == 2
+        assert outcome.launched == 3
+        assert time.monotonic() - start < 1.0
+
+    def test_best_result_when_none_accepted(self):
+        outcome = run_hedged([lambda h: 0.3, lambda h: 0.5, lambda h: 0.4], hedge_delay=0.0,
+                             accept=accept, score=lambda r: r)
+        assert outcome.winner == 1
+        assert outcome.result == 0.5
+
+    def test_all_failing(self):
+        outcome = run_hedged([lambda h: None, lambda h: None], hedge_delay=0.0, accept=accept)
+        assert outcome.winner is None
+        assert outcome.result is None
+
+
+@pytest.mark.unit
+class TestStrategyStats:
+    """Test the latency histogram"""
+
+    def test_histogram_and_quantiles(self):
+        stats = StrategyStats(buckets=(1.0, 2.0, 4.0))
+        for seconds in (0.5, 0.8, 1.5, 3.0, 10.0):
+            stats.record("direct_url", seconds, "success")
+        stats.record("direct_url", 0.2, "cancelled")
+        stats.record_win("direct_url")
+
+        snapshot = stats.snapshot()["direct_url"]
+        assert snapshot["latency_histogram"]["success"] == [2, 1, 1, 1]
+        assert snapshot["success"] == 5
+        assert snapshot["cancelled"] == 1
+        assert snapshot["wins"] == 1
+
+        assert stats.latency_quantile("direct_url", 0.4) == 1.0
+        assert stats.latency_quantile("direct_url", 0.6) == 2.0
+        assert stats.latency_quantile("direct_url", 1.0) == float("inf")
+        assert stats.suggest_hedge_delay("direct_url", q=0.8) == 4.0
+        assert stats.suggest_hedge_delay("mobile_url") is None
+
+
+@pytest.mark.unit
+class TestHedgedScraper:
+    """Test hedged strategies in ProductionAmazonScraper"""
+
+    @pytest.fixture
+    def scraper(self):
+        return ProductionAmazonScraper(result_cache=ScrapeResultCache(), strategy_stats=StrategyStats())
+
+    def test_blocked_direct_url_loses_to_mobile(self, scraper):
+        def try_url_strategy(strategy, hedge=None):
+            if strategy['name'] == 'direct_url':
+                # CAPTCHA, then a long backoff before the retry
+                hedge.escalate()
+                hedge.sleep(30.0)
+                return None
+            return {"title": "Isolate Protein", "confidence_score": 0.8}
+
+        with patch.object(scraper, "try_url_strategy", side_effect=try_url_strategy), \
+                patch.object(scraper, "try_search_fallback", return_value=None) as search:
+            start = time.monotonic()
+            result = scraper.scrape_with_full_url(URL, hedge_delay=10.0)
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 2.0
+        assert result["scraping_metadata"]["successful_strategy"] == "mobile_url"
+        assert result["scraping_metadata"]["hedged"] is True
+        search.assert_not_called()
+
+        stats = scraper.strategy_stats.snapshot()
+        assert stats["mobile_url"]["wins"] == 1
+        assert stats["direct_url"]["cancelled"] == 1
+
+    def test_low_confidence_result_used_when_nothing_better(self, scraper):
+        low = {"title": "Search result", "confidence_score": 0.3}
+        with patch.object(scraper, "try_url_strategy", return_value=None), \
+                patch.object(scraper, "try_search_fallback", return_value=dict(low)):
+            result = scraper.scrape_with_full_url(URL, hedge_delay=0.0)
+
+        assert result["scraping_metadata"]["successful_strategy"] == "search_fallback"
+        assert result["scraping_metadata"]["attempts_made"] == 3
+
+    def test_sequential_without_hedge_delay(self, scraper):
+        with patch.object(scraper, "try_url_strategy", return_value={"title": "x", "confidence_score": 0.9}) as attempt:
+            result = scraper.scrape_with_full_url(URL)
+
+        assert scraper.hedge_delay is None
+        assert result["scraping_metadata"]["hedged"] is False
+        assert attempt.call_count == 1
+        assert scraper.strategy_stats.snapshot()["direct_url"]["wins"] == 1
+
+    def test_cancelled_request_skips_pauses(self, scraper):
+        """make_request_with_retry stops at its first pause once the race is decided"""
+        class DecidedRace:
+            cancelled = True
+
+            def sleep(self, seconds):
+                return False
+
+        with patch.object(scraper.session, "get") as get:
+            assert scraper.make_request_with_retry(URL, "direct_url", DecidedRace()) is None
+        get.assert_not_called()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Materials Intelligence Service
+============================================
+
+Tests for the shared materials engine and its precompiled phrase matcher.
+
+Coverage:
+- PhraseMatcher parity with plain substring checks
+- Process-wide shared service lifecycle
+- Tier 3 / Tier 4 / boost results from the compiled matcher
+"""
+
+import pytest
+import random
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.utils.phrase_matcher import PhraseMatcher
+from backend.services import materials_service
+from backend.services.materials_service import (
+    EnhancedMaterialsIntelligenceService,
+    detect_product_materials,
+    get_materials_service
+)
+
+
+@pytest.mark.unit
+class TestPhraseMatcher:
+    """Test the Aho-Corasick phrase matcher"""
+
+    def test_overlapping_phrases_are_all_found(self):
+        """Test that nested and overlapping phrases are reported together"""
+        matcher = PhraseMatcher(['stainless', 'stainless steel', 'steel', 'less', 'pc'])
+
+        assert matcher.find_all('premium stainless steel mug') == {
+            'stainless', 'stainless steel', 'steel', 'less'
+        }
+        assert matcher.find_all('10 pcs') == {'pc'}
+        assert matcher.find_all('') == frozenset()
+
+    def test_matches_plain_substring_checks(self):
+        """Test random phrase sets against the `in` operator"""
+        rng = random.Random(42)
+        for _ in range(500):
+            phrases = [''.join(rng.choice('ab c') for _ in range(rng.randint(1, 4))) for _ in range(15)]
+            text = ''.join(rng.choice('ab c') for _ in range(40))
+
+            matcher = PhraseMatcher(phrases)
+            assert matcher.find_all(text) == {p for p in phrases if p in text}
+
+    def test_empty_and_duplicate_phrases_ignored(self):
+        """Test that blanks are skipped and duplicates counted once"""
+        matcher = PhraseMatcher(['glass', '', 'glass', 'wood'])
+
+        assert matcher.phrase_count == 2
+        assert matcher.find_all('glass jar') == {'glass'}
+
+
+@pytest.mark.unit
+class TestSharedMaterialsService:
+    """Test the process-wide materials service"""
+
+    def test_shared_service_is_built_once(self):
+        """Test that repeated lookups reuse a single engine"""
+        first = get_materials_service()
+        second = get_materials_service()
+
+        assert first is second
+        assert isinstance(first, EnhancedMaterialsIntelligenceService)
+
+    def test_detect_product_materials_uses_shared_service(self):
+        """Test that the convenience function never rebuilds the tables"""
+        get_materials_service()
+
+        with pytest.MonkeyPatch.context() as mp:
+            def fail_init(self):
+                raise AssertionError("service rebuilt on a hot path")
+            mp.setattr(EnhancedMaterialsIntelligenceService, '__init__', fail_init)
+
+            result = detect_product_materials({'title': 'Stainless steel water bottle'})
+
+        assert result['tier'] in (3, 4)
+        assert materials_service._shared_service is get_materials_service()
+
+    def test_category_prediction(self):
+        """Test Tier 4 exact, word and fuzzy category matches"""
+        service = get_materials_service()
+
+        result = service.detect_materials({'title': 'Apple MacBook Air 13 inch'})
+        assert result['tier'] == 4
+        assert result['primary_material'] == 'Aluminum'
+
+        fuzzy = service._tier4_enhanced_category_based({'title': 'cheap notebook'})
+        assert fuzzy is not None
+
+    def test_keyword_prediction(self):
+        """Test Tier 3 keyword scoring prefers the most specific material"""
+        service = get_materials_service()
+
+        result = service._tier3_enhanced_single_material({
+            'title': 'insulated flask',
+            'description': 'made from 18/8 stainless steel'
+        })
+
+        assert result['primary_material'] == 'Stainless Steel'
+        assert result['confidence'] > 0.5
+
+    def test_brand_boost(self):
+        """Test brand intelligence boosts confidence on matching predictions"""
+        service = get_materials_service()
+
+        plain = service.detect_materials({'title': 'smartphone case phone'})
+        boosted = service.detect_materials({'title': 'apple phone'})
+
+        assert boosted['primary_material'] == 'Glass'
+        assert boosted.get('intelligence_applied') == 'Brand: apple'
+        assert 'intelligence_applied' not in plain
+
+    def test_fallback_when_nothing_matches(self):
+        """Test Tier 5 fallback for unrecognised titles"""
+        result = detect_product_materials({'title': 'zzqx'})
+
+        assert result['tier'] == 5
+        assert result['primary_material'] == 'Mixed'
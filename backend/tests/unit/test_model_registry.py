@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Lazy Loading and Model Registry
+=============================================
+
+Tests for the deferred-import helpers and the model/encoder registry that
+keep importing the API cheap.
+
+Coverage:
+- LazyModule / LazyObject load once, on first attribute access
+- Missing optional modules report unavailable instead of raising
+- ModelRegistry loads nothing until current()/preload(), then loads once
+- Hot swap: new versions on file changes, old bundles kept by in-flight requests
+- Fallback to the rule-based model when no trained model can be read
+"""
+
+import pytest
+import threading
+from unittest.mock import Mock, patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.utils.lazy import LazyModule, lazy_import, lazy_object, module_available
+from backend.ml.inference import model_registry
+from backend.ml.inference.model_registry import (
+    FallbackModel,
+    ModelRegistry,
+    bundle_fingerprint,
+    load_model,
+    publish_manifest
+)
+
+
+class TestLazyModule:
+    def test_import_deferred_until_attribute_access(self):
+        module = LazyModule("colorsys")
+        sys.modules.pop("colorsys", None)
+
+        assert not module.is_loaded
+        assert "colorsys" not in sys.modules
+        assert module.rgb_to_hsv(1, 0, 0)[0] == 0
+        assert module.is_loaded
+        assert "colorsys" in sys.modules
+
+    def test_lazy_import_is_shared(self):
+        assert lazy_import("colorsys") is lazy_import("colorsys")
+
+    def test_missing_module_is_unavailable(self):
+        with patch('builtins.print'):
+            module = LazyModule("definitely_not_a_real_module_xyz")
+            assert module.available is False
+            assert module.available is False
+        with pytest.raises(ImportError):
+            module.anything
+
+    def test_module_available_does_not_import(self):
+        sys.modules.pop("colorsys", None)
+        assert module_available("colorsys")
+        assert "colorsys" not in sys.modules
+        assert not module_available("definitely_not_a_real_module_xyz")
+
+
+class TestLazyObject:
+    def test_factory_called_once_on_first_use(self):
+        factory = Mock(return_value=Mock(value=42))
+        obj = lazy_object(factory, "thing")
+
+        factory.assert_not_called()
+        assert obj.value == 42
+        assert obj.value == 42
+        factory.assert_called_once()
+
+    def test_concurrent_first_access_builds_once(self):
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def factory():
+            calls.append(1)
+            return Mock(value=1)
+
+        obj = lazy_object(factory)
+
+        def worker():
+            barrier.wait()
+            obj.value
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+
+
+class TestModelRegistry:
+    @pytest.fixture
+    def fake_loaders(self):
+        encoder = Mock(classes_=["A", "B", "C"])
+        encoders = {name: encoder for name in model_registry.BASE_ENCODERS + model_registry.ENHANCED_ENCODERS}
+        with patch.object(model_registry, "load_model", return_value=(Mock(), "enhanced_16")) as load_model_mock, \
+                patch.object(model_registry, "load_encoders", return_value=encoders), \
+                patch.object(model_registry, "EcoFeatureBuilder"), \
+                patch('builtins.print'):
+            yield load_model_mock
+
+    def test_nothing_loaded_until_first_use(self, fake_loaders):
+        registry = ModelRegistry(reload_interval=0)
+        assert not registry.is_loaded
+        fake_loaders.assert_not_called()
+
+        models = registry.current()
+        assert registry.is_loaded
+        assert models.model_type == "enhanced_16"
+        assert models.valid_scores == ["A", "B", "C"]
+
+    def test_loads_once(self, fake_loaders):
+        registry = ModelRegistry(reload_interval=0)
+        first = registry.preload()
+        assert registry.current() is first
+        fake_loaders.assert_called_once()
+
+    def test_reload_swaps_only_on_change(self, fake_loaders, tmp_path):
+        registry = ModelRegistry(str(tmp_path), str(tmp_path), reload_interval=0)
+        old = registry.current()
+        assert registry.reload() is None
+
+        (tmp_path / "eco_model.pkl").write_bytes(b"new model")
+        new = registry.reload()
+        assert new is not None and new is registry.current()
+        assert new.version != old.version
+        # The request still holding the old bundle keeps it alive as draining
+        assert [v["status"] for v in registry.loaded_versions()] == ["live", "draining"]
+
+    def test_swap_listener_called(self, fake_loaders, tmp_path):
+        registry = ModelRegistry(str(tmp_path), str(tmp_path), reload_interval=0)
+        listener = Mock()
+        registry.on_swap(listener)
+        old = registry.current()
+        new = registry.reload(force=True)
+        listener.assert_called_once_with(old, new)
+
+    def test_fallback_never_replaces_trained_model(self, fake_loaders, tmp_path):
+        registry = ModelRegistry(str(tmp_path), str(tmp_path), reload_interval=0)
+        trained = registry.current()
+        fake_loaders.return_value = (FallbackModel(), None)
+        assert registry.reload(force=True) is None
+        assert registry.current() is trained
+
+    def test_manifest_versions_the_bundle(self, fake_loaders, tmp_path):
+        (tmp_path / "eco_model.pkl").write_bytes(b"model")
+        publish_manifest(str(tmp_path))
+        fingerprint = bundle_fingerprint(str(tmp_path), str(tmp_path))
+        assert [name for name, _, _ in fingerprint] == ["manifest.json"]
+
+        registry = ModelRegistry(str(tmp_path), str(tmp_path), reload_interval=0)
+        manifest = publish_manifest(str(tmp_path), trainer="test")
+        assert registry.current().version == manifest["version"]
+
+    def test_falls_back_to_rule_based_model(self, tmp_path):
+        with patch('builtins.print'):
+            model, model_type = load_model(str(tmp_path))
+        assert isinstance(model, FallbackModel)
+        assert model_type is None
+        assert len(model.predict_proba([[1, 1, 1, 1, 1, 1]])[0]) == 7
+
+
+class TestAdminModelsEndpoint:
+    def test_requires_admin_session(self):
+        with patch('builtins.print'):
+            from backend.api.app import app
+
+        client = app.test_client()
+        assert client.get('/admin/models').status_code == 401
+
+        with client.session_transaction() as session:
+            session['user'] = {'username': 'viewer', 'role': 'user'}
+        assert client.get('/admin/models').status_code == 401
+
+        with client.session_transaction() as session:
+            session['user'] = {'username': 'admin', 'role': 'admin'}
+        response = client.get('/admin/models')
+        assert response.status_code == 200
+        assert 'versions' in response.get_json()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Single-Parse Product Page
+=======================================
+
+Tests for ParsedProductPage and the production scraper's single-parse
+extraction pipeline.
+
+Coverage:
+- Pre-flattened detail key/value dicts
+- Memoized selector lookups
+- One parse per fetched page, shared by block check and extractors
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from bs4 import BeautifulSoup
+
+from backend.scrapers.amazon import page_parser
+from backend.scrapers.amazon.page_parser import ParsedProductPage
+from backend.scrapers.amazon.production_scraper import ProductionAmazonScraper
+from backend.scrapers.amazon.scraper_pool import ScrapeResultCache
+from backend.tests.fixtures.amazon_pages import build_product_page
+
+
+@pytest.mark.unit
+class TestParsedProductPage:
+    """Test scoped lookups on a parsed page"""
+
+    def test_detail_kv_flattens_tables_and_bullets(self):
+        """Test that labels are cleaned and mapped to their values"""
+        page = ParsedProductPage(build_product_page())
+
+        assert page.detail_value('item weight') == '480 Grams'
+        assert page.detail_value('country of origin') == 'United Kingdom'
+        assert page.detail_value('asin') == 'B0CKFK6716'
+        assert page.detail_value('missing', 'brand') == 'Grenade'
+
+    def test_selector_lookups_are_memoized(self):
+        """Test that each selector runs against the tree only once"""
+        page = ParsedProductPage(build_product_page())
+
+        with patch.object(page, '_select', wraps=page._select) as select:
+            first = page.texts_lower('#feature-bullets')
+            second = page.texts_lower('#feature-bullets')
+
+        assert first is second
+        assert select.call_count == 1
+        assert '22 g of protein' in first[0]
+
+    @pytest.mark.parametrize("selector", [
+        'table#productDetails_techSpec_section_1', '#feature-bullets li', 'div#detailBullets_feature_div li',
+        '.a-unordered-list .a-list-item', 'span.a-text-bold', '[id*="productDetails"]', '[class*="review"]',
+        'table[id*="product"]', '.a-section', 'table', '#productTitle', 'h1', '#missing li',
+        'h2 a[href*="/dp/"], h2 a[href*="/gp/product/"]', '[data-automation-id="product-title"]'
+    ])
+    def test_indexed_select_matches_soupsieve(self, selector):
+        """Test that index-resolved selectors return what soup.select does"""
+        page = ParsedProductPage(build_product_page(filler_blocks=10))
+
+        assert page.select(selector) == page.soup.select(selector)
+
+    def test_from_soup_wraps_existing_trees(self):
+        """Test that extractors accept a plain BeautifulSoup"""
+        soup = BeautifulSoup(build_product_page(), 'html.parser')
+        page = ParsedProductPage.from_soup(soup)
+
+        assert page.soup is soup
+        assert ParsedProductPage.from_soup(page) is page
+        assert ParsedProductPage.from_soup(None) is None
+
+
+@pytest.mark.unit
+class TestSingleParsePipeline:
+    """Test the production scraper parses each page once"""
+
+    def test_extract_product_data_from_page(self):
+        """Test the extracted fields on a synthetic product page"""
+        scraper = ProductionAmazonScraper(result_cache=ScrapeResultCache())
+        page = ParsedProductPage(build_product_page(filler_blocks=20))
+
+        data = scraper.extract_product_data(page, {'url': 'https://www.amazon.co.uk/dp/B0CKFK6716'})
+
+        assert data['title'].startswith('Grenade Protein Powder')
+        assert data['weight_kg'] == pytest.approx(0.48)
+        assert data['origin'] == 'UK'
+        assert data['brand'] == 'Grenade'
+
+    def test_legacy_soup_argument_still_works(self):
+        """Test extraction from a BeautifulSoup matches the page path"""
+        scraper = ProductionAmazonScraper(result_cache=ScrapeResultCache())
+        html = build_product_page()
+        strategy = {'url': 'https://www.amazon.co.uk/dp/B0CKFK6716'}
+
+        from_soup = scraper.extract_product_data(BeautifulSoup(html, 'html.parser'), strategy)
+        from_page = scraper.extract_product_data(ParsedProductPage(html), strategy)
+
+        assert from_soup == from_page
+
+    def test_response_parsed_once(self):
+        """Test the block check and extractors share one parse"""
+        scraper = ProductionAmazonScraper(result_cache=ScrapeResultCache())
+        response = Mock(status_code=200, content=build_product_page(filler_blocks=5).encode())
+        scraper.session.get = Mock(return_value=response)
+
+        with patch('time.sleep'), \
+                patch.object(page_parser, 'BeautifulSoup', wraps=page_parser.BeautifulSoup) as parse:
+            result = scraper.try_url_strategy({
+                'name': 'direct', 'url': 'https://www.amazon.co.uk/dp/B0CKFK6716', 'priority': 1
+            })
+
+        assert parse.call_count == 1
+        assert result['weight_kg'] == pytest.approx(0.48)
+
+    def test_captcha_page_is_blocked(self):
+        """Test that a CAPTCHA interstitial is still detected"""
+        scraper = ProductionAmazonScraper(result_cache=ScrapeResultCache())
+        captcha = ParsedProductPage(
+            "<html><head><title>Amazon.co.uk</title></head><body>"
+            "<form action='/errors/validateCaptcha'><p>Type the characters you see in this image</p></form>"
+            "</body></html>"
+        )
+
+        assert scraper.is_blocked_or_captcha(captcha)
+        assert not scraper.is_blocked_or_captcha(ParsedProductPage(build_product_page()))
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Prediction Store
+==============================
+
+Tests for the bounded prediction storage behind MLMonitoringService.
+
+Coverage:
+- Ring buffer eviction, id lookup and recency order
+- SQLite spill of overwritten predictions, including feedback updates
+- Sliding time window counts for the dashboard
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.core.prediction_store import ModelPrediction, PredictionStore, RecentWindow
+
+
+def make_prediction(i, when=None):
+    return ModelPrediction(
+        prediction_id=f"p{i}",
+        model_name="xgboost_eco_tracker",
+        model_version="1.0.0",
+        input_features={"weight": float(i)},
+        prediction="B",
+        confidence=0.9,
+        prediction_time=when or datetime(2025, 1, 1),
+        processing_time_ms=1.0
+    )
+
+
+@pytest.mark.unit
+class TestPredictionStore:
+    """Test the in-memory ring buffer"""
+
+    def test_keeps_newest_capacity_predictions(self):
+        store = PredictionStore(capacity=3)
+        for i in range(5):
+            store.add(make_prediction(i))
+
+        assert len(store) == 3
+        assert store.total == 5
+        assert [p.prediction_id for p in store] == ["p2", "p3", "p4"]
+        assert [p.prediction_id for p in store.recent(2)] == ["p3", "p4"]
+        assert store.get("p1") is None
+        assert store.get("p4").input_features == {"weight": 4.0}
+
+    def test_partially_filled(self):
+        store = PredictionStore(capacity=10)
+        store.add(make_prediction(0))
+        assert [p.prediction_id for p in store.recent(5)] == ["p0"]
+        assert "p0" in store
+
+    def test_slotted_records(self):
+        with pytest.raises(AttributeError):
+            make_prediction(0).unexpected = 1
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError):
+            PredictionStore(capacity=0)
+
+
+@pytest.mark.unit
+class TestSpill:
+    """Test spilling overwritten predictions to SQLite"""
+
+    def test_overwritten_predictions_are_found_on_disk(self, tmp_path):
+        path = str(tmp_path / "spill" / "predictions.db")
+        store = PredictionStore(capacity=2, spill_path=path, spill_batch_size=2)
+        for i in range(6):
+            store.add(make_prediction(i))
+
+        # p0, p1 written in a batch; p2, p3 written; nothing pending
+        assert store.get("p0").input_features == {"weight": 0.0}
+        assert store.get("p3").prediction_id == "p3"
+        assert len(store) == 2
+        store.close()
+
+        reopened = PredictionStore(capacity=2, spill_path=path)
+        assert reopened.get("p1").prediction_id == "p1"
+        reopened.close()
+
+    def test_feedback_on_spilled_prediction_persists(self, tmp_path):
+        path = str(tmp_path / "predictions.db")
+        store = PredictionStore(capacity=1, spill_path=path, spill_batch_size=100)
+        store.add(make_prediction(0))
+        store.add(make_prediction(1))
+
+        spilled = store.get("p0")
+        spilled.feedback = "A"
+        store.update(spilled)
+        store.close()
+
+        reopened = PredictionStore(capacity=1, spill_path=path)
+        assert reopened.get("p0").feedback == "A"
+        reopened.close()
+
+
+@pytest.mark.unit
+class TestRecentWindow:
+    """Test the sliding time window"""
+
+    def test_counts_expire_with_items(self):
+        now = [datetime(2025, 1, 2, 12, 0)]
+        window = RecentWindow(
+            timedelta(hours=24),
+            timestamp=lambda item: item[0],
+            key=lambda item: item[1],
+            clock=lambda: now[0]
+        )
+        window.add((datetime(2025, 1, 1, 13, 0), "data_drift"))
+        window.add((datetime(2025, 1, 2, 11, 0), "data_drift"))
+        window.add((datetime(2025, 1, 2, 11, 30), "performance_drift"))
+
+        assert len(window) == 3
+        assert window.counts["data_drift"] == 2
+
+        now[0] = datetime(2025, 1, 2, 13, 0)
+        assert len(window) == 2
+        assert window.counts["data_drift"] == 1
+        assert [item[1] for item in window.latest(1)] == ["performance_drift"]
+
+        now[0] = datetime(2025, 1, 4)
+        assert window.latest(10) == []
+        assert not window.counts
+
+    def test_max_items_drops_oldest(self):
+        now = datetime(2025, 1, 2, 12, 0)
+        window = RecentWindow(
+            timedelta(hours=24),
+            timestamp=lambda item: item[0],
+            key=lambda item: item[1],
+            clock=lambda: now,
+            max_items=3
+        )
+        for minute, kind in enumerate(["data_drift", "data_drift", "performance_drift", "data_drift"]):
+            window.add((datetime(2025, 1, 2, 11, minute), kind))
+
+        assert len(window) == 3
+        assert window.counts == {"data_drift": 2, "performance_drift": 1}
+        assert window.latest(10)[0][0] == datetime(2025, 1, 2, 11, 1)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Atomic Rate Limiting
+==================================
+
+Tests for the Lua-script TokenBucket, SlidingWindowCounter and MultiLimit,
+run against fakeredis with its Lua runtime.
+
+Coverage:
+- Admission and retry_after for both algorithms
+- Exact admission counts under concurrent checks
+- All-or-nothing charging across several limits
+- Script loaded once, then one EVALSHA round trip per check
+- Fail-open on Redis errors
+"""
+
+import pytest
+import asyncio
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+pytest.importorskip("jwt")
+
+from backend.core.rate_limiting import (
+    MultiLimit,
+    RateLimitService,
+    SlidingWindowCounter,
+    TokenBucket,
+    UserRole
+)
+
+
+class CountingRedis(fakeredis.aioredis.FakeRedis):
+    """fakeredis client recording every command sent"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commands = []
+
+    async def execute_command(self, *args, **options):
+        self.commands.append(args[0])
+        return await super().execute_command(*args, **options)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test the scripted token bucket"""
+
+    def test_burst_then_reject(self):
+        """Test the bucket admits its capacity and then reports retry_after"""
+        async def scenario():
+            bucket = TokenBucket(capacity=3, refill_rate=1.0, redis_client=CountingRedis(decode_responses=True))
+            return [await bucket.consume("user") for _ in range(4)]
+
+        results = _run(scenario())
+
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert results[2][1]["tokens_remaining"] == pytest.approx(0, abs=0.01)
+        assert 0.9 < results[3][1]["retry_after"] <= 1.0
+        assert results[3][1]["algorithm"] == "token_bucket"
+
+    def test_concurrent_checks_never_over_admit(self):
+        """Test a burst of simultaneous requests gets exactly the capacity"""
+        async def scenario():
+            bucket = TokenBucket(capacity=10, refill_rate=0.001, redis_client=CountingRedis(decode_responses=True))
+            results = await asyncio.gather(*(bucket.consume("user") for _ in range(50)))
+            return sum(allowed for allowed, _ in results)
+
+        assert _run(scenario()) == 10
+
+    def test_one_round_trip_per_check(self):
+        """Test the script is loaded once and later checks are a single EVALSHA"""
+        async def scenario():
+            client = CountingRedis(decode_responses=True)
+            bucket = TokenBucket(capacity=5, refill_rate=1.0, redis_client=client)
+            await bucket.consume("user")
+            client.commands.clear()
+            for _ in range(3):
+                await bucket.consume("user")
+            return client.commands
+
+        assert _run(scenario()) == ["EVALSHA"] * 3
+
+    def test_fails_open_when_redis_is_down(self):
+        """Test Redis errors admit the request"""
+        async def scenario():
+            server = fakeredis.FakeServer()
+            server.connected = False
+            client = fakeredis.aioredis.FakeRedis(server=server)
+            return await TokenBucket(capacity=1, refill_rate=1.0, redis_client=client).consume("user")
+
+        allowed, metadata = _run(scenario())
+        assert allowed and metadata == {"error": "rate_limit_unavailable"}
+
+
+@pytest.mark.unit
+class TestSlidingWindow:
+    """Test the scripted sliding window"""
+
+    def test_window_limit_under_concurrency(self):
+        """Test concurrent requests are admitted up to max_requests exactly"""
+        async def scenario():
+            client = CountingRedis(decode_responses=True)
+            window = SlidingWindowCounter(window_size=60, max_requests=7, redis_client=client)
+            results = await asyncio.gather(*(window.is_allowed("ip") for _ in range(30)))
+            return results, await client.zcard("sliding:ip")
+
+        results, stored = _run(scenario())
+
+        assert sum(allowed for allowed, _ in results) == 7
+        assert stored == 7  # same-microsecond requests are not merged
+        denied = next(metadata for allowed, metadata in results if not allowed)
+        assert denied["requests_in_window"] == 7
+        assert 59 < denied["retry_after"] <= 60
+
+
+@pytest.mark.unit
+class TestMultiLimit:
+    """Test several limits checked in one call"""
+
+    def test_rejected_request_charges_no_limit(self):
+        """Test the hourly quota rejecting a request leaves the burst bucket untouched"""
+        async def scenario():
+            client = CountingRedis(decode_responses=True)
+            bucket = TokenBucket(capacity=10, refill_rate=0.001, redis_client=client)
+            hourly = SlidingWindowCounter(window_size=3600, max_requests=2, redis_client=client, key_prefix="hourly")
+            limit = MultiLimit([bucket, hourly], client)
+            results = [await limit.check("user") for _ in range(4)]
+            return results, await client.hget("bucket:user", "tokens")
+
+        results, tokens = _run(scenario())
+
+        assert [allowed for allowed, _ in results] == [True, True, False, False]
+        assert float(tokens) == pytest.approx(8, abs=0.01)
+        denied = results[2][1]
+        assert [limit["algorithm"] for limit in denied["limits"]] == ["token_bucket", "sliding_window"]
+        assert denied["retry_after"] > 3500
+
+    def test_service_enforces_hourly_quota(self):
+        """Test role limits combine the per-minute algorithm with requests_per_hour"""
+        async def scenario():
+            client = CountingRedis(decode_responses=True)
+            service = RateLimitService(client)
+            allowed, metadata = await service.check_rate_limit("1.2.3.4", UserRole.GUEST, "estimate")
+            client.commands.clear()
+            await service.check_rate_limit("1.2.3.4", UserRole.GUEST, "estimate")
+            return allowed, metadata, client.commands
+
+        allowed, metadata, commands = _run(scenario())
+
+        assert allowed
+        assert metadata["algorithm"] == "token_bucket"
+        assert metadata["limits"][1]["max_requests"] == 100
+        assert commands == ["EVALSHA"]
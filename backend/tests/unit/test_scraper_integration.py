@@ -12,6 +12,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from backend.scrapers.amazon.unified_scraper import UnifiedProductScraper, scrape_amazon_product_page
+from backend.scrapers.amazon.scraper_pool import ScrapeResultCache
 
 @pytest.mark.integration
 class TestScraperIntegration:
@@ -24,7 +25,7 @@ class TestScraperIntegration:
         # Should have at least 2 strategies (requests + fallback)
         assert len(scraper.strategies) >= 2
         assert scraper.cache_ttl > 0
-        assert isinstance(scraper.cache, dict)
+        assert isinstance(scraper.cache, ScrapeResultCache)
     
     def test_legacy_function_compatibility(self):
         """Test that legacy function still works"""
@@ -57,8 +58,9 @@ class TestScraperIntegration:
         assert hasattr(result, 'quality_score')
     
     @pytest.mark.slow
+    @pytest.mark.network
     def test_real_amazon_url(self):
-        """Test with a real Amazon URL (marked as slow)"""
+        """Test with a real Amazon URL (marked as slow, needs network access)"""
         scraper = UnifiedProductScraper()
         test_url = "https://www.amazon.co.uk/dp/B0CL5KNB9M"
         
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Scraper Pool & Shared Result Cache
+================================================
+
+Tests for the pooled scraper instances and the ASIN-keyed result cache
+shared by ProductionAmazonScraper, UnifiedProductScraper and
+scrape_amazon_product_page.
+
+Coverage:
+- ASIN normalization across URL formats
+- LRU eviction, TTL expiry and namespaces
+- Pool reuse and size limits
+- Cache hits skipping the network and politeness delays
+"""
+
+import pytest
+import queue
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.scrapers.amazon.scraper_pool import (
+    ScrapeResultCache,
+    ScraperPool,
+    cache_key_for_url,
+    get_result_cache,
+    make_pooled_session,
+    normalize_asin
+)
+from backend.scrapers.amazon.production_scraper import ProductionAmazonScraper
+from backend.scrapers.amazon.unified_scraper import (
+    ScrapingResult,
+    ScrapingStrategy,
+    ScrapingStrategyBase,
+    UnifiedProductScraper
+)
+
+
+@pytest.mark.unit
+class TestNormalizeAsin:
+    """Test ASIN extraction"""
+
+    @pytest.mark.parametrize("url", [
+        "https://www.amazon.co.uk/Grenade-Protein/dp/B0CKFK6716/ref=sr_1_51",
+        "https://amazon.co.uk/dp/b0ckfk6716?th=1",
+        "https://www.amazon.co.uk/gp/product/B0CKFK6716",
+        "https://www.amazon.co.uk/gp/aw/d/B0CKFK6716#reviews",
+        " B0CKFK6716 ",
+    ])
+    def test_formats_share_one_key(self, url):
+        """Test that every product URL format maps to the same ASIN"""
+        assert normalize_asin(url) == "B0CKFK6716"
+
+    def test_urls_without_asin(self):
+        """Test that non-product URLs fall back to a URL hash"""
+        assert normalize_asin("https://www.amazon.co.uk/s?k=protein") is None
+        assert normalize_asin(None) is None
+        assert cache_key_for_url("https://test1.com") != cache_key_for_url("https://test2.com")
+
+
+@pytest.mark.unit
+class TestScrapeResultCache:
+    """Test the bounded LRU/TTL cache"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = ScrapeResultCache(max_entries=2)
+        cache.set("A", {"title": "a"})
+        cache.set("B", {"title": "b"})
+        cache.get("A")
+        cache.set("C", {"title": "c"})
+
+        assert cache.get("B") is None
+        assert cache.get("A") == {"title": "a"}
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are not served"""
+        cache = ScrapeResultCache(ttl_seconds=60)
+        cache.set("A", {"title": "a"}, ttl=0.05)
+        time.sleep(0.1)
+
+        assert cache.get("A") is None
+
+    def test_namespaces_are_isolated(self):
+        """Test that result formats never collide"""
+        cache = ScrapeResultCache()
+        cache.set("B0CKFK6716", {"title": "raw"}, namespace="production")
+
+        assert cache.get("B0CKFK6716", namespace="unified") is None
+        assert cache.clear(namespace="unified") == 0
+        assert cache.invalidate("B0CKFK6716") == 1
+        assert len(cache) == 0
+
+    def test_dict_values_are_copied(self):
+        """Test that callers cannot mutate cached entries"""
+        cache = ScrapeResultCache()
+        original = {"title": "a", "materials": {}}
+        cache.set("A", original)
+        original["title"] = "changed"
+        cache.get("A")["materials"]["primary_material"] = "Glass"
+
+        assert cache.get("A") == {"title": "a", "materials": {}}
+
+
+@pytest.mark.unit
+class TestScraperPool:
+    """Test pooled scraper instances"""
+
+    def test_instances_are_reused(self):
+        """Test that sequential requests share one warm instance"""
+        factory = Mock(side_effect=lambda: object())
+        pool = ScraperPool(factory, size=2)
+
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            pass
+
+        assert first is second
+        assert factory.call_count == 1
+
+    def test_pool_never_exceeds_size(self):
+        """Test that concurrent borrowers wait instead of creating more"""
+        pool = ScraperPool(object, size=2)
+        borrowed = []
+        release = threading.Event()
+
+        def borrow():
+            with pool.acquire() as scraper:
+                borrowed.append(scraper)
+                release.wait(1)
+
+        threads = [threading.Thread(target=borrow) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert pool.stats()["created"] == 2
+        assert len({id(s) for s in borrowed}) == 2
+
+    def test_overflow_after_timeout(self):
+        """Test that a borrower gets a fresh, unpooled instance once the wait runs out"""
+        pool = ScraperPool(object, size=1)
+
+        with pool.acquire() as pooled:
+            start = time.monotonic()
+            with pool.acquire(timeout=0.05, overflow=True) as extra:
+                assert extra is not pooled
+            assert time.monotonic() - start < 1.0
+
+        assert pool.stats() == {"size": 1, "created": 1, "idle": 1, "overflow": 1}
+        with pool.acquire() as again:
+            assert again is pooled
+
+    def test_timeout_without_overflow_raises(self):
+        """Test that an exhausted pool raises queue.Empty when overflow is off"""
+        pool = ScraperPool(object, size=1)
+
+        with pool.acquire():
+            with pytest.raises(queue.Empty):
+                with pool.acquire(timeout=0.01):
+                    pass
+
+    def test_pooled_session_keeps_connections(self):
+        """Test that sessions mount a connection-pooling adapter"""
+        session = make_pooled_session(pool_maxsize=8)
+
+        assert session.get_adapter("https://www.amazon.co.uk")._pool_maxsize == 8
+
+
+@pytest.mark.unit
+class TestSharedResultCache:
+    """Test cache hits across scraper instances"""
+
+    def test_production_scraper_cache_hit_skips_network(self):
+        """Test that a repeat lookup never sleeps or makes a request"""
+        cache = ScrapeResultCache()
+        first = ProductionAmazonScraper(result_cache=cache)
+        product = {"title": "Grenade Protein Powder", "weight_kg": 0.48}
+
+        with patch.object(first, "try_url_strategy", return_value=dict(product)):
+            first.scrape_with_full_url("https://www.amazon.co.uk/Grenade/dp/B0CKFK6716/ref=sr_1_51")
+
+        second = ProductionAmazonScraper(result_cache=cache)
+        with patch.object(second, "make_request_with_retry") as request, patch("time.sleep") as sleep:
+            start = time.perf_counter()
+            result = second.scrape_with_full_url("https://amazon.co.uk/dp/B0CKFK6716?th=1")
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert result["title"] == product["title"]
+        assert result["scraping_metadata"]["cache_hit"] is True
+        request.assert_not_called()
+        sleep.assert_not_called()
+        assert elapsed_ms < 50
+
+    def test_unified_scrapers_share_cache(self):
+        """Test that a new UnifiedProductScraper sees earlier results"""
+        cache = ScrapeResultCache()
+        strategy = Mock(spec=ScrapingStrategyBase)
+        strategy.can_handle.return_value = True
+        strategy.priority = 0
+        strategy.strategy_name = ScrapingStrategy.REQUESTS
+        strategy.scrape.return_value = ScrapingResult(
+            title="Cached Product", origin="UK", weight_kg=1.0,
+            dimensions_cm=[10, 10, 10], material_type="Plastic",
+            recyclability="High", brand="TestBrand", asin="B0CKFK6716"
+        )
+
+        first = UnifiedProductScraper(result_cache=cache)
+        first.strategies = [strategy]
+        first.scrape("https://www.amazon.co.uk/dp/B0CKFK6716")
+
+        second = UnifiedProductScraper(result_cache=cache)
+        second.strategies = [strategy]
+        result = second.scrape("https://www.amazon.co.uk/gp/product/B0CKFK6716")
+
+        assert result.title == "Cached Product"
+        strategy.scrape.assert_called_once()
+
+    def test_scrape_amazon_product_page_uses_shared_cache(self):
+        """Test that the legacy function reuses results across calls"""
+        from backend.scrapers.amazon import unified_scraper
+
+        with patch.object(unified_scraper, "scrape_with_requests", return_value={
+            "title": "Stainless Steel Water Bottle 750ml", "origin": "China",
+            "weight_kg": 0.35, "brand": "Chilly's", "material_type": "Steel",
+            "asin": "B0TESTASIN"
+        }) as scrape:
+            first = unified_scraper.scrape_amazon_product_page("https://www.amazon.co.uk/dp/B0TESTASIN")
+            second = unified_scraper.scrape_amazon_product_page("https://www.amazon.co.uk/x/dp/B0TESTASIN/ref=1")
+
+        assert first == second
+        scrape.assert_called_once()
+        get_result_cache().invalidate("B0TESTASIN")
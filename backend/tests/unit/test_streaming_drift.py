@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Streaming Drift Statistics
+========================================
+
+Tests for FeatureDriftState, the incremental histograms behind
+DriftDetector.
+
+Coverage:
+- PSI, KL and KS match StatisticalTests on the same windows
+- Bin counts stay correct as values are evicted and the reference changes
+- KS reruns only on its stride or timer
+- DriftDetector batch and per-value APIs (needs the monitoring stack)
+"""
+
+import pytest
+import numpy as np
+from scipy import stats
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.core.streaming_drift import FeatureDriftState
+
+
+def reference_psi(reference, current, bins=10):
+    """StatisticalTests.population_stability_index"""
+    _, bin_edges = np.histogram(reference, bins=bins)
+    ref_counts, _ = np.histogram(reference, bins=bin_edges)
+    cur_counts, _ = np.histogram(current, bins=bin_edges)
+    ref_props = (ref_counts + 1e-6) / (len(reference) + bins * 1e-6)
+    cur_props = (cur_counts + 1e-6) / (len(current) + bins * 1e-6)
+    return np.sum((cur_props - ref_props) * np.log(cur_props / ref_props))
+
+
+def reference_kl(reference, current, bins=10):
+    """StatisticalTests.kullback_leibler_divergence"""
+    ref_hist, bin_edges = np.histogram(reference, bins=bins, density=True)
+    cur_hist, _ = np.histogram(current, bins=bin_edges, density=True)
+    ref_dist = (ref_hist + 1e-10) / np.sum(ref_hist + 1e-10)
+    cur_dist = (cur_hist + 1e-10) / np.sum(cur_hist + 1e-10)
+    return np.sum(cur_dist * np.log(cur_dist / ref_dist))
+
+
+@pytest.fixture
+def reference():
+    return np.random.RandomState(0).normal(5, 2, 1000)
+
+
+@pytest.mark.unit
+class TestHistogramStatistics:
+    """Test PSI and KL from incremental bin counts"""
+
+    def test_matches_batch_statistics_while_sliding(self, reference):
+        state = FeatureDriftState(reference_window_size=1000, detection_window_size=100)
+        state.add_reference(reference.tolist())
+        # Drifting stream, including values outside the reference range
+        stream = np.random.RandomState(1).normal(6, 3, 500)
+
+        for i, value in enumerate(stream):
+            state.append(value)
+            if i >= 99 and i % 37 == 0:
+                window = stream[i - 99:i + 1]
+                assert state.psi() == pytest.approx(reference_psi(reference, window), rel=1e-9)
+                assert state.kl_divergence() == pytest.approx(reference_kl(reference, window), rel=1e-9)
+
+        window = stream[-100:]
+        expected_counts, _ = np.histogram(window, bins=np.histogram(reference, bins=10)[1])
+        np.testing.assert_array_equal(state.current_counts, expected_counts)
+
+    def test_values_on_bin_edges(self):
+        reference = np.arange(11, dtype=float)
+        state = FeatureDriftState(detection_window_size=20)
+        state.add_reference(reference)
+        current = np.array([0.0, 1.0, 5.0, 10.0, -0.5, 10.5] * 3)
+        state.extend(current)
+
+        expected_counts, _ = np.histogram(current, bins=np.histogram(reference, bins=10)[1])
+        np.testing.assert_array_equal(state.current_counts, expected_counts)
+        assert state.psi() == pytest.approx(reference_psi(reference, current), rel=1e-9)
+
+    def test_current_window_rebinned_when_reference_changes(self, reference):
+        state = FeatureDriftState(detection_window_size=100)
+        state.add_reference(reference[:500].tolist())
+        current = np.random.RandomState(2).normal(5, 2, 100)
+        state.extend(current)
+        state.psi()
+
+        state.add_reference(reference[500:].tolist())
+        assert state.psi() == pytest.approx(reference_psi(reference, current), rel=1e-9)
+        assert state.reference_mean == pytest.approx(np.mean(reference))
+
+    def test_window_outside_reference_range(self, reference):
+        state = FeatureDriftState(detection_window_size=10)
+        state.add_reference(reference.tolist())
+        state.extend([1000.0] * 10)
+
+        assert state.current_counts.sum() == 0
+        assert state.psi() == pytest.approx(reference_psi(reference, np.full(10, 1000.0)), rel=1e-9)
+        assert np.isnan(state.kl_divergence())
+
+
+@pytest.mark.unit
+class TestKSSchedule:
+    """Test the strided KS test"""
+
+    def test_ks_matches_scipy_and_reruns_on_stride(self, reference):
+        state = FeatureDriftState(detection_window_size=100, ks_stride=25)
+        state.add_reference(reference.tolist())
+        stream = np.random.RandomState(3).normal(7, 2, 200)
+        state.extend(stream[:100])
+
+        p_value, drift = state.ks_test(alpha=0.05)
+        assert p_value == pytest.approx(stats.ks_2samp(reference, stream[:100]).pvalue)
+        assert drift
+        assert state.ks_runs == 1
+
+        state.extend(stream[100:124])
+        assert state.ks_test(alpha=0.05)[0] == p_value
+        assert state.ks_runs == 1
+
+        state.append(stream[124])
+        assert state.ks_test(alpha=0.05)[0] == pytest.approx(stats.ks_2samp(reference, stream[25:125]).pvalue)
+        assert state.ks_runs == 2
+
+    def test_ks_reruns_on_timer(self, reference):
+        state = FeatureDriftState(detection_window_size=10, ks_stride=1000, ks_interval_seconds=0.0)
+        state.add_reference(reference.tolist())
+        state.extend(reference[:10])
+        state.ks_test()
+        state.append(5.0)
+        state.ks_test()
+        assert state.ks_runs == 2
+
+
+@pytest.mark.unit
+class TestDriftDetector:
+    """Test DriftDetector on top of the streaming state"""
+
+    @pytest.fixture
+    def detector(self):
+        pytest.importorskip("opentelemetry")
+        from backend.core.ml_monitoring import DriftDetector
+        return DriftDetector(detection_window_size=100, ks_stride=25)
+
+    def test_drifted_stream_raises_alerts(self, detector, reference):
+        detector.add_reference_data("feature", reference.tolist())
+        for value in np.random.RandomState(4).normal(9, 2, 100):
+            detector.add_current_data("feature", value)
+
+        assert detector.alerts
+        assert detector.alerts[-1].metadata["psi_score"] > detector.psi_threshold
+
+    def test_batch_detects_once(self, detector, reference):
+        detector.add_reference_data("feature", reference.tolist())
+        detector.add_current_batch("feature", np.random.RandomState(4).normal(9, 2, 300).tolist())
+
+        assert len(detector.alerts) == 1
+        assert len(detector.current_data["feature"]) == 100
+
+    def test_alert_history_is_bounded(self, reference):
+        pytest.importorskip("opentelemetry")
+        from backend.core.ml_monitoring import DriftDetector
+        detector = DriftDetector(detection_window_size=100, ks_stride=25, max_alerts=2)
+        detector.add_reference_data("feature", reference.tolist())
+        for seed in range(3):
+            detector.add_current_batch("feature", np.random.RandomState(seed).normal(9, 2, 300).tolist())
+
+        assert detector.total_alerts == 3
+        assert len(detector.alerts) == 2
+        assert len(detector.recent_alerts) == 2
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Supplier Sustainability Scoring
+=============================================
+
+Tests for the grouped supplier table behind
+/api/enterprise/suppliers/sustainability-scoring.
+
+Coverage:
+- Scores, grades and ranking match the per-supplier loop they replace
+- Report summary, risk analysis and insights
+- Paginated and sorted access through the endpoint
+- Table cached per dataset version
+"""
+
+import json
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask
+from unittest.mock import patch
+
+import sys
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.api.routes import enterprise_dashboard
+from backend.api.routes.enterprise_dashboard import (
+    build_supplier_analysis,
+    build_supplier_table,
+    get_improvement_recommendations,
+    get_sustainability_grade
+)
+
+BRAND_LOCATIONS = {
+    "UK": {"origin": "UK"},
+    "USA": {"origin": "USA"},
+    "Germany": {"origin": "Europe"},
+    "Brazil": {}
+}
+
+
+def make_dataset(rows=3000, suppliers=60, seed=0):
+    rng = random.Random(seed)
+    origins = ["UK", "USA", "Germany", "Brazil"] + [f"Supplier {i}" for i in range(suppliers - 4)]
+    return pd.DataFrame({
+        'title': [f"Product {i}" for i in range(rows)],
+        'origin': [rng.choice(origins) if rng.random() > 0.02 else None for _ in range(rows)],
+        'co2_emissions': [round(rng.uniform(0.5, 25), 2) if rng.random() > 0.05 else np.nan for _ in range(rows)],
+        'recyclability': [rng.choice(["High", "Medium", "Low"]) for _ in range(rows)],
+        'material': [rng.choice(["bamboo", "cork", "Plastic", "Steel", "hemp"]) for _ in range(rows)],
+        'category': [rng.choice(["Kitchen", "Garden", "Toys", None]) for _ in range(rows)]
+    })
+
+
+def legacy_ranking(df, brand_locations):
+    """The per-supplier scan get_supplier_analysis used to run"""
+    supplier_scores = {}
+    for brand in df['origin'].unique():
+        if pd.isna(brand):
+            continue
+        brand_data = df[df['origin'] == brand]
+        avg_carbon = brand_data['co2_emissions'].mean()
+        carbon_score = max(0, 100 - (avg_carbon * 5))
+        recyclability_score = (brand_data['recyclability'] == 'High').sum() / len(brand_data) * 100
+        brand_materials = brand_data['material'].value_counts()
+        sustainable_count = sum(brand_materials.get(mat, 0) for mat in enterprise_dashboard.SUSTAINABLE_MATERIALS)
+        material_score = min(100, (sustainable_count / len(brand_data)) * 200)
+        geographic_score = 50
+        if brand in brand_locations:
+            origin = brand_locations[brand].get('origin', '').lower()
+            if origin in ['uk', 'united kingdom', 'europe']:
+                geographic_score = 75
+            elif origin in ['usa', 'canada', 'north america']:
+                geographic_score = 65
+        overall_score = carbon_score * 0.4 + recyclability_score * 0.25 + material_score * 0.25 + geographic_score * 0.1
+        supplier_scores[brand] = {
+            'overall_score': round(overall_score, 1),
+            'carbon_performance': round(carbon_score, 1),
+            'recyclability_score': round(recyclability_score, 1),
+            'material_sustainability': round(material_score, 1),
+            'geographic_efficiency': round(geographic_score, 1),
+            'product_count': len(brand_data),
+            'category_diversity': brand_data['category'].nunique(),
+            'avg_carbon_kg': round(avg_carbon, 2),
+            'sustainability_grade': get_sustainability_grade(overall_score),
+            'origin_country': brand_locations.get(brand, {}).get('origin', 'Unknown'),
+            'improvement_areas': get_improvement_recommendations(carbon_score, recyclability_score, material_score)
+        }
+    return sorted(supplier_scores.items(), key=lambda x: x[1]['overall_score'], reverse=True)
+
+
+@pytest.mark.unit
+class TestSupplierTable:
+    """Test the grouped scoring"""
+
+    @pytest.mark.parametrize("categorical", [False, True])
+    def test_matches_per_supplier_loop(self, categorical):
+        df = make_dataset()
+        if categorical:
+            df = df.astype({'origin': 'category', 'recyclability': 'category', 'material': 'category', 'category': 'category'})
+        expected = legacy_ranking(df, BRAND_LOCATIONS)
+
+        table = build_supplier_table(df, BRAND_LOCATIONS)
+        assert list(table.index) == [brand for brand, _ in expected]
+        for (brand, data), (_, row) in zip(expected, table.iterrows()):
+            for key, value in data.items():
+                assert row[key] == pytest.approx(value) if isinstance(value, float) else row[key] == value, (brand, key)
+
+    def test_missing_columns(self):
+        df = pd.DataFrame({'origin': ['UK', 'UK', 'Brazil']})
+        table = build_supplier_table(df, BRAND_LOCATIONS)
+        assert table.loc['UK', 'carbon_performance'] == 100
+        assert table.loc['UK', 'material_sustainability'] == 50
+        assert table.loc['UK', 'category_diversity'] == 1
+        assert build_supplier_table(pd.DataFrame({'title': ['x']}), {}).empty
+
+    def test_report(self):
+        df = make_dataset()
+        expected = legacy_ranking(df, BRAND_LOCATIONS)
+        report = build_supplier_analysis(df, BRAND_LOCATIONS)['report']
+
+        assert report['summary']['total_suppliers'] == len(expected)
+        assert report['summary']['top_performer'] == expected[0]
+        assert report['summary']['average_sustainability_score'] == round(
+            sum(data['overall_score'] for _, data in expected) / len(expected), 1
+        )
+        assert [s['brand'] for s in report['supplier_rankings']['bottom_10_need_improvement']] == [b for b, _ in expected[-10:]]
+        assert report['risk_analysis']['high_risk_suppliers'] == [
+            {'brand': brand, 'score': data['overall_score'], 'risk_factors': data['improvement_areas']}
+            for brand, data in expected if data['overall_score'] < 30
+        ]
+        assert report['actionable_insights'] == enterprise_dashboard.generate_supplier_insights(
+            expected, report['risk_analysis']['high_risk_suppliers']
+        )
+
+
+@pytest.mark.unit
+class TestSupplierEndpoint:
+    """Test pagination, sorting and caching of the endpoint"""
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        dataset_path = tmp_path / "enhanced_eco_dataset.csv"
+        make_dataset().to_csv(dataset_path, index=False)
+        locations_path = tmp_path / "brand_locations.json"
+        locations_path.write_text(json.dumps(BRAND_LOCATIONS))
+
+        app = Flask(__name__)
+        app.register_blueprint(enterprise_dashboard.enterprise_bp)
+        with patch.object(enterprise_dashboard, "ENTERPRISE_DATASET_PATH", str(dataset_path)), \
+                patch.object(enterprise_dashboard, "BRAND_LOCATIONS_PATH", str(locations_path)), \
+                patch.dict(os.environ, {"DATASET_CACHE_DIR": str(tmp_path / "cache")}), \
+                patch('builtins.print'):
+            yield app.test_client()
+
+    def test_pages_cover_every_supplier(self, client):
+        url = '/api/enterprise/suppliers/sustainability-scoring'
+        first = client.get(url, query_string={'page_size': 25}).get_json()
+        assert first['status'] == 'success'
+        suppliers = first['suppliers']
+        assert suppliers['total'] == first['summary']['total_suppliers']
+        assert suppliers['total_pages'] == -(-suppliers['total'] // 25)
+
+        brands = []
+        for page in range(1, suppliers['total_pages'] + 1):
+            brands += [s['brand'] for s in client.get(url, query_string={'page_size': 25, 'page': page}).get_json()['suppliers']['items']]
+        assert brands == [s['brand'] for s in first['supplier_rankings']['top_10_sustainable']] + brands[10:]
+        assert len(set(brands)) == suppliers['total']
+
+    def test_sorted_access(self, client):
+        url = '/api/enterprise/suppliers/sustainability-scoring'
+        items = client.get(url, query_string={'sort_by': 'avg_carbon_kg', 'order': 'asc', 'page_size': 500}).get_json()['suppliers']['items']
+        carbon = [s['avg_carbon_kg'] for s in items]
+        assert carbon == sorted(carbon)
+
+        response = client.get(url, query_string={'sort_by': 'brand; drop'})
+        assert response.status_code == 400
+
+    def test_table_built_once_per_dataset_version(self, client):
+        url = '/api/enterprise/suppliers/sustainability-scoring'
+        with patch.object(enterprise_dashboard, "build_supplier_table", wraps=build_supplier_table) as build:
+            client.get(url)
+            client.get(url, query_string={'page': 2})
+            client.get(url, query_string={'sort_by': 'product_count'})
+            assert build.call_count == 1
+
+            dataset_path = enterprise_dashboard.ENTERPRISE_DATASET_PATH
+            make_dataset(rows=500, seed=1).to_csv(dataset_path, index=False)
+            os.utime(dataset_path, ns=(1, 1))
+            assert client.get(url).get_json()['summary']['total_suppliers'] <= 60
+            assert build.call_count == 2
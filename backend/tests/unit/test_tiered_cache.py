@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Two-Tier Response Cache
+=====================================
+
+Tests for TieredCache (in-process LRU in front of Redis) used by
+/estimate_emissions, run against fakeredis.
+
+Coverage:
+- L1/L2 hits and L2 -> L1 promotion across processes
+- Request coalescing for concurrent identical misses
+- Stale-while-revalidate refreshes
+- L1 fallback when the Redis circuit breaker opens
+- Tag-based and SCAN-based invalidation (TieredCache and CacheService)
+"""
+
+import pytest
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from backend.core.caching import (
+    CacheService,
+    CircuitBreaker,
+    CircuitBreakerState,
+    LocalLRUCache,
+    TieredCache,
+    asin_tag,
+    get_response_cache,
+    dataset_tag,
+    model_tag,
+    tag_key
+)
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _eventually(condition, timeout=2.0):
+    """Poll for work done on the cache's background threads"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def _cache(server, **kwargs):
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    kwargs.setdefault("circuit_breaker", CircuitBreaker(failure_threshold=2, recovery_timeout=60))
+    return TieredCache(namespace="test", redis_client=client, **kwargs)
+
+
+@pytest.mark.unit
+class TestTieredCache:
+    """Test the L1/L2 lookup path"""
+
+    def test_miss_then_l1_hit(self, server):
+        """Test a computed value is served from L1 afterwards"""
+        cache = _cache(server)
+        calls = []
+
+        first = cache.get_or_compute("B0TEST0001:SW1A", lambda: calls.append(1) or {"score": "B"})
+        second = cache.get_or_compute("B0TEST0001:SW1A", lambda: calls.append(1) or {"score": "X"})
+
+        assert first == second == {"score": "B"}
+        assert len(calls) == 1
+        stats = cache.get_stats()
+        assert stats["misses"] == 1 and stats["l1_hits"] == 1
+
+    def test_l2_shared_across_processes(self, server):
+        """Test another process's L1 is filled from Redis"""
+        _cache(server).get_or_compute("key", lambda: {"score": "A"})
+        other = _cache(server)
+
+        assert other.get_or_compute("key", lambda: pytest.fail("should not recompute")) == {"score": "A"}
+        assert other.get_stats()["l2_hits"] == 1
+        assert len(other.l1) == 1
+
+    def test_should_cache_veto(self, server):
+        """Test error results are returned but not stored"""
+        cache = _cache(server)
+        result = cache.get_or_compute("bad", lambda: ({"error": "x"}, 500), should_cache=lambda r: r[1] == 200)
+
+        assert result == ({"error": "x"}, 500)
+        assert cache.get("bad") is None
+
+    def test_l1_is_bounded(self):
+        """Test LRU eviction in the local tier"""
+        l1 = LocalLRUCache(max_entries=2)
+        envelope = {"value": 1, "fresh_until": time.time() + 60, "expires_at": time.time() + 60}
+        l1.set("a", envelope)
+        l1.set("b", envelope)
+        l1.get("a")
+        l1.set("c", envelope)
+
+        assert l1.get("b") is None
+        assert l1.get("a") is not None and l1.get("c") is not None
+
+
+@pytest.mark.unit
+class TestCoalescingAndRefresh:
+    """Test concurrent and stale requests"""
+
+    def test_concurrent_misses_share_one_computation(self, server):
+        """Test identical in-flight requests wait for the first"""
+        cache = _cache(server)
+        calls = []
+        barrier = threading.Barrier(8)
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"score": "C"}
+
+        def worker():
+            barrier.wait()
+            results.append(cache.get_or_compute("same", compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"score": "C"}] * 8
+        assert cache.get_stats()["coalesced"] == 7
+
+    def test_stale_value_served_while_refreshing(self, server):
+        """Test expired-but-stale entries return immediately and refresh once"""
+        cache = _cache(server, ttl=1, stale_ttl=60)
+        cache.set("key", {"version": 1}, ttl=1)
+        cache.l1.get("key")["fresh_until"] = time.time() - 1
+
+        refreshed = threading.Event()
+
+        def compute():
+            refreshed.set()
+            return {"version": 2}
+
+        assert cache.get_or_compute("key", compute) == {"version": 1}
+        assert refreshed.wait(2)
+        time.sleep(0.05)
+
+        assert cache.get("key") == {"version": 2}
+        stats = cache.get_stats()
+        assert stats["stale_hits"] == 1 and stats["refreshes"] == 1
+
+
+@pytest.mark.unit
+class TestRedisOutage:
+    """Test degradation when Redis is unavailable"""
+
+    def test_falls_back_to_l1_when_breaker_opens(self, server):
+        """Test L1 keeps serving and Redis is skipped once the breaker is open"""
+        cache = _cache(server)
+        cache.get_or_compute("warm", lambda: {"score": "A"})
+
+        server.connected = False
+        calls = []
+        for i in range(3):
+            cache.get_or_compute(f"cold-{i}", lambda: calls.append(1) or {"score": "B"})
+
+        assert cache.circuit_breaker.state == CircuitBreakerState.OPEN
+        assert len(calls) == 3
+
+        # Served from L1 without touching Redis
+        l2_errors = cache.get_stats()["l2_errors"]
+        assert cache.get_or_compute("warm", lambda: pytest.fail("should hit L1")) == {"score": "A"}
+        assert cache.get_or_compute("cold-0", lambda: pytest.fail("should hit L1")) == {"score": "B"}
+        assert cache.get_stats()["l2_errors"] == l2_errors
+
+        stats = cache.get_stats()
+        assert stats["circuit_breaker_state"] == "open"
+        assert stats["l1_hits"] == 2
+
+    def test_shared_cache_per_namespace(self):
+        """Test the process-wide registry"""
+        assert get_response_cache("unit-test-ns") is get_response_cache("unit-test-ns")
+
+
+def _no_keys(*args, **kwargs):
+    raise AssertionError("KEYS must not be used")
+
+
+@pytest.mark.unit
+class TestTagInvalidation:
+    """Test eviction by tag and by pattern"""
+
+    def test_invalidate_tag_evicts_only_tagged_entries(self, server):
+        """Test both tiers drop the tagged entries and keep the rest"""
+        cache = _cache(server)
+        cache.set("B0AAAAAAAA:SW1A", {"score": "A"}, tags=[asin_tag("B0AAAAAAAA"), model_tag("xgboost")])
+        cache.set("B0BBBBBBBB:SW1A", {"score": "B"}, tags=[asin_tag("B0BBBBBBBB"), model_tag("xgboost")])
+        cache.set("static", {"score": "C"}, tags=["dataset:expanded"])
+
+        evicted = cache.invalidate_tags(model_tag("xgboost"))
+
+        assert evicted == 4  # two L1 copies + two Redis keys
+        assert cache.get("B0AAAAAAAA:SW1A") is None
+        assert cache.get("B0BBBBBBBB:SW1A") is None
+        assert cache.get("static") == {"score": "C"}
+        assert not cache.redis_client.exists(tag_key(cache.key_prefix, model_tag("xgboost")))
+
+    def test_invalidation_runs_in_batches(self, server):
+        """Test large tag sets are drained batch by batch"""
+        cache = _cache(server)
+        for i in range(25):
+            cache.set(f"k{i}", i, tags=["dataset:expanded"])
+        cache.clear_local()
+
+        calls = []
+        original = cache.redis_client.spop
+        cache.redis_client.spop = lambda *args: calls.append(args) or original(*args)
+
+        assert cache.invalidate_tags("dataset:expanded", batch_size=10) == 25
+        assert len(calls) == 4  # 10 + 10 + 5 + empty
+
+    def test_redis_entries_shared_across_processes(self, server):
+        """Test another process's invalidation evicts the shared Redis copy"""
+        writer, other = _cache(server), _cache(server)
+        writer.get_or_compute("B0AAAAAAAA:SW1A", lambda: {"v": 1}, tags=lambda value: [asin_tag("B0AAAAAAAA")])
+
+        other.invalidate_tags(asin_tag("B0AAAAAAAA"))
+
+        assert _cache(server).get("B0AAAAAAAA:SW1A") is None
+
+    def test_pattern_uses_scan_not_keys(self, server):
+        """Test ad-hoc patterns are evicted incrementally"""
+        cache = _cache(server)
+        for i in range(12):
+            cache.set(f"B0CCCCCCCC:district{i}", i)
+        cache.set("B0DDDDDDDD:SW1A", 0)
+        cache.redis_client.keys = _no_keys
+
+        evicted = cache.invalidate_pattern("B0CCCCCCCC:*", batch_size=5)
+
+        assert evicted == 24
+        assert cache.get("B0DDDDDDDD:SW1A") == 0
+
+    def test_cache_service_tags_and_scan(self):
+        """Test the async CacheService uses the same tag sets"""
+        async def scenario():
+            service = CacheService(key_prefix="unit")
+            service.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+            service.redis_client.keys = _no_keys
+            await service.set("scraping:1", {"a": 1}, tags=[asin_tag("B0AAAAAAAA")])
+            await service.set("scraping:2", {"a": 2}, tags=[asin_tag("B0BBBBBBBB")])
+            await service.set("prediction:1", {"a": 3})
+
+            tagged = await service.invalidate_tags(asin_tag("B0AAAAAAAA"))
+            matched = await service.invalidate_pattern("prediction:*")
+            remaining = await service.redis_client.exists("unit:scraping:2")
+            return tagged, matched, remaining
+
+        assert asyncio.run(scenario()) == (1, 1, 1)
+
+    def test_global_tag_sets_drop_expired_members(self, server):
+        """Test model/dataset tag sets are swept of keys that have expired"""
+        cache = _cache(server)
+        global_tags = [model_tag("xgboost"), dataset_tag("brand_locations")]
+        live = {cache._make_key(f"B0LIVE000{i}:SW1A") for i in range(3)}
+        with patch("backend.core.caching.TAG_PRUNE_INTERVAL", 10):
+            for i in range(9):
+                cache.set(f"B0EXPIRED{i}:SW1A", i, tags=global_tags)
+            # Stand-in for the entries' TTLs running out
+            cache.redis_client.delete(*[cache._make_key(f"B0EXPIRED{i}:SW1A") for i in range(9)])
+            for i in range(3):
+                cache.set(f"B0LIVE000{i}:SW1A", i, tags=global_tags)
+
+            for tag in global_tags:
+                set_key = tag_key(cache.key_prefix, tag)
+                assert _eventually(lambda: cache.redis_client.smembers(set_key) == live)
+
+    def test_prune_runs_off_the_request_path(self, server):
+        """Test set() returns while a sweep is still running"""
+        cache = _cache(server)
+        sweeping, release = threading.Event(), threading.Event()
+
+        def slow_prune(client, set_key):
+            sweeping.set()
+            release.wait(2)
+            return 0
+
+        with patch("backend.core.caching.TAG_PRUNE_INTERVAL", 2), \
+                patch("backend.core.caching.prune_tag_set", side_effect=slow_prune) as prune:
+            cache.set("k0", 0, tags=["dataset:expanded"])
+            start = time.perf_counter()
+            cache.set("k1", 1, tags=["dataset:expanded"])
+            cache.set("k2", 2, tags=["dataset:expanded"])
+            elapsed = time.perf_counter() - start
+
+            assert sweeping.wait(2)
+            release.set()
+
+        assert elapsed < 0.5
+        assert prune.call_count == 1  # one sweep per set at a time
+
+    def test_prune_threshold_survives_skipped_sizes(self, server):
+        """Test a set that jumps past the threshold (interleaved writers) is still swept"""
+        cache = _cache(server)
+        set_key = tag_key(cache.key_prefix, "dataset:expanded")
+        # Another process's writes took the set from 3 to 12 members
+        cache.redis_client.sadd(set_key, *[f"gone{i}" for i in range(12)])
+        with patch("backend.core.caching.TAG_PRUNE_INTERVAL", 10):
+            cache.set("k", 1, tags=["dataset:expanded"])
+
+            assert _eventually(lambda: cache.redis_client.smembers(set_key) == {cache._make_key("k")})
+
+    def test_cache_service_prunes_tag_sets(self):
+        """Test the async CacheService sweeps its tag sets in a background task"""
+        async def scenario():
+            service = CacheService(key_prefix="unit")
+            service.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+            with patch("backend.core.caching.TAG_PRUNE_INTERVAL", 4):
+                for i in range(3):
+                    await service.set(f"prediction:{i}", i, tags=[model_tag("xgboost")])
+                await service.redis_client.delete("unit:prediction:0", "unit:prediction:1")
+                await service.set("prediction:3", 3, tags=[model_tag("xgboost")])
+                await asyncio.gather(*service._background_tasks)
+            return await service.redis_client.smembers(tag_key("unit", model_tag("xgboost")))
+
+        assert asyncio.run(scenario()) == {"unit:prediction:2", "unit:prediction:3"}
+
+
+@pytest.mark.unit
+class TestCacheStatsEndpoint:
+    """Test /admin/cache-stats is admin-only"""
+
+    def test_requires_admin_session(self):
+        with patch('builtins.print'):
+            from backend.api.app import app
+
+        client = app.test_client()
+        assert client.get('/admin/cache-stats').status_code == 401
+
+        with client.session_transaction() as session:
+            session['user'] = {'username': 'viewer', 'role': 'user'}
+        assert client.get('/admin/cache-stats').status_code == 401
+
+        with client.session_transaction() as session:
+            session['user'] = {'username': 'admin', 'role': 'admin'}
+        response = client.get('/admin/cache-stats')
+        assert response.status_code == 200
+        assert 'estimate_emissions' in response.get_json()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Title Feature Engine
+==================================
+
+Tests for backend.utils.title_features and the weight extractors built on
+it.
+
+Coverage:
+- One scan returns weights, volumes, pack size, nutrition, dimension and
+  spec spans
+- The extractors return what their own regex loops used to return
+- LRU cache keyed by the normalized title
+- parse_many matches row-by-row parsing
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+
+import sys
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.utils.title_features import (
+    MAX_CACHED_LENGTH,
+    clear_title_cache,
+    container_weight_kg,
+    normalize_title,
+    parse_many,
+    parse_title,
+    title_cache_info
+)
+
+with patch('builtins.print'):
+    from backend.api.app import extract_weight_from_title
+    from backend.scrapers.amazon.production_scraper import ProductionAmazonScraper
+    from backend.scrapers.amazon.requests_scraper import RequestsScraper
+    from backend.scrapers.amazon.scrape_amazon_titles import extract_weight
+    from backend.services.fixed_weight_parser import FixedWeightParser
+
+DATASET_PATH = os.path.join(project_root, "common", "data", "csv", "expanded_eco_dataset.csv")
+
+TITLES = [
+    "Kinetica Sports Whey Protein Powder | 23g Protein/Serve, 76 Servings/2.27Kg Pack",
+    "Optimum Nutrition Gold Standard 5lb Protein",
+    "Casein 900g", "Whey isolate 300g", "Mass gainer 3 kilograms",
+    "Rice 500g bag", "Coffee beans 1 kg", "Spice 50 grams", "Beans 16 ounces", "Item 12 oz can",
+    "Tea 100g 20 servings", "Protein bar 60g x 12", "Dumbbell 10 lbs", "Dumbbell 25 pounds",
+    "iPhone 15 128GB 171g", "Samsung 256gb phone 900g", "Program 5g", "Weight: 2.5 kg",
+    "Units: 600.0 gram", "Dimensions 45.01 x 30 x 19.99 cm; 600 g", "11 x 7 x 27 cm; 0.6 kg",
+    "Water 2 l 1.5kg", "Olive oil 500ml", "Heavy anvil 150kg", "Feather 2g", "Laptop 2kg",
+    "Stanley Camp Mug 0.35L", "16 Pack Galaxy Slime", "", "No weight here",
+]
+
+
+# === The regex loops the extractors used to run ===
+
+def legacy_app(title):
+    if not title:
+        return 0.0
+    title_lower = title.lower()
+    cleaned = title_lower
+    for exclusion in [r'\d+\s*g\s*protein\b', r'\d+\s*g\s*carbs?\b', r'\d+\s*g\s*fat\b',
+                      r'\d+\s*mg\s*(?:sodium|caffeine)\b', r'\d+\s*(?:cal|kcal)\b', r'\d+\s*g\s*sugar\b',
+                      r'\d+\s*g\s*fiber\b', r'\d+\s*servings?\b', r'\d+\s*scoops?\b']:
+        cleaned = re.sub(exclusion, ' ', cleaned)
+    patterns = [
+        (r'(\d+(?:\.\d+)?)\s*kg\b', 'kg', 1.0), (r'(\d+(?:\.\d+)?)\s*lb[s]?\b', 'lb', 0.453592),
+        (r'(\d+(?:\.\d+)?)\s*pound[s]?\b', 'lb', 0.453592), (r'(\d{3,4})\s*g\b', 'g_large', 0.001),
+        (r'(\d+(?:\.\d+)?)\s*kilograms?\b', 'kg', 1.0), (r'(\d+(?:\.\d+)?)\s*pounds?\b', 'lb', 0.453592),
+        (r'(\d+(?:\.\d+)?)\s*ounces?\b', 'oz', 0.0283495), (r'(\d+(?:\.\d+)?)\s*g\b(?!ram)', 'g', 0.001),
+    ]
+    supplement = any(k in title_lower for k in ['protein', 'whey', 'casein', 'mass gainer', 'supplement'])
+    for pattern, unit, multiplier in patterns:
+        matches = re.findall(pattern, cleaned)
+        if matches:
+            value = float(matches[0])
+            if supplement and ((unit == 'g' and value < 200) or (unit == 'g_large' and value < 400)):
+                continue
+            if 0.05 <= value * multiplier <= 50:
+                return value * multiplier
+    return 0.0
+
+
+def legacy_production(title):
+    title = title.lower()
+    for exclusion in [r'\d+\s*g\s*protein\b', r'\d+\s*g\s*carbs?\b', r'\d+\s*g\s*fat\b', r'\d+\s*mg\s*(?:sodium|caffeine)\b']:
+        title = re.sub(exclusion, '', title)
+    for pattern, multiplier in [(r'(\d+(?:\.\d+)?)\s*kg\b', 1.0), (r'(\d+(?:\.\d+)?)\s*lb[s]?\b', 0.453592),
+                                (r'(\d+(?:\.\d+)?)\s*g\b(?!\s*protein)', 0.001), (r'(\d+(?:\.\d+)?)\s*oz\b', 0.0283495)]:
+        matches = re.findall(pattern, title)
+        if matches and 0.01 <= float(matches[0]) * multiplier <= 100:
+            return float(matches[0]) * multiplier
+    return 0
+
+
+def legacy_requests(text):
+    text = text.lower()
+    patterns = [
+        (r'weight[:\s]+(\d+(?:\.\d+)?)\s*(kg|kilograms?)', 'kg'), (r'weight[:\s]+(\d+(?:\.\d+)?)\s*(g|grams?)', 'g'),
+        (r';\s*(\d+(?:\.\d+)?)\s*(kg)\b', 'kg'), (r';\s*(\d+(?:\.\d+)?)\s*(g)\b', 'g'),
+        (r'units[:\s]+(\d+(?:\.\d+)?)\s*(g|gram)', 'g'), (r'\b(\d+(?:\.\d+)?)\s*kg\b', 'kg'),
+        (r'\b(\d+(?:\.\d+)?)\s*g\b(?!ram)', 'g'),
+    ]
+    for pattern, unit in patterns:
+        for match in re.findall(pattern, text):
+            value = float(match[0]) if isinstance(match, tuple) else float(match)
+            if (unit == 'kg' and value < 0.01) or (unit == 'g' and value < 10):
+                continue
+            return value if unit == 'kg' else value / 1000
+    matches = re.findall(r'(\d+(?:\.\d+)?)\s*(?:lb|lbs|pounds?)', text)
+    return float(matches[0]) * 0.453592 if matches else 1.0
+
+
+def legacy_scrape(text):
+    if not text:
+        return None
+    text = text.lower()
+    match = re.search(r"[\d.]+\s*[x×]\s*[\d.]+\s*[x×]\s*[\d.]+\s*cm[;,\s]+([\d.]+)\s*g\b", text)
+    if match:
+        return round(float(match.group(1)) / 1000, 3)
+    match = re.search(r"([\d.]+)\s?(kg|kilogram|kilograms)", text)
+    if match:
+        return round(float(match.group(1)), 3)
+    match = re.search(r"([\d.]+)\s?(g|grams?|gramme?s?)\b", text)
+    return round(float(match.group(1)) / 1000, 3) if match else None
+
+
+def legacy_fixed(parser, title):
+    title_lower = title.lower()
+    has_storage = any(re.search(p, title_lower) for p in [
+        r'\d+\s*(?:gb|tb|mb|kb)', r'\d+\s*(?:ghz|mhz)', r'\d+\s*(?:mp|megapixel)', r'\d+\s*(?:inch|")', r'\d+\s*(?:volt|v|amp)'
+    ])
+    for pattern, unit, factor in [
+        (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*kg(?:\s|$)', 'kg', 1.0),
+        (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*pound?s?(?:\s|$)', 'pounds', 0.453592),
+        (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*lbs?(?:\s|$)', 'lbs', 0.453592),
+        (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*g(?:ram)?s?(?:\s|$|[^b])', 'grams', 0.001),
+        (r'(?:weighs?\s+)?(\d+(?:\.\d+)?)\s*oz(?:unce)?s?(?:\s|$)', 'ounces', 0.0283495),
+    ]:
+        for match in re.findall(pattern, title_lower):
+            value = float(match)
+            if not parser._is_reasonable_weight(value * factor, title):
+                continue
+            if has_storage and unit == 'grams' and value > 500:
+                continue
+            return value * factor, f"{value} {unit}"
+    return None
+
+
+def all_titles():
+    titles = list(TITLES)
+    if os.path.exists(DATASET_PATH):
+        titles += list(pd.read_csv(DATASET_PATH, usecols=['title'])['title'].dropna().unique())
+    return titles
+
+
+def assert_same(expected, actual, title):
+    if expected is None:
+        assert actual is None, title
+    else:
+        assert actual == pytest.approx(expected, rel=1e-9), title
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    with patch('builtins.print'):
+        yield
+
+
+@pytest.mark.unit
+class TestTitleScan:
+    """Test what one scan finds"""
+
+    def test_features(self):
+        features = parse_title("Kinetica Whey | 23g Protein/Serve, 76 Servings/2.27Kg Pack | 2 x 500ml bottles, 6 Pack")
+        assert [(w.value, w.unit) for w in features.weights] == [(2.27, 'kg')]
+        assert [(v.value, v.ml) for v in features.volumes] == [(500, 500)]
+        assert features.pack_size == 6
+        assert [features.text[start:end] for start, end in features.nutrition] == ["23g protein", "76 servings"]
+        assert features.is_supplement
+
+    def test_labels_dimensions_and_specs(self):
+        features = parse_title("iPhone 15, 6.1 inch, 128GB | 14.7 x 7.1 x 0.8 cm; 171 g | Weight: 0.2 kg")
+        assert [(w.value, w.label) for w in features.weights] == [(171, ';'), (0.2, 'weight')]
+        assert features.follows_dimensions(features.weights[0])
+        assert not features.follows_dimensions(features.weights[1])
+        assert len(features.specs) == 2
+        assert parse_title("Box of 12 pencils").pack_size == 12
+        assert parse_title(None).weights == ()
+
+    def test_units(self):
+        weights = parse_title("1 kilogram, 2 lbs, 3 pounds, 4 ounces, 5 oz, 6 grams, 7 kgs").weights
+        assert [w.unit for w in weights] == ['kg', 'lb', 'lb', 'oz', 'oz', 'g', 'kg']
+        assert weights[1].kg == pytest.approx(2 * 0.453592)
+        assert parse_title("100 GSM paper, 2000W, program").weights == ()
+
+
+@pytest.mark.unit
+class TestExtractorParity:
+    """The extractors return what their regex loops returned"""
+
+    def test_app_extract_weight_from_title(self):
+        for title in all_titles():
+            assert_same(legacy_app(title), extract_weight_from_title(title), title)
+            assert_same(legacy_app(title) or None, container_weight_kg(parse_title(title)), title)
+
+    def test_production_scraper(self):
+        scraper = ProductionAmazonScraper.__new__(ProductionAmazonScraper)
+        for title in all_titles():
+            element = MagicMock()
+            element.get_text.return_value = title
+            page = MagicMock()
+            page.select_one.return_value = element
+            assert_same(legacy_production(title), scraper.extract_weight_from_title(page), title)
+
+    def test_requests_scraper(self):
+        scraper = RequestsScraper.__new__(RequestsScraper)
+        for title in all_titles():
+            assert_same(legacy_requests(title), scraper.extract_weight(title), title)
+
+    def test_scrape_amazon_titles(self):
+        for title in all_titles():
+            assert_same(legacy_scrape(title), extract_weight(title), title)
+
+    def test_fixed_weight_parser(self):
+        parser = FixedWeightParser()
+        for title in all_titles() + ["Galaxy phone 128gb 190g", "Blender 1500 watt 4.5 kg", "Sofa 40 kg"]:
+            if 'ounce' in title.lower():
+                continue
+            expected = legacy_fixed(parser, title)
+            result = parser._parse_weight_from_title_fixed(title)
+            if expected is None:
+                assert result is None, title
+            else:
+                assert result['weight_kg'] == pytest.approx(expected[0]), title
+                assert result['matched_text'] == expected[1], title
+
+        # The old "oz(?:unce)?s?" pattern never matched "ounces"
+        assert parser._parse_weight_from_title_fixed("Beans 16 ounces")['weight_kg'] == pytest.approx(16 * 0.0283495)
+
+    def test_nutrition_never_read_as_weight(self):
+        scraper = RequestsScraper.__new__(RequestsScraper)
+        assert scraper.extract_weight("Energy bar 25g sugar") == 1.0
+        assert extract_weight_from_title("Energy bar 25g sugar") == 0.0
+
+
+@pytest.mark.unit
+class TestCacheAndSeries:
+    """Test the LRU cache and parse_many"""
+
+    def test_cache_keyed_by_normalized_title(self):
+        clear_title_cache()
+        first = parse_title("Coffee  Beans 1 KG")
+        assert parse_title("coffee beans\t1 kg") is first
+        assert normalize_title("  Coffee  Beans\n1 KG ") == "coffee beans 1 kg"
+        info = title_cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+        # Whole page texts are scanned but not cached
+        parse_title("2kg " + "x" * MAX_CACHED_LENGTH)
+        assert title_cache_info().currsize == 1
+
+    def test_parse_many_matches_rows(self):
+        titles = pd.Series(TITLES * 3 + [None, np.nan], index=range(100, 100 + len(TITLES) * 3 + 2))
+        frame = parse_many(titles)
+        assert list(frame.index) == list(titles.index)
+        assert list(frame.columns) == ['weight_kg', 'pack_size', 'volume_ml', 'has_nutrition']
+
+        for index, title in titles.items():
+            features = parse_title(title)
+            row = frame.loc[index]
+            assert_same(container_weight_kg(features), None if pd.isna(row['weight_kg']) else row['weight_kg'], title)
+            assert_same(features.pack_size, None if pd.isna(row['pack_size']) else row['pack_size'], title)
+            assert row['has_nutrition'] == bool(features.nutrition)
+        assert frame['volume_ml'].max() == 2000
+
+    def test_parse_many_custom_policy(self):
+        titles = pd.Series(["Rice 500g", "Tea 20g", "Nothing"])
+        frame = parse_many(titles, weight=lambda f: f.weights[0].kg if f.weights else None)
+        assert frame['weight_kg'].tolist()[:2] == pytest.approx([0.5, 0.02])
+        assert pd.isna(frame['weight_kg'].iloc[2])
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Training Orchestrator
+===================================
+
+Tests for the cross-validation, search and early-stopping helpers behind
+EnhancedXGBoostTrainer, on a small imbalanced synthetic dataset.
+
+Coverage:
+- One fit per fold for all metrics, SMOTE on training folds only
+- Cached results on a rerun
+- Out-of-fold permutation test
+- Successive-halving search and XGBoost early stopping
+- Early stopping inside each cross-validation training fold
+"""
+
+import pytest
+import numpy as np
+from unittest.mock import patch
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.datasets import make_classification
+from sklearn.model_selection import StratifiedKFold
+from sklearn.tree import DecisionTreeClassifier
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.ml.training.training_orchestrator import (
+    MAX_BOOSTING_ROUNDS,
+    EarlyStoppedClassifier,
+    SCORING,
+    TrainingOrchestrator,
+    permutation_test
+)
+
+FITS = []
+
+
+class CountingTree(BaseEstimator, ClassifierMixin):
+    """Decision tree that records the size of every training set it sees"""
+
+    def __init__(self, max_depth=3):
+        self.max_depth = max_depth
+
+    def fit(self, X, y):
+        FITS.append(len(y))
+        self.tree_ = DecisionTreeClassifier(max_depth=self.max_depth, random_state=0).fit(X, y)
+        self.classes_ = self.tree_.classes_
+        return self
+
+    def predict(self, X):
+        return self.tree_.predict(X)
+
+    def predict_proba(self, X):
+        return self.tree_.predict_proba(X)
+
+
+@pytest.fixture
+def data():
+    X, y = make_classification(
+        n_samples=1500, n_features=8, n_informative=5, n_classes=3,
+        weights=[0.7, 0.2, 0.1], random_state=0
+    )
+    return pd.DataFrame(X, columns=[f"f{i}" for i in range(8)]), pd.Series(y)
+
+
+@pytest.fixture
+def orchestrator(tmp_path):
+    FITS.clear()
+    return TrainingOrchestrator(cache_dir=str(tmp_path / "cache"), n_jobs=1, random_state=0)
+
+
+@pytest.mark.unit
+class TestCrossValidate:
+    """Test single-fit multi-metric cross-validation"""
+
+    def test_one_fit_per_fold_for_all_metrics(self, orchestrator, data):
+        X, y = data
+        cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=0)
+        result = orchestrator.cross_validate(orchestrator.pipeline(CountingTree()), X, y, cv=cv)
+
+        assert len(FITS) == 5
+        assert set(result["scores"]) == set(SCORING)
+        assert all(len(scores) == 5 for scores in result["scores"].values())
+        assert len(result["oof_predictions"]) == len(y)
+
+    def test_smote_resamples_training_folds_only(self, orchestrator, data):
+        """Test each fit sees a balanced training fold, and every real row is predicted once"""
+        X, y = data
+        cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=0)
+        result = orchestrator.cross_validate(orchestrator.pipeline(CountingTree()), X, y, cv=cv)
+
+        majority_per_fold = int((y == 0).sum() * 4 / 5)
+        assert all(abs(n - 3 * majority_per_fold) <= 3 for n in FITS)
+        accuracy = np.mean(result["oof_predictions"] == y.to_numpy())
+        assert accuracy == pytest.approx(result["scores"]["accuracy"].mean(), abs=0.01)
+
+    def test_rerun_is_served_from_cache(self, orchestrator, data):
+        X, y = data
+        cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=0)
+        first = orchestrator.cross_validate(orchestrator.pipeline(CountingTree()), X, y, cv=cv)
+        fits = len(FITS)
+        second = orchestrator.cross_validate(orchestrator.pipeline(CountingTree()), X, y, cv=cv)
+
+        assert len(FITS) == fits
+        np.testing.assert_array_equal(first["oof_predictions"], second["oof_predictions"])
+
+        orchestrator.cross_validate(orchestrator.pipeline(CountingTree(max_depth=4)), X, y, cv=cv)
+        assert len(FITS) == fits + 3
+
+
+@pytest.mark.unit
+class TestPermutationTest:
+    """Test the refit-free permutation test"""
+
+    def test_informative_predictions_are_significant(self):
+        y = np.arange(300) % 3
+        result = permutation_test(y, y, n_permutations=200, random_state=0)
+        assert result["score"] == 1.0
+        assert result["p_value"] == pytest.approx(1 / 201)
+        assert result["significant"]
+
+    def test_random_predictions_are_not(self):
+        rng = np.random.RandomState(1)
+        y = rng.randint(0, 3, 300)
+        result = permutation_test(y, rng.randint(0, 3, 300), n_permutations=200, random_state=0)
+        assert not result["significant"]
+
+
+@pytest.mark.unit
+class TestSearch:
+    """Test successive halving and early stopping"""
+
+    def test_halving_search_returns_grid_params(self, orchestrator, data):
+        X, y = data
+        grid = {"model__max_depth": [2, 3, 4, 5, 6, 7]}
+        best_params, best_score = orchestrator.search(orchestrator.pipeline(CountingTree()), grid, X, y, n_candidates=6)
+        assert best_params["model__max_depth"] in grid["model__max_depth"]
+        assert 0 < best_score <= 1
+
+    def test_min_resources_keeps_rare_class_resamplable(self, orchestrator):
+        y = np.array([0] * 9900 + [1] * 100)
+        # 27 candidates would start at 10000 / 27 rows, with only ~4 rows of the rare class
+        assert orchestrator._min_resources(y, n_candidates=27, cv=3) >= 1800
+        assert orchestrator._min_resources(np.arange(9000) % 3, n_candidates=27, cv=3) == 9000 // 27
+
+    def test_early_stopping_sets_boosting_rounds(self, orchestrator, data):
+        xgb = pytest.importorskip("xgboost")
+        X, y = data
+        pipeline = orchestrator.pipeline(xgb.XGBClassifier(tree_method="hist", learning_rate=0.3, n_jobs=1))
+        stopped = orchestrator.early_stopped(pipeline, X, y)
+
+        rounds = stopped.get_params()["model__n_estimators"]
+        assert 1 <= rounds < MAX_BOOSTING_ROUNDS
+        assert stopped.get_params()["model__early_stopping_rounds"] is None
+
+
+    def test_cross_validation_early_stops_on_training_folds(self, orchestrator, data):
+        xgb = pytest.importorskip("xgboost")
+        X, y = data
+        pipeline = orchestrator.pipeline(xgb.XGBClassifier(tree_method="hist", learning_rate=0.3, n_jobs=1))
+        cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=0)
+        seen = []
+        original_fit = EarlyStoppedClassifier.fit
+
+        def fit(self, X_fold, y_fold):
+            seen.append(set(X_fold.index))
+            return original_fit(self, X_fold, y_fold)
+
+        with patch.object(EarlyStoppedClassifier, "fit", fit):
+            result = orchestrator.cross_validate(orchestrator.early_stopping(pipeline), X, y, cv=cv)
+
+        assert len(seen) == 3
+        for fit_rows, (_, test_idx) in zip(seen, cv.split(X, y)):
+            assert fit_rows.isdisjoint(test_idx)
+        assert result["scores"]["accuracy"].mean() > 0.5
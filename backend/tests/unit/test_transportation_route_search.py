@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests: Transportation Route Search
+=========================================
+
+Tests for the adjacency index and hop-bounded Pareto route search of
+TransportationOptimizationEngine.
+
+Coverage:
+- Index holds only cargo-compatible routes
+- Pareto front against brute-force enumeration of every path
+- Hop bound from max_handling_points, multi-modal switch
+- Batch optimize_routes and memoized search trees
+"""
+
+import itertools
+import math
+import random
+
+import pytest
+from unittest.mock import patch
+
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from backend.services.transportation_optimization_engine import (
+    CargoType,
+    OptimizationConstraints,
+    TransportationOptimizationEngine,
+    TransportMode,
+    TransportRoute,
+    UrgencyLevel
+)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    with patch('builtins.print'):
+        return TransportationOptimizationEngine()
+
+
+def make_route(engine, origin, destination, distance, mode):
+    return TransportRoute(
+        origin=origin, destination=destination, distance_km=distance, transport_mode=mode,
+        carbon_intensity_g_per_tonne_km=engine.carbon_intensities[mode],
+        cost_per_tonne_km=engine.cost_coefficients[mode],
+        transit_time_hours=distance / 1000 * engine.time_coefficients[mode],
+        reliability_score=engine.reliability_scores[mode],
+        capacity_constraints={}, weather_dependent=False, customs_complexity=1, infrastructure_quality=0.9
+    )
+
+
+@pytest.fixture
+def random_engine():
+    """Engine on a random network dense enough for many multi-leg paths"""
+    with patch('builtins.print'):
+        engine = TransportationOptimizationEngine()
+    rng = random.Random(0)
+    cities = [f"City {i}" for i in range(12)]
+    modes = [TransportMode.OCEAN_FREIGHT, TransportMode.RAIL_FREIGHT, TransportMode.TRUCK_DIESEL, TransportMode.AIR_FREIGHT]
+    engine.transport_network = [
+        make_route(engine, a, b, rng.choice([300, 800, 2000, 6000]), rng.choice(modes))
+        for a, b in itertools.permutations(cities, 2) if rng.random() < 0.35
+    ]
+    engine.rebuild_route_index()
+    return engine, cities
+
+
+def brute_force_paths(engine, origin, destination, cargo_type, max_legs):
+    """Every simple, valid path of at most max_legs compatible routes"""
+    compatible = [r for r in engine.transport_network if cargo_type in engine.cargo_compatibility[r.transport_mode]]
+    paths = []
+
+    def walk(path, node, visited):
+        if node == destination and path:
+            paths.append(list(path))
+            return
+        if len(path) == max_legs:
+            return
+        for route in compatible:
+            if route.origin != node or route.destination in visited:
+                continue
+            if path and not engine._is_valid_multi_modal_combination(path[-1], route):
+                continue
+            walk(path + [route], route.destination, visited | {route.destination})
+
+    walk([], origin, {origin})
+    return paths
+
+
+def objectives(path):
+    return (
+        round(sum(r.carbon_intensity_g_per_tonne_km * r.distance_km for r in path), 6),
+        round(sum(r.cost_per_tonne_km * r.distance_km for r in path), 6),
+        round(sum(r.transit_time_hours for r in path) + 4 * (len(path) - 1), 6),
+        round(-sum(math.log(r.reliability_score) for r in path), 6)
+    )
+
+
+@pytest.mark.unit
+class TestRouteIndex:
+    """Test the (origin, cargo type) adjacency index"""
+
+    def test_index_holds_compatible_routes_only(self, engine):
+        routes = engine.route_index[("Shanghai, China", CargoType.FRAGILE)]
+        assert routes
+        assert all(r.origin == "Shanghai, China" for r in routes)
+        assert all(CargoType.FRAGILE in engine.cargo_compatibility[r.transport_mode] for r in routes)
+        assert not any(r.transport_mode == TransportMode.OCEAN_FREIGHT for r in routes)
+
+
+@pytest.mark.unit
+class TestParetoSearch:
+    """Test the hop-bounded multi-objective search"""
+
+    def test_front_matches_brute_force(self, random_engine):
+        engine, cities = random_engine
+        constraints = OptimizationConstraints(max_handling_points=3, min_reliability_score=0.0)
+        for destination in cities[1:]:
+            paths = brute_force_paths(engine, cities[0], destination, CargoType.GENERAL, 3)
+            front = engine.find_pareto_routes(cities[0], destination, CargoType.GENERAL, constraints)
+            if not paths:
+                assert front == []
+                continue
+
+            vectors = {objectives(p) for p in paths}
+            nondominated = {
+                v for v in vectors
+                if not any(all(o <= x for o, x in zip(other, v)) and other != v for other in vectors)
+            }
+            assert nondominated <= {objectives(p) for p in front}
+
+            best = max(engine._calculate_route_score(p, 1000, constraints)["optimization_score"] for p in paths)
+            found = max(engine._calculate_route_score(p, 1000, constraints)["optimization_score"] for p in front)
+            assert found == pytest.approx(best)
+
+    def test_three_leg_route_within_hop_bound(self, engine):
+        constraints = OptimizationConstraints(max_handling_points=3)
+        routes = engine.find_pareto_routes("Shanghai, China", "Detroit, USA", CargoType.GENERAL, constraints)
+        assert [[r.destination for r in path] for path in routes] == [["Los Angeles, USA", "Chicago, USA", "Detroit, USA"]]
+
+        constraints = OptimizationConstraints(max_handling_points=2)
+        assert engine.find_pareto_routes("Shanghai, China", "Detroit, USA", CargoType.GENERAL, constraints) == []
+
+    def test_direct_only_without_multi_modal(self, engine):
+        constraints = OptimizationConstraints(allow_multi_modal=False)
+        assert engine.find_pareto_routes("Shanghai, China", "Chicago, USA", CargoType.GENERAL, constraints) == []
+        direct = engine.find_pareto_routes("Shanghai, China", "London, UK", CargoType.GENERAL, constraints)
+        assert all(len(path) == 1 for path in direct)
+        assert {path[0].transport_mode for path in direct} == {TransportMode.OCEAN_FREIGHT, TransportMode.AIR_FREIGHT}
+
+    def test_optimize_route_picks_best_scored(self, engine):
+        constraints = OptimizationConstraints(urgency_level=UrgencyLevel.ECONOMY)
+        with patch('builtins.print'):
+            route = engine.optimize_route("Shanghai, China", "London, UK", 1000, CargoType.GENERAL, constraints)
+        assert route.route_segments[0].transport_mode == TransportMode.OCEAN_FREIGHT
+
+
+@pytest.mark.unit
+class TestBatchOptimization:
+    """Test optimize_routes and search tree memoization"""
+
+    def test_batch_matches_single_and_reuses_trees(self, random_engine):
+        engine, cities = random_engine
+        constraints = OptimizationConstraints(min_reliability_score=0.0)
+        pairs = [(cities[0], d) for d in cities[1:]] + [(cities[1], cities[0])]
+
+        with patch.object(engine, "_label_setting_search", wraps=engine._label_setting_search) as search, \
+                patch('builtins.print'):
+            batch = engine.optimize_routes(pairs, 500, CargoType.GENERAL, constraints)
+            assert search.call_count == 2
+
+            for (origin, destination), result in zip(pairs, batch):
+                try:
+                    single = engine.optimize_route(origin, destination, 500, CargoType.GENERAL, constraints)
+                except ValueError:
+                    assert result is None
+                    continue
+                assert result.route_segments == single.route_segments
+            assert search.call_count == 2
+
+    def test_rebuild_index_clears_trees(self, random_engine):
+        engine, cities = random_engine
+        constraints = OptimizationConstraints()
+        engine.find_pareto_routes(cities[0], cities[1], CargoType.GENERAL, constraints)
+        assert engine._search_trees
+
+        engine.transport_network = []
+        engine.rebuild_route_index()
+        assert engine.find_pareto_routes(cities[0], cities[1], CargoType.GENERAL, constraints) == []
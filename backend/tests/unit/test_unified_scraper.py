@@ -35,6 +35,7 @@ from backend.scrapers.amazon.unified_scraper import (
     FallbackStrategy,
     ScrapingStrategyBase
 )
+from backend.scrapers.amazon.scraper_pool import ScrapeResultCache
 from backend.core.exceptions import (
     ScrapingException,
     DataValidationException,
@@ -331,7 +332,7 @@ class TestUnifiedProductScraper:
         
         assert len(scraper.strategies) >= 2  # At least requests + fallback
         assert scraper.cache_ttl == 7200
-        assert isinstance(scraper.cache, dict)
+        assert isinstance(scraper.cache, ScrapeResultCache)
         
         # Verify strategies are sorted by priority
         priorities = [s.priority for s in scraper.strategies]
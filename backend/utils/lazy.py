@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+💤 LAZY MODULES AND OBJECTS
+==========================
+
+Defers expensive imports and constructors until first use. Used by the API
+so that importing it stays cheap: the selenium scraper stack, pgeocode and
+the materials databases load on the first request that needs them, not in
+every worker at boot.
+
+Usage:
+    pgeocode = lazy_import("pgeocode")                       # imported on first attribute access
+    materials_db = lazy_object(EnhancedMaterialsDatabase)    # built on first attribute access
+
+Only attribute access triggers loading; `from x import y` on a lazy module
+or `obj[key]` on a lazy object does not work, so reach through attributes.
+"""
+
+import importlib
+import importlib.util
+import threading
+import types
+from typing import Any, Callable, Dict
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_error"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+    @property
+    def available(self) -> bool:
+        """Whether the module imports cleanly. The first check imports it; failures are remembered"""
+        if self.__dict__["_lazy_error"] is not None:
+            return False
+        try:
+            self._load()
+            return True
+        except ImportError as e:
+            self.__dict__["_lazy_error"] = e
+            print(f"⚠️ {self.__name__} not available: {e}")
+            return False
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+class LazyObject:
+    """Stand-in for an object built by factory() on first attribute access"""
+
+    def __init__(self, factory: Callable[[], Any], name: str = ""):
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_name", name or getattr(factory, "__name__", "object"))
+        object.__setattr__(self, "_lazy_value", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    def _load(self) -> Any:
+        value = object.__getattribute__(self, "_lazy_value")
+        if value is None:
+            with object.__getattribute__(self, "_lazy_lock"):
+                value = object.__getattribute__(self, "_lazy_value")
+                if value is None:
+                    value = object.__getattribute__(self, "_lazy_factory")()
+                    object.__setattr__(self, "_lazy_value", value)
+        return value
+
+    @property
+    def is_loaded(self) -> bool:
+        return object.__getattribute__(self, "_lazy_value") is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy {object.__getattribute__(self, '_lazy_name')} ({state})>"
+
+
+_modules: Dict[str, LazyModule] = {}
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Process-wide LazyModule for name"""
+    module = _modules.get(name)
+    if module is None:
+        module = _modules.setdefault(name, LazyModule(name))
+    return module
+
+
+def lazy_object(factory: Callable[[], Any], name: str = "") -> LazyObject:
+    return LazyObject(factory, name)
+
+
+def module_available(name: str) -> bool:
+    """Whether name can be imported, without importing it (parent packages are imported)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
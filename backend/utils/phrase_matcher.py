@@ -0,0 +1,70 @@
+"""
+Multi-pattern substring matcher (Aho-Corasick).
+
+Finds every registered phrase that occurs anywhere in a piece of text in a
+single left-to-right pass, including overlapping phrases such as
+'stainless' and 'stainless steel'. Matching is plain substring matching,
+exactly like ``phrase in text``, so it can replace loops of ``in`` checks
+without changing results.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over a fixed set of phrases"""
+
+    def __init__(self, phrases: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[FrozenSet[str]] = [frozenset()]
+
+        pending: List[set] = [set()]
+        registered = set()
+        for phrase in phrases:
+            if not phrase or phrase in registered:
+                continue
+            registered.add(phrase)
+            state = 0
+            for char in phrase:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    pending.append(set())
+                state = next_state
+            pending[state].add(phrase)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                pending[next_state] |= pending[self._fail[next_state]]
+
+        self._output = [frozenset(found) for found in pending]
+        self.phrase_count = len(registered)
+
+    def find_all(self, text: str) -> FrozenSet[str]:
+        """Return the set of phrases that occur in ``text``"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return frozenset(found)
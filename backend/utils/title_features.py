@@ -0,0 +1,278 @@
+"""
+Title feature engine shared by the weight extractors.
+
+Every quantity pattern the extractors care about (weights, volumes, pack
+sizes, box dimensions, nutrition facts and electronics specs) is compiled
+once into a single alternation. One left-to-right scan of the normalized
+title returns all of them with their spans, and each extractor applies its
+own unit priority and range checks to that result instead of running its
+own loop of regexes.
+
+- Nutrition facts ("23g protein", "76 servings") are matched ahead of
+  plain weights at the same position, so they are never read as the
+  product weight
+- A weight preceded by "weight:", "units:" or ";" (the Amazon
+  "11 x 7 x 27 cm; 600 g" format) keeps that label
+- Titles are normalized (lower case, single spaces) and parsed results
+  are kept in an LRU cache. Long page texts are scanned but not cached
+- parse_many parses each distinct title of a Series once and maps the
+  results back, for dataset rebuilds
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+TITLE_CACHE_SIZE = 8192
+# Longer text (whole product pages) is scanned but not kept in the cache
+MAX_CACHED_LENGTH = 512
+
+KG_PER_UNIT = {'kg': 1.0, 'g': 0.001, 'lb': 0.453592, 'oz': 0.0283495}
+ML_PER_UNIT = {'ml': 1.0, 'l': 1000.0, 'fl oz': 29.5735}
+
+# spelling in the title -> canonical unit
+UNIT_ALIASES = {
+    'kg': 'kg', 'kgs': 'kg', 'kilogram': 'kg', 'kilograms': 'kg',
+    'g': 'g', 'gram': 'g', 'grams': 'g', 'gramme': 'g', 'grammes': 'g',
+    'lb': 'lb', 'lbs': 'lb', 'pound': 'lb', 'pounds': 'lb',
+    'oz': 'oz', 'ounce': 'oz', 'ounces': 'oz',
+    'ml': 'ml', 'milliliter': 'ml', 'milliliters': 'ml', 'millilitre': 'ml', 'millilitres': 'ml',
+    'l': 'l', 'liter': 'l', 'liters': 'l', 'litre': 'l', 'litres': 'l',
+}
+
+SUPPLEMENT_KEYWORDS = ('protein', 'whey', 'casein', 'mass gainer', 'supplement')
+
+_NUMBER = r'\d+(?:\.\d+)?'
+
+# Alternatives are tried in this order at each position. Every alternative
+# is one named outer group, so match.lastgroup says which one matched.
+_TITLE_PATTERN = re.compile('|'.join([
+    # Nutrition facts come first so "23g protein" is not a 23 g product
+    rf'(?P<nutrition>{_NUMBER}\s*g\s*(?:protein|carbs?|fat|sugar|fiber)\b'
+    rf'|{_NUMBER}\s*mg\s*(?:sodium|caffeine)\b'
+    rf'|{_NUMBER}\s*k?cal\b'
+    rf'|\d+\s*(?:servings?|scoops?)\b)',
+    rf'(?P<dimensions>{_NUMBER}\s*[x×*]\s*{_NUMBER}\s*[x×*]\s*{_NUMBER}\s*'
+    rf'(?P<d_unit>cm|mm|centimet(?:er|re)s?|inch(?:es)?|in)\b)',
+    r'(?P<pack>(?P<p_count>\d+)\s*-?\s*(?:pack|pk|count|ct|pcs|pieces)\b'
+    r'|(?:pack|set|box|case) of (?P<p_of>\d+)\b)',
+    rf'(?P<quantity>(?:(?P<q_label>weight|units)[:\s]+|(?P<q_semi>;)\s*)?'
+    rf'(?P<q_value>{_NUMBER})\s*'
+    r'(?P<q_unit>fl\.?\s*oz|kilograms?|kgs?|grammes?|grams?|g|pounds?|lbs?|ounces?|oz'
+    r'|millilit(?:er|re)s?|ml|lit(?:er|re)s?|l)\b)',
+    r'(?P<spec>\d+\s*(?:gb|tb|mb|kb|ghz|mhz|mp|megapixels?|inch(?:es)?|volts?|v|amps?)\b|\d+\s*")',
+]))
+
+_SUPPLEMENT_PATTERN = re.compile('|'.join(SUPPLEMENT_KEYWORDS))
+
+
+@dataclass(frozen=True)
+class Quantity:
+    """A number with a weight or volume unit found in a title"""
+    value: float
+    unit: str  # canonical: kg, g, lb, oz, ml, l, fl oz
+    unit_text: str  # as written: "kilograms", "lbs", "g"
+    label: Optional[str]  # "weight", "units", ";" or None
+    start: int  # span of the number and unit, without the label
+    end: int
+
+    @property
+    def kg(self) -> Optional[float]:
+        factor = KG_PER_UNIT.get(self.unit)
+        return self.value * factor if factor is not None else None
+
+    @property
+    def ml(self) -> Optional[float]:
+        factor = ML_PER_UNIT.get(self.unit)
+        return self.value * factor if factor is not None else None
+
+
+@dataclass(frozen=True)
+class TitleFeatures:
+    """Everything one scan of a normalized title found, in title order"""
+    text: str
+    weights: Tuple[Quantity, ...]
+    volumes: Tuple[Quantity, ...]
+    pack_size: Optional[int]
+    nutrition: Tuple[Tuple[int, int], ...]
+    dimensions: Tuple[Tuple[int, int], ...]
+    specs: Tuple[Tuple[int, int], ...]
+    is_supplement: bool
+
+    @property
+    def has_specs(self) -> bool:
+        """Storage, frequency, camera, screen or electrical figures in the title"""
+        return bool(self.specs)
+
+    def iter_weights(self, units=None, labels=None) -> Iterator[Quantity]:
+        """Weights in title order, optionally limited to unit spellings and labels"""
+        for weight in self.weights:
+            if units is not None and weight.unit_text not in units:
+                continue
+            if labels is not None and weight.label not in labels:
+                continue
+            yield weight
+
+    def first_weight(self, units=None, labels=None) -> Optional[Quantity]:
+        return next(self.iter_weights(units, labels), None)
+
+    def follows_dimensions(self, weight: Quantity) -> bool:
+        """True for the weight in "45 x 30 x 20 cm; 600 g" """
+        for _, end in self.dimensions:
+            if end <= weight.start and not self.text[end:weight.start].strip(' ;,'):
+                return True
+        return False
+
+
+def normalize_title(title) -> str:
+    """Lower case with runs of whitespace collapsed; the cache key"""
+    if not isinstance(title, str):
+        return ''
+    return ' '.join(title.lower().split())
+
+
+def _scan(text: str) -> TitleFeatures:
+    weights, volumes, nutrition, dimensions, specs = [], [], [], [], []
+    pack_size = None
+
+    for match in _TITLE_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'quantity':
+            unit_text = match.group('q_unit')
+            unit = UNIT_ALIASES.get(unit_text) or 'fl oz'
+            quantity = Quantity(
+                value=float(match.group('q_value')),
+                unit=unit,
+                unit_text=unit_text,
+                label=match.group('q_label') or match.group('q_semi'),
+                start=match.start('q_value'),
+                end=match.end()
+            )
+            (weights if unit in KG_PER_UNIT else volumes).append(quantity)
+        elif kind == 'nutrition':
+            nutrition.append(match.span())
+        elif kind == 'pack':
+            if pack_size is None:
+                pack_size = int(match.group('p_count') or match.group('p_of'))
+        elif kind == 'dimensions':
+            dimensions.append(match.span())
+        else:
+            specs.append(match.span())
+
+    return TitleFeatures(
+        text=text,
+        weights=tuple(weights),
+        volumes=tuple(volumes),
+        pack_size=pack_size,
+        nutrition=tuple(nutrition),
+        dimensions=tuple(dimensions),
+        specs=tuple(specs),
+        is_supplement=_SUPPLEMENT_PATTERN.search(text) is not None
+    )
+
+
+_scan_cached = lru_cache(maxsize=TITLE_CACHE_SIZE)(_scan)
+
+
+def parse_title(title) -> TitleFeatures:
+    """Scan a title (or page text) once for all its quantity features"""
+    text = normalize_title(title)
+    if len(text) > MAX_CACHED_LENGTH:
+        return _scan(text)
+    return _scan_cached(text)
+
+
+def clear_title_cache() -> None:
+    _scan_cached.cache_clear()
+
+
+def title_cache_info():
+    return _scan_cached.cache_info()
+
+
+# === Weight policies ===
+
+# Unit spellings in the order extract_weight_from_title has always tried them
+CONTAINER_WEIGHT_PRIORITY = (
+    ('kg', ('kg',)),
+    ('lb', ('lb', 'lbs')),
+    ('lb', ('pound', 'pounds')),
+    ('g_large', ('g',)),
+    ('kg', ('kilogram', 'kilograms')),
+    ('oz', ('ounce', 'ounces')),
+    ('g', ('g',)),
+)
+
+
+def _first_large_grams(features: TitleFeatures) -> Optional[Quantity]:
+    """First whole 3-4 digit gram figure (500g, 2500g): usually the container"""
+    for weight in features.iter_weights(('g',)):
+        if weight.value.is_integer() and 100 <= weight.value < 10000:
+            return weight
+    return None
+
+
+def container_weight(features: TitleFeatures, min_kg: float = 0.05, max_kg: float = 50.0) -> Optional[Tuple[Quantity, str, float]]:
+    """
+    The product's own (container) weight: the first mention of each unit in
+    priority order that passes the checks, with the rule name and kilograms.
+    Small gram figures on supplements are taken as nutrition, not weight.
+    """
+    for rule, units in CONTAINER_WEIGHT_PRIORITY:
+        weight = _first_large_grams(features) if rule == 'g_large' else features.first_weight(units)
+        if weight is None:
+            continue
+        if features.is_supplement:
+            if rule == 'g' and weight.value < 200:
+                continue
+            if rule == 'g_large' and weight.value < 400:
+                continue
+        weight_kg = weight.kg
+        if min_kg <= weight_kg <= max_kg:
+            return weight, rule, weight_kg
+    return None
+
+
+def container_weight_kg(features: TitleFeatures) -> Optional[float]:
+    found = container_weight(features)
+    return found[2] if found else None
+
+
+# === Series mode ===
+
+def parse_many(titles: pd.Series, weight: Callable[[TitleFeatures], Optional[float]] = container_weight_kg) -> pd.DataFrame:
+    """
+    Title features for a whole column: each distinct title is parsed once
+    (through the cache) and the results are spread back over the rows.
+
+    Columns: weight_kg (by the given policy), pack_size, volume_ml and
+    has_nutrition. Missing values are NaN / False.
+    """
+    codes, uniques = pd.factorize(titles, sort=False)
+    weights = np.full(len(uniques) + 1, np.nan)
+    packs = np.full(len(uniques) + 1, np.nan)
+    volumes = np.full(len(uniques) + 1, np.nan)
+    nutrition = np.zeros(len(uniques) + 1, dtype=bool)
+
+    for i, title in enumerate(uniques):
+        features = parse_title(title)
+        found = weight(features)
+        if found is not None:
+            weights[i] = found
+        if features.pack_size is not None:
+            packs[i] = features.pack_size
+        if features.volumes:
+            volumes[i] = features.volumes[0].ml
+        nutrition[i] = bool(features.nutrition)
+
+    # Missing titles have code -1, which picks the trailing empty slot
+    return pd.DataFrame({
+        'weight_kg': weights[codes],
+        'pack_size': packs[codes],
+        'volume_ml': volumes[codes],
+        'has_nutrition': nutrition[codes]
+    }, index=titles.index)
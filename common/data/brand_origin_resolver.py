@@ -1,12 +1,91 @@
-import json
+import heapq
 import os
 import re
+import threading
+from collections import Counter
 from difflib import SequenceMatcher
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
+
+from common.data.brand_store import get_brand_store
 
 # === CONFIG ===
 BRAND_ORIGIN_JSON = os.path.join(os.path.dirname(__file__), "json", "brand_orign_data.json")  # Note: keeping existing typo
 
+# Most similar candidates (by shared trigrams) scored per fuzzy lookup
+MAX_FUZZY_CANDIDATES = 64
+# Largest bonus fuzzy_match_brand adds on top of the similarity ratio
+MAX_MATCH_BONUS = 0.35
+
+# === FUZZY BRAND INDEX ===
+
+class BrandIndex:
+    """
+    Inverted trigram index over normalized brand names
+
+    Normalized names are computed once, when a brand is added. A lookup
+    collects the brands sharing the most trigrams with the target (plus
+    brands whose acronym equals it), so only a small candidate set is
+    scored instead of every known brand.
+    """
+
+    def __init__(self, normalize: Callable[[str], str], brands: Iterable[str] = ()):
+        self.normalize = normalize
+        self.keys: List[str] = []
+        self.names: List[str] = []
+        self._gram_counts: List[int] = []
+        self._ordinals: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._acronyms: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        for brand in brands:
+            self.add(brand)
+
+    @staticmethod
+    def trigrams(name: str) -> set:
+        padded = f"  {name} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, brand: str) -> bool:
+        return brand in self._ordinals
+
+    def add(self, brand: str) -> None:
+        """Index one brand key (no-op if already indexed)"""
+        with self._lock:
+            if brand in self._ordinals:
+                return
+            name = self.normalize(brand)
+            ordinal = len(self.keys)
+            self._ordinals[brand] = ordinal
+            self.keys.append(brand)
+            self.names.append(name)
+            grams = self.trigrams(name)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(ordinal)
+            acronym = ''.join(word[0] for word in name.split() if word)
+            if len(acronym) > 1:
+                self._acronyms.setdefault(acronym, []).append(ordinal)
+
+    def candidates(self, target_clean: str, limit: int = MAX_FUZZY_CANDIDATES) -> List[int]:
+        """Ordinals of the likeliest matches (by trigram Dice overlap), in insertion order"""
+        target_grams = self.trigrams(target_clean)
+        shared = Counter()
+        for gram in target_grams:
+            shared.update(self._postings.get(gram, ()))
+        # Dice rather than raw counts, so short names are not crowded out by long ones
+        gram_counts, n_target = self._gram_counts, len(target_grams)
+        ranked = heapq.nlargest(
+            limit, shared.items(),
+            key=lambda item: (item[1] / (gram_counts[item[0]] + n_target), -item[0])
+        )
+        ordinals = {ordinal for ordinal, _ in ranked}
+        ordinals.update(self._acronyms.get(target_clean, ()))
+        return sorted(ordinals)
+
+
 # === INTELLIGENT BRAND ORIGIN DETECTION ===
 
 class EnhancedBrandResolver:
@@ -34,16 +113,15 @@ class EnhancedBrandResolver:
         self.industry_patterns = self._build_industry_patterns()
         self.origin_keywords = self._build_origin_keywords()
         self.learning_cache = {}
+        # Built on the first fuzzy lookup
+        self._brand_index: Optional[BrandIndex] = None
+        # BrandStore.version the index last synced with
+        self._index_version: Optional[int] = None
+        self._index_lock = threading.Lock()
     
     def _load_brand_data(self) -> Dict:
-        """Load existing brand data with error handling"""
-        try:
-            if os.path.exists(BRAND_ORIGIN_JSON):
-                with open(BRAND_ORIGIN_JSON, "r", encoding="utf-8") as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"⚠️ Error loading brand data: {e}")
-        return {}
+        """Brand database, shared with other processes through a write-behind BrandStore"""
+        return get_brand_store(BRAND_ORIGIN_JSON)
     
     def _build_domain_patterns(self) -> Dict[str, str]:
         """Domain TLD to country mapping - Handle edge cases"""
@@ -107,11 +185,20 @@ class EnhancedBrandResolver:
         best_match = None
         best_score = 0.0
         
-        for known_brand in self.exact_matches.keys():
-            known_clean = self._normalize_brand_name(known_brand)
+        index = self._get_brand_index()
+        matcher = SequenceMatcher(None)
+        matcher.set_seq1(target_clean)
+        
+        for ordinal in index.candidates(target_clean):
+            known_clean = index.names[ordinal]
+            matcher.set_seq2(known_clean)
+            
+            # Skip candidates that cannot reach the threshold even with both bonuses
+            if matcher.real_quick_ratio() + MAX_MATCH_BONUS < threshold:
+                continue
             
             # Multiple similarity algorithms
-            similarity = SequenceMatcher(None, target_clean, known_clean).ratio()
+            similarity = matcher.ratio()
             
             # Bonus scoring for exact word matches
             if self._has_exact_word_match(target_clean, known_clean):
@@ -121,12 +208,54 @@ class EnhancedBrandResolver:
             if self._is_common_abbreviation(target_clean, known_clean):
                 similarity += 0.20
                 
-            if similarity >= threshold and similarity > best_score:
-                best_match = known_brand
+            # The index only grows: skip brands deleted since they were indexed
+            if similarity >= threshold and similarity > best_score \
+                    and self._known_brand_record(index.keys[ordinal]) is not None:
+                best_match = index.keys[ordinal]
                 best_score = similarity
         
         return (best_match, best_score) if best_match else None
     
+    def _known_brand_record(self, brand: str) -> Optional[Dict]:
+        """Database or learned record for brand; None if deleted or without a country"""
+        for source in (self.exact_matches, self.learning_cache):
+            if brand in source:
+                record = source.get(brand)
+                if isinstance(record, dict) and record.get("country"):
+                    return record
+        return None
+    
+    def _get_brand_index(self) -> BrandIndex:
+        """Fuzzy index over known and learned brands, kept in step with exact_matches"""
+        index = self._brand_index
+        # The store's change counter covers direct edits (exact_matches is
+        # shared via load_brand_origin_data) and brands other workers wrote
+        version = getattr(self.exact_matches, "version", None)
+        if index is None:
+            with self._index_lock:
+                index = self._brand_index
+                if index is None:
+                    self._index_version = version
+                    index = BrandIndex(self._normalize_brand_name, self.exact_matches.keys())
+                    for brand in self.learning_cache:
+                        index.add(brand)
+                    self._brand_index = index
+        elif version is not None and version != self._index_version:
+            self._index_version = version
+            for brand in list(self.exact_matches):
+                index.add(brand)
+        elif version is None and len(index) < len(self.exact_matches):
+            # Plain dict: no counter, so only growth past the index is noticed
+            for brand in list(self.exact_matches):
+                index.add(brand)
+        return index
+    
+    def add_known_brand(self, brand: str, record: Dict) -> None:
+        """Add or update a database brand; it is fuzzy-matchable immediately"""
+        self.exact_matches[brand] = record
+        if self._brand_index is not None:
+            self._brand_index.add(brand)
+    
     def _normalize_brand_name(self, brand: str) -> str:
         """Intelligent brand name normalization"""
         if not brand:
@@ -269,9 +398,10 @@ class EnhancedBrandResolver:
         
         # Step 2: Fuzzy Match (High Confidence)
         fuzzy_result = self.fuzzy_match_brand(brand_clean)
-        if fuzzy_result:
+        # Re-read the record: another thread may have deleted the brand since
+        match_data = self._known_brand_record(fuzzy_result[0]) if fuzzy_result else None
+        if match_data is not None:
             matched_brand, similarity = fuzzy_result
-            match_data = self.exact_matches[matched_brand]
             return {
                 "country": match_data["country"],
                 "city": match_data.get("city", "Unknown"),
@@ -349,6 +479,8 @@ class EnhancedBrandResolver:
                 "confidence": confidence,
                 "learned_at": "auto_detection"
             }
+            if self._brand_index is not None:
+                self._brand_index.add(brand.lower())
 
 # === GLOBAL RESOLVER INSTANCE ===
 _enhanced_resolver = EnhancedBrandResolver()
@@ -360,12 +492,10 @@ def load_brand_origin_data():
     return _enhanced_resolver.exact_matches
 
 def save_brand_origin_data(data):
-    """Legacy function for backward compatibility"""
-    try:
-        with open(BRAND_ORIGIN_JSON, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-    except IOError as e:
-        print(f"⚠️ Error saving brand data: {e}")
+    """Legacy function for backward compatibility. Only brands that changed are written (behind, in a batch)"""
+    store = get_brand_store(BRAND_ORIGIN_JSON)
+    if data is not store:
+        store.update(data)
 
 def get_brand_origin(brand):
     """Legacy function - now uses intelligent resolution"""
@@ -386,6 +516,5 @@ def get_brand_origin_intelligent(brand, product_title="", additional_context="")
 def update_brand_origin(brand, country, city="Unknown"):
     """Legacy function for backward compatibility"""
     brand = brand.lower().strip()
-    data = load_brand_origin_data()
-    data[brand] = {"country": country.title(), "city": city.title()}
-    save_brand_origin_data(data)
+    # exact_matches is the BrandStore, so this queues a write-behind update
+    _enhanced_resolver.add_known_brand(brand, {"country": country.title(), "city": city.title()})
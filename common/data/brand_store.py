@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+🏷️ WRITE-BEHIND BRAND STORE
+==========================
+
+Dict-like store for brand location files (brand_locations.json,
+brand_orign_data.json) shared by scraper processes and API workers.
+
+- Reads come from an in-memory dict. Nothing touches the disk on a hit
+- Assignments only queue the change. One writer thread per store collects
+  changes for DEBOUNCE_SECONDS and appends them as a batch to a sidecar
+  JSON Lines log (<file>.log.jsonl) with a single write() under an
+  exclusive file lock, so learning a brand never rewrites the whole file
+- Before appending, the writer reads what other processes appended since
+  its last read. Lookups that miss do the same, at most once per
+  REFRESH_SECONDS, so brands learned by another worker become visible
+- version goes up whenever the in-memory brands change, whether the
+  change was made here or read from another process's appends, so caches
+  built over the store know when to resync
+- Once the log grows past COMPACT_BYTES (and when the process exits) it is
+  folded into the JSON file: temp file + os.replace, then a fresh log.
+  Other tools keep reading the JSON file as before
+
+Usage:
+    store = get_brand_store("brand_locations.json")
+    store["huel"] = {"origin": {"country": "UK", "city": "Tring"}, "fulfillment": "UK"}
+    store.get("huel")
+    store.flush()  # wait until queued changes are in the log
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev runs, the writer thread is enough
+    fcntl = None
+
+# How long the writer waits after the first change so a burst goes out as one append
+DEBOUNCE_SECONDS = float(os.environ.get("BRAND_STORE_DEBOUNCE", "0.5"))
+# Fold the log into the JSON file once it is this large
+COMPACT_BYTES = 512 * 1024
+# Minimum time between checks for other processes' appends on a lookup miss
+REFRESH_SECONDS = 1.0
+
+_DELETED = object()
+
+
+class _FileLock:
+    """Exclusive flock on a sidecar file (no-op where fcntl is unavailable)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class BrandStore(MutableMapping):
+    """JSON snapshot + append-only change log, read from memory, written behind"""
+
+    def __init__(self, path: str, debounce: float = DEBOUNCE_SECONDS, compact_bytes: int = COMPACT_BYTES):
+        self.path = os.path.abspath(path)
+        self.log_path = self.path + ".log.jsonl"
+        self.debounce = debounce
+        self.compact_bytes = compact_bytes
+
+        self._lock_path = self.path + ".lock"
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._data: Dict[str, Any] = {}
+        # Changes not yet in the log: queued, and taken by the writer
+        self._pending: Dict[str, Any] = {}
+        self._inflight: Dict[str, Any] = {}
+        self._snapshot_inode: Optional[int] = None
+        self._log_inode: Optional[int] = None
+        self._log_offset = 0
+        self._last_refresh = 0.0
+        self._dirty = False
+        self._writer: Optional[threading.Thread] = None
+        # Bumped on every change to _data, local or read from the log
+        self.version = 0
+
+        self.stats = {"queued": 0, "written": 0, "batches": 0, "write_errors": 0,
+                      "tail_reads": 0, "reloads": 0, "compactions": 0}
+        with _FileLock(self._lock_path):
+            self._reload()
+
+    # === Reading ===
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._data[key]
+        except KeyError:
+            if self._maybe_refresh():
+                return self._data[key]
+            raise
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._data:
+            return True
+        return self._maybe_refresh() and key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"BrandStore({self.path!r}, {len(self._data)} brands)"
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._data)
+
+    def refresh(self) -> None:
+        """Pick up changes other processes have appended or compacted"""
+        with _FileLock(self._lock_path):
+            self._sync_from_disk()
+        self._last_refresh = time.monotonic()
+
+    def _maybe_refresh(self) -> bool:
+        """Refresh after a miss, at most once per REFRESH_SECONDS. True if it ran"""
+        if time.monotonic() - self._last_refresh < REFRESH_SECONDS:
+            return False
+        self.refresh()
+        return True
+
+    def _reload(self) -> None:
+        """Snapshot plus the whole log (caller holds the file lock)"""
+        data: Dict[str, Any] = {}
+        self._snapshot_inode = _inode(self.path)
+        try:
+            if self._snapshot_inode is not None:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Could not load {os.path.basename(self.path)}: {e}")
+        with self._lock:
+            self._data = data
+            # Local changes not yet logged win over the file
+            self._data.update(self._inflight)
+            self._data.update(self._pending)
+            self._drop_deleted()
+            self._log_inode = None
+            self._log_offset = 0
+            self.version += 1
+        self._tail()
+
+    def _sync_from_disk(self) -> None:
+        """Apply new log records, or reload if the files were compacted (caller holds the file lock)"""
+        log_inode = _inode(self.log_path)
+        if _inode(self.path) != self._snapshot_inode or (self._log_inode is not None and log_inode != self._log_inode):
+            self.stats["reloads"] += 1
+            self._reload()
+        else:
+            self._tail()
+
+    def _tail(self) -> None:
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if self._log_inode is None:
+                self._log_inode = st.st_ino
+            if st.st_size <= self._log_offset:
+                return
+            self.stats["tail_reads"] += 1
+            f.seek(self._log_offset)
+            chunk = f.read(st.st_size - self._log_offset)
+        end = chunk.rfind(b"\n") + 1
+        with self._lock:
+            self.version += 1
+            for line in chunk[:end].splitlines():
+                record = _decode(line)
+                if record is None:
+                    continue
+                key = record["k"]
+                if key in self._pending or key in self._inflight:
+                    continue
+                if record.get("d"):
+                    self._data.pop(key, None)
+                else:
+                    self._data[key] = record.get("v")
+        self._log_offset += end
+
+    def _drop_deleted(self) -> None:
+        for key in [key for key, value in self._data.items() if value is _DELETED]:
+            del self._data[key]
+
+    # === Writing ===
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            if key in self._data and self._data[key] == value:
+                return
+            self._data[key] = value
+            self.version += 1
+            self._queue(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            del self._data[key]
+            self.version += 1
+            self._queue(key, _DELETED)
+
+    def _queue(self, key: str, value: Any) -> None:
+        self._pending[key] = value
+        self._dirty = True
+        self.stats["queued"] += 1
+        self._ensure_writer()
+        self._changed.notify_all()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._run_writer, name=f"brand-store:{os.path.basename(self.path)}", daemon=True)
+            self._writer.start()
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._lock:
+                self._changed.wait_for(lambda: bool(self._pending))
+            # Let the burst settle, then take everything queued so far
+            time.sleep(self.debounce)
+            with self._lock:
+                self._inflight, self._pending = self._pending, {}
+            self._write_batch()
+
+    def _write_batch(self) -> None:
+        lines = [_encode(key, value) for key, value in self._inflight.items()]
+        try:
+            with _FileLock(self._lock_path):
+                # Apply other processes' records first so ours land after them
+                self._sync_from_disk()
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                    f.flush()
+                    st = os.fstat(f.fileno())
+                self._log_inode = st.st_ino
+                self._log_offset = st.st_size
+                self.stats["written"] += len(lines)
+                self.stats["batches"] += 1
+                if st.st_size >= self.compact_bytes:
+                    self._compact_locked()
+        except OSError as e:
+            self.stats["write_errors"] += len(lines)
+            print(f"❌ Failed to write {len(lines)} brand updates to {self.log_path}: {e}")
+        finally:
+            with self._lock:
+                self._inflight = {}
+                self._changed.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every change made in this process is in the log"""
+        with self._lock:
+            return self._changed.wait_for(lambda: not self._pending and not self._inflight, timeout=timeout)
+
+    def save(self) -> None:
+        """Legacy save hook. Changes are already queued on assignment, so this only wakes the writer"""
+        with self._lock:
+            self._changed.notify_all()
+
+    # === Compaction ===
+
+    def compact(self) -> None:
+        """Fold the log into the JSON file and start a fresh log"""
+        self.flush()
+        with _FileLock(self._lock_path):
+            self._sync_from_disk()
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        # Changes still queued are included too; logging them later is harmless
+        with self._lock:
+            snapshot = json.dumps(self._data, indent=2)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.path)
+        self._snapshot_inode = _inode(self.path)
+        # New inodes: other processes reload on their next read
+        tmp_path = f"{self.log_path}.{os.getpid()}.tmp"
+        open(tmp_path, "w").close()
+        os.replace(tmp_path, self.log_path)
+        self._log_inode = _inode(self.log_path)
+        self._log_offset = 0
+        self._dirty = False
+        self.stats["compactions"] += 1
+
+    def close(self) -> None:
+        """Flush, and compact if this process changed anything"""
+        self.flush(timeout=2.0)
+        if self._dirty:
+            try:
+                self.compact()
+            except OSError as e:
+                print(f"⚠️ Could not compact {os.path.basename(self.path)}: {e}")
+
+
+def _inode(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return None
+
+
+def _encode(key: str, value: Any) -> str:
+    record = {"k": key, "d": True} if value is _DELETED else {"k": key, "v": value}
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return record if isinstance(record, dict) and "k" in record else None
+
+
+_stores: Dict[str, BrandStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_brand_store(path: str) -> BrandStore:
+    """Process-wide BrandStore for a path"""
+    key = os.path.abspath(path)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = _stores[key] = BrandStore(key)
+    return store
+
+
+@atexit.register
+def _close_all() -> None:
+    for store in list(_stores.values()):
+        store.close()
@@ -350,7 +350,7 @@ class EnterpriseFeatureDemo:
             print(f"   🔐 JWT Token Generated: {jwt_token[:50]}...")
             
             # Verify token
-            payload = auth_service.verify_jwt_token(jwt_token)
+            payload = await auth_service.verify_jwt_token(jwt_token)
             print(f"   ✅ Token Verified - User: {payload['user_id']}")
             print(f"   👑 Role: {payload['role']}")
             print(f"   📋 Custom Claims: {payload.get('department', 'None')}")
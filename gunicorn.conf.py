@@ -0,0 +1,31 @@
+"""
+Gunicorn settings (read automatically from the working directory)
+
+    gunicorn backend.api.app:app --bind 0.0.0.0:$PORT
+
+The app is imported once in the master and the eco-score model registry is
+loaded there before workers fork, so every worker starts warm and shares
+the model and encoder pages copy-on-write instead of loading its own copy.
+Set PRELOAD_MODELS=false to load them lazily on each worker's first
+prediction instead.
+"""
+
+import os
+
+preload_app = True
+# Worker count and timeout keep gunicorn's defaults (one worker, 30s) unless
+# the platform sets WEB_CONCURRENCY
+if "WEB_CONCURRENCY" in os.environ:
+    workers = int(os.environ["WEB_CONCURRENCY"])
+
+
+def when_ready(server):
+    if os.environ.get("PRELOAD_MODELS", "true").lower() in ("0", "false", "no"):
+        return
+    from backend.ml.inference.model_registry import get_model_registry
+    try:
+        models = get_model_registry().preload()
+        server.log.info("Preloaded eco-score model (%s) in %.2fs", models.model_type, models.load_seconds)
+    except Exception as e:
+        # Workers fall back to loading on first prediction
+        server.log.warning("Model preload failed: %s", e)
@@ -362,7 +362,7 @@ class EnterpriseFeatureTester:
             
             # Verify JWT token
             try:
-                payload = auth_service.verify_jwt_token(jwt_token)
+                payload = await auth_service.verify_jwt_token(jwt_token)
                 results["jwt_auth"] = {
                     "token_generated": len(jwt_token) > 0,
                     "token_verified": payload["user_id"] == "test_user_123",